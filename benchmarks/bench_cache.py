@@ -0,0 +1,70 @@
+"""Benchmark cached Graphviz layouts against running dot.
+
+Times compute() per layout, once with a cold cache and then with every
+layout already stored:
+
+    dot ms      best-of-N GraphvizEngine.compute() without a cache
+    hit ms      best-of-N GraphvizEngine(cache=...).compute() on a hit
+    speedup     dot ms / hit ms
+    entry B     size of the cache entry
+
+Needs the dot command.
+
+Usage:
+    uv run python benchmarks/bench_cache.py [--repeat N]
+"""
+
+import argparse
+import sys
+import tempfile
+import timeit
+
+from visualflow.engines import GraphvizCache, GraphvizEngine
+from visualflow.models import DAG
+
+BOX = "+--------+\n| {:<6} |\n+--------+"
+
+
+def layered(layers: int, width: int) -> DAG:
+    """Create `layers` layers of `width` nodes, each linked to the next layer."""
+    dag = DAG()
+    for layer in range(layers):
+        for i in range(width):
+            dag.add_node(f"n{layer}_{i}", BOX.format(f"{layer}.{i}"))
+            if layer:
+                dag.add_edge(f"n{layer - 1}_{i}", f"n{layer}_{i}")
+                dag.add_edge(f"n{layer - 1}_{(i + 1) % width}", f"n{layer}_{i}")
+    return dag
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    if not GraphvizEngine.is_available():
+        sys.exit("Needs the dot command (run: brew install graphviz)")
+
+    cases = {
+        "2 x 2": layered(2, 2),
+        "5 x 5": layered(5, 5),
+        "10 x 10": layered(10, 10),
+        "20 x 20": layered(20, 20),
+    }
+    with tempfile.TemporaryDirectory() as directory:
+        cache = GraphvizCache(directory)
+        uncached, cached = GraphvizEngine(), GraphvizEngine(cache=cache)
+        print(f"{'graph':<10}{'dot ms':>10}{'hit ms':>10}{'speedup':>9}{'entry B':>10}")
+        for name, dag in cases.items():
+            before = cache.size()
+            cached.compute(dag)  # Store the entry
+            entry = cache.size() - before
+            times = [
+                min(timeit.repeat(lambda engine=engine: engine.compute(dag), number=1, repeat=args.repeat))
+                for engine in (uncached, cached)
+            ]
+            print(f"{name:<10}{times[0] * 1e3:>10.2f}{times[1] * 1e3:>10.2f}{times[0] / times[1]:>8.1f}x{entry:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Benchmark canvas area and draw time with and without compaction.
+
+Lays out a few synthetic graphs with GrandalfEngine, then compares the
+engine's layout against compact_layout() of it:
+
+    area        canvas cells (width x height)
+    saved       area reduction
+    draw ms     best-of-N route + canvas time for the layout
+
+Usage:
+    uv run python benchmarks/bench_compact.py [--repeat N]
+"""
+
+import argparse
+import timeit
+
+from visualflow import _draw_layout, compact_layout
+from visualflow.engines import GrandalfEngine
+from visualflow.models import DAG, DEFAULT_THEME
+from visualflow.routing import SimpleRouter
+
+BOX = "+---------+\n| {:<7} |\n+---------+"
+
+
+def components(count: int) -> DAG:
+    """Create `count` disconnected three-node chains (one layout call)."""
+    dag = DAG()
+    for i in range(count):
+        for level in range(3):
+            dag.add_node(f"k{i}_{level}", BOX.format(f"K{i}.{level}"))
+        dag.add_edge(f"k{i}_0", f"k{i}_1")
+        dag.add_edge(f"k{i}_1", f"k{i}_2")
+    return dag
+
+
+def fanout(children: int) -> DAG:
+    """Create root -> c_i -> g_i."""
+    dag = DAG()
+    dag.add_node("root", BOX.format("ROOT"))
+    for i in range(children):
+        dag.add_node(f"c{i}", BOX.format(f"C{i}"))
+        dag.add_node(f"g{i}", BOX.format(f"G{i}"))
+        dag.add_edge("root", f"c{i}")
+        dag.add_edge(f"c{i}", f"g{i}")
+    return dag
+
+
+def diamonds(count: int) -> DAG:
+    """Create a chain of diamonds (splits and merges)."""
+    dag = DAG()
+    dag.add_node("d0", BOX.format("D0"))
+    for i in range(count):
+        for side in "lr":
+            dag.add_node(f"{side}{i}", BOX.format(f"{side.upper()}{i}"))
+            dag.add_edge(f"d{i}", f"{side}{i}")
+        dag.add_node(f"d{i + 1}", BOX.format(f"D{i + 1}"))
+        dag.add_edge(f"l{i}", f"d{i + 1}")
+        dag.add_edge(f"r{i}", f"d{i + 1}")
+    return dag
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    engine = GrandalfEngine()
+    router = SimpleRouter()
+    cases = {
+        "components": components(20),
+        "fanout": fanout(40),
+        "diamonds": diamonds(10),
+    }
+    print(f"{'graph':<12}{'area':>10}{'compact':>10}{'saved':>8}{'draw ms':>10}{'compact':>10}")
+    for name, dag in cases.items():
+        layout = engine.compute(dag)
+        compacted = compact_layout(layout)
+        area = layout.width * layout.height
+        compact_area = compacted.width * compacted.height
+        times = [
+            min(timeit.repeat(
+                lambda current=current: _draw_layout(dag, current, router, DEFAULT_THEME),
+                number=1,
+                repeat=args.repeat,
+            ))
+            for current in (layout, compacted)
+        ]
+        print(
+            f"{name:<12}{area:>10}{compact_area:>10}{1 - compact_area / area:>8.0%}"
+            f"{times[0] * 1e3:>10.2f}{times[1] * 1e3:>10.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
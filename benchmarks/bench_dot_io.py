@@ -0,0 +1,126 @@
+"""Benchmark GraphvizEngine's DOT writer and plain output parser.
+
+Times the text handling around `dot` on large graphs (no Graphviz
+needed: the plain output is synthesized), against the previous
+line-by-line implementation kept here for reference:
+
+    write ms    best-of-N DOT generation, previous vs current
+    parse ms    best-of-N plain output parsing, previous vs current
+
+Usage:
+    uv run python benchmarks/bench_dot_io.py [--repeat N]
+"""
+
+import argparse
+import random
+import timeit
+from dataclasses import dataclass
+
+from visualflow.engines import GraphvizEngine
+from visualflow.models import DAG
+
+BOX = "+--------+\n| {:<6} |\n+--------+"
+
+
+@dataclass(slots=True)
+class _PreviousPlainNode:
+    name: str
+    x: float
+    y: float
+    width: float
+    height: float
+
+
+def previous_generate_dot(engine: GraphvizEngine, dag: DAG) -> str:
+    """DOT generation before the streaming writer."""
+    lines = ["digraph G {"]
+    lines.append("  rankdir=TB;")
+    for node_id, node in dag.nodes.items():
+        width_inches = node.width / engine.CHARS_PER_INCH
+        height_inches = node.height / engine.LINES_PER_INCH
+        safe_id = node_id.replace("-", "_")
+        lines.append(
+            f'  {safe_id} [label="{node_id}" '
+            f"width={width_inches:.2f} height={height_inches:.2f} fixedsize=true];"
+        )
+    for edge in dag.edges:
+        safe_source = edge.source.replace("-", "_")
+        safe_target = edge.target.replace("-", "_")
+        lines.append(f"  {safe_source} -> {safe_target};")
+    lines.append("}")
+    return "\n".join(lines)
+
+
+def previous_parse(plain: str) -> dict[str, _PreviousPlainNode]:
+    """Plain output parsing before the single-pass parser."""
+    nodes: dict[str, _PreviousPlainNode] = {}
+    for line in plain.strip().split("\n"):
+        parts = line.split()
+        if not parts:
+            continue
+        if parts[0] == "node":
+            nodes[parts[1]] = _PreviousPlainNode(
+                name=parts[1],
+                x=float(parts[2]),
+                y=float(parts[3]),
+                width=float(parts[4]),
+                height=float(parts[5]),
+            )
+    return nodes
+
+
+def random_dag(nodes: int, seed: int = 1) -> DAG:
+    """Create a random DAG with about 1.5 edges per node."""
+    rng = random.Random(seed)
+    dag = DAG()
+    for i in range(nodes):
+        dag.add_node(f"n{i}", BOX.format(f"N{i}"))
+    for _ in range(nodes * 3 // 2):
+        source = rng.randrange(nodes - 1)
+        dag.add_edge(f"n{source}", f"n{rng.randrange(source + 1, min(nodes, source + 20))}")
+    return dag
+
+
+def synthetic_plain(dag: DAG) -> str:
+    """Plain output placing the nodes on a grid, with 4-point edges."""
+    lines = [f"graph 1 {len(dag.nodes) ** 0.5 * 2:.4g} 100"]
+    centers = {}
+    for i, node_id in enumerate(dag.nodes):
+        x, y = 1 + (i % 100) * 1.5, 99 - (i // 100) * 2.5
+        centers[node_id] = (x, y)
+        lines.append(f"node {node_id} {x:.5g} {y:.5g} 1 1.5 \"\" solid ellipse black lightgrey")
+    for edge in dag.edges:
+        (x1, y1), (x2, y2) = centers[edge.source], centers[edge.target]
+        points = " ".join(f"{x1 + (x2 - x1) * t / 3:.5g} {y1 + (y2 - y1) * t / 3:.5g}" for t in range(4))
+        lines.append(f"edge {edge.source} {edge.target} 4 {points} solid black")
+    lines.append("stop")
+    return "\n".join(lines) + "\n"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    engine = GraphvizEngine()
+    print(f"{'nodes':>7}{'write ms':>10}{'now':>8}{'speedup':>9}{'parse ms':>10}{'now':>8}{'speedup':>9}")
+    for nodes in (1_000, 10_000, 50_000):
+        dag = random_dag(nodes)
+        plain = synthetic_plain(dag)
+        timings = [
+            min(timeit.repeat(func, number=1, repeat=args.repeat))
+            for func in (
+                lambda: previous_generate_dot(engine, dag),
+                lambda: engine._generate_dot(dag),
+                lambda: previous_parse(plain),
+                lambda: engine._parse_plain(plain),
+            )
+        ]
+        print(
+            f"{nodes:>7}{timings[0] * 1e3:>10.1f}{timings[1] * 1e3:>8.1f}{timings[0] / timings[1]:>8.1f}x"
+            f"{timings[2] * 1e3:>10.1f}{timings[3] * 1e3:>8.1f}{timings[2] / timings[3]:>8.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Benchmark closed-form layout engines against GrandalfEngine.
+
+Times each engine's compute() on chains and complete trees of growing
+size, and reports the canvas area of each layout:
+
+    grandalf ms   best-of-N GrandalfEngine.compute()
+    fast ms       best-of-N ChainEngine / TreeEngine.compute()
+    speedup       grandalf ms / fast ms
+    area          canvas cells (width x height), Grandalf vs fast
+
+Usage:
+    uv run python benchmarks/bench_engines.py [--repeat N] [--max-nodes N]
+"""
+
+import argparse
+import timeit
+
+from visualflow.engines import ChainEngine, GrandalfEngine, TreeEngine
+from visualflow.models import DAG
+
+BOX = "+---------+\n| {:<7} |\n+---------+"
+
+
+def chain(length: int) -> DAG:
+    """Create n0 -> n1 -> ... of the given length."""
+    dag = DAG()
+    for i in range(length):
+        dag.add_node(f"n{i}", BOX.format(f"N{i}"))
+        if i:
+            dag.add_edge(f"n{i - 1}", f"n{i}")
+    return dag
+
+
+def tree(depth: int, fanout: int) -> DAG:
+    """Create a complete tree with varying box widths."""
+    dag = DAG()
+    dag.add_node("n0", BOX.format("ROOT"))
+    level = ["n0"]
+    for _ in range(depth - 1):
+        next_level = []
+        for parent in level:
+            for _ in range(fanout):
+                node_id = f"n{len(dag.nodes)}"
+                label = node_id.upper() + "*" * (len(dag.nodes) % 5)
+                dag.add_node(node_id, f"+{'-' * (len(label) + 2)}+\n| {label} |\n+{'-' * (len(label) + 2)}+")
+                dag.add_edge(parent, node_id)
+                next_level.append(node_id)
+        level = next_level
+    return dag
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--max-nodes", type=int, default=400)
+    args = parser.parse_args()
+
+    cases = [
+        (f"chain {length}", chain(length), ChainEngine())
+        for length in (10, 100, 400)
+    ] + [
+        (f"tree {depth}x{fanout}", tree(depth, fanout), TreeEngine())
+        for depth, fanout in ((4, 2), (6, 2), (4, 4), (3, 12))
+    ]
+    grandalf = GrandalfEngine()
+    print(f"{'graph':<12}{'nodes':>7}{'grandalf ms':>13}{'fast ms':>10}{'speedup':>9}{'area':>10}{'fast':>10}")
+    for name, dag, fast in cases:
+        if len(dag.nodes) > args.max_nodes:
+            continue
+        times = []
+        layouts = []
+        for engine in (grandalf, fast):
+            times.append(min(timeit.repeat(lambda engine=engine: engine.compute(dag), number=1, repeat=args.repeat)))
+            layouts.append(engine.compute(dag))
+        areas = [layout.width * layout.height for layout in layouts]
+        print(
+            f"{name:<12}{len(dag.nodes):>7}{times[0] * 1e3:>13.2f}{times[1] * 1e3:>10.3f}"
+            f"{times[0] / times[1]:>8.0f}x{areas[0]:>10}{areas[1]:>10}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""Benchmark longest-path vs network simplex layering.
+
+Lays out synthetic graphs with GrandalfEngine using each layering and
+reports what network simplex saves:
+
+    span        total edge span in layers (sum over edges)
+    length      total routed edge length (cells)
+    area        canvas cells (width x height)
+    ms          best-of-N compute() time
+
+Usage:
+    uv run python benchmarks/bench_layering.py [--repeat N]
+"""
+
+import argparse
+import random
+import timeit
+
+from visualflow import measure_layout
+from visualflow.engines import GrandalfEngine
+from visualflow.layering import longest_path_ranks, network_simplex_ranks, total_span
+from visualflow.models import DAG
+
+BOX = "+--------+\n| {:<6} |\n+--------+"
+
+
+def side_inputs(length: int) -> DAG:
+    """Create a pipeline with one extra input joining at every stage."""
+    dag = DAG()
+    for i in range(length):
+        dag.add_node(f"s{i}", BOX.format(f"S{i}"))
+        dag.add_node(f"in{i}", BOX.format(f"IN{i}"))
+        dag.add_edge(f"in{i}", f"s{i}")
+        if i:
+            dag.add_edge(f"s{i - 1}", f"s{i}")
+    return dag
+
+
+def skip_edges(length: int) -> DAG:
+    """Create a chain whose nodes also feed the node three steps down."""
+    dag = DAG()
+    for i in range(length):
+        dag.add_node(f"n{i}", BOX.format(f"N{i}"))
+        if i:
+            dag.add_edge(f"n{i - 1}", f"n{i}")
+        if i >= 3:
+            dag.add_edge(f"n{i - 3}", f"n{i}")
+    # Short leaf branches hanging off each node
+    for i in range(0, length, 2):
+        dag.add_node(f"leaf{i}", BOX.format(f"L{i}"))
+        dag.add_edge(f"leaf{i}", f"n{i}")
+    return dag
+
+
+def random_dag(nodes: int, edges: int, seed: int = 1) -> DAG:
+    """Create a random DAG (edges point to higher-numbered nodes)."""
+    rng = random.Random(seed)
+    dag = DAG()
+    for i in range(nodes):
+        dag.add_node(f"n{i}", BOX.format(f"N{i}"))
+    for _ in range(edges):
+        source = rng.randrange(nodes - 1)
+        target = rng.randrange(source + 1, min(nodes, source + 12))
+        dag.add_edge(f"n{source}", f"n{target}")
+    return dag
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    cases = {
+        "side inputs": side_inputs(12),
+        "skip edges": skip_edges(16),
+        "random 60": random_dag(60, 90),
+        "random 150": random_dag(150, 240),
+    }
+    engines = {
+        "longest_path": GrandalfEngine(),
+        "network_simplex": GrandalfEngine(layering="network_simplex"),
+    }
+    print(
+        f"{'graph':<13}{'layering':<17}{'span':>6}{'length':>9}{'area':>9}{'ms':>9}"
+    )
+    for name, dag in cases.items():
+        pairs = [(edge.source, edge.target) for edge in dag.edges]
+        spans = {
+            "longest_path": total_span(longest_path_ranks(dag.nodes, pairs), pairs),
+            "network_simplex": total_span(network_simplex_ranks(dag.nodes, pairs), pairs),
+        }
+        results = {}
+        for label, engine in engines.items():
+            seconds = min(timeit.repeat(lambda engine=engine: engine.compute(dag), number=1, repeat=args.repeat))
+            results[label] = measure_layout(engine.compute(dag), dag.edges)
+            metrics = results[label]
+            print(
+                f"{name:<13}{label:<17}{spans[label]:>6}{metrics.edge_length:>9}"
+                f"{metrics.area:>9}{seconds * 1e3:>9.1f}"
+            )
+        before, after = results["longest_path"], results["network_simplex"]
+        print(
+            f"{'':<13}{'saved':<17}{1 - spans['network_simplex'] / spans['longest_path']:>6.0%}"
+            f"{1 - after.edge_length / before.edge_length:>9.0%}{1 - after.area / before.area:>9.0%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Benchmark in-process libgvc layouts against the dot subprocess.
+
+Times compute() per layout on small graphs, where starting `dot` costs
+more than the layout itself:
+
+    dot ms      best-of-N GraphvizEngine.compute() (subprocess)
+    libgvc ms   best-of-N LibGraphvizEngine.compute() (in-process)
+    speedup     dot ms / libgvc ms
+
+Needs both the dot command and the libgvc shared library.
+
+Usage:
+    uv run python benchmarks/bench_libgvc.py [--repeat N]
+"""
+
+import argparse
+import sys
+import timeit
+
+from visualflow.engines import GraphvizEngine, LibGraphvizEngine
+from visualflow.models import DAG
+
+BOX = "+--------+\n| {:<6} |\n+--------+"
+
+
+def fan(width: int) -> DAG:
+    """Create one root with `width` children."""
+    dag = DAG()
+    dag.add_node("root", BOX.format("ROOT"))
+    for i in range(width):
+        dag.add_node(f"c{i}", BOX.format(f"C{i}"))
+        dag.add_edge("root", f"c{i}")
+    return dag
+
+
+def chain(length: int) -> DAG:
+    """Create n0 -> n1 -> ... of the given length."""
+    dag = DAG()
+    for i in range(length):
+        dag.add_node(f"n{i}", BOX.format(f"N{i}"))
+        if i:
+            dag.add_edge(f"n{i - 1}", f"n{i}")
+    return dag
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    if not GraphvizEngine.is_available() or not LibGraphvizEngine.is_in_process():
+        sys.exit("Needs the dot command and libgvc (run: brew install graphviz)")
+
+    cases = {
+        "chain 2": chain(2),
+        "chain 10": chain(10),
+        "fan 5": fan(5),
+        "fan 30": fan(30),
+        "chain 100": chain(100),
+    }
+    engines = (GraphvizEngine(), LibGraphvizEngine())
+    print(f"{'graph':<12}{'dot ms':>10}{'libgvc ms':>11}{'speedup':>9}")
+    for name, dag in cases.items():
+        times = [
+            min(timeit.repeat(lambda engine=engine: engine.compute(dag), number=1, repeat=args.repeat))
+            for engine in engines
+        ]
+        print(f"{name:<12}{times[0] * 1e3:>10.2f}{times[1] * 1e3:>11.2f}{times[0] / times[1]:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
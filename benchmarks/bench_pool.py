@@ -0,0 +1,90 @@
+"""Benchmark sustained renders with and without canvas pooling.
+
+Renders a few similar-size layouts round-robin, the way a dashboard
+process re-renders its diagrams, and reports for each mode:
+
+    ms/render    mean wall time per draw
+    gc runs      garbage collections triggered (all generations)
+    peak KB      peak traced memory during one draw (tracemalloc)
+
+Usage:
+    uv run python benchmarks/bench_pool.py [--renders N] [--layers N] [--width N]
+"""
+
+import argparse
+import gc
+import time
+import tracemalloc
+
+from visualflow import _draw_layout
+from visualflow.engines import GrandalfEngine
+from visualflow.models import DAG, DEFAULT_THEME
+from visualflow.render import canvas_pool
+from visualflow.routing import SimpleRouter
+
+
+def layered_dag(layers: int, width: int, label: str) -> DAG:
+    """Create a layered DAG where each node feeds two nodes in the next layer."""
+    dag = DAG()
+    for layer in range(layers):
+        for i in range(width):
+            node_id = f"{label}{layer}_{i}"
+            dag.add_node(
+                node_id,
+                f"+----------+\n| {node_id:<8} |\n|          |\n| status   |\n+----------+",
+            )
+    for layer in range(layers - 1):
+        for i in range(width):
+            dag.add_edge(f"{label}{layer}_{i}", f"{label}{layer + 1}_{i}")
+            dag.add_edge(f"{label}{layer}_{i}", f"{label}{layer + 1}_{(i + 1) % width}")
+    return dag
+
+
+def gc_runs() -> int:
+    """Total collections so far, all generations."""
+    return sum(stats["collections"] for stats in gc.get_stats())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--renders", type=int, default=2000)
+    parser.add_argument("--layers", type=int, default=6)
+    parser.add_argument("--width", type=int, default=6)
+    args = parser.parse_args()
+
+    engine = GrandalfEngine()
+    router = SimpleRouter()
+    # Similar-size diagrams: same shape, one layer more or less
+    jobs = []
+    for label, layers in zip("abc", (args.layers - 1, args.layers, args.layers + 1)):
+        dag = layered_dag(layers, args.width, label)
+        jobs.append((dag, engine.compute(dag)))
+    sizes = ", ".join(f"{layout.width}x{layout.height}" for _, layout in jobs)
+    print(f"{args.renders} renders over canvases {sizes}")
+
+    print(f"{'mode':<10}{'ms/render':>12}{'gc runs':>10}{'peak KB':>10}")
+    max_idle = canvas_pool.max_idle
+    for name, idle in (("fresh", 0), ("pooled", max_idle)):
+        canvas_pool.max_idle = idle
+        for dag, layout in jobs:
+            _draw_layout(dag, layout, router, DEFAULT_THEME)
+
+        collections = gc_runs()
+        start = time.perf_counter()
+        for i in range(args.renders):
+            dag, layout = jobs[i % len(jobs)]
+            _draw_layout(dag, layout, router, DEFAULT_THEME)
+        elapsed = time.perf_counter() - start
+        collections = gc_runs() - collections
+
+        dag, layout = jobs[-1]
+        tracemalloc.start()
+        _draw_layout(dag, layout, router, DEFAULT_THEME)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"{name:<10}{elapsed / args.renders * 1e3:>12.3f}{collections:>10}{peak / 1024:>10.0f}")
+    canvas_pool.max_idle = max_idle
+
+
+if __name__ == "__main__":
+    main()
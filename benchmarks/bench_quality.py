@@ -0,0 +1,88 @@
+"""Benchmark layout engines on quality as well as speed.
+
+Lays out a few synthetic graphs with each engine and reports, per graph
+and engine:
+
+    ms          best-of-N compute() time
+    crossings   straight-line crossings between adjacent layers
+    length      total routed edge length (cells)
+    bends       direction changes along routed paths
+    area        canvas cells (width x height)
+
+Usage:
+    uv run python benchmarks/bench_quality.py [--repeat N] [--budget SECONDS]
+"""
+
+import argparse
+import random
+import timeit
+
+from visualflow import measure_layout
+from visualflow.engines import AutoEngine, GrandalfEngine, GraphvizEngine, LayoutEngine
+from visualflow.models import DAG
+
+BOX = "+--------+\n| {:<6} |\n+--------+"
+
+
+def layered(layers: int, width: int, fanout: int, seed: int = 1) -> DAG:
+    """Create a random layered DAG with edges to the next layer."""
+    rng = random.Random(seed)
+    dag = DAG()
+    for level in range(layers):
+        for i in range(width):
+            dag.add_node(f"n{level}_{i}", BOX.format(f"{level}.{i}"))
+    for level in range(layers - 1):
+        for i in range(width):
+            for target in rng.sample(range(width), fanout):
+                dag.add_edge(f"n{level}_{i}", f"n{level + 1}_{target}")
+    return dag
+
+
+def tree(depth: int, fanout: int) -> DAG:
+    """Create a complete tree."""
+    dag = DAG()
+    dag.add_node("n0", BOX.format("ROOT"))
+    level = ["n0"]
+    for _ in range(depth - 1):
+        next_level = []
+        for parent in level:
+            for _ in range(fanout):
+                node_id = f"n{len(dag.nodes)}"
+                dag.add_node(node_id, BOX.format(node_id.upper()))
+                dag.add_edge(parent, node_id)
+                next_level.append(node_id)
+        level = next_level
+    return dag
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--budget", type=float, default=0.2, help="time_budget for the anytime engine")
+    args = parser.parse_args()
+
+    engines: dict[str, LayoutEngine] = {
+        "grandalf": GrandalfEngine(),
+        f"budget {args.budget:g}s": GrandalfEngine(time_budget=args.budget),
+        "auto": AutoEngine(),
+    }
+    if GraphvizEngine.is_available():
+        engines["graphviz"] = GraphvizEngine()
+    cases = {
+        "layered 6x8": layered(6, 8, 2),
+        "layered 10x20": layered(10, 20, 2),
+        "tree 5x3": tree(5, 3),
+    }
+    print(f"{'graph':<15}{'engine':<15}{'ms':>9}{'crossings':>11}{'length':>9}{'bends':>7}{'area':>9}")
+    for name, dag in cases.items():
+        for label, engine in engines.items():
+            seconds = min(timeit.repeat(lambda engine=engine: engine.compute(dag), number=1, repeat=args.repeat))
+            metrics = measure_layout(engine.compute(dag), dag.edges)
+            print(
+                f"{name:<15}{label:<15}{seconds * 1e3:>9.1f}{metrics.crossings:>11}"
+                f"{metrics.edge_length:>9}{metrics.bends:>7}{metrics.area:>9}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Benchmark time and allocations per render.
+
+Times the drawing half of the pipeline (route + canvas) on a precomputed
+layout, and the full render_dag() call, reporting for each:
+
+    ms        best-of-N wall time per call
+    peak KB   peak traced memory during one call (tracemalloc)
+
+Usage:
+    uv run python benchmarks/bench_render.py [--layers N] [--width N] [--repeat N]
+"""
+
+import argparse
+import timeit
+import tracemalloc
+from collections.abc import Callable
+
+from visualflow import _draw_layout, render_dag
+from visualflow.engines import GrandalfEngine
+from visualflow.models import DAG, DEFAULT_THEME
+from visualflow.routing import SimpleRouter
+
+
+def layered_dag(layers: int, width: int) -> DAG:
+    """Create a layered DAG where each node feeds two nodes in the next layer."""
+    dag = DAG()
+    for layer in range(layers):
+        for i in range(width):
+            node_id = f"n{layer}_{i}"
+            dag.add_node(node_id, f"+-------+\n| {node_id:<5} |\n+-------+")
+    for layer in range(layers - 1):
+        for i in range(width):
+            dag.add_edge(f"n{layer}_{i}", f"n{layer + 1}_{i}")
+            dag.add_edge(f"n{layer}_{i}", f"n{layer + 1}_{(i + 1) % width}")
+    return dag
+
+
+def peak_memory(run: Callable[[], object]) -> int:
+    """Run once under tracemalloc, returning peak traced bytes."""
+    tracemalloc.start()
+    run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--layers", type=int, default=8)
+    parser.add_argument("--width", type=int, default=8)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    dag = layered_dag(args.layers, args.width)
+    engine = GrandalfEngine()
+    layout = engine.compute(dag)
+    router = SimpleRouter()
+    print(f"{len(dag.nodes)} nodes, {len(dag.edges)} edges, canvas {layout.width}x{layout.height}")
+
+    stages: dict[str, Callable[[], object]] = {
+        "draw": lambda: _draw_layout(dag, layout, router, DEFAULT_THEME),
+        "render_dag": lambda: render_dag(dag, engine=engine, router=router, theme=DEFAULT_THEME),
+    }
+    print(f"{'stage':<12}{'ms':>10}{'peak KB':>10}")
+    for name, run in stages.items():
+        best = min(timeit.repeat(run, number=1, repeat=args.repeat))
+        peak = peak_memory(run)
+        print(f"{name:<12}{best * 1e3:>10.2f}{peak / 1024:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
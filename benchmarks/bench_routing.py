@@ -0,0 +1,102 @@
+"""Benchmark per-path vs columnar routing and drawing.
+
+Builds a synthetic layered layout directly (no layout engine, so large
+edge counts stay cheap to set up) and compares:
+
+    paths     route_with_connectors() + draw_edge() per EdgePath
+    columnar  route_columnar() + draw_segments()
+
+Reports best-of-5 wall time for routing alone and for routing plus
+drawing, and peak traced allocation for each.
+
+Usage:
+    uv run python benchmarks/bench_routing.py [--layers N] [--width N] [--fanout N]
+"""
+
+import argparse
+import timeit
+import tracemalloc
+from collections.abc import Callable
+
+from visualflow.models import Edge, Node, NodePosition
+from visualflow.render import Canvas
+from visualflow.routing import SimpleRouter
+
+BOX_WIDTH = 9
+BOX_HEIGHT = 3
+COLUMN_GAP = 3
+LAYER_GAP = 8
+
+
+def layered_layout(
+    layers: int, width: int, fanout: int
+) -> tuple[dict[str, NodePosition], list[Edge], int, int]:
+    """Place nodes on a grid and connect each to `fanout` nodes in the next layer."""
+    content = "+" + "-" * (BOX_WIDTH - 2) + "+\n|" + " " * (BOX_WIDTH - 2) + "|\n+" + "-" * (BOX_WIDTH - 2) + "+"
+    positions: dict[str, NodePosition] = {}
+    for layer in range(layers):
+        for i in range(width):
+            node_id = f"n{layer}_{i}"
+            positions[node_id] = NodePosition(
+                node=Node(id=node_id, content=content),
+                x=i * (BOX_WIDTH + COLUMN_GAP),
+                y=layer * (BOX_HEIGHT + LAYER_GAP),
+            )
+    edges = [
+        Edge(source=f"n{layer}_{i}", target=f"n{layer + 1}_{(i + k) % width}")
+        for layer in range(layers - 1)
+        for i in range(width)
+        for k in range(fanout)
+    ]
+    canvas_width = width * (BOX_WIDTH + COLUMN_GAP)
+    canvas_height = layers * (BOX_HEIGHT + LAYER_GAP)
+    return positions, edges, canvas_width, canvas_height
+
+
+def measure(run: Callable[[], object]) -> tuple[float, int]:
+    """Return (best-of-5 untraced seconds, peak traced bytes of one more run)."""
+    elapsed = min(timeit.repeat(run, number=1, repeat=5))
+    tracemalloc.start()
+    run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--layers", type=int, default=50)
+    parser.add_argument("--width", type=int, default=100)
+    parser.add_argument("--fanout", type=int, default=10)
+    args = parser.parse_args()
+
+    positions, edges, width, height = layered_layout(args.layers, args.width, args.fanout)
+    router = SimpleRouter()
+    print(f"{len(positions)} nodes, {len(edges)} edges, canvas {width}x{height}")
+
+    def per_path() -> None:
+        canvas = Canvas(width=width, height=height)
+        routes = router.route_with_connectors(positions, edges)
+        canvas.place_connectors(routes.exits)
+        for path in routes.paths:
+            canvas.draw_edge(path)
+
+    def columnar() -> None:
+        canvas = Canvas(width=width, height=height)
+        table = router.route_columnar(positions, edges)
+        canvas.place_connectors(table.exits)
+        canvas.draw_segments(table)
+
+    routers = {
+        "paths": lambda: router.route_with_connectors(positions, edges),
+        "columnar": lambda: router.route_columnar(positions, edges),
+    }
+    print(f"{'mode':<10}{'route s':>10}{'total s':>10}{'peak MB':>10}")
+    for name, run in (("paths", per_path), ("columnar", columnar)):
+        routing, _ = measure(routers[name])
+        elapsed, peak = measure(run)
+        print(f"{name:<10}{routing:>10.3f}{elapsed:>10.3f}{peak / 2**20:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
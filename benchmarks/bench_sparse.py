@@ -0,0 +1,75 @@
+"""Benchmark dense vs sparse canvas on a wide fan-out.
+
+A single root fanning out to many children lays out as one very wide,
+mostly blank canvas. Draws the same layout on each backend and reports
+best-of-5 wall time and peak traced memory:
+
+    dense     fresh Canvas each draw (pool disabled)
+    pooled    Canvas reused from a warm CanvasPool, as render_dag() does
+    sparse    SparseCanvas
+
+Usage:
+    uv run python benchmarks/bench_sparse.py [--children N]
+"""
+
+import argparse
+import timeit
+import tracemalloc
+
+import visualflow
+from visualflow import _draw_layout
+from visualflow.engines import GrandalfEngine
+from visualflow.models import DAG, DEFAULT_THEME
+from visualflow.render import CanvasPool, sparse
+from visualflow.render.sparse import layout_density
+from visualflow.routing import SimpleRouter
+
+
+def wide_fanout(children: int) -> DAG:
+    """Create root -> child_i for i in range(children), each child with one grandchild."""
+    dag = DAG()
+    dag.add_node("root", "+--------+\n|  ROOT  |\n+--------+")
+    for i in range(children):
+        dag.add_node(f"c{i}", f"+--------+\n| C{i:<5}|\n+--------+")
+        dag.add_node(f"g{i}", f"+--------+\n| G{i:<5}|\n+--------+")
+        dag.add_edge("root", f"c{i}")
+        dag.add_edge(f"c{i}", f"g{i}")
+    return dag
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--children", type=int, default=200)
+    args = parser.parse_args()
+
+    dag = wide_fanout(args.children)
+    layout = GrandalfEngine().compute(dag)
+    router = SimpleRouter()
+    print(
+        f"{len(dag.nodes)} nodes, canvas {layout.width}x{layout.height}, "
+        f"density {layout_density(layout):.3f}"
+    )
+
+    print(f"{'backend':<10}{'ms':>10}{'peak KB':>10}")
+    outputs = []
+    for name, threshold, pool in (
+        ("dense", 0.0, CanvasPool(max_idle=0)),
+        ("pooled", 0.0, CanvasPool()),
+        ("sparse", 2.0, CanvasPool()),
+    ):
+        sparse.SPARSE_DENSITY = threshold
+        visualflow.canvas_pool = pool  # Pool _draw_layout() takes dense canvases from
+        outputs.append(_draw_layout(dag, layout, router, DEFAULT_THEME))  # Warms the pool
+        elapsed = min(timeit.repeat(
+            lambda: _draw_layout(dag, layout, router, DEFAULT_THEME), number=1, repeat=5
+        ))
+        tracemalloc.start()
+        _draw_layout(dag, layout, router, DEFAULT_THEME)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"{name:<10}{elapsed * 1e3:>10.1f}{peak / 1024:>10.0f}")
+    assert outputs[0] == outputs[1] == outputs[2], "backends disagree"
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Benchmark edge drawing and junction fixing across themes.
+
+Lays out a dense layered DAG once (every node feeds every node in the
+next layer, so edges overlap and cross heavily), then times the canvas
+stages per theme:
+
+    draw    boxes + connectors + edges + render (the render pipeline)
+    fix     fix_junctions() over a canvas filled with the rendered text
+
+Usage:
+    uv run python benchmarks/bench_themes.py [--layers N] [--width N] [--repeat N]
+"""
+
+import argparse
+import timeit
+
+from visualflow import _draw_layout
+from visualflow.engines import GrandalfEngine
+from visualflow.models import DAG, DEFAULT_THEME, HEAVY_THEME, ROUNDED_THEME
+from visualflow.render import Canvas
+from visualflow.render.glyphs import compile_theme
+from visualflow.routing import SimpleRouter
+
+THEMES = {
+    "DEFAULT": DEFAULT_THEME,
+    "ROUNDED": ROUNDED_THEME,
+    "HEAVY": HEAVY_THEME,
+}
+
+
+def dense_dag(layers: int, width: int) -> DAG:
+    """Create a layered DAG with complete bipartite edges between layers."""
+    dag = DAG()
+    for layer in range(layers):
+        for i in range(width):
+            node_id = f"n{layer}_{i}"
+            dag.add_node(node_id, f"+-------+\n| {node_id:<5} |\n+-------+")
+    for layer in range(layers - 1):
+        for i in range(width):
+            for j in range(width):
+                dag.add_edge(f"n{layer}_{i}", f"n{layer + 1}_{j}")
+    return dag
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--layers", type=int, default=6)
+    parser.add_argument("--width", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    dag = dense_dag(args.layers, args.width)
+    layout = GrandalfEngine().compute(dag)
+    router = SimpleRouter()
+    print(
+        f"{len(dag.nodes)} nodes, {len(dag.edges)} edges, "
+        f"canvas {layout.width}x{layout.height}, best of {args.repeat}"
+    )
+
+    compile_time = timeit.timeit(lambda: compile_theme(ROUNDED_THEME), number=10_000) / 10_000
+    print(f"compile_theme (cached lookup): {compile_time * 1e6:.2f} us")
+
+    print(f"{'theme':<10}{'draw ms':>10}{'fix ms':>10}")
+    for name, theme in THEMES.items():
+        draw = min(timeit.repeat(
+            lambda: _draw_layout(dag, layout, router, theme),
+            number=1, repeat=args.repeat,
+        ))
+
+        text = _draw_layout(dag, layout, router, theme).splitlines()
+        filled = Canvas(width=layout.width, height=len(text), theme=theme)
+        for y, line in enumerate(text):
+            filled.place_box(line, 0, y)
+        fix = min(timeit.repeat(filled.fix_junctions, number=1, repeat=args.repeat))
+
+        print(f"{name:<10}{draw * 1e3:>10.2f}{fix * 1e3:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,15 +4,34 @@ Generate flawless ASCII diagrams of directed acyclic graphs
 with variable-sized boxes.
 """
 
+import asyncio
+from collections.abc import Iterator
+from concurrent.futures import Executor
+from typing import Iterable
+
 from visualflow.models import (
-    DAG, Node, Edge, LayoutResult, NodePosition, EdgePath,
+    DAG, Node, Edge, LayoutResult, NodePosition, EdgePath, RouteResult,
     EdgeTheme, DEFAULT_THEME, LIGHT_THEME, ROUNDED_THEME, HEAVY_THEME,
 )
-from visualflow.engines import LayoutEngine, GrandalfEngine, GraphvizEngine
-from visualflow.render import Canvas
-from visualflow.routing import EdgeRouter, SimpleRouter
+from visualflow.engines import (
+    LayoutEngine, GrandalfEngine, GraphvizEngine, AutoEngine, ChainEngine, PackEngine,
+    TreeEngine, LibGraphvizEngine, GraphvizCache,
+)
+from visualflow.render import (
+    Canvas, CanvasPool, SparseCanvas, canvas_for_layout, canvas_pool, paginate_layout,
+    tile_layout,
+)
+from visualflow.render.tiled import DEFAULT_BAND_ROWS
+from visualflow.routing import (
+    ColumnarRouter, ConnectorRouter, EdgeRouter, LayoutRouter, SegmentTable, SimpleRouter,
+    SnapRouter,
+)
 from visualflow.settings import settings
 from visualflow.partition import partition_dag
+from visualflow.layout import compact_layout, wrap_layers
+from visualflow.metrics import LayoutMetrics, count_crossings, measure_layout
+from visualflow.collapse import collapse_dag, CollapseMode
+from visualflow.neighborhood import AdjacencyIndex, extract_neighborhood
 
 __version__ = "0.1.0"
 
@@ -22,6 +41,8 @@ def render_dag(
     engine: LayoutEngine | None = None,
     router: EdgeRouter | None = None,
     theme: EdgeTheme | None = None,
+    max_width: int | None = None,
+    compact: bool = False,
 ) -> str:
     """Render a DAG to ASCII string.
 
@@ -33,7 +54,13 @@ def render_dag(
         dag: The directed acyclic graph to render
         engine: Layout engine to use (defaults to GrandalfEngine)
         router: Edge router to use (defaults to SimpleRouter if edges exist)
-        theme: Edge theme for line/arrow characters (defaults to ASCII theme)
+        theme: Edge theme for line/arrow characters (defaults to
+            settings.theme, including any active settings.override())
+        max_width: Column budget; layers wider than this are wrapped into
+            stacked sub-rows (see wrap_layers()). None keeps the engine's
+            layout as is.
+        compact: Shrink empty column and row bands of each layout before
+            drawing (see compact_layout())
 
     Returns:
         Multi-line ASCII string representation
@@ -50,13 +77,13 @@ def render_dag(
 
     # Render connected subgraphs (largest first)
     for subgraph in subgraphs:
-        rendered = _render_single_dag(subgraph, engine, router, theme)
+        rendered = _render_single_dag(subgraph, engine, router, theme, max_width, compact)
         if rendered:
             rendered_parts.append(rendered)
 
     # Render standalones (if any)
     if standalones.nodes:
-        rendered = _render_single_dag(standalones, engine, router, theme)
+        rendered = _render_single_dag(standalones, engine, router, theme, max_width, compact)
         if rendered:
             rendered_parts.append(rendered)
 
@@ -64,11 +91,243 @@ def render_dag(
     return "\n".join(rendered_parts).lstrip("\n")
 
 
+async def render_dag_async(
+    dag: DAG,
+    engine: LayoutEngine | None = None,
+    router: EdgeRouter | None = None,
+    theme: EdgeTheme | None = None,
+    executor: Executor | None = None,
+    max_width: int | None = None,
+    compact: bool = False,
+) -> str:
+    """Render a DAG to ASCII string without blocking the event loop.
+
+    Same output as render_dag(). CPU-bound stages (partitioning, layout,
+    routing and drawing) run in `executor`; subgraphs are processed
+    concurrently. Engines that provide `compute_async()` (such as
+    GraphvizEngine, which awaits the `dot` subprocess) are awaited
+    directly instead of occupying an executor worker.
+
+    The theme is resolved in the calling context (honoring
+    settings.override()) before any work is offloaded.
+
+    Args:
+        dag: The directed acyclic graph to render
+        engine: Layout engine to use (defaults to GrandalfEngine)
+        router: Edge router to use (defaults to SimpleRouter if edges exist)
+        theme: Edge theme for line/arrow characters (defaults to settings.theme)
+        executor: Executor for CPU-bound stages (defaults to the event
+            loop's default executor). A ProcessPoolExecutor works when the
+            engine and router are picklable.
+        max_width: Column budget for wrapping wide layers, as in render_dag()
+        compact: Shrink empty column and row bands, as in render_dag()
+
+    Returns:
+        Multi-line ASCII string representation
+    """
+    if engine is None:
+        engine = GrandalfEngine()
+    if theme is None:
+        theme = settings.theme
+
+    loop = asyncio.get_running_loop()
+    subgraphs, standalones = await loop.run_in_executor(executor, partition_dag, dag)
+    if standalones.nodes:
+        subgraphs.append(standalones)
+
+    async def render_part(part: DAG) -> str:
+        compute_async = getattr(engine, "compute_async", None)
+        if compute_async is not None:
+            layout = await compute_async(part)
+        else:
+            layout = await loop.run_in_executor(executor, engine.compute, part)
+        return await loop.run_in_executor(
+            executor, _draw_layout, part, layout, router, theme, max_width, compact
+        )
+
+    rendered = await asyncio.gather(*(render_part(part) for part in subgraphs))
+    rendered_parts = [part for part in rendered if part]
+    return "\n".join(rendered_parts).lstrip("\n")
+
+
+def render_summary(
+    dag: DAG,
+    mode: CollapseMode = "chains",
+    expand: Iterable[str] | None = None,
+    min_size: int = 2,
+    engine: LayoutEngine | None = None,
+    router: EdgeRouter | None = None,
+    theme: EdgeTheme | None = None,
+    max_width: int | None = None,
+    compact: bool = False,
+) -> str:
+    """Render a summarized DAG with groups collapsed into aggregate boxes.
+
+    Collapses chains, subtrees, id prefixes or connected components
+    (see collapse_dag) before layout, shrinking the layout problem for
+    overview renders of very large graphs.
+
+    Args:
+        dag: The directed acyclic graph to render
+        mode: Grouping strategy ("chains", "subtrees", "prefix", "components")
+        expand: Node or aggregate ids to keep expanded
+        min_size: Minimum number of members for a group to collapse
+        engine: Layout engine to use (defaults to GrandalfEngine)
+        router: Edge router to use (defaults to SimpleRouter if edges exist)
+        theme: Edge theme for line/arrow characters (defaults to settings.theme)
+        max_width: Column budget for wrapping wide layers, as in render_dag()
+        compact: Shrink empty column and row bands, as in render_dag()
+
+    Returns:
+        Multi-line ASCII string representation
+    """
+    collapsed, _ = collapse_dag(dag, mode=mode, expand=expand, min_size=min_size)
+    return render_dag(
+        collapsed, engine=engine, router=router, theme=theme, max_width=max_width, compact=compact
+    )
+
+
+def render_neighborhood(
+    source: DAG | AdjacencyIndex,
+    node_ids: Iterable[str],
+    upstream: int | None = 1,
+    downstream: int | None = 1,
+    engine: LayoutEngine | None = None,
+    router: EdgeRouter | None = None,
+    theme: EdgeTheme | None = None,
+) -> str:
+    """Render only the k-hop neighborhood around one or more nodes.
+
+    Pass a prebuilt AdjacencyIndex when rendering many neighborhoods of
+    the same DAG, so each call costs time proportional to the
+    neighborhood instead of the full graph.
+
+    Args:
+        source: DAG, or a prebuilt AdjacencyIndex over it
+        node_ids: Seed node IDs
+        upstream: Max hops to predecessors (None = unlimited)
+        downstream: Max hops to successors (None = unlimited)
+        engine: Layout engine to use (defaults to GrandalfEngine)
+        router: Edge router to use (defaults to SimpleRouter if edges exist)
+        theme: Edge theme for line/arrow characters (defaults to settings.theme)
+
+    Returns:
+        Multi-line ASCII string representation
+
+    Raises:
+        KeyError: If a seed node ID is not in the DAG
+    """
+    subgraph = extract_neighborhood(source, node_ids, upstream, downstream)
+    return render_dag(subgraph, engine=engine, router=router, theme=theme)
+
+
+def render_pages(
+    dag: DAG,
+    max_rows: int,
+    engine: LayoutEngine | None = None,
+    router: EdgeRouter | None = None,
+    theme: EdgeTheme | None = None,
+    max_width: int | None = None,
+    compact: bool = False,
+) -> Iterator[str]:
+    """Render a DAG as a lazy sequence of pages of at most max_rows rows.
+
+    Pages break between layer bands; edges crossing a break end in
+    labeled continuation stubs. Each page is drawn on its own canvas
+    when requested, so only one page's canvas is resident at a time.
+    Subgraphs are organized as in render_dag() and never share a page.
+
+    Args:
+        dag: The directed acyclic graph to render
+        max_rows: Maximum rows per page (a single layer taller than this
+            still gets a page of its own)
+        engine: Layout engine to use (defaults to GrandalfEngine)
+        router: Edge router to use (defaults to SimpleRouter if edges exist)
+        theme: Edge theme for line/arrow characters (defaults to settings.theme)
+        max_width: Column budget for wrapping wide layers, as in render_dag()
+        compact: Shrink empty column and row bands, as in render_dag()
+
+    Yields:
+        Rendered pages as multi-line strings
+
+    Raises:
+        ValueError: If max_rows is too small to hold any content
+    """
+    if engine is None:
+        engine = GrandalfEngine()
+    if theme is None:
+        theme = settings.theme
+
+    subgraphs, standalones = partition_dag(dag)
+    if standalones.nodes:
+        subgraphs.append(standalones)
+
+    for subgraph in subgraphs:
+        layout = _adjust_layout(engine.compute(subgraph), max_width, compact)
+        routes = _route(router, layout, subgraph.edges) if subgraph.edges else RouteResult()
+        yield from paginate_layout(layout, routes, theme, max_rows)
+
+
+def render_tiled(
+    dag: DAG,
+    band_rows: int = DEFAULT_BAND_ROWS,
+    engine: LayoutEngine | None = None,
+    router: EdgeRouter | None = None,
+    theme: EdgeTheme | None = None,
+    max_width: int | None = None,
+    compact: bool = False,
+) -> Iterator[str]:
+    """Render a DAG as a lazy sequence of rows with bounded canvas memory.
+
+    Joining the rows with newlines gives the same text as render_dag(),
+    but draws each subgraph band by band on one reusable canvas of
+    band_rows rows instead of allocating the full layout area, so very
+    tall diagrams can be streamed to a file or terminal.
+
+    Args:
+        dag: The directed acyclic graph to render
+        band_rows: Rows per band (bounds canvas memory to width x band_rows)
+        engine: Layout engine to use (defaults to GrandalfEngine)
+        router: Edge router to use (defaults to SimpleRouter if edges exist)
+        theme: Edge theme for line/arrow characters (defaults to settings.theme)
+        max_width: Column budget for wrapping wide layers, as in render_dag()
+        compact: Shrink empty column and row bands, as in render_dag()
+
+    Yields:
+        Rendered rows, top to bottom
+
+    Raises:
+        ValueError: If band_rows is less than 1
+    """
+    if band_rows < 1:
+        raise ValueError(f"band_rows must be at least 1, got {band_rows}")
+    if engine is None:
+        engine = GrandalfEngine()
+    if theme is None:
+        theme = settings.theme
+
+    subgraphs, standalones = partition_dag(dag)
+    if standalones.nodes:
+        subgraphs.append(standalones)
+
+    # Leading blank rows of the whole output are dropped, as in render_dag()
+    started = False
+    for subgraph in subgraphs:
+        layout = _adjust_layout(engine.compute(subgraph), max_width, compact)
+        table = _route_table(router, layout, subgraph.edges) if subgraph.edges else SegmentTable()
+        for line in tile_layout(layout, table, theme, band_rows):
+            if line or started:
+                started = True
+                yield line
+
+
 def _render_single_dag(
     dag: DAG,
     engine: LayoutEngine,
     router: EdgeRouter | None,
     theme: EdgeTheme,
+    max_width: int | None = None,
+    compact: bool = False,
 ) -> str:
     """Render a single DAG (internal helper).
 
@@ -77,39 +336,130 @@ def _render_single_dag(
         engine: Layout engine to use
         router: Edge router to use
         theme: Edge theme for characters
+        max_width: Column budget for wrap_layers() (None = no wrapping)
+        compact: Apply compact_layout() before wrapping and drawing
 
     Returns:
         Multi-line ASCII string representation
     """
     # Compute layout
     layout = engine.compute(dag)
+    return _draw_layout(dag, layout, router, theme, max_width, compact)
+
+
+def _adjust_layout(layout: LayoutResult, max_width: int | None, compact: bool) -> LayoutResult:
+    """Apply the optional layout post-passes (internal helper).
+
+    Args:
+        layout: Computed layout
+        max_width: Column budget for wrap_layers() (None = no wrapping)
+        compact: Apply compact_layout() before wrapping
+
+    Returns:
+        The adjusted layout (the same object if neither pass applies)
+    """
+    if compact:
+        layout = compact_layout(layout)
+    if max_width is not None:
+        layout = wrap_layers(layout, max_width)
+    return layout
+
+
+def _draw_layout(
+    dag: DAG,
+    layout: LayoutResult,
+    router: EdgeRouter | None,
+    theme: EdgeTheme,
+    max_width: int | None = None,
+    compact: bool = False,
+) -> str:
+    """Route edges and draw a computed layout (internal helper).
+
+    Args:
+        dag: The DAG that was laid out
+        layout: Computed layout for the DAG
+        router: Edge router to use (defaults to SimpleRouter)
+        theme: Edge theme for characters
+        max_width: Column budget for wrap_layers() (None = no wrapping)
+        compact: Apply compact_layout() before wrapping and drawing
 
+    Returns:
+        Multi-line ASCII string representation
+    """
+    layout = _adjust_layout(layout, max_width, compact)
     if not layout.positions:
         return ""
 
-    # Create canvas with theme
-    canvas = Canvas(width=layout.width, height=layout.height, theme=theme)
+    # Route first so a router error never holds a pooled canvas
+    table = _route_table(router, layout, dag.edges) if dag.edges else None
+
+    # Create canvas with theme (sparse backend for mostly-empty layouts,
+    # pooled dense canvas otherwise)
+    canvas = canvas_for_layout(layout, theme, pool=canvas_pool)
+    try:
+        # Place boxes
+        for node_id, pos in layout.positions.items():
+            canvas.place_box(pos.node.content, pos.x, pos.y)
+
+        # Place connectors at the router's exits, then draw edges
+        if table is not None:
+            canvas.place_connectors(table.exits)
+            canvas.draw_segments(table)
+
+        return canvas.render()
+    finally:
+        canvas_pool.release(canvas)
+
+
+def _route_table(
+    router: EdgeRouter | None,
+    layout: LayoutResult,
+    edges: list[Edge],
+) -> SegmentTable:
+    """Route edges into a columnar table (internal helper).
 
-    # Place boxes
-    for node_id, pos in layout.positions.items():
-        canvas.place_box(pos.node.content, pos.x, pos.y)
+    Args:
+        router: Edge router to use (defaults to SimpleRouter)
+        layout: Computed layout
+        edges: Edges to route
 
-    # Place box connectors (before edge drawing)
-    if dag.edges:
-        canvas.place_box_connectors(layout.positions, dag.edges)
+    Returns:
+        SegmentTable from the router's route_layout() or route_columnar(),
+        or converted from its RouteResult if the router has neither
+    """
+    if router is None:
+        router = SimpleRouter()
+    if isinstance(router, LayoutRouter):
+        return router.route_layout(layout, edges)
+    if isinstance(router, ColumnarRouter):
+        return router.route_columnar(layout.positions, edges)
+    return SegmentTable.from_route_result(_route(router, layout, edges))
 
-    # Route and draw edges
-    if dag.edges:
-        if router is None:
-            router = SimpleRouter()
-        paths = router.route(layout.positions, dag.edges)
-        for path in paths:
-            canvas.draw_edge(path)
 
-        # Fix junction characters based on actual neighbors
-        canvas.fix_junctions()
+def _route(
+    router: EdgeRouter | None,
+    layout: LayoutResult,
+    edges: list[Edge],
+) -> RouteResult:
+    """Route edges, including connector points (internal helper).
 
-    return canvas.render()
+    Args:
+        router: Edge router to use (defaults to SimpleRouter)
+        layout: Computed layout
+        edges: Edges to route
+
+    Returns:
+        RouteResult from the router (converted from route_layout() when
+        present), or derived from its paths if the router only
+        implements route()
+    """
+    if router is None:
+        router = SimpleRouter()
+    if isinstance(router, LayoutRouter):
+        return router.route_layout(layout, edges).to_route_result()
+    if isinstance(router, ConnectorRouter):
+        return router.route_with_connectors(layout.positions, edges)
+    return RouteResult.from_paths(router.route(layout.positions, edges))
 
 
 __all__ = [
@@ -120,6 +470,7 @@ __all__ = [
     "LayoutResult",
     "NodePosition",
     "EdgePath",
+    "RouteResult",
     # Theming
     "EdgeTheme",
     "DEFAULT_THEME",
@@ -132,12 +483,47 @@ __all__ = [
     "LayoutEngine",
     "GrandalfEngine",
     "GraphvizEngine",
+    "LibGraphvizEngine",
+    "GraphvizCache",
+    "AutoEngine",
+    "ChainEngine",
+    "PackEngine",
+    "TreeEngine",
     # Routing
     "EdgeRouter",
+    "ConnectorRouter",
+    "ColumnarRouter",
+    "LayoutRouter",
     "SimpleRouter",
+    "SnapRouter",
+    "SegmentTable",
     # Rendering
     "Canvas",
+    "SparseCanvas",
+    "CanvasPool",
     "render_dag",
+    "render_dag_async",
     # Partitioning
     "partition_dag",
+    # Layout post-passes
+    "compact_layout",
+    "wrap_layers",
+    # Metrics
+    "LayoutMetrics",
+    "measure_layout",
+    "count_crossings",
+    # Summarizing
+    "collapse_dag",
+    "CollapseMode",
+    "render_summary",
+    # Neighborhoods
+    "AdjacencyIndex",
+    "extract_neighborhood",
+    "render_neighborhood",
+    # Pagination
+    "render_pages",
+    "paginate_layout",
+    # Tiling
+    "render_tiled",
+    "tile_layout",
 ]
@@ -0,0 +1,541 @@
+"""Level-of-detail collapsing for large DAGs.
+
+Replaces groups of nodes with single aggregate boxes (with member counts)
+before layout, so overview renders of very large graphs stay small and
+readable. Collapsing is deterministic, so a caller can expand a chosen
+node later by collapsing again with that node in `expand`.
+"""
+
+from collections import defaultdict
+from typing import Iterable, Literal
+
+from wcwidth import wcswidth
+
+from visualflow.models import DAG
+from visualflow.partition import partition_dag
+
+CollapseMode = Literal["chains", "subtrees", "prefix", "components"]
+
+
+def collapse_dag(
+    dag: DAG,
+    mode: CollapseMode = "chains",
+    expand: Iterable[str] | None = None,
+    min_size: int = 2,
+    separator: str = "-",
+) -> tuple[DAG, dict[str, list[str]]]:
+    """Collapse groups of nodes into aggregate boxes.
+
+    Modes:
+    - "chains": maximal linear runs (a -> b -> c with no branching)
+    - "subtrees": maximal out-trees (every descendant has a single parent)
+    - "prefix": nodes whose ids share the part before `separator`
+      (split where a path leaves the group and comes back, so the
+      collapsed DAG stays acyclic)
+    - "components": whole connected subgraphs from partition_dag()
+
+    Runs in O(nodes + edges), plus a pass per prefix group that must be
+    split. Edges between collapsed groups are rewired to the aggregate
+    boxes (duplicates and self-loops dropped). An aggregate id that is
+    already the id of an ungrouped node gets a `#1` (`#2`, ...) suffix.
+
+    Args:
+        dag: The directed acyclic graph to summarize
+        mode: Grouping strategy
+        expand: Node or aggregate ids to keep expanded. A group that
+            contains an expanded node is split (chains, prefix) or left
+            expanded (subtrees, components) so that node stays visible.
+        min_size: Minimum number of members for a group to collapse
+        separator: Id separator used by "prefix" mode
+
+    Returns:
+        Tuple of:
+        - DAG: The collapsed DAG (aggregate boxes plus untouched nodes)
+        - dict[str, list[str]]: Aggregate id -> member node ids
+
+    Raises:
+        ValueError: If mode is unknown or min_size < 2
+
+    Examples:
+        >>> dag = DAG()
+        >>> for node_id in ("a", "b", "c"):
+        ...     dag.add_node(node_id, node_id.upper())
+        >>> dag.add_edge("a", "b")
+        >>> dag.add_edge("b", "c")
+        >>> collapsed, groups = collapse_dag(dag)
+        >>> groups
+        {'a..c': ['a', 'b', 'c']}
+        >>> collapsed, groups = collapse_dag(dag, expand=["a..c"])
+        >>> groups
+        {}
+    """
+    if min_size < 2:
+        raise ValueError(f"min_size must be at least 2, got {min_size}")
+
+    expanded = set(expand) if expand else set()
+
+    if mode == "chains":
+        groups = _chain_groups(dag, expanded, min_size)
+    elif mode == "subtrees":
+        groups = _subtree_groups(dag, expanded, min_size)
+    elif mode == "prefix":
+        groups = _prefix_groups(dag, expanded, min_size, separator)
+    elif mode == "components":
+        groups = _component_groups(dag, expanded, min_size)
+    else:
+        raise ValueError(f"Unknown collapse mode: {mode!r}")
+
+    groups = _unique_ids(dag, groups, expanded)
+    return _build_collapsed(dag, groups), groups
+
+
+def _adjacency(dag: DAG) -> tuple[dict[str, list[str]], dict[str, list[str]]]:
+    """Build successor and predecessor lists for nodes present in the DAG.
+
+    Args:
+        dag: Source DAG
+
+    Returns:
+        Tuple of (successors, predecessors) keyed by node ID
+    """
+    succ: dict[str, list[str]] = defaultdict(list)
+    pred: dict[str, list[str]] = defaultdict(list)
+    for edge in dag.edges:
+        if edge.source in dag.nodes and edge.target in dag.nodes:
+            succ[edge.source].append(edge.target)
+            pred[edge.target].append(edge.source)
+    return succ, pred
+
+
+def _chain_groups(
+    dag: DAG, expanded: set[str], min_size: int
+) -> dict[str, list[str]]:
+    """Find maximal linear chains (single out-edge into single in-edge).
+
+    Args:
+        dag: Source DAG
+        expanded: Ids to keep expanded
+        min_size: Minimum chain length to collapse
+
+    Returns:
+        Aggregate id -> chain member ids (in path order)
+    """
+    succ, pred = _adjacency(dag)
+
+    def continues(node_id: str) -> str | None:
+        """Return the next chain node after node_id, if the link is linear."""
+        nexts = succ.get(node_id)
+        if nexts and len(nexts) == 1 and len(pred[nexts[0]]) == 1:
+            return nexts[0]
+        return None
+
+    groups: dict[str, list[str]] = {}
+    for node_id in dag.nodes:
+        parents = pred.get(node_id)
+        if parents and len(parents) == 1 and continues(parents[0]) == node_id:
+            continue  # Not a chain head
+
+        chain = [node_id]
+        current = continues(node_id)
+        while current is not None and current != node_id:
+            chain.append(current)
+            current = continues(current)
+
+        # Expanded nodes split the chain into independent runs
+        run: list[str] = []
+        for member in chain + [None]:
+            if member is None or member in expanded:
+                _add_group(groups, run, f"{run[0]}..{run[-1]}" if run else "",
+                           expanded, min_size)
+                run = []
+            else:
+                run.append(member)
+
+    return groups
+
+
+def _subtree_groups(
+    dag: DAG, expanded: set[str], min_size: int
+) -> dict[str, list[str]]:
+    """Find maximal out-trees whose descendants each have a single parent.
+
+    Args:
+        dag: Source DAG
+        expanded: Ids to keep expanded
+        min_size: Minimum subtree size to collapse
+
+    Returns:
+        Aggregate id -> subtree member ids (root first, preorder)
+    """
+    succ, pred = _adjacency(dag)
+
+    # Topological order; nodes on cycles never become tree members
+    order = _topological_order(dag, succ, pred)
+
+    # Bottom-up: is the subtree under each node a pure tree, and how big is it?
+    is_tree: dict[str, bool] = {}
+    size: dict[str, int] = {}
+    blocked: dict[str, bool] = {}  # Subtree contains an expanded node
+    for node_id in reversed(order):
+        children = succ.get(node_id, ())
+        is_tree[node_id] = all(
+            len(pred[child]) == 1 and is_tree.get(child, False) for child in children
+        )
+        size[node_id] = 1 + sum(size.get(child, 1) for child in children)
+        blocked[node_id] = node_id in expanded or any(
+            blocked.get(child, True) for child in children
+        )
+
+    # Top-down: take the highest collapsible root, skip what it absorbed
+    groups: dict[str, list[str]] = {}
+    absorbed: set[str] = set()
+    for root in order:
+        if root in absorbed or not is_tree[root] or blocked[root]:
+            continue
+        if size[root] < min_size or f"{root}/*" in expanded:
+            continue
+        members: list[str] = []
+        stack = [root]
+        while stack:
+            current = stack.pop()
+            members.append(current)
+            stack.extend(reversed(succ.get(current, ())))
+        absorbed.update(members)
+        groups[f"{root}/*"] = members
+
+    return groups
+
+
+def _prefix_groups(
+    dag: DAG, expanded: set[str], min_size: int, separator: str
+) -> dict[str, list[str]]:
+    """Group nodes whose ids share the prefix before the separator.
+
+    Args:
+        dag: Source DAG
+        expanded: Ids to keep expanded
+        min_size: Minimum group size to collapse
+        separator: Id separator
+
+    Returns:
+        Aggregate id -> member ids (in DAG insertion order)
+    """
+    by_prefix: dict[str, list[str]] = defaultdict(list)
+    for node_id in dag.nodes:
+        if separator in node_id and node_id not in expanded:
+            by_prefix[node_id.split(separator, 1)[0]].append(node_id)
+
+    groups: dict[str, list[str]] = {}
+    for prefix, members in by_prefix.items():
+        _add_group(groups, members, f"{prefix}{separator}*", expanded, min_size)
+    return _acyclic_groups(dag, groups, expanded, min_size)
+
+
+def _acyclic_groups(
+    dag: DAG, groups: dict[str, list[str]], expanded: set[str], min_size: int
+) -> dict[str, list[str]]:
+    """Split or drop groups whose aggregates would close a cycle.
+
+    Unlike chains and subtrees, an id prefix says nothing about edges:
+    a path can leave a group and come back (a-1 -> b -> a-2), or run
+    between two groups both ways. Groups on such cycles are split into
+    parts no path leaves and re-enters (ids suffixed "#1", "#2", ...);
+    parts still on a cycle between groups stay expanded.
+
+    Args:
+        dag: Source DAG
+        groups: Candidate groups
+        expanded: Ids to keep expanded
+        min_size: Minimum part size to collapse
+
+    Returns:
+        Groups whose collapsed DAG is acyclic
+    """
+    succ, pred = _adjacency(dag)
+    cyclic = _cyclic_groups(dag, groups, succ)
+    if not cyclic:
+        return groups
+
+    order = _topological_order(dag, succ, pred)
+    result: dict[str, list[str]] = {}
+    for group_id, members in groups.items():
+        if group_id not in cyclic:
+            result[group_id] = members
+            continue
+        parts = _convex_parts(members, order, pred)
+        if len(parts) == 1:
+            result[group_id] = parts[0]
+            continue
+        for index, part in enumerate(parts, 1):
+            _add_group(result, part, f"{group_id}#{index}", expanded, min_size)
+
+    # Each part is now closed under paths, so any cycle left runs
+    # between groups; expanding them cannot create a new one
+    cyclic = _cyclic_groups(dag, result, succ)
+    return {group_id: members for group_id, members in result.items() if group_id not in cyclic}
+
+
+def _topological_order(
+    dag: DAG, succ: dict[str, list[str]], pred: dict[str, list[str]]
+) -> list[str]:
+    """Order nodes so that edges point forward (Kahn); cycles are omitted.
+
+    Args:
+        dag: Source DAG
+        succ: Successor lists from _adjacency()
+        pred: Predecessor lists from _adjacency()
+
+    Returns:
+        Node ids in topological order
+    """
+    indegree = {node_id: len(pred.get(node_id, ())) for node_id in dag.nodes}
+    order = [node_id for node_id, deg in indegree.items() if deg == 0]
+    for node_id in order:
+        for child in succ.get(node_id, ()):
+            indegree[child] -= 1
+            if indegree[child] == 0:
+                order.append(child)
+    return order
+
+
+def _convex_parts(
+    members: list[str], order: list[str], pred: dict[str, list[str]]
+) -> list[list[str]]:
+    """Split a group into parts that no outside path leaves and re-enters.
+
+    A member's level counts how often a path into it has left the group
+    and come back; a path that leaves and returns always raises it, so
+    members of one level form a part. Members on input cycles are left
+    out of every part.
+
+    Args:
+        members: Group member ids
+        order: Topological order of the DAG
+        pred: Predecessor lists from _adjacency()
+
+    Returns:
+        Member lists by level, each in the order of members
+    """
+    member_set = set(members)
+    level: dict[str, int] = {}  # Members: level; others: highest level reaching them
+    for node_id in order:
+        best = -1 if node_id not in member_set else 0
+        for parent in pred.get(node_id, ()):
+            reached = level.get(parent)
+            if reached is None:
+                continue
+            if node_id in member_set and parent not in member_set:
+                reached += 1  # Came back into the group
+            best = max(best, reached)
+        if best >= 0:
+            level[node_id] = best
+
+    parts: dict[int, list[str]] = defaultdict(list)
+    for member in members:
+        if member in level:
+            parts[level[member]].append(member)
+    return [parts[key] for key in sorted(parts)]
+
+
+def _cyclic_groups(
+    dag: DAG, groups: dict[str, list[str]], succ: dict[str, list[str]]
+) -> set[str]:
+    """Find groups on a cycle of the collapsed DAG (Tarjan's SCC).
+
+    Args:
+        dag: Source DAG
+        groups: Aggregate id -> member ids
+        succ: Successor lists from _adjacency()
+
+    Returns:
+        Aggregate ids in a strongly connected component of two or more
+        collapsed nodes
+    """
+    group_of = {member: group_id for group_id, members in groups.items() for member in members}
+    graph: dict[str, set[str]] = defaultdict(set)
+    for source, targets in succ.items():
+        collapsed_source = group_of.get(source, source)
+        for target in targets:
+            collapsed_target = group_of.get(target, target)
+            if collapsed_source != collapsed_target:
+                graph[collapsed_source].add(collapsed_target)
+
+    index: dict[str, int] = {}
+    low: dict[str, int] = {}
+    stack: list[str] = []
+    on_stack: set[str] = set()
+    cyclic: set[str] = set()
+    for start in list(graph):
+        if start in index:
+            continue
+        index[start] = low[start] = len(index)
+        stack.append(start)
+        on_stack.add(start)
+        work = [(start, iter(graph[start]))]
+        while work:
+            node, children = work[-1]
+            child = next(children, None)
+            if child is not None:
+                if child not in index:
+                    index[child] = low[child] = len(index)
+                    stack.append(child)
+                    on_stack.add(child)
+                    work.append((child, iter(graph.get(child, ()))))
+                elif child in on_stack:
+                    low[node] = min(low[node], index[child])
+                continue
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                low[parent] = min(low[parent], low[node])
+            if low[node] == index[node]:
+                component = []
+                while True:
+                    member = stack.pop()
+                    on_stack.discard(member)
+                    component.append(member)
+                    if member == node:
+                        break
+                if len(component) > 1:
+                    cyclic.update(member for member in component if member in groups)
+    return cyclic
+
+
+def _component_groups(
+    dag: DAG, expanded: set[str], min_size: int
+) -> dict[str, list[str]]:
+    """Collapse each connected subgraph from partition_dag() into one box.
+
+    Args:
+        dag: Source DAG
+        expanded: Ids to keep expanded
+        min_size: Minimum component size to collapse
+
+    Returns:
+        Aggregate id -> member ids (sorted for stable output)
+    """
+    subgraphs, _ = partition_dag(dag)
+    groups: dict[str, list[str]] = {}
+    for subgraph in subgraphs:
+        members = sorted(subgraph.nodes)
+        if expanded.intersection(members):
+            continue
+        _add_group(groups, members, f"{members[0]}+{len(members) - 1}",
+                   expanded, min_size)
+    return groups
+
+
+def _add_group(
+    groups: dict[str, list[str]],
+    members: list[str],
+    group_id: str,
+    expanded: set[str],
+    min_size: int,
+) -> None:
+    """Record a group if it is large enough and not explicitly expanded.
+
+    Args:
+        groups: Groups collected so far (mutated)
+        members: Candidate member ids
+        group_id: Aggregate id for the group
+        expanded: Ids to keep expanded
+        min_size: Minimum group size to collapse
+    """
+    if len(members) >= min_size and group_id not in expanded:
+        groups[group_id] = list(members)
+
+
+def _unique_ids(
+    dag: DAG, groups: dict[str, list[str]], expanded: set[str]
+) -> dict[str, list[str]]:
+    """Rename aggregates whose id is taken by a node left ungrouped.
+
+    Args:
+        dag: Source DAG
+        groups: Aggregate id -> member ids
+        expanded: Ids to keep expanded (also checked against new ids)
+
+    Returns:
+        Groups with unique ids, in the same order
+    """
+    grouped = {member for members in groups.values() for member in members}
+    taken = {node_id for node_id in dag.nodes if node_id not in grouped}
+    if taken.isdisjoint(groups):
+        return groups
+    taken.update(groups)
+    result: dict[str, list[str]] = {}
+    for group_id, members in groups.items():
+        if group_id in dag.nodes and group_id not in grouped:
+            index = 1
+            while f"{group_id}#{index}" in taken:
+                index += 1
+            group_id = f"{group_id}#{index}"
+            taken.add(group_id)
+            if group_id in expanded:
+                continue
+        result[group_id] = members
+    return result
+
+
+def _build_collapsed(dag: DAG, groups: dict[str, list[str]]) -> DAG:
+    """Build the collapsed DAG from the selected groups.
+
+    Aggregates take the position of their first member in node order,
+    so the collapsed DAG keeps the original insertion order.
+
+    Args:
+        dag: Source DAG
+        groups: Aggregate id -> member ids
+
+    Returns:
+        DAG with aggregate boxes replacing grouped nodes
+    """
+    group_of: dict[str, str] = {}
+    for group_id, members in groups.items():
+        for member in members:
+            group_of[member] = group_id
+
+    collapsed = DAG()
+    for node_id, node in dag.nodes.items():
+        group_id = group_of.get(node_id)
+        if group_id is None:
+            collapsed.nodes[node_id] = node
+        elif group_id not in collapsed.nodes:
+            collapsed.add_node(
+                group_id, _aggregate_box(group_id, len(groups[group_id]))
+            )
+
+    seen: set[tuple[str, str]] = set()
+    for edge in dag.edges:
+        if edge.source not in dag.nodes or edge.target not in dag.nodes:
+            continue
+        source = group_of.get(edge.source, edge.source)
+        target = group_of.get(edge.target, edge.target)
+        if source == target or (source, target) in seen:
+            continue
+        seen.add((source, target))
+        collapsed.add_edge(source, target)
+
+    return collapsed
+
+
+def _aggregate_box(title: str, count: int) -> str:
+    """Create the box content for an aggregate node.
+
+    Args:
+        title: Aggregate id shown on the first line
+        count: Number of collapsed member nodes
+
+    Returns:
+        Multi-line box with ASCII borders
+    """
+    lines = [title, f"({count} nodes)"]
+    widths = [wcswidth(line) for line in lines]
+    widths = [w if w >= 0 else len(line) for w, line in zip(widths, lines)]
+    inner = max(widths) + 2
+    border = "+" + "-" * inner + "+"
+    body = [
+        "| " + line + " " * (inner - 1 - width) + "|"
+        for line, width in zip(lines, widths)
+    ]
+    return "\n".join([border, *body, border])
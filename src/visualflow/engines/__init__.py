@@ -3,5 +3,23 @@
 from visualflow.engines.base import LayoutEngine
 from visualflow.engines.grandalf import GrandalfEngine
 from visualflow.engines.graphviz import GraphvizEngine
+from visualflow.engines.graphviz_cache import GraphvizCache
+from visualflow.engines.libgvc import LibGraphvizEngine
+from visualflow.engines.chain import ChainEngine
+from visualflow.engines.pack import PackEngine
+from visualflow.engines.tree import TreeEngine
+from visualflow.engines.auto import AutoEngine, GraphShape, classify
 
-__all__ = ["LayoutEngine", "GrandalfEngine", "GraphvizEngine"]
+__all__ = [
+    "LayoutEngine",
+    "GrandalfEngine",
+    "GraphvizEngine",
+    "LibGraphvizEngine",
+    "GraphvizCache",
+    "ChainEngine",
+    "PackEngine",
+    "TreeEngine",
+    "AutoEngine",
+    "GraphShape",
+    "classify",
+]
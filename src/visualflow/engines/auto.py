@@ -0,0 +1,164 @@
+"""Adaptive layout engine.
+
+AutoEngine classifies each DAG it is given by size and shape and hands
+it to the cheapest engine that lays that shape out well:
+
+    empty / standalones  -> PackEngine (no layering needed)
+    chain                -> ChainEngine (closed form)
+    tree / forest        -> TreeEngine (tidy-tree packing)
+    dag                  -> GrandalfEngine
+    large (>= threshold) -> GraphvizEngine, when `dot` is installed
+
+render_dag() partitions graphs before layout, so each connected
+subgraph and the standalone group are classified separately.
+"""
+
+import threading
+from collections import Counter
+from dataclasses import dataclass
+
+from visualflow.engines.base import LayoutEngine
+from visualflow.engines.chain import ChainEngine, chain_order
+from visualflow.engines.grandalf import GrandalfEngine
+from visualflow.engines.graphviz import GraphvizEngine
+from visualflow.engines.pack import PackEngine
+from visualflow.engines.tree import TreeEngine
+from visualflow.models import DAG, LayoutResult
+
+
+@dataclass(frozen=True, slots=True)
+class GraphShape:
+    """Size and shape summary of a DAG, as used for engine selection."""
+
+    nodes: int
+    edges: int
+    depth: int  # Nodes on the longest path (0 if empty)
+    kind: str  # "empty", "standalones", "chain", "tree", "forest" or "dag"
+
+
+def classify(dag: DAG) -> GraphShape:
+    """Summarize a DAG's size and shape in linear time.
+
+    Kinds: "chain" is a single path through every node; "tree" has one
+    root and every other node exactly one parent; "forest" is several
+    such trees; anything else with edges is a "dag".
+
+    Args:
+        dag: DAG to inspect
+
+    Returns:
+        GraphShape for the DAG
+    """
+    if not dag.nodes:
+        return GraphShape(nodes=0, edges=0, depth=0, kind="empty")
+
+    children: dict[str, list[str]] = {node_id: [] for node_id in dag.nodes}
+    parents: dict[str, int] = dict.fromkeys(dag.nodes, 0)
+    edge_count = 0
+    for edge in dag.edges:
+        if edge.source in children and edge.target in children:
+            children[edge.source].append(edge.target)
+            parents[edge.target] += 1
+            edge_count += 1
+
+    # Longest path (in nodes) by Kahn's algorithm
+    depth = dict.fromkeys(dag.nodes, 1)
+    remaining = dict(parents)
+    ready = [node_id for node_id, count in parents.items() if not count]
+    roots = len(ready)
+    visited = 0
+    while ready:
+        node_id = ready.pop()
+        visited += 1
+        for child in children[node_id]:
+            depth[child] = max(depth[child], depth[node_id] + 1)
+            remaining[child] -= 1
+            if not remaining[child]:
+                ready.append(child)
+
+    if not edge_count:
+        kind = "standalones"
+    elif visited < len(dag.nodes) or any(count > 1 for count in parents.values()):
+        kind = "dag"
+    elif roots == 1:
+        kind = "chain" if chain_order(dag) is not None else "tree"
+    else:
+        kind = "forest"
+    return GraphShape(
+        nodes=len(dag.nodes), edges=edge_count, depth=max(depth.values()), kind=kind
+    )
+
+
+class AutoEngine:
+    """Layout engine that picks a strategy per DAG by size and shape.
+
+    Attributes:
+        large_graph: Node count from which Graphviz is preferred
+        last_strategy: Strategy chosen by the most recent compute() call
+        strategy_counts: How often each strategy has been chosen
+
+    Usage:
+        engine = AutoEngine()
+        render_dag(dag, engine=engine)
+        engine.strategy_counts  # Counter({'chain': 3, 'grandalf': 1, ...})
+    """
+
+    def __init__(
+        self,
+        large_graph: int = 300,
+        grandalf: LayoutEngine | None = None,
+        graphviz: GraphvizEngine | None = None,
+    ) -> None:
+        """Initialize the engine and its strategies.
+
+        Args:
+            large_graph: Node count from which Graphviz is used (if installed)
+            grandalf: Engine for general DAGs (defaults to GrandalfEngine)
+            graphviz: Engine for large DAGs (defaults to GraphvizEngine)
+        """
+        self.large_graph = large_graph
+        self._engines: dict[str, LayoutEngine] = {
+            "pack": PackEngine(),
+            "chain": ChainEngine(),
+            "tree": TreeEngine(),
+            "grandalf": grandalf if grandalf is not None else GrandalfEngine(),
+            "graphviz": graphviz if graphviz is not None else GraphvizEngine(),
+        }
+        self.last_strategy: str | None = None
+        self.strategy_counts: Counter[str] = Counter()
+        self._lock = threading.Lock()
+
+    def choose(self, dag: DAG) -> str:
+        """Pick the strategy for a DAG without laying it out.
+
+        Args:
+            dag: DAG to inspect
+
+        Returns:
+            Strategy name: "pack", "chain", "tree", "grandalf" or "graphviz"
+        """
+        shape = classify(dag)
+        if shape.kind in ("empty", "standalones"):
+            return "pack"
+        if shape.kind == "chain":
+            return "chain"
+        if shape.kind in ("tree", "forest"):
+            return "tree"
+        if shape.nodes >= self.large_graph and GraphvizEngine.is_available():
+            return "graphviz"
+        return "grandalf"
+
+    def compute(self, dag: DAG) -> LayoutResult:
+        """Compute layout positions with the strategy chosen for the DAG.
+
+        Args:
+            dag: The directed acyclic graph to lay out
+
+        Returns:
+            LayoutResult with positions in character coordinates
+        """
+        strategy = self.choose(dag)
+        with self._lock:
+            self.last_strategy = strategy
+            self.strategy_counts[strategy] += 1
+        return self._engines[strategy].compute(dag)
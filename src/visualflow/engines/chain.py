@@ -0,0 +1,90 @@
+"""Closed-form layout for simple chains.
+
+A chain (a -> b -> c ...) needs no layering or crossing reduction: each
+node goes one layer below the previous one, all centered on one column.
+The placement matches GrandalfEngine's for the same chain, in linear
+time.
+"""
+
+from visualflow.models import DAG, LayoutResult, NodePosition
+
+
+class ChainEngine:
+    """Layout engine for DAGs that form a single directed path."""
+
+    def __init__(
+        self,
+        horizontal_spacing: int = 4,
+        vertical_spacing: int = 6,
+    ) -> None:
+        """Initialize engine with spacing parameters.
+
+        Args:
+            horizontal_spacing: Characters of margin left and right
+            vertical_spacing: Lines between nodes (and top/bottom margin)
+        """
+        self.horizontal_spacing = horizontal_spacing
+        self.vertical_spacing = vertical_spacing
+
+    def compute(self, dag: DAG) -> LayoutResult:
+        """Compute layout positions for a chain.
+
+        Args:
+            dag: A DAG whose edges form one path through all its nodes
+
+        Returns:
+            LayoutResult with positions in character coordinates
+
+        Raises:
+            ValueError: If the DAG is not a single chain
+        """
+        if not dag.nodes:
+            return LayoutResult(positions={}, width=0, height=0)
+
+        order = chain_order(dag)
+        if order is None:
+            raise ValueError("ChainEngine requires a DAG that forms a single path")
+
+        max_width = max(node.width for node in dag.nodes.values())
+        positions: dict[str, NodePosition] = {}
+        y = self.vertical_spacing
+        for node_id in order:
+            node = dag.nodes[node_id]
+            x = (max_width - node.width) // 2 + self.horizontal_spacing
+            positions[node_id] = NodePosition.model_construct(node=node, x=x, y=y)
+            y += node.height + self.vertical_spacing
+
+        return LayoutResult.model_construct(
+            positions=positions,
+            width=max_width + 2 * self.horizontal_spacing,
+            height=y,
+        )
+
+
+def chain_order(dag: DAG) -> list[str] | None:
+    """Order the nodes of a chain from head to tail.
+
+    Args:
+        dag: DAG to inspect
+
+    Returns:
+        Node IDs along the path, or None if the edges do not form a
+        single path through every node
+    """
+    successor: dict[str, str] = {}
+    has_parent: set[str] = set()
+    for edge in dag.edges:
+        if edge.source not in dag.nodes or edge.target not in dag.nodes:
+            continue
+        if edge.source in successor or edge.target in has_parent:
+            return None
+        successor[edge.source] = edge.target
+        has_parent.add(edge.target)
+
+    heads = [node_id for node_id in dag.nodes if node_id not in has_parent]
+    if len(heads) != 1:
+        return None
+    order = [heads[0]]
+    while order[-1] in successor and len(order) <= len(dag.nodes):
+        order.append(successor[order[-1]])
+    return order if len(order) == len(dag.nodes) else None
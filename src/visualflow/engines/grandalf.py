@@ -2,13 +2,31 @@
 
 Uses the Grandalf library (pure Python Sugiyama layout) to compute
 node positions, then converts to character coordinates.
+
+With a time budget or sweep limit the layout is computed "anytime":
+a quick layout first (longest-path layering, one downward ordering
+sweep), then further crossing-reduction sweeps while the budget lasts,
+keeping the ordering with the fewest crossings seen. The budget bounds
+crossing reduction only: layering and Grandalf's vertex placement,
+which grows faster than linearly and dominates on large graphs, run in
+full outside it.
+
+Grandalf ranks nodes by longest path; layering="network_simplex"
+re-ranks them to minimize total edge span first (see layering.py).
 """
 
+import time
+
 from grandalf.graphs import Graph, Vertex, Edge as GEdge
-from grandalf.layouts import SugiyamaLayout
+from grandalf.layouts import Layer, SugiyamaLayout
 
+from visualflow.layering import Layering, network_simplex_ranks
+from visualflow.metrics import bilayer_crossings
 from visualflow.models import DAG, LayoutResult, NodePosition
 
+# Anytime ordering gives up after this many sweeps without fewer crossings
+STALL_SWEEPS = 8
+
 
 class _VertexView:
     """View object for Grandalf vertex with dimensions.
@@ -35,15 +53,34 @@ class GrandalfEngine:
         self,
         horizontal_spacing: int = 4,
         vertical_spacing: int = 6,
+        time_budget: float | None = None,
+        max_sweeps: int | None = None,
+        layering: Layering = "longest_path",
     ) -> None:
         """Initialize engine with spacing parameters.
 
         Args:
             horizontal_spacing: Characters between nodes horizontally
             vertical_spacing: Lines between nodes vertically
+            time_budget: Seconds of crossing reduction per compute() call,
+                counted from the first ordering sweep; layering, vertex
+                placement and the first sweep of every component always
+                run (None = no deadline)
+            max_sweeps: Crossing-reduction sweeps (each over all layers in one
+                direction) after the quick layout
+                (None = until the budget expires or STALL_SWEEPS sweeps in
+                a row bring no improvement)
+            layering: "longest_path" (Grandalf's own) or "network_simplex"
+                (shortest total edge span, so fewer long vertical runs)
+
+        With neither time_budget nor max_sweeps set, Grandalf's default ordering (one and a half
+        sweeps) is used.
         """
         self.horizontal_spacing = horizontal_spacing
         self.vertical_spacing = vertical_spacing
+        self.time_budget = time_budget
+        self.max_sweeps = max_sweeps
+        self.layering = layering
 
     def compute(self, dag: DAG) -> LayoutResult:
         """Compute layout positions for the DAG.
@@ -54,6 +91,8 @@ class GrandalfEngine:
         Returns:
             LayoutResult with positions in character coordinates
         """
+        anytime = self.time_budget is not None or self.max_sweeps is not None
+        budget = self.time_budget
         if not dag.nodes:
             return LayoutResult(positions={}, width=0, height=0)
 
@@ -61,13 +100,28 @@ class GrandalfEngine:
         vertices, edges = self._build_grandalf_graph(dag)
         graph = Graph(list(vertices.values()), edges)
 
-        # Layout each connected component and offset to prevent overlap
+        # Layout each connected component and offset to prevent overlap.
+        # Components share the budget by size; time one leaves unused
+        # goes to the next.
+        components = list(graph.C)
+        weight = sum(len(c.sV) + len(c.sE) for c in components)
         x_offset = 0.0
-        for component in graph.C:
+        for component in components:
             sug = SugiyamaLayout(component)
             sug.yspace = self.vertical_spacing  # Override Grandalf's default (20)
-            sug.init_all()
-            sug.draw()
+            if self.layering == "network_simplex":
+                self._init_network_simplex(sug)
+            else:
+                sug.init_all()
+            if anytime:
+                size = len(component.sV) + len(component.sE)
+                share = None if budget is None else budget * size / weight
+                spent = self._draw_anytime(sug, share)
+                if budget is not None:
+                    budget = max(0.0, budget - spent)
+                weight -= size
+            else:
+                sug.draw()
 
             # Find the bounds of this component
             min_x = float("inf")
@@ -96,7 +150,83 @@ class GrandalfEngine:
         # Calculate canvas size
         width, height = self._calculate_canvas_size(positions)
 
-        return LayoutResult(positions=positions, width=width, height=height)
+        return LayoutResult.model_construct(positions=positions, width=width, height=height)
+
+    def _init_network_simplex(self, sug: SugiyamaLayout) -> None:
+        """Initialize a Sugiyama layout like init_all(), with optimal ranks.
+
+        Grandalf's longest-path layering still runs first: its layer
+        order seeds the order within the new layers.
+
+        Args:
+            sug: Fresh Sugiyama layout of one component
+        """
+        roots = [v for v in sug.g.sV if len(v.e_in()) == 0]
+        sug.g.get_scs_with_feedback(roots)
+        sug.alt_e = [e for e in sug.g.sE if e.feedback]
+        sug.rank_all(roots)
+
+        # Rank along the edges as Grandalf orients them (feedback edges reversed)
+        pairs = [(e.v[1], e.v[0]) if e.feedback else e.v for e in sug.g.sE if e.v[0] is not e.v[1]]
+        try:
+            ranks = network_simplex_ranks(sug.g.sV, pairs)
+        except ValueError:
+            ranks = {v: sug.grx[v].rank for v in sug.g.sV}  # Keep Grandalf's ranks
+        seeded = [v for layer in sug.layers for v in layer]
+        sug.layers = [Layer() for _ in range(max(ranks.values()) + 1)]
+        for v in seeded:
+            sug.grx[v].rank = ranks[v]
+            sug.layers[ranks[v]].append(v)
+
+        # As init_all(): dummy vertices for long edges, then layer setup
+        for e in sug.g.E():
+            sug.setdummies(e)
+        for layer in sug.layers:
+            layer.setup(sug)
+        sug.initdone = True
+
+    def _draw_anytime(self, sug: SugiyamaLayout, budget: float | None) -> float:
+        """Order layers until the budget or sweep limit, then place vertices.
+
+        Sweeps alternate downward and upward, as Grandalf's own ordering
+        does, so once its three sweeps fit in the budget the result has
+        no more crossings than the default layout. The first downward
+        sweep always completes, so there is a layout to return; later
+        sweeps stop as soon as the budget is used up, even mid-sweep,
+        and the complete ordering with the fewest crossings is restored.
+
+        Args:
+            sug: Initialized Sugiyama layout of one component
+            budget: Seconds of ordering (None = no deadline)
+
+        Returns:
+            Seconds spent ordering
+        """
+        start = time.monotonic()
+        deadline = None if budget is None else start + budget
+        _sweep(sug, downward=True, deadline=None)
+        best = _crossings(sug)
+        best_order = [list(layer) for layer in sug.layers]
+        sweeps = 0
+        stalled = 0
+        while best and stalled < STALL_SWEEPS and (self.max_sweeps is None or sweeps < self.max_sweeps):
+            sweeps += 1
+            if not _sweep(sug, downward=sweeps % 2 == 0, deadline=deadline):
+                break
+            crossings = _crossings(sug)
+            if crossings < best:
+                best, best_order = crossings, [list(layer) for layer in sug.layers]
+                stalled = 0
+            else:
+                stalled += 1
+        spent = time.monotonic() - start
+
+        for layer, order in zip(sug.layers, best_order):
+            layer[:] = order
+            layer.setup(sug)
+        sug.setxy()
+        sug.draw_edges()
+        return spent
 
     def _build_grandalf_graph(
         self, dag: DAG
@@ -161,10 +291,10 @@ class GrandalfEngine:
                 # Convert center to top-left and normalize
                 x = int(cx - vertex.view.w / 2 - min_x) + self.horizontal_spacing
                 y = int(cy - vertex.view.h / 2 - min_y) + self.vertical_spacing
-                positions[node_id] = NodePosition(node=node, x=x, y=y)
+                positions[node_id] = NodePosition.model_construct(node=node, x=x, y=y)
             else:
                 # Fallback for nodes without position
-                positions[node_id] = NodePosition(node=node, x=0, y=0)
+                positions[node_id] = NodePosition.model_construct(node=node, x=0, y=0)
 
         return positions
 
@@ -192,3 +322,48 @@ class GrandalfEngine:
 
         # Add padding
         return (max_x + self.horizontal_spacing, max_y + self.vertical_spacing)
+
+
+def _sweep(sug: SugiyamaLayout, downward: bool, deadline: float | None) -> bool:
+    """Reorder every layer once, by mean position of its neighbors.
+
+    Args:
+        sug: Sugiyama layout with initialized layers
+        downward: Order each layer by the one above (else by the one below)
+        deadline: time.monotonic() value to stop at (None = no deadline)
+
+    Returns:
+        False if the deadline passed before the sweep completed
+    """
+    sug.dirv = -1 if downward else +1
+    for layer in sug.layers if downward else reversed(sug.layers):
+        if deadline is not None and time.monotonic() >= deadline:
+            return False
+        layer.order()
+    return True
+
+
+def _crossings(sug: SugiyamaLayout) -> int:
+    """Count edge crossings between adjacent layers of a Sugiyama layout.
+
+    Counts on the current ordering, including dummy vertices of long
+    edges, with the same inversion counter as the layout metrics.
+
+    Args:
+        sug: Sugiyama layout with ordered layers
+
+    Returns:
+        Total number of crossings
+    """
+    sug.dirv = -1  # Neighbors in the layer above
+    grx = sug.grx
+    sug._edge_inverter()
+    try:
+        return sum(
+            bilayer_crossings(
+                [(grx[upper].pos, grx[v].pos) for v in layer for upper in layer._neighbors(v)]
+            )
+            for layer in sug.layers[1:]
+        )
+    finally:
+        sug._edge_inverter()
@@ -4,16 +4,24 @@ Uses the Graphviz CLI (dot command) to compute node positions,
 then converts to character coordinates.
 """
 
+import asyncio
+import re
 import shutil
 import subprocess
+from collections.abc import Iterable, Iterator
+from functools import lru_cache
+from typing import TextIO
 
-from pydantic import BaseModel
+from dataclasses import dataclass
 
+from visualflow.engines.base import LayoutEngine
+from visualflow.engines.graphviz_cache import GraphvizCache
 from visualflow.models import DAG, LayoutResult, NodePosition
 
 
-class _PlainNode(BaseModel):
-    """Parsed node from Graphviz plain output."""
+@dataclass(slots=True)
+class _PlainNode:
+    """Parsed node from Graphviz plain output (internal, one per node line)."""
 
     name: str
     x: float  # Center x in inches
@@ -29,29 +37,62 @@ class GraphvizEngine:
     and converts positions to character coordinates.
 
     Note:
-        Node IDs should be alphanumeric (letters, numbers, underscores).
-        Hyphens are automatically converted to underscores for DOT compatibility.
-        Other special characters may cause parsing issues.
+        Node IDs that are not plain identifiers are written as quoted DOT
+        strings, so IDs with hyphens, spaces, quotes or non-ASCII
+        characters reach Graphviz unchanged.
     """
 
     # Conversion factor: characters per inch (width)
     CHARS_PER_INCH = 10.0
     # Conversion factor: lines per inch (height)
     LINES_PER_INCH = 2.0
+    # Graphviz invocation and its default timeout in seconds
+    COMMAND = ("dot", "-Tplain")
+    TIMEOUT = 30.0
 
     def __init__(
         self,
         horizontal_spacing: int = 4,
         vertical_spacing: int = 2,
+        timeout: float | None = None,
+        mclimit: float | None = None,
+        nslimit: float | None = None,
+        keep_edge_points: bool = False,
+        cache: GraphvizCache | None = None,
+        fallback: LayoutEngine | None = None,
     ) -> None:
         """Initialize engine with spacing parameters.
 
         Args:
             horizontal_spacing: Characters between nodes horizontally
             vertical_spacing: Lines between nodes vertically
+            timeout: Seconds `dot` may run (None = TIMEOUT)
+            mclimit: Scale for dot's crossing-minimization iterations
+                (e.g. 0.1 for a tenth; None = dot's default)
+            nslimit: Scale for dot's network simplex iterations, in both
+                ranking and x placement (None = dot's default)
+            keep_edge_points: Keep dot's edge splines in the layout's
+                edge_points, for SnapRouter
+            cache: Disk cache of layouts; a hit skips running Graphviz
+            fallback: Engine laying out instead when `dot` runs longer
+                than the timeout, e.g. GrandalfEngine(max_sweeps=0) for a
+                quick layout (None = raise TimeoutExpired)
         """
         self.horizontal_spacing = horizontal_spacing
         self.vertical_spacing = vertical_spacing
+        self.timeout = self.TIMEOUT if timeout is None else timeout
+        # Graph attributes overriding dot's defaults
+        self.graph_attributes = {
+            name: str(value)
+            for name, value in (("mclimit", mclimit), ("nslimit", nslimit), ("nslimit1", nslimit))
+            if value is not None
+        }
+        self.command = self.COMMAND + tuple(
+            f"-G{name}={value}" for name, value in self.graph_attributes.items()
+        )
+        self.keep_edge_points = keep_edge_points
+        self.cache = cache
+        self.fallback = fallback
 
     @staticmethod
     def is_available() -> bool:
@@ -69,6 +110,10 @@ class GraphvizEngine:
 
         Raises:
             RuntimeError: If Graphviz is not installed or fails
+            ValueError: If a node ID cannot be written as a DOT string
+                (see write_dot())
+            subprocess.TimeoutExpired: If dot runs longer than the timeout
+                and there is no fallback engine
         """
         if not dag.nodes:
             return LayoutResult(positions={}, width=0, height=0)
@@ -78,20 +123,162 @@ class GraphvizEngine:
 
         # Generate DOT input
         dot_input = self._generate_dot(dag)
+        cache_key, layout = self._cache_lookup(dag, dot_input)
+        if layout is not None:
+            return layout
 
         # Run Graphviz
-        plain_output = self._run_graphviz(dot_input)
+        try:
+            plain_output = self._run_graphviz(dot_input)
+        except subprocess.TimeoutExpired:
+            if self.fallback is None:
+                raise
+            return self.fallback.compute(dag)
+
+        return self._build_layout(dag, plain_output, cache_key)
+
+    async def compute_async(self, dag: DAG) -> LayoutResult:
+        """Compute layout positions without blocking the event loop.
+
+        Same result as compute(), but runs `dot` with
+        asyncio.create_subprocess_exec so many layouts can be in flight
+        concurrently without threads. With a cache, the lookup (including
+        the one-time `dot -V` version query) and the store run in a
+        worker thread, as they read and write files.
+
+        Args:
+            dag: The directed acyclic graph to lay out
+
+        Returns:
+            LayoutResult with positions in character coordinates
+
+        Raises:
+            RuntimeError: If Graphviz is not installed or fails
+            ValueError: If a node ID cannot be written as a DOT string
+                (see write_dot())
+            subprocess.TimeoutExpired: If dot runs longer than the timeout
+                and there is no fallback engine
+        """
+        if not dag.nodes:
+            return LayoutResult(positions={}, width=0, height=0)
+
+        if not self.is_available():
+            raise RuntimeError("Graphviz not installed (run: brew install graphviz)")
+
+        dot_input = self._generate_dot(dag)
+        cache_key, layout = None, None
+        if self.cache is not None:
+            cache_key, layout = await asyncio.to_thread(self._cache_lookup, dag, dot_input)
+            if layout is not None:
+                return layout
+        try:
+            plain_output = await self._run_graphviz_async(dot_input)
+        except subprocess.TimeoutExpired:
+            if self.fallback is None:
+                raise
+            return await asyncio.to_thread(self.fallback.compute, dag)
+        if cache_key is not None:
+            return await asyncio.to_thread(self._build_layout, dag, plain_output, cache_key)
+        return self._build_layout(dag, plain_output)
+
+    def graphviz_version(self) -> str:
+        """Version of the Graphviz that lays out (e.g. "2.43.0").
+
+        Raises:
+            RuntimeError: If the version cannot be determined
+        """
+        return _dot_version(self.command[0])
+
+    def _cache_lookup(self, dag: DAG, dot_input: str) -> tuple[str | None, LayoutResult | None]:
+        """Look a layout up in the cache.
+
+        Args:
+            dag: Source DAG
+            dot_input: DOT input generated for the DAG
+
+        Returns:
+            (cache key, cached layout); the key is None without a cache,
+            the layout is None on a miss
+        """
+        if self.cache is None:
+            return None, None
+        options = " ".join(f"{name}={value}" for name, value in self.graph_attributes.items())
+        cache_key = self.cache.key(dot_input, options, self.graphviz_version())
+        entry = self.cache.get(cache_key)
+        if entry is None:
+            return cache_key, None
+        nodes, edges = entry
+        plain_nodes = {name: _PlainNode(name, *values) for name, values in nodes.items()}
+        return cache_key, self._layout_from_plain(dag, plain_nodes, edges)
+
+    def _build_layout(self, dag: DAG, plain_output: str, cache_key: str | None = None) -> LayoutResult:
+        """Convert Graphviz plain output into a LayoutResult.
+
+        Args:
+            dag: Source DAG
+            plain_output: Plain format output from dot
+            cache_key: Key to store the parsed layout under (None = not cached)
 
-        # Parse output
-        plain_nodes = self._parse_plain_output(plain_output)
+        Returns:
+            LayoutResult with positions in character coordinates
+        """
+        # Parse output (with edges when caching, so that any later
+        # keep_edge_points lookup of the entry has them)
+        plain_nodes, plain_edges = self._parse_plain(
+            plain_output, self.keep_edge_points or cache_key is not None
+        )
+        if cache_key is not None and self.cache is not None:
+            nodes = {name: (n.x, n.y, n.width, n.height) for name, n in plain_nodes.items()}
+            try:
+                self.cache.put(cache_key, nodes, plain_edges)
+            except OSError:
+                pass  # An unwritable cache only costs speed
+        return self._layout_from_plain(dag, plain_nodes, plain_edges)
+
+    def _layout_from_plain(
+        self,
+        dag: DAG,
+        plain_nodes: dict[str, _PlainNode],
+        plain_edges: list[tuple[str, str, list[tuple[float, float]]]],
+    ) -> LayoutResult:
+        """Convert parsed Graphviz nodes and edges into a LayoutResult.
+
+        Args:
+            dag: Source DAG
+            plain_nodes: Graphviz nodes, in inches
+            plain_edges: Graphviz edge control points, in inches (used
+                only with keep_edge_points)
 
+        Returns:
+            LayoutResult with positions in character coordinates
+        """
         # Convert to character coordinates
         positions = self._convert_positions(dag, plain_nodes)
 
         # Calculate canvas size
         width, height = self._calculate_canvas_size(positions)
 
-        return LayoutResult(positions=positions, width=width, height=height)
+        edge_points = (
+            self._convert_edge_points(dag, plain_edges, plain_nodes)
+            if self.keep_edge_points
+            else {}
+        )
+        return LayoutResult.model_construct(
+            positions=positions, width=width, height=height, edge_points=edge_points
+        )
+
+    def write_dot(self, dag: DAG, out: TextIO) -> None:
+        """Write the DOT input for a DAG to a text stream, line by line.
+
+        Args:
+            dag: Source DAG
+            out: Writable text stream (file, StringIO, pipe)
+
+        Raises:
+            ValueError: If a node ID cannot be written as a DOT string: an
+                odd run of backslashes before a quote, a newline or its end
+        """
+        out.writelines(self._dot_lines(dag))
 
     def _generate_dot(self, dag: DAG) -> str:
         """Generate DOT format input for Graphviz.
@@ -102,27 +289,39 @@ class GraphvizEngine:
         Returns:
             DOT format string
         """
-        lines = ["digraph G {"]
-        lines.append("  rankdir=TB;")  # Top to bottom
+        return "".join(self._dot_lines(dag))
+
+    def _dot_lines(self, dag: DAG) -> Iterator[str]:
+        """Yield the DOT input for a DAG, one line at a time.
+
+        Args:
+            dag: Source DAG
+
+        Yields:
+            DOT lines, newline-terminated
+        """
+        yield "digraph G {\n"
+        yield "  rankdir=TB;\n"  # Top to bottom
 
+        # Attributes per distinct box size (in inches). Labels stay empty:
+        # boxes have a fixed size, so Graphviz need not measure any text.
+        attributes: dict[tuple[int, int], str] = {}
+        names = _dot_names(dag.nodes)
         for node_id, node in dag.nodes.items():
-            # Convert character dimensions to inches
-            width_inches = node.width / self.CHARS_PER_INCH
-            height_inches = node.height / self.LINES_PER_INCH
-            # Quote node ID and escape special characters
-            safe_id = node_id.replace("-", "_")
-            lines.append(
-                f'  {safe_id} [label="{node_id}" '
-                f"width={width_inches:.2f} height={height_inches:.2f} fixedsize=true];"
-            )
+            name = names[node_id]
+            size = node.size
+            node_attributes = attributes.get(size)
+            if node_attributes is None:
+                node_attributes = attributes[size] = (
+                    f"width={size[0] / self.CHARS_PER_INCH:.2f} "
+                    f'height={size[1] / self.LINES_PER_INCH:.2f} fixedsize=true label=""'
+                )
+            yield f"  {name} [{node_attributes}];\n"
 
         for edge in dag.edges:
-            safe_source = edge.source.replace("-", "_")
-            safe_target = edge.target.replace("-", "_")
-            lines.append(f"  {safe_source} -> {safe_target};")
+            yield f"  {names[edge.source]} -> {names[edge.target]};\n"
 
-        lines.append("}")
-        return "\n".join(lines)
+        yield "}\n"
 
     def _run_graphviz(self, dot_input: str) -> str:
         """Run Graphviz and return plain output.
@@ -137,41 +336,125 @@ class GraphvizEngine:
             RuntimeError: If Graphviz fails
         """
         result = subprocess.run(
-            ["dot", "-Tplain"],
+            self.command,
             input=dot_input,
             capture_output=True,
             text=True,
-            timeout=30,
+            timeout=self.timeout,
         )
         if result.returncode != 0:
             raise RuntimeError(f"Graphviz failed: {result.stderr}")
         return result.stdout
 
-    def _parse_plain_output(self, plain: str) -> dict[str, _PlainNode]:
-        """Parse Graphviz plain output format.
+    async def _run_graphviz_async(self, dot_input: str) -> str:
+        """Run Graphviz as an asyncio subprocess and return plain output.
+
+        Args:
+            dot_input: DOT format input
+
+        Returns:
+            Plain format output
+
+        Raises:
+            RuntimeError: If Graphviz fails
+            subprocess.TimeoutExpired: If dot runs longer than the timeout
+        """
+        process = await asyncio.create_subprocess_exec(
+            *self.command,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        try:
+            stdout, stderr = await asyncio.wait_for(
+                process.communicate(dot_input.encode()), timeout=self.timeout
+            )
+        except asyncio.TimeoutError:
+            await _reap(process)
+            raise subprocess.TimeoutExpired(self.command, self.timeout) from None
+        except BaseException:
+            # Cancelled (or failed) while dot runs: do not leave it behind
+            await _reap(process)
+            raise
+        if process.returncode != 0:
+            raise RuntimeError(f"Graphviz failed: {stderr.decode(errors='replace')}")
+        return stdout.decode()
+
+    def _parse_plain(
+        self, plain: str, keep_edges: bool = False
+    ) -> tuple[dict[str, _PlainNode], list[tuple[str, str, list[tuple[float, float]]]]]:
+        """Parse Graphviz plain output format in one pass.
+
+        Node lines are "node name x y width height label ...", edge lines
+        "edge tail head n x1 y1 ... xn yn ...", the edge points being
+        B-spline control points; all values are in inches. Names are
+        quoted by Graphviz when they are not plain identifiers.
 
         Args:
             plain: Plain format output
+            keep_edges: Also parse edge lines
 
         Returns:
-            Dict mapping node name to PlainNode
+            (node name -> PlainNode, [(tail, head, control points)])
         """
         nodes: dict[str, _PlainNode] = {}
+        edges: list[tuple[str, str, list[tuple[float, float]]]] = []
+        for line in plain.splitlines():
+            if line.startswith("node "):
+                if line[5] == '"':
+                    name, rest = _split_name(line, 5)
+                    x, y, width, height = rest.split(None, 4)[:4]
+                else:
+                    _, name, x, y, width, height = line.split(None, 6)[:6]
+                nodes[name] = _PlainNode(name, float(x), float(y), float(width), float(height))
+            elif keep_edges and line.startswith("edge "):
+                if '"' in line:
+                    tail, rest = _split_name(line, 5)
+                    head, rest = _split_name(rest, 0)
+                    parts = rest.split()
+                else:
+                    _, tail, head, *parts = line.split()
+                coords = map(float, parts[1 : 1 + 2 * int(parts[0])])
+                edges.append((tail, head, list(zip(coords, coords))))
+        return nodes, edges
+
+    def _convert_edge_points(
+        self,
+        dag: DAG,
+        plain_edges: list[tuple[str, str, list[tuple[float, float]]]],
+        plain_nodes: dict[str, _PlainNode],
+    ) -> dict[tuple[str, str], list[tuple[float, float]]]:
+        """Convert edge control points to character coordinates.
 
-        for line in plain.strip().split("\n"):
-            parts = line.split()
-            if not parts:
-                continue
+        Uses the same transform as _convert_positions(), so the points
+        line up with the boxes. Of parallel edges, the first is kept.
 
-            if parts[0] == "node":
-                name = parts[1]
-                x = float(parts[2])
-                y = float(parts[3])
-                w = float(parts[4])
-                h = float(parts[5])
-                nodes[name] = _PlainNode(name=name, x=x, y=y, width=w, height=h)
+        Args:
+            dag: Original DAG with node IDs
+            plain_edges: Parsed Graphviz edges
+            plain_nodes: Parsed Graphviz nodes
 
-        return nodes
+        Returns:
+            Dict mapping (source, target) node IDs to points
+        """
+        if not plain_nodes:
+            return {}
+        max_y = max(n.y + n.height / 2 for n in plain_nodes.values())
+        edge_points: dict[tuple[str, str], list[tuple[float, float]]] = {}
+        for tail, head, points in plain_edges:
+            if tail not in dag.nodes or head not in dag.nodes:
+                continue
+            edge_points.setdefault(
+                (tail, head),
+                [
+                    (
+                        x * self.CHARS_PER_INCH + self.horizontal_spacing,
+                        (max_y - y) * self.LINES_PER_INCH + self.vertical_spacing,
+                    )
+                    for x, y in points
+                ],
+            )
+        return edge_points
 
     def _convert_positions(
         self, dag: DAG, plain_nodes: dict[str, _PlainNode]
@@ -197,13 +480,11 @@ class GraphvizEngine:
         max_y = max(n.y + n.height / 2 for n in plain_nodes.values())
 
         for node_id, node in dag.nodes.items():
-            safe_id = node_id.replace("-", "_")
-            if safe_id not in plain_nodes:
-                positions[node_id] = NodePosition(node=node, x=0, y=0)
+            plain = plain_nodes.get(node_id)
+            if plain is None:
+                positions[node_id] = NodePosition.model_construct(node=node, x=0, y=0)
                 continue
 
-            plain = plain_nodes[safe_id]
-
             # Convert inches to characters
             cx = plain.x * self.CHARS_PER_INCH
             # Flip y axis (Graphviz origin is bottom-left)
@@ -217,7 +498,7 @@ class GraphvizEngine:
             x = max(0, x)
             y = max(0, y)
 
-            positions[node_id] = NodePosition(node=node, x=x, y=y)
+            positions[node_id] = NodePosition.model_construct(node=node, x=x, y=y)
 
         return positions
 
@@ -244,3 +525,157 @@ class GraphvizEngine:
             max_y = max(max_y, bottom)
 
         return (max_x + self.horizontal_spacing, max_y + self.vertical_spacing)
+
+
+async def _reap(process: asyncio.subprocess.Process) -> None:
+    """Kill a subprocess if it still runs, and wait for it to exit.
+
+    The wait is shielded, so a cancellation arriving meanwhile cannot
+    leave the process unreaped.
+
+    Args:
+        process: Subprocess to stop
+    """
+    if process.returncode is None:
+        try:
+            process.kill()
+        except ProcessLookupError:
+            pass  # Exited in the meantime
+    await asyncio.shield(process.wait())
+
+
+# Odd run of backslashes before a quote, a newline or the end (_check_name()).
+# NUL ends an ID in the IDs _check_names() joins.
+_UNWRITABLE = re.compile(r'(?<!\\)(?:\\\\)*\\(?:["\n\0]|\Z)')
+
+# DOT keywords, which cannot be bare IDs (in any letter case)
+_KEYWORDS = frozenset({"node", "edge", "graph", "digraph", "subgraph", "strict"})
+
+
+@lru_cache(maxsize=None)
+def _dot_version(executable: str) -> str:
+    """Graphviz version reported by `dot -V` (run once per executable).
+
+    Raises:
+        RuntimeError: If dot does not report a version
+    """
+    try:
+        result = subprocess.run([executable, "-V"], capture_output=True, text=True, timeout=10)
+    except (OSError, subprocess.SubprocessError) as error:
+        raise RuntimeError(f"Graphviz version unknown: {error}") from error
+    return _version_number(result.stderr + result.stdout)
+
+
+def _version_number(text: str) -> str:
+    """Extract the version number from Graphviz version output.
+
+    Raises:
+        RuntimeError: If the text holds no version number
+    """
+    match = re.search(r"\d+(?:\.\d+)+", text)
+    if match is None:
+        raise RuntimeError(f"Graphviz version unknown: {text.strip()!r}")
+    return match.group()
+
+
+def _quote(name: str) -> str:
+    """Write a node ID as a DOT ID: bare if a plain identifier, else quoted.
+
+    Raises:
+        ValueError: If DOT cannot represent the ID (see _check_name())
+    """
+    return _dot_name(_check_name(name))
+
+
+class _DotNames(dict[str, str]):
+    """Node ID -> DOT ID; IDs missing from the batch are written on lookup."""
+
+    __slots__ = ()
+
+    def __missing__(self, node_id: str) -> str:
+        name = self[node_id] = _quote(node_id)
+        return name
+
+
+def _dot_names(ids: Iterable[str]) -> _DotNames:
+    """Write many node IDs as DOT IDs (see _quote()), checked in one pass.
+
+    Raises:
+        ValueError: If DOT cannot represent an ID (see _check_name())
+    """
+    ids = list(ids)
+    _check_names(ids)
+    return _DotNames((name, _dot_name(name)) for name in ids)
+
+
+def _dot_name(name: str) -> str:
+    """Write a checked node ID bare, or as a string with quotes escaped."""
+    if name.isidentifier() and name.lower() not in _KEYWORDS:
+        return name
+    return '"' + name.replace('"', '\\"') + '"'
+
+
+def _check_names(ids: Iterable[str]) -> None:
+    """Check many node IDs with one pattern pass (see _check_name()).
+
+    Raises:
+        ValueError: If an ID cannot be written as a DOT string
+    """
+    joined = "\0".join(ids)
+    if "\\" in joined and _UNWRITABLE.search(joined):
+        for name in joined.split("\0"):
+            _check_name(name)
+
+
+def _check_name(name: str) -> str:
+    """Check that a node ID survives a DOT string.
+
+    DOT reads backslashes in pairs, and a single one before a quote or
+    newline escapes it. An odd run of backslashes just before a quote,
+    a newline or the end of the ID therefore cannot be written.
+
+    Args:
+        name: Node ID
+
+    Returns:
+        The ID unchanged
+
+    Raises:
+        ValueError: If the ID cannot be written as a DOT string
+    """
+    if "\\" in name and _UNWRITABLE.search(name):
+        raise ValueError(
+            f"Graphviz cannot represent node ID {name!r} "
+            "(odd run of backslashes before a quote, a newline or its end)"
+        )
+    return name
+
+
+def _split_name(text: str, start: int) -> tuple[str, str]:
+    """Read one node name of a plain output line.
+
+    Args:
+        text: Line (or remainder of a line)
+        start: Index where the name begins
+
+    Returns:
+        (unquoted name, text after the name and its separating space)
+    """
+    if text.startswith('"', start):
+        end = text.index('"', start + 1)
+        if "\\" not in text[start + 1 : end]:
+            return text[start + 1 : end], text[end + 2 :]
+        # As DOT reads strings: backslashes pair up, and a single one
+        # before a quote escapes it
+        chars: list[str] = []
+        end = start + 1
+        while text[end] != '"':
+            if text[end] == "\\" and text[end + 1] in '"\\':
+                chars.append('"' if text[end + 1] == '"' else "\\\\")
+                end += 2
+            else:
+                chars.append(text[end])
+                end += 1
+        return "".join(chars), text[end + 2 :]
+    end = text.index(" ", start)
+    return text[start:end], text[end + 1 :]
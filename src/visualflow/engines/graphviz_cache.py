@@ -0,0 +1,268 @@
+"""On-disk cache of Graphviz layouts.
+
+Rendering the same graphs again (on one machine or many sharing a
+directory) would otherwise run `dot` every time. GraphvizCache stores
+the parsed plain output of each layout under a content address: the
+SHA-256 of the DOT input, the layout options and the Graphviz version,
+so a changed graph, option or Graphviz upgrade is simply a miss.
+
+Entries are compact binary files (struct-packed doubles, names stored
+once), written to a temporary file and renamed into place so readers
+never see a partial entry. When the directory grows past max_bytes, the
+least recently used entries are evicted, along with temporary files
+left behind by processes killed mid-write.
+
+Usage:
+    cache = GraphvizCache("~/.cache/visualflow")
+    engine = GraphvizEngine(cache=cache)
+"""
+
+import hashlib
+import os
+import struct
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+# Parsed plain output: node name -> (x, y, width, height) in inches, and
+# (tail, head, control points in inches) per edge
+PlainNodes = dict[str, tuple[float, float, float, float]]
+PlainEdges = list[tuple[str, str, list[tuple[float, float]]]]
+
+_MAGIC = b"VFGV"
+_FORMAT = 1
+_SUFFIX = ".layout"
+_TEMP_PREFIX = ".tmp-"
+_HEADER = struct.Struct("<4sHII")  # magic, format, node count, edge count
+_NAME = struct.Struct("<I")  # UTF-8 byte length, then the bytes
+_NODE = struct.Struct("<4d")
+_EDGE = struct.Struct("<III")  # tail index, head index, point count
+
+# Eviction trims the cache to this fraction of max_bytes, so that it
+# does not run again on the next few writes
+_EVICT_TO = 0.8
+
+# Temporary files older than this (seconds) were left by a process that
+# died mid-write, and are deleted on eviction
+_STALE_TEMP = 3600
+
+
+class GraphvizCache:
+    """Content-addressed disk cache of parsed Graphviz layouts.
+
+    Safe to share between threads and processes: entries are written
+    atomically, and a missing or unreadable entry is a miss.
+
+    Attributes:
+        directory: Directory holding the entries
+        max_bytes: Total entry size that triggers eviction
+        hits: Lookups answered from the cache
+        misses: Lookups that found no usable entry
+    """
+
+    def __init__(self, directory: str | os.PathLike[str], max_bytes: int = 64 << 20) -> None:
+        """Create a cache in a directory (created if missing).
+
+        Args:
+            directory: Cache directory (`~` is expanded)
+            max_bytes: Total entry size that triggers eviction
+        """
+        self.directory = Path(directory).expanduser()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._size: int | None = None  # Estimated total entry size
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(dot_input: str, options: str, version: str) -> str:
+        """Content address of a layout.
+
+        Args:
+            dot_input: DOT text laid out
+            options: Layout options not in the DOT text (e.g. -G flags)
+            version: Graphviz version string
+
+        Returns:
+            Hex SHA-256 digest
+        """
+        digest = hashlib.sha256()
+        for part in (version, options, dot_input):
+            data = part.encode()
+            digest.update(len(data).to_bytes(8, "little"))
+            digest.update(data)
+        return digest.hexdigest()
+
+    def get(self, key: str) -> tuple[PlainNodes, PlainEdges] | None:
+        """Read an entry.
+
+        Args:
+            key: Entry key from key()
+
+        Returns:
+            (nodes, edges), or None on a miss
+        """
+        path = self._path(key)
+        try:
+            data = path.read_bytes()
+            entry = _decode(data)
+        except (OSError, ValueError, struct.error, UnicodeDecodeError, IndexError):
+            entry = None
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        if entry is not None:
+            try:
+                os.utime(path)  # Mark as recently used for eviction
+            except OSError:
+                pass
+        return entry
+
+    def put(self, key: str, nodes: PlainNodes, edges: PlainEdges) -> None:
+        """Write an entry atomically, then evict if over max_bytes.
+
+        Args:
+            key: Entry key from key()
+            nodes: Node name -> (x, y, width, height)
+            edges: (tail, head, control points); edges with an endpoint
+                missing from nodes are dropped
+        """
+        data = _encode(nodes, edges)
+        path = self._path(key)
+        fd, temp = tempfile.mkstemp(dir=self.directory, prefix=_TEMP_PREFIX)
+        try:
+            with os.fdopen(fd, "wb") as file:
+                file.write(data)
+            try:
+                replaced = path.stat().st_size  # Overwritten entry
+            except OSError:
+                replaced = 0
+            os.replace(temp, path)
+        except BaseException:
+            try:
+                os.unlink(temp)
+            except OSError:
+                pass
+            raise
+        with self._lock:
+            if self._size is None:
+                self._size = self.size()
+            else:
+                self._size += len(data) - replaced
+            if self._size > self.max_bytes:
+                self._size = self._evict(int(self.max_bytes * _EVICT_TO))
+
+    def size(self) -> int:
+        """Total size of all entries in bytes."""
+        return sum(size for _, _, size in self._entries())
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            for path, _, _ in self._entries():
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+            self._size = 0
+
+    def _path(self, key: str) -> Path:
+        """File of an entry."""
+        return self.directory / f"{key}{_SUFFIX}"
+
+    def _entries(self) -> list[tuple[Path, float, int]]:
+        """(path, last use, size) of every entry."""
+        entries = []
+        for item in os.scandir(self.directory):
+            if item.name.endswith(_SUFFIX):
+                try:
+                    stat = item.stat()
+                except OSError:
+                    continue  # Evicted by another process
+                entries.append((Path(item.path), stat.st_mtime, stat.st_size))
+        return entries
+
+    def _evict(self, target: int) -> int:
+        """Delete least recently used entries until at most target bytes remain.
+
+        Stale temporary files are deleted first.
+
+        Returns:
+            Remaining total size
+        """
+        self._remove_stale_temps()
+        entries = sorted(self._entries(), key=lambda entry: entry[1])
+        total = sum(size for _, _, size in entries)
+        for path, _, size in entries:
+            if total <= target:
+                break
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            total -= size
+        return total
+
+    def _remove_stale_temps(self) -> None:
+        """Delete temporary files older than _STALE_TEMP seconds."""
+        cutoff = time.time() - _STALE_TEMP
+        for item in os.scandir(self.directory):
+            if item.name.startswith(_TEMP_PREFIX):
+                try:
+                    if item.stat().st_mtime < cutoff:
+                        os.unlink(item.path)
+                except OSError:
+                    continue  # Renamed into place or removed meanwhile
+
+
+def _encode(nodes: PlainNodes, edges: PlainEdges) -> bytes:
+    """Pack an entry into bytes."""
+    index = {name: i for i, name in enumerate(nodes)}
+    edges = [edge for edge in edges if edge[0] in index and edge[1] in index]
+    parts = [_HEADER.pack(_MAGIC, _FORMAT, len(nodes), len(edges))]
+    for name, values in nodes.items():
+        encoded = name.encode()
+        parts.append(_NAME.pack(len(encoded)))
+        parts.append(encoded)
+        parts.append(_NODE.pack(*values))
+    for tail, head, points in edges:
+        parts.append(_EDGE.pack(index[tail], index[head], len(points)))
+        parts.append(struct.pack(f"<{2 * len(points)}d", *[value for point in points for value in point]))
+    return b"".join(parts)
+
+
+def _decode(data: bytes) -> tuple[PlainNodes, PlainEdges]:
+    """Unpack an entry.
+
+    Raises:
+        ValueError: If the data is not a current-format entry
+        struct.error: If the data is truncated
+    """
+    magic, version, node_count, edge_count = _HEADER.unpack_from(data)
+    if magic != _MAGIC or version != _FORMAT:
+        raise ValueError("Not a layout cache entry")
+    offset = _HEADER.size
+    names: list[str] = []
+    nodes: PlainNodes = {}
+    for _ in range(node_count):
+        (length,) = _NAME.unpack_from(data, offset)
+        offset += _NAME.size
+        name = data[offset : offset + length].decode()
+        offset += length
+        nodes[name] = _NODE.unpack_from(data, offset)
+        offset += _NODE.size
+        names.append(name)
+    edges: PlainEdges = []
+    for _ in range(edge_count):
+        tail, head, count = _EDGE.unpack_from(data, offset)
+        offset += _EDGE.size
+        values = struct.unpack_from(f"<{2 * count}d", data, offset)
+        offset += 16 * count
+        edges.append((names[tail], names[head], list(zip(values[::2], values[1::2]))))
+    if offset != len(data):
+        raise ValueError("Trailing data in layout cache entry")
+    return nodes, edges
@@ -0,0 +1,250 @@
+"""In-process Graphviz layout through libgvc.
+
+GraphvizEngine starts a `dot` process per layout, writing DOT text to it
+and parsing its plain output; for small graphs the process spawn costs
+far more than the layout itself. LibGraphvizEngine instead loads
+Graphviz's shared libraries with ctypes, builds the graph through
+libcgraph's C API (no DOT text), runs libgvc's dot layout in this
+process and renders its plain output to memory, so coordinates match
+the dot command exactly.
+
+When libgvc or libcgraph cannot be loaded, it falls back to
+GraphvizEngine's subprocess path, so it can be used wherever
+GraphvizEngine can.
+"""
+
+import asyncio
+import ctypes
+import ctypes.util
+import threading
+from functools import lru_cache
+
+from visualflow.engines.graphviz import GraphvizEngine, _check_names, _version_number
+from visualflow.models import DAG, LayoutResult
+
+
+class _Agdesc(ctypes.Structure):
+    """Graph kind (Agdesc_t): a bit field that fits one unsigned int."""
+
+    _fields_ = [("bits", ctypes.c_uint)]
+
+
+class _LibGvc:
+    """Loaded Graphviz libraries and their shared layout context.
+
+    Graphviz keeps global state, so layouts through one context are
+    serialized with `lock`.
+    """
+
+    def __init__(self, cgraph: ctypes.CDLL, gvc: ctypes.CDLL) -> None:
+        """Declare the C signatures used and create the layout context.
+
+        Args:
+            cgraph: Loaded libcgraph
+            gvc: Loaded libgvc
+
+        Raises:
+            OSError: If a symbol is missing or the context cannot be created
+            RuntimeError: If the Graphviz version cannot be read
+        """
+        pointer, name = ctypes.c_void_p, ctypes.c_char_p
+        cgraph.agopen.argtypes = [name, _Agdesc, pointer]
+        cgraph.agopen.restype = pointer
+        cgraph.agnode.argtypes = [pointer, name, ctypes.c_int]
+        cgraph.agnode.restype = pointer
+        cgraph.agedge.argtypes = [pointer, pointer, pointer, name, ctypes.c_int]
+        cgraph.agedge.restype = pointer
+        cgraph.agsafeset.argtypes = [pointer, name, name, name]
+        cgraph.agsafeset.restype = ctypes.c_int
+        cgraph.agclose.argtypes = [pointer]
+        cgraph.agclose.restype = ctypes.c_int
+        gvc.gvContext.argtypes = []
+        gvc.gvContext.restype = pointer
+        gvc.gvLayout.argtypes = [pointer, pointer, name]
+        gvc.gvLayout.restype = ctypes.c_int
+        gvc.gvFreeLayout.argtypes = [pointer, pointer]
+        gvc.gvFreeLayout.restype = ctypes.c_int
+        gvc.gvFreeRenderData.argtypes = [pointer]
+        gvc.gvFreeRenderData.restype = None
+        gvc.gvcVersion.argtypes = [pointer]
+        gvc.gvcVersion.restype = name
+
+        self.cgraph = cgraph
+        self.gvc = gvc
+        self.directed = _Agdesc.in_dll(cgraph, "Agdirected")
+        self.context = gvc.gvContext()
+        if not self.context:
+            raise OSError("gvContext() failed")
+        self.lock = threading.Lock()
+
+        # The rendered length is an unsigned int before Graphviz 9 and a
+        # size_t since
+        major = int(_version_number(gvc.gvcVersion(self.context).decode()).split(".")[0])
+        self.length_type = ctypes.c_uint if major < 9 else ctypes.c_size_t
+        gvc.gvRenderData.argtypes = [
+            pointer, pointer, name, ctypes.POINTER(pointer), ctypes.POINTER(self.length_type)
+        ]
+        gvc.gvRenderData.restype = ctypes.c_int
+
+
+@lru_cache(maxsize=None)
+def _load_libgvc() -> _LibGvc | None:
+    """Load libgvc and libcgraph once per process.
+
+    Returns:
+        Loaded libraries, or None if they are not installed or unusable
+    """
+    gvc_path = ctypes.util.find_library("gvc")
+    cgraph_path = ctypes.util.find_library("cgraph")
+    if gvc_path is None or cgraph_path is None:
+        return None
+    try:
+        cgraph = ctypes.CDLL(cgraph_path)
+        return _LibGvc(cgraph, ctypes.CDLL(gvc_path))
+    except (OSError, AttributeError, ValueError, RuntimeError):
+        return None
+
+
+class LibGraphvizEngine(GraphvizEngine):
+    """Graphviz dot layout run in-process through libgvc.
+
+    Same layouts and options as GraphvizEngine (the graph is built with
+    the attributes GraphvizEngine writes as DOT), without starting a
+    `dot` process. Layouts run one at a time, since Graphviz is not
+    thread-safe.
+
+    Note:
+        `timeout` only applies when falling back to the `dot` subprocess;
+        an in-process layout cannot be interrupted. Bound it with
+        mclimit and nslimit instead.
+    """
+
+    @staticmethod
+    def is_available() -> bool:
+        """Check if libgvc can be loaded or the dot command is installed."""
+        return _load_libgvc() is not None or GraphvizEngine.is_available()
+
+    @staticmethod
+    def is_in_process() -> bool:
+        """Check if layouts run in-process (libgvc loaded)."""
+        return _load_libgvc() is not None
+
+    def compute(self, dag: DAG) -> LayoutResult:
+        """Compute layout positions for the DAG.
+
+        Args:
+            dag: The directed acyclic graph to lay out
+
+        Returns:
+            LayoutResult with positions in character coordinates
+
+        Raises:
+            RuntimeError: If Graphviz is not installed or fails
+            ValueError: If a node ID cannot be written as a DOT string
+            subprocess.TimeoutExpired: If the `dot` fallback runs longer
+                than the timeout
+        """
+        lib = _load_libgvc()
+        if lib is None or not dag.nodes:
+            return super().compute(dag)
+        cache_key, layout = self._cache_lookup(dag, self._generate_dot(dag)) if self.cache else (None, None)
+        if layout is not None:
+            return layout
+        return self._compute_in_process(lib, dag, cache_key)
+
+    async def compute_async(self, dag: DAG) -> LayoutResult:
+        """Compute layout positions without blocking the event loop.
+
+        In-process layouts run in a worker thread; the fallback awaits
+        the `dot` subprocess as GraphvizEngine does.
+
+        Args:
+            dag: The directed acyclic graph to lay out
+
+        Returns:
+            LayoutResult with positions in character coordinates
+
+        Raises:
+            RuntimeError: If Graphviz is not installed or fails
+            subprocess.TimeoutExpired: If the `dot` fallback runs longer
+                than the timeout
+        """
+        lib = _load_libgvc()
+        if lib is None or not dag.nodes:
+            return await super().compute_async(dag)
+        return await asyncio.to_thread(self.compute, dag)
+
+    def graphviz_version(self) -> str:
+        """Version of the Graphviz that lays out (e.g. "2.43.0").
+
+        The loaded libgvc's version, or the dot command's when falling
+        back, so cache entries are shared with GraphvizEngine.
+
+        Raises:
+            RuntimeError: If the version cannot be determined
+        """
+        lib = _load_libgvc()
+        if lib is None:
+            return super().graphviz_version()
+        return _version_number(lib.gvc.gvcVersion(lib.context).decode())
+
+    def _compute_in_process(self, lib: _LibGvc, dag: DAG, cache_key: str | None = None) -> LayoutResult:
+        """Lay out the DAG with libgvc.
+
+        Args:
+            lib: Loaded Graphviz libraries
+            dag: Non-empty DAG to lay out
+            cache_key: Key to store the layout under (None = not cached)
+
+        Returns:
+            LayoutResult with positions in character coordinates
+
+        Raises:
+            RuntimeError: If the dot layout or its rendering fails
+            ValueError: If a node ID is one the dot command cannot take
+        """
+        # Same IDs as the DOT path accepts, so both engines agree (the
+        # plain output could not be read back for them either)
+        _check_names(dag.nodes)
+        _check_names(node_id for edge in dag.edges for node_id in (edge.source, edge.target))
+
+        cgraph = lib.cgraph
+        with lib.lock:
+            graph = cgraph.agopen(b"G", lib.directed, None)
+            try:
+                for name, value in self.graph_attributes.items():
+                    cgraph.agsafeset(graph, name.encode(), value.encode(), b"")
+
+                # Nodes and edges with the attributes write_dot() writes
+                handles: dict[str, int] = {}
+                for node_id, node in dag.nodes.items():
+                    handle = handles[node_id] = cgraph.agnode(graph, node_id.encode(), 1)
+                    cgraph.agsafeset(handle, b"label", b"", b"\\N")
+                    cgraph.agsafeset(handle, b"width", f"{node.width / self.CHARS_PER_INCH:.2f}".encode(), b"0.75")
+                    cgraph.agsafeset(handle, b"height", f"{node.height / self.LINES_PER_INCH:.2f}".encode(), b"0.5")
+                    cgraph.agsafeset(handle, b"fixedsize", b"true", b"false")
+                for edge in dag.edges:
+                    source = handles.get(edge.source) or cgraph.agnode(graph, edge.source.encode(), 1)
+                    target = handles.get(edge.target) or cgraph.agnode(graph, edge.target.encode(), 1)
+                    cgraph.agedge(graph, source, target, None, 1)
+
+                if lib.gvc.gvLayout(lib.context, graph, b"dot") != 0:
+                    raise RuntimeError("Graphviz failed: dot layout did not run")
+                try:
+                    # Plain output rendered to memory, for the same
+                    # coordinates (and rounding) as the dot command
+                    data = ctypes.c_void_p()
+                    length = lib.length_type(0)
+                    try:
+                        if lib.gvc.gvRenderData(lib.context, graph, b"plain", ctypes.byref(data), ctypes.byref(length)):
+                            raise RuntimeError("Graphviz failed: plain output did not render")
+                        plain_output = ctypes.string_at(data, length.value).decode()
+                    finally:
+                        if data:
+                            lib.gvc.gvFreeRenderData(data)
+                finally:
+                    lib.gvc.gvFreeLayout(lib.context, graph)
+            finally:
+                cgraph.agclose(graph)
+        return self._build_layout(dag, plain_output, cache_key)
+
@@ -0,0 +1,82 @@
+"""Packing layout for nodes without edges.
+
+Standalone nodes need no layering at all; they are placed side by side
+in insertion order, top-aligned in their row. With the default
+settings the placement matches GrandalfEngine's (which lays out each
+node as its own component, separated by four times the horizontal
+spacing); with a max_width, rows wrap like text.
+"""
+
+from visualflow.models import DAG, LayoutResult, NodePosition
+
+
+class PackEngine:
+    """Layout engine for DAGs without edges."""
+
+    def __init__(
+        self,
+        horizontal_spacing: int = 4,
+        vertical_spacing: int = 6,
+        max_width: int | None = None,
+    ) -> None:
+        """Initialize engine with spacing parameters.
+
+        Args:
+            horizontal_spacing: Characters of margin (nodes are separated
+                by four times this, as components are in GrandalfEngine)
+            vertical_spacing: Lines between rows (and top/bottom margin)
+            max_width: Start a new row before a node would end past this
+                column (None = a single row)
+        """
+        self.horizontal_spacing = horizontal_spacing
+        self.vertical_spacing = vertical_spacing
+        self.max_width = max_width
+
+    def compute(self, dag: DAG) -> LayoutResult:
+        """Compute layout positions for unconnected nodes.
+
+        Args:
+            dag: A DAG without edges
+
+        Returns:
+            LayoutResult with positions in character coordinates
+
+        Raises:
+            ValueError: If the DAG has edges
+        """
+        if not dag.nodes:
+            return LayoutResult(positions={}, width=0, height=0)
+        if any(edge.source in dag.nodes and edge.target in dag.nodes for edge in dag.edges):
+            raise ValueError("PackEngine lays out nodes without edges only")
+
+        margin = self.horizontal_spacing
+        gap = self.horizontal_spacing * 4
+
+        # Fill rows left to right
+        rows: list[list[tuple[str, int]]] = [[]]
+        x = margin
+        for node_id, node in dag.nodes.items():
+            if (
+                self.max_width is not None
+                and rows[-1]
+                and x + node.width + margin > self.max_width
+            ):
+                rows.append([])
+                x = margin
+            rows[-1].append((node_id, x))
+            x += node.width + gap
+
+        positions: dict[str, NodePosition] = {}
+        width = 0
+        y = self.vertical_spacing
+        for row in rows:
+            row_height = max(dag.nodes[node_id].height for node_id, _ in row)
+            for node_id, x in row:
+                node = dag.nodes[node_id]
+                positions[node_id] = NodePosition.model_construct(node=node, x=x, y=y)
+                width = max(width, x + node.width)
+            y += row_height + self.vertical_spacing
+
+        return LayoutResult.model_construct(
+            positions=positions, width=width + margin, height=y
+        )
@@ -0,0 +1,198 @@
+"""Tidy-tree layout for rooted out-trees and forests.
+
+A tree needs no crossing reduction: children are placed in edge order,
+each subtree is packed as close to its left sibling as their contours
+allow (Reingold-Tilford style, using real box widths), and every parent
+is centered over its first and last child. Layers are the node depths,
+each as tall as its tallest box, with boxes top-aligned.
+
+Contours are stored deepest level first with a lazy offset per list, so
+a parent adds its own level with an append, shifts a subtree in O(1),
+and merging two siblings costs only the depth of the shallower one:
+the whole layout runs in time linear in the number of nodes, even for
+deep chains.
+"""
+
+from visualflow.models import DAG, LayoutResult, NodePosition
+
+
+class TreeEngine:
+    """Layout engine for DAGs in which every node has at most one parent."""
+
+    def __init__(
+        self,
+        horizontal_spacing: int = 4,
+        vertical_spacing: int = 6,
+    ) -> None:
+        """Initialize engine with spacing parameters.
+
+        Args:
+            horizontal_spacing: Characters between neighboring boxes (and
+                margin); separate trees of a forest are four times apart,
+                as components are in GrandalfEngine
+            vertical_spacing: Lines between layers (and top/bottom margin)
+        """
+        self.horizontal_spacing = horizontal_spacing
+        self.vertical_spacing = vertical_spacing
+
+    def compute(self, dag: DAG) -> LayoutResult:
+        """Compute layout positions for a tree or forest.
+
+        Args:
+            dag: A DAG in which every node has at most one parent
+
+        Returns:
+            LayoutResult with positions in character coordinates
+
+        Raises:
+            ValueError: If a node has several parents or the edges form a cycle
+        """
+        if not dag.nodes:
+            return LayoutResult(positions={}, width=0, height=0)
+
+        children: dict[str, list[str]] = {node_id: [] for node_id in dag.nodes}
+        has_parent: set[str] = set()
+        for edge in dag.edges:
+            if edge.source not in children or edge.target not in children:
+                continue
+            if edge.target in has_parent:
+                raise ValueError(f"TreeEngine requires a tree: {edge.target!r} has several parents")
+            has_parent.add(edge.target)
+            children[edge.source].append(edge.target)
+        roots = [node_id for node_id in dag.nodes if node_id not in has_parent]
+
+        # Pre-order from the roots (iterative: deep chains must not recurse)
+        order: list[str] = []
+        depth: dict[str, int] = {}
+        stack = [(root, 0) for root in reversed(roots)]
+        while stack:
+            node_id, level = stack.pop()
+            order.append(node_id)
+            depth[node_id] = level
+            stack.extend((child, level + 1) for child in reversed(children[node_id]))
+        if len(order) != len(dag.nodes):
+            raise ValueError("TreeEngine requires a tree: the edges form a cycle")
+
+        # Post-order: pack each node's subtrees. Offsets are child
+        # centers relative to their parent's center.
+        contours: dict[str, _Contour] = {}
+        offset: dict[str, int] = {}
+        for node_id in reversed(order):
+            width = dag.nodes[node_id].width
+            kids = children[node_id]
+            if not kids:
+                contours[node_id] = _Contour(-(width // 2), width - width // 2)
+                continue
+            shifts, contour = _pack([contours.pop(kid) for kid in kids], self.horizontal_spacing)
+            mid = shifts[-1] // 2
+            for kid, shift in zip(kids, shifts):
+                offset[kid] = shift - mid
+            contour.push(-(width // 2), width - width // 2, mid)
+            contours[node_id] = contour
+
+        # Trees of a forest are packed like siblings, further apart
+        root_shifts, _ = _pack([contours[root] for root in roots], 4 * self.horizontal_spacing)
+
+        # Absolute centers, then layer rows
+        center: dict[str, int] = dict(zip(roots, root_shifts))
+        for node_id in order:
+            for kid in children[node_id]:
+                center[kid] = center[node_id] + offset[kid]
+        layer_heights: list[int] = []
+        for node_id, level in depth.items():
+            if level == len(layer_heights):
+                layer_heights.append(0)
+            layer_heights[level] = max(layer_heights[level], dag.nodes[node_id].height)
+        layer_tops = [self.vertical_spacing]
+        for height in layer_heights:
+            layer_tops.append(layer_tops[-1] + height + self.vertical_spacing)
+
+        min_left = min(center[node_id] - dag.nodes[node_id].width // 2 for node_id in order)
+        shift_x = self.horizontal_spacing - min_left
+        positions: dict[str, NodePosition] = {}
+        width = 0
+        for node_id in dag.nodes:
+            node = dag.nodes[node_id]
+            x = center[node_id] - node.width // 2 + shift_x
+            positions[node_id] = NodePosition.model_construct(
+                node=node, x=x, y=layer_tops[depth[node_id]]
+            )
+            width = max(width, x + node.width)
+
+        return LayoutResult.model_construct(
+            positions=positions,
+            width=width + self.horizontal_spacing,
+            height=layer_tops[-1],
+        )
+
+
+class _Contour:
+    """Left and right (exclusive) box extents per depth of a subtree.
+
+    Lists run from the deepest level up to the subtree root; a stored
+    value plus its list's offset is the extent relative to the root's
+    center.
+    """
+
+    __slots__ = ("left", "left_offset", "right", "right_offset")
+
+    def __init__(self, left: int, right: int) -> None:
+        """Create the contour of a single box.
+
+        Args:
+            left: Left extent relative to the box center
+            right: Right extent relative to the box center
+        """
+        self.left = [left]
+        self.left_offset = 0
+        self.right = [right]
+        self.right_offset = 0
+
+    def push(self, left: int, right: int, center: int) -> None:
+        """Re-center on a new root above the current top level.
+
+        Args:
+            left: Left extent of the new root's box relative to its center
+            right: Right extent of the new root's box relative to its center
+            center: New root's center in the current coordinates
+        """
+        self.left_offset -= center
+        self.right_offset -= center
+        self.left.append(left - self.left_offset)
+        self.right.append(right - self.right_offset)
+
+
+def _pack(contours: list[_Contour], gap: int) -> tuple[list[int], _Contour]:
+    """Place subtrees left to right as close as their contours allow.
+
+    Each step only touches the levels the packed subtrees have in
+    common; the deeper contour is reused and updated in place.
+
+    Args:
+        contours: Per subtree, its contour (consumed)
+        gap: Minimum blank columns between boxes at the same depth
+
+    Returns:
+        (root center of each subtree relative to the first one, combined
+        contour relative to the first root's center)
+    """
+    outer = contours[0]
+    shifts = [0]
+    for sub in contours[1:]:
+        closest = max(
+            right - left for right, left in zip(reversed(outer.right), reversed(sub.left))
+        )
+        shift = closest + outer.right_offset - sub.left_offset + gap
+        shifts.append(shift)
+        if len(sub.left) > len(outer.left):
+            # The new subtree reaches deeper: keep its lists, with the
+            # packed subtrees' left edge on its top levels
+            left_offset = sub.left_offset + shift
+            delta = outer.left_offset - left_offset
+            sub.left[-len(outer.left):] = [value + delta for value in outer.left]
+            outer.left, outer.left_offset = sub.left, left_offset
+            outer.right, outer.right_offset = sub.right, sub.right_offset + shift
+        else:
+            delta = sub.right_offset + shift - outer.right_offset
+            outer.right[-len(sub.right):] = [value + delta for value in sub.right]
+    return shifts, outer
@@ -0,0 +1,326 @@
+"""Layer (rank) assignment for layered layout.
+
+Layered engines first give every node a rank, its layer from the top,
+such that each edge points at least one rank down:
+
+- "longest_path": every source at rank 0, every other node one below
+  its lowest parent. Fast, but edges into nodes with a deep parent are
+  stretched over many layers (long vertical runs, taller canvases).
+- "network_simplex": ranks minimizing the total edge span (the sum of
+  rank differences over all edges), by the network simplex method used
+  by Graphviz dot. Nodes move as close to their neighbors as the other
+  edges allow.
+
+Both take any hashable node keys, so engines can rank their own
+vertex objects.
+"""
+
+from collections.abc import Hashable, Iterable
+from typing import Literal, TypeVar
+
+Layering = Literal["longest_path", "network_simplex"]
+
+H = TypeVar("H", bound=Hashable)
+
+# Negative cut values compared per network simplex pivot (as in dot)
+_SEARCH_SIZE = 30
+
+
+def longest_path_ranks(nodes: Iterable[H], edges: Iterable[tuple[H, H]]) -> dict[H, int]:
+    """Rank nodes by their longest path from a source.
+
+    Args:
+        nodes: Node keys
+        edges: (source, target) pairs between nodes; self-loops are ignored
+
+    Returns:
+        Dict mapping node key to rank (0 = top)
+
+    Raises:
+        ValueError: If the edges form a cycle
+    """
+    keys = list(nodes)
+    index = {key: i for i, key in enumerate(keys)}
+    weights = _edge_weights(index, edges)
+    ranks = _longest_path(len(keys), weights)
+    return {key: ranks[i] for i, key in enumerate(keys)}
+
+
+def network_simplex_ranks(
+    nodes: Iterable[H],
+    edges: Iterable[tuple[H, H]],
+    max_iterations: int | None = None,
+) -> dict[H, int]:
+    """Rank nodes minimizing the total edge span.
+
+    Each connected component is solved separately and normalized so its
+    top rank is 0. Parallel edges weigh more (they count once each).
+
+    Args:
+        nodes: Node keys
+        edges: (source, target) pairs between nodes; self-loops are ignored
+        max_iterations: Simplex pivots per component (None = until
+            optimal); an early stop still returns valid ranks
+
+    Returns:
+        Dict mapping node key to rank (0 = top)
+
+    Raises:
+        ValueError: If the edges form a cycle
+    """
+    keys = list(nodes)
+    index = {key: i for i, key in enumerate(keys)}
+    weights = _edge_weights(index, edges)
+    ranks = _longest_path(len(keys), weights)
+
+    # Connected components, each solved on its own
+    neighbors: list[list[int]] = [[] for _ in keys]
+    for source, target in weights:
+        neighbors[source].append(target)
+        neighbors[target].append(source)
+    component = [-1] * len(keys)
+    for start in range(len(keys)):
+        if component[start] >= 0:
+            continue
+        component[start] = start
+        members = [start]
+        stack = [start]
+        while stack:
+            node = stack.pop()
+            for other in neighbors[node]:
+                if component[other] < 0:
+                    component[other] = start
+                    members.append(other)
+                    stack.append(other)
+        if len(members) > 1:
+            local = {node: i for i, node in enumerate(members)}
+            local_edges = [
+                (local[source], local[target], weight)
+                for (source, target), weight in weights.items()
+                if component[source] == start
+            ]
+            local_ranks = [ranks[node] for node in members]
+            _simplex(local_ranks, local_edges, max_iterations)
+            top = min(local_ranks)
+            for node, rank in zip(members, local_ranks):
+                ranks[node] = rank - top
+        else:
+            ranks[start] = 0
+    return {key: ranks[i] for i, key in enumerate(keys)}
+
+
+def total_span(ranks: dict[H, int], edges: Iterable[tuple[H, H]]) -> int:
+    """Sum of rank differences over all edges.
+
+    Args:
+        ranks: Node ranks
+        edges: (source, target) pairs
+
+    Returns:
+        Total span (each edge of a tight layering spans 1)
+    """
+    return sum(abs(ranks[target] - ranks[source]) for source, target in edges)
+
+
+def _edge_weights(index: dict[H, int], edges: Iterable[tuple[H, H]]) -> dict[tuple[int, int], int]:
+    """Count edges per (source, target) index pair, without self-loops."""
+    weights: dict[tuple[int, int], int] = {}
+    for source, target in edges:
+        pair = (index[source], index[target])
+        if pair[0] != pair[1]:
+            weights[pair] = weights.get(pair, 0) + 1
+    return weights
+
+
+def _longest_path(count: int, weights: dict[tuple[int, int], int]) -> list[int]:
+    """Longest-path ranks by Kahn's algorithm.
+
+    Raises:
+        ValueError: If the edges form a cycle
+    """
+    children: list[list[int]] = [[] for _ in range(count)]
+    parents = [0] * count
+    for source, target in weights:
+        children[source].append(target)
+        parents[target] += 1
+    ranks = [0] * count
+    ready = [node for node in range(count) if not parents[node]]
+    ranked = 0
+    while ready:
+        node = ready.pop()
+        ranked += 1
+        for child in children[node]:
+            ranks[child] = max(ranks[child], ranks[node] + 1)
+            parents[child] -= 1
+            if not parents[child]:
+                ready.append(child)
+    if ranked != count:
+        raise ValueError("Cannot rank nodes: the edges form a cycle")
+    return ranks
+
+
+def _simplex(
+    ranks: list[int],
+    edges: list[tuple[int, int, int]],
+    max_iterations: int | None,
+) -> None:
+    """Improve a feasible ranking of one connected component in place.
+
+    Follows Gansner et al., "A Technique for Drawing Directed Graphs":
+    build a spanning tree of tight edges (span exactly 1), then swap a
+    tree edge with a negative cut value for the non-tree edge of least
+    slack across the same cut, until no cut value is negative.
+
+    Args:
+        ranks: Feasible ranks, updated in place
+        edges: (source, target, weight) with local node indices
+        max_iterations: Pivot limit (None = until optimal)
+    """
+    count = len(ranks)
+    incident: list[list[int]] = [[] for _ in range(count)]
+    net = [0] * count  # Outgoing minus incoming weight per node
+    for i, (source, target, weight) in enumerate(edges):
+        incident[source].append(i)
+        incident[target].append(i)
+        net[source] += weight
+        net[target] -= weight
+
+    # Feasible tree: grow along tight edges; when stuck, shift the tree
+    # to make the least-slack edge leaving it tight
+    in_tree = [False] * count
+    in_tree[0] = True
+    tree_nodes = [0]
+    tree: list[int] = []
+    frontier = [0]
+    while True:
+        while frontier:
+            node = frontier.pop()
+            for i in incident[node]:
+                source, target, _ = edges[i]
+                other = target if source == node else source
+                if not in_tree[other] and ranks[target] - ranks[source] == 1:
+                    in_tree[other] = True
+                    tree_nodes.append(other)
+                    tree.append(i)
+                    frontier.append(other)
+        if len(tree_nodes) == count:
+            break
+        best = -1
+        best_slack = 0
+        for i, (source, target, _) in enumerate(edges):
+            if in_tree[source] != in_tree[target]:
+                slack = ranks[target] - ranks[source] - 1
+                if best < 0 or slack < best_slack:
+                    best, best_slack = i, slack
+        source, target, _ = edges[best]
+        delta = best_slack if in_tree[source] else -best_slack
+        for node in tree_nodes:
+            ranks[node] += delta
+        frontier = list(tree_nodes)
+
+    in_tree_edge = [False] * len(edges)
+    tree_edges: list[list[int]] = [[] for _ in range(count)]
+    for i in tree:
+        in_tree_edge[i] = True
+        source, target, _ = edges[i]
+        tree_edges[source].append(i)
+        tree_edges[target].append(i)
+
+    # Rooted at node 0: node x's subtree occupies [low[x], low[x] + size[x])
+    # of a preorder numbering; by_low inverts it
+    parent_edge = [-1] * count
+    parent = [-1] * count
+    other_end = [source ^ target for source, target, _ in edges]  # XOR with one end
+    low = [0] * count
+    size = [1] * count
+    by_low = [0] * count
+    subtree_net = list(net)  # Cut value of x's parent edge is +-subtree_net[x]
+
+    def renumber(root: int) -> None:
+        """Recompute parents, intervals and net weights below root."""
+        # Depth-first preorder, so every subtree is numbered contiguously
+        order = []
+        stack = [root]
+        next_low = low[root]
+        while stack:
+            node = stack.pop()
+            low[node] = next_low
+            by_low[next_low] = node
+            next_low += 1
+            order.append(node)
+            subtree_net[node] = net[node]
+            size[node] = 1
+            for i in tree_edges[node]:
+                if i != parent_edge[node]:
+                    child = other_end[i] ^ node
+                    parent_edge[child] = i
+                    parent[child] = node
+                    stack.append(child)
+        for node in reversed(order[1:]):
+            subtree_net[parent[node]] += subtree_net[node]
+            size[parent[node]] += size[node]
+
+    renumber(0)
+    cursor = 1
+    iterations = 0
+    while max_iterations is None or iterations < max_iterations:
+        # Leaving edge: the most negative cut value among the next few
+        # negative ones, searching round-robin as dot does
+        leave_node = -1
+        leave_cut = 0
+        found = 0
+        for step in range(1, count):
+            node = (cursor + step - 1) % (count - 1) + 1
+            source, _, _ = edges[parent_edge[node]]
+            cut = subtree_net[node] if source == node else -subtree_net[node]
+            if cut < 0:
+                found += 1
+                if cut < leave_cut:
+                    leave_node, leave_cut = node, cut
+                if found >= _SEARCH_SIZE:
+                    cursor = node
+                    break
+        if leave_node < 0:
+            return
+
+        # Entering edge: least slack from the head component to the tail.
+        # One end lies in the leaving edge's subtree, so scan only that.
+        leave = parent_edge[leave_node]
+        start, end = low[leave_node], low[leave_node] + size[leave_node]
+        head_inside = edges[leave][1] == leave_node
+        enter = -1
+        enter_slack = 0
+        for node in by_low[start:end]:
+            for i in incident[node]:
+                if in_tree_edge[i]:
+                    continue
+                source, target, _ = edges[i]
+                inside, other = (source, target) if head_inside else (target, source)
+                if inside == node and not start <= low[other] < end:
+                    slack = ranks[target] - ranks[source] - 1
+                    if enter < 0 or slack < enter_slack:
+                        enter, enter_slack = i, slack
+        if enter < 0:
+            return
+
+        # The subtree side moves to make the entering edge tight
+        delta = enter_slack if head_inside else -enter_slack
+        if delta:
+            for node in by_low[start:end]:
+                ranks[node] += delta
+
+        # Swap the edges, then renumber below the lowest common ancestor
+        # of the entering edge's ends (the path through both edges)
+        source, target, _ = edges[enter]
+        lca = source
+        while not low[lca] <= low[target] < low[lca] + size[lca]:
+            lca = parent[lca]
+        leave_source, leave_target, _ = edges[leave]
+        tree_edges[leave_source].remove(leave)
+        tree_edges[leave_target].remove(leave)
+        tree_edges[source].append(enter)
+        tree_edges[target].append(enter)
+        in_tree_edge[leave] = False
+        in_tree_edge[enter] = True
+        renumber(lca)
+        iterations += 1
@@ -0,0 +1,242 @@
+"""Layout post-passes.
+
+Transformations applied to a computed LayoutResult before routing:
+
+- compact_layout(): shrink empty column and row bands
+- wrap_layers(): fold over-wide layers into stacked sub-rows
+
+When both are used, compact first: wrap_layers() leaves routing lanes
+in empty columns that compaction would squeeze out.
+"""
+
+from bisect import bisect_right
+from collections.abc import Callable
+
+from visualflow.models import LayoutResult, NodePosition
+
+# Least number of columns left free of boxes on either side of a wrapped
+# layer, so routes can descend past its sub-rows (a layer with more
+# sub-rows gets a column per sub-row where it fits, see _wrap_grid())
+WRAP_LANE = 2
+
+
+def compact_layout(
+    layout: LayoutResult,
+    column_gap: int = 4,
+    row_gap: int = 6,
+) -> LayoutResult:
+    """Shrink empty column and row bands of a layout.
+
+    A column (row) is empty when no box covers it. Every run of empty
+    columns wider than column_gap - between boxes, before the first box
+    or after the last - is shrunk to column_gap; rows likewise to
+    row_gap. Boxes keep their size and left-to-right / top-to-bottom
+    order, and boxes that shared a column or row still do, so edges
+    route exactly as before, only shorter.
+
+    Args:
+        layout: Computed layout
+        column_gap: Widest empty column run kept (at least 2)
+        row_gap: Tallest empty row run kept (at least 5, room for a
+            trunk, split line and arrow between layers)
+
+    Returns:
+        New LayoutResult, or the input layout if nothing could be removed
+
+    Raises:
+        ValueError: If a gap is too small to route through
+    """
+    if column_gap < 2:
+        raise ValueError(f"column_gap must be at least 2, got {column_gap}")
+    if row_gap < 5:
+        raise ValueError(f"row_gap must be at least 5, got {row_gap}")
+    if not layout.positions:
+        return layout
+
+    positions = layout.positions.values()
+    map_x, width = _squeeze(
+        [(pos.x, pos.x + pos.node.width) for pos in positions], layout.width, column_gap
+    )
+    map_y, height = _squeeze(
+        [(pos.y, pos.y + pos.node.height) for pos in positions], layout.height, row_gap
+    )
+    if width == layout.width and height == layout.height:
+        return layout
+
+    return LayoutResult.model_construct(
+        positions={
+            node_id: NodePosition.model_construct(
+                node=pos.node, x=map_x(pos.x), y=map_y(pos.y), layer=pos.layer, row=pos.row
+            )
+            for node_id, pos in layout.positions.items()
+        },
+        width=width,
+        height=height,
+    )
+
+
+def _squeeze(
+    spans: list[tuple[int, int]], extent: int, gap: int
+) -> tuple[Callable[[int], int], int]:
+    """Plan the removal of empty runs longer than gap along one axis.
+
+    Args:
+        spans: Covered [start, end) ranges (box extents on this axis)
+        extent: Current canvas size on this axis
+        gap: Longest empty run kept
+
+    Returns:
+        (mapping from an old box start to its new coordinate, new extent)
+    """
+    # Merge covered ranges; record how much is removed before each one
+    starts: list[int] = []
+    removed_before: list[int] = []
+    removed = 0
+    end = 0
+    for start, stop in sorted(spans):
+        if starts and start <= end:
+            end = max(end, stop)
+            continue
+        removed += max(0, start - end - gap)
+        starts.append(start)
+        removed_before.append(removed)
+        end = stop
+    trailing = min(max(extent - end, 0), gap)
+
+    def move(coordinate: int) -> int:
+        return coordinate - removed_before[bisect_right(starts, coordinate) - 1]
+
+    return move, end - removed + trailing
+
+
+def wrap_layers(
+    layout: LayoutResult,
+    max_width: int,
+    column_gap: int = 3,
+    row_gap: int = 5,
+) -> LayoutResult:
+    """Wrap layers wider than max_width into stacked sub-rows.
+
+    A layer (nodes whose rows overlap) that does not fit in max_width
+    columns is laid out as a grid: boxes left-aligned in equal-width
+    cells, as many cells per sub-row as fit, sub-rows stacked downwards.
+    Layers below move down by the added height. Narrower layers that
+    merely sit beyond max_width (e.g. a parent centered over a huge
+    fan-out) are shifted left to fit.
+
+    Wrapped nodes are tagged with `layer` and `row` so SimpleRouter can
+    route through the grid: into a lower sub-row via a lane just left of
+    the target's cell, and out of an upper sub-row via a lane just right
+    of the source's cell. Gaps widen so every sub-row gets lanes of its
+    own, as far as max_width allows.
+
+    Args:
+        layout: Computed layout
+        max_width: Column budget for the canvas
+        column_gap: Least number of blank columns between cells (at least 3)
+        row_gap: Blank rows between sub-rows (at least 4)
+
+    Returns:
+        New LayoutResult, or the input layout if it already fits
+
+    Raises:
+        ValueError: If a gap is too small to route through
+    """
+    if column_gap < 3:
+        raise ValueError(f"column_gap must be at least 3, got {column_gap}")
+    if row_gap < 4:
+        raise ValueError(f"row_gap must be at least 4, got {row_gap}")
+    if layout.width <= max_width or not layout.positions:
+        return layout
+
+    positions: dict[str, NodePosition] = {}
+    width = 0
+    shift_y = 0
+    for index, (top, bottom, members) in enumerate(_layers(layout)):
+        left = min(pos.x for _, pos in members)
+        right = max(pos.x + pos.node.width for _, pos in members)
+
+        if right <= max_width or right - left <= max_width:
+            # Fits: keep the layer, moved down and (if needed) left
+            shift_x = max(0, right - max_width)
+            for node_id, pos in members:
+                positions[node_id] = NodePosition.model_construct(
+                    node=pos.node, x=pos.x - shift_x, y=pos.y + shift_y
+                )
+            width = max(width, right - shift_x)
+            continue
+
+        # Wrap into a grid of equal cells, keeping left-to-right order
+        members.sort(key=lambda member: member[1].x)
+        cell_width = max(pos.node.width for _, pos in members)
+        per_row, gap, margin = _wrap_grid(len(members), cell_width, max_width, column_gap)
+        pitch = cell_width + gap
+        y = top + shift_y
+        for row, start in enumerate(range(0, len(members), per_row)):
+            chunk = members[start:start + per_row]
+            for column, (node_id, pos) in enumerate(chunk):
+                positions[node_id] = NodePosition.model_construct(
+                    node=pos.node, x=margin + column * pitch, y=y, layer=index, row=row,
+                )
+            # Right margin keeps the lanes beside the last cell
+            width = max(width, 2 * margin + len(chunk) * pitch - gap)
+            y += max(pos.node.height for _, pos in chunk) + row_gap
+        shift_y += (y - row_gap) - (top + shift_y) - (bottom - top)
+
+    return LayoutResult.model_construct(
+        positions=positions, width=width, height=layout.height + shift_y
+    )
+
+
+def _wrap_grid(
+    count: int, cell_width: int, max_width: int, column_gap: int
+) -> tuple[int, int, int]:
+    """Size the grid of a wrapped layer.
+
+    The gap right of a cell holds one lane out of each of its upper
+    sub-rows, and one lane into each lower sub-row of the next cell; the
+    margins hold the lanes of the outer cells. The widest grid whose
+    gaps fit all lanes within max_width wins. If none does, the grid is
+    as wide as plain gaps allow and its sub-rows share one lane per side.
+
+    Args:
+        count: Number of boxes in the layer
+        cell_width: Widest box of the layer
+        max_width: Column budget for the canvas
+        column_gap: Least number of blank columns between cells
+
+    Returns:
+        (cells per sub-row, columns between cells, columns of each margin);
+        the margin is one column wider than the lanes on each side
+    """
+    widest = max(1, (max_width - 2 * WRAP_LANE + column_gap) // (cell_width + column_gap))
+    for per_row in range(widest, 0, -1):
+        lanes = -(-count // per_row) - 1
+        gap = max(column_gap, 2 * lanes + 1)
+        margin = max(WRAP_LANE, lanes + 1)
+        if 2 * margin + per_row * (cell_width + gap) - gap <= max_width:
+            return per_row, gap, margin
+    return widest, column_gap, WRAP_LANE
+
+
+def _layers(layout: LayoutResult) -> list[tuple[int, int, list[tuple[str, NodePosition]]]]:
+    """Group nodes into layers of overlapping row ranges.
+
+    Args:
+        layout: Computed layout
+
+    Returns:
+        Per layer, top to bottom: (top, bottom, [(node_id, position)]),
+        bottom exclusive
+    """
+    ordered = sorted(layout.positions.items(), key=lambda item: item[1].y)
+    layers: list[tuple[int, int, list[tuple[str, NodePosition]]]] = []
+    for node_id, pos in ordered:
+        bottom = pos.y + pos.node.height
+        if layers and pos.y < layers[-1][1]:
+            top, end, members = layers[-1]
+            members.append((node_id, pos))
+            layers[-1] = (top, max(end, bottom), members)
+        else:
+            layers.append((pos.y, bottom, [(node_id, pos)]))
+    return layers
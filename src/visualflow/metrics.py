@@ -0,0 +1,212 @@
+"""Layout quality metrics.
+
+Measures a computed layout and its routes, for comparing engines on
+quality as well as speed, or as an objective while laying out:
+
+- crossings: edge crossings between adjacent layers, with edges drawn
+  as straight lines between box centers (as layered layout counts them)
+- edge_length: total length of the routed segments, in cells
+- bends: direction changes along the routed paths
+- area: canvas cells (width x height)
+
+Crossings are counted per layer pair as inversions, with a Fenwick
+tree, in O(E log E).
+"""
+
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+from visualflow.models import Edge, EdgePath, LayoutResult, RouteResult
+from visualflow.routing import ColumnarRouter, EdgeRouter, LayoutRouter, SegmentTable, SimpleRouter
+
+
+@dataclass(frozen=True, slots=True)
+class LayoutMetrics:
+    """Quality measures of one layout and its routes."""
+
+    crossings: int
+    edge_length: int
+    bends: int
+    width: int
+    height: int
+
+    @property
+    def area(self) -> int:
+        """Canvas cells (width x height)."""
+        return self.width * self.height
+
+
+def measure_layout(
+    layout: LayoutResult,
+    edges: list[Edge],
+    routes: SegmentTable | RouteResult | list[EdgePath] | None = None,
+    router: EdgeRouter | None = None,
+) -> LayoutMetrics:
+    """Compute all quality metrics of a layout.
+
+    Args:
+        layout: Computed layout
+        edges: Edges of the laid out DAG
+        routes: Routed edges, in any router output format; computed with
+            the router if not given
+        router: Router for the edges (defaults to SimpleRouter)
+
+    Returns:
+        LayoutMetrics for the layout
+    """
+    if routes is None:
+        router = router if router is not None else SimpleRouter()
+        if isinstance(router, LayoutRouter):
+            routes = router.route_layout(layout, edges)
+        elif isinstance(router, ColumnarRouter):
+            routes = router.route_columnar(layout.positions, edges)
+        else:
+            routes = router.route(layout.positions, edges)
+    if isinstance(routes, list):
+        routes = RouteResult.from_paths(routes)
+    if isinstance(routes, RouteResult):
+        routes = SegmentTable.from_route_result(routes)
+    return LayoutMetrics(
+        crossings=count_crossings(layout, edges),
+        edge_length=edge_length(routes),
+        bends=count_bends(routes),
+        width=layout.width,
+        height=layout.height,
+    )
+
+
+def count_crossings(layout: LayoutResult, edges: Iterable[Edge]) -> int:
+    """Count straight-line edge crossings between adjacent layers.
+
+    Layers are groups of boxes with overlapping rows. An edge spanning
+    several layers is split at each layer it passes, at the point where
+    the straight line between the box centers meets it. Edges within a
+    layer, or with an unknown endpoint, are ignored; edges sharing an
+    endpoint do not cross.
+
+    Args:
+        layout: Computed layout
+        edges: Edges to count
+
+    Returns:
+        Number of crossings
+    """
+    positions = layout.positions
+    layer = _layer_index(layout)
+    pairs: dict[int, list[tuple[float, float]]] = {}
+    for edge in edges:
+        if edge.source not in positions or edge.target not in positions:
+            continue
+        top, bottom = positions[edge.source], positions[edge.target]
+        first, last = layer[edge.source], layer[edge.target]
+        if first == last:
+            continue
+        if first > last:
+            top, bottom, first, last = bottom, top, last, first
+        x_top = top.x + top.node.width // 2
+        x_bottom = bottom.x + bottom.node.width // 2
+        span = last - first
+        upper = x_top
+        for k in range(first, last):
+            lower = (x_top * (last - k - 1) + x_bottom * (k + 1 - first)) / span
+            pairs.setdefault(k, []).append((upper, lower))
+            upper = lower
+    return sum(bilayer_crossings(segments) for segments in pairs.values())
+
+
+def bilayer_crossings(segments: list[tuple[float, float]]) -> int:
+    """Count crossings among straight segments between two layers.
+
+    Two segments cross when their order on the upper layer is strictly
+    the opposite of their order on the lower one.
+
+    Args:
+        segments: (upper x, lower x) per segment
+
+    Returns:
+        Number of crossing pairs
+    """
+    if len(segments) < 2:
+        return 0
+    ordered = sorted(segments)
+    ranks = {x: rank for rank, x in enumerate(sorted({lower for _, lower in ordered}), 1)}
+    size = len(ranks)
+    tree = [0] * (size + 1)  # Fenwick tree of lower ranks seen so far
+    crossings = 0
+    for seen, (_, lower) in enumerate(ordered):
+        rank = ranks[lower]
+        # Earlier segments (left on the upper layer) ending right of this one
+        at_most = 0
+        i = rank
+        while i:
+            at_most += tree[i]
+            i -= i & -i
+        crossings += seen - at_most
+        i = rank
+        while i <= size:
+            tree[i] += 1
+            i += i & -i
+    return crossings
+
+
+def edge_length(routes: SegmentTable) -> int:
+    """Total length of all routed segments, in cells.
+
+    Args:
+        routes: Routed edges
+
+    Returns:
+        Sum of segment lengths (shared trunks count once per edge)
+    """
+    data = routes.segments
+    return sum(
+        abs(data[i + 2] - data[i]) + abs(data[i + 3] - data[i + 1])
+        for i in range(0, len(data), 4)
+    )
+
+
+def count_bends(routes: SegmentTable) -> int:
+    """Count direction changes along the routed paths.
+
+    Args:
+        routes: Routed edges
+
+    Returns:
+        Number of bends over all edges (zero-length segments ignored)
+    """
+    data = routes.segments
+    bends = 0
+    for index in range(len(routes)):
+        previous = None
+        for i in range(routes.offsets[index] * 4, routes.offsets[index + 1] * 4, 4):
+            dx = data[i + 2] - data[i]
+            dy = data[i + 3] - data[i + 1]
+            if not dx and not dy:
+                continue
+            direction = ((dx > 0) - (dx < 0), (dy > 0) - (dy < 0))
+            if previous is not None and direction != previous:
+                bends += 1
+            previous = direction
+    return bends
+
+
+def _layer_index(layout: LayoutResult) -> dict[str, int]:
+    """Map node IDs to layers of overlapping row ranges, top to bottom.
+
+    Args:
+        layout: Computed layout
+
+    Returns:
+        Dict mapping node ID to layer index
+    """
+    layer: dict[str, int] = {}
+    index = -1
+    bottom = None
+    for node_id, pos in sorted(layout.positions.items(), key=lambda item: item[1].y):
+        if bottom is None or pos.y >= bottom:
+            index += 1
+            bottom = pos.y + pos.node.height
+        else:
+            bottom = max(bottom, pos.y + pos.node.height)
+        layer[node_id] = index
+    return layer
@@ -1,8 +1,15 @@
 """Data models for ASCII DAG visualization.
 
 All data structures use Pydantic BaseModel with strong typing and built-in validation.
+
+Validation happens at the API boundary, when callers build a DAG. Models
+derived from already-validated data inside the pipeline (node positions,
+layout results, edge paths) are created with `model_construct()`, which
+skips re-validation but yields the same public types.
 """
 
+from functools import lru_cache
+
 from pydantic import BaseModel, Field, computed_field
 from wcwidth import wcswidth
 
@@ -29,17 +36,30 @@ class Node(BaseModel):
         Uses wcswidth for accurate terminal column count.
         Falls back to len() if wcswidth returns -1 (non-printable chars).
         """
-        lines = self.content.split("\n")
-        if not lines:
-            return 0
-        w = wcswidth(lines[0])
-        return w if w >= 0 else len(lines[0])
+        return _box_size(self.content)[0]
 
     @computed_field
     @property
     def height(self) -> int:
         """Box height = number of lines."""
-        return len(self.content.split("\n"))
+        return _box_size(self.content)[1]
+
+    @property
+    def size(self) -> tuple[int, int]:
+        """Box (width, height), measured in one pass."""
+        return _box_size(self.content)
+
+
+@lru_cache(maxsize=4096)
+def _box_size(content: str) -> tuple[int, int]:
+    """Measure (width, height) of box content.
+
+    Cached by content, since routing and drawing read node sizes many
+    times per render and identical boxes are common.
+    """
+    lines = content.split("\n")
+    w = wcswidth(lines[0])
+    return (w if w >= 0 else len(lines[0]), len(lines))
 
 
 class Edge(BaseModel):
@@ -74,6 +94,8 @@ class NodePosition(BaseModel):
     node: Node
     x: int  # Left edge (characters)
     y: int  # Top edge (lines)
+    layer: int | None = None  # Layer index, set for nodes of a wrapped layer
+    row: int = 0  # Sub-row within a wrapped layer (0 = top)
 
 
 class LayoutResult(BaseModel):
@@ -82,6 +104,11 @@ class LayoutResult(BaseModel):
     positions: dict[str, NodePosition]
     width: int  # Canvas width in characters
     height: int  # Canvas height in lines
+    # Engine-computed edge routes: (source, target) -> polyline or spline
+    # control points in character coordinates (see SnapRouter). Empty
+    # unless the engine was asked to keep them; dropped by post-passes
+    # that move boxes.
+    edge_points: dict[tuple[str, str], list[tuple[float, float]]] = Field(default_factory=dict)
 
 
 class EdgePath(BaseModel):
@@ -95,6 +122,42 @@ class EdgePath(BaseModel):
     segments: list[tuple[int, int, int, int]] = Field(default_factory=list)
 
 
+class RouteResult(BaseModel):
+    """Edge router output: paths plus the box connector points they use.
+
+    Exits are (x, y) cells on source box bottom borders where edges leave
+    (drawn as connectors). Entries are (x, y) cells just above target boxes
+    where edges arrive (drawn as arrows). Both are deduplicated.
+    """
+
+    paths: list[EdgePath] = Field(default_factory=list)
+    exits: list[tuple[int, int]] = Field(default_factory=list)
+    entries: list[tuple[int, int]] = Field(default_factory=list)
+
+    @classmethod
+    def from_paths(cls, paths: list[EdgePath]) -> "RouteResult":
+        """Derive connector points from path endpoints.
+
+        For routers that only implement route(): each path is assumed to
+        start on the row below its source box and end at its entry cell.
+
+        Args:
+            paths: Routed edge paths
+
+        Returns:
+            RouteResult with exits and entries taken from the paths
+        """
+        exits: dict[tuple[int, int], None] = {}
+        entries: dict[tuple[int, int], None] = {}
+        for path in paths:
+            if path.segments:
+                x1, y1, _, _ = path.segments[0]
+                _, _, x2, y2 = path.segments[-1]
+                exits[(x1, y1 - 1)] = None
+                entries[(x2, y2)] = None
+        return cls(paths=paths, exits=list(exits), entries=list(entries))
+
+
 class EdgeTheme(BaseModel):
     """Character set for edge rendering.
 
@@ -0,0 +1,136 @@
+"""Neighborhood extraction for on-demand rendering.
+
+Builds an adjacency index once per DAG, then extracts the k-hop
+upstream/downstream subgraph around chosen nodes in time proportional
+to the neighborhood rather than the whole DAG.
+"""
+
+from collections import defaultdict
+from typing import Callable, Iterable
+
+from visualflow.models import DAG, Edge
+
+
+class AdjacencyIndex:
+    """Successor/predecessor index over a DAG.
+
+    The index is a snapshot: rebuild it after mutating the DAG.
+
+    Usage:
+        index = AdjacencyIndex(dag)  # O(nodes + edges), once
+        sub = extract_neighborhood(index, ["poc-3"], upstream=2)  # per query
+    """
+
+    def __init__(self, dag: DAG) -> None:
+        """Index the edges of the DAG.
+
+        Args:
+            dag: The DAG to index
+        """
+        self.dag = dag
+        self._out: dict[str, list[Edge]] = defaultdict(list)
+        self._in: dict[str, list[Edge]] = defaultdict(list)
+        for edge in dag.edges:
+            if edge.source in dag.nodes and edge.target in dag.nodes:
+                self._out[edge.source].append(edge)
+                self._in[edge.target].append(edge)
+
+    def successors(self, node_id: str) -> list[str]:
+        """Get direct successors (targets of outgoing edges) of a node."""
+        return [edge.target for edge in self._out.get(node_id, ())]
+
+    def predecessors(self, node_id: str) -> list[str]:
+        """Get direct predecessors (sources of incoming edges) of a node."""
+        return [edge.source for edge in self._in.get(node_id, ())]
+
+    def out_edges(self, node_id: str) -> list[Edge]:
+        """Get outgoing edges of a node."""
+        return self._out.get(node_id, [])
+
+
+def extract_neighborhood(
+    source: DAG | AdjacencyIndex,
+    node_ids: Iterable[str],
+    upstream: int | None = 1,
+    downstream: int | None = 1,
+) -> DAG:
+    """Extract the k-hop neighborhood around one or more nodes.
+
+    Walks `upstream` hops along incoming edges (what the nodes depend on)
+    and `downstream` hops along outgoing edges (what depends on them).
+    The result is the induced subgraph: every edge between two included
+    nodes is kept. Node objects are shared with the source DAG.
+
+    Args:
+        source: DAG, or a prebuilt AdjacencyIndex for repeated queries
+        node_ids: Seed node IDs
+        upstream: Max hops to predecessors (None = unlimited)
+        downstream: Max hops to successors (None = unlimited)
+
+    Returns:
+        DAG containing the seeds and their neighborhood
+
+    Raises:
+        KeyError: If a seed node ID is not in the DAG
+
+    Examples:
+        >>> dag = DAG()
+        >>> for node_id in ("a", "b", "c", "d"):
+        ...     dag.add_node(node_id, node_id.upper())
+        >>> dag.add_edge("a", "b")
+        >>> dag.add_edge("b", "c")
+        >>> dag.add_edge("c", "d")
+        >>> sorted(extract_neighborhood(dag, ["b"]).nodes)
+        ['a', 'b', 'c']
+    """
+    index = source if isinstance(source, AdjacencyIndex) else AdjacencyIndex(source)
+    dag = index.dag
+
+    seeds = list(node_ids)
+    for node_id in seeds:
+        if node_id not in dag.nodes:
+            raise KeyError(f"Unknown node id: {node_id!r}")
+
+    # Discovery order is kept so the subgraph lays out deterministically
+    included: dict[str, None] = dict.fromkeys(seeds)
+    _walk(seeds, index.predecessors, upstream, included)
+    _walk(seeds, index.successors, downstream, included)
+
+    subgraph = DAG()
+    for node_id in included:
+        subgraph.nodes[node_id] = dag.nodes[node_id]
+    for node_id in included:
+        for edge in index.out_edges(node_id):
+            if edge.target in included:
+                subgraph.edges.append(edge)
+
+    return subgraph
+
+
+def _walk(
+    seeds: list[str],
+    neighbors: Callable[[str], list[str]],
+    max_hops: int | None,
+    included: dict[str, None],
+) -> None:
+    """Breadth-first walk up to max_hops, recording visited nodes.
+
+    Args:
+        seeds: Starting node IDs
+        neighbors: Function returning the next nodes for a node
+        max_hops: Hop limit (None = unlimited)
+        included: Ordered set of included nodes (mutated)
+    """
+    visited = set(seeds)
+    frontier = seeds
+    hops = 0
+    while frontier and (max_hops is None or hops < max_hops):
+        next_frontier: list[str] = []
+        for node_id in frontier:
+            for neighbor in neighbors(node_id):
+                if neighbor not in visited:
+                    visited.add(neighbor)
+                    included[neighbor] = None
+                    next_frontier.append(neighbor)
+        frontier = next_frontier
+        hops += 1
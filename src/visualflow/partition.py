@@ -49,9 +49,7 @@ def partition_dag(dag: DAG) -> tuple[list[DAG], DAG]:
     # If no edges exist, all nodes are standalone
     if not dag.edges:
         standalones = DAG()
-        for node_id in dag.nodes:
-            node = dag.nodes[node_id]
-            standalones.add_node(node_id, node.content)
+        standalones.nodes.update(dag.nodes)
         return [], standalones
 
     # Build adjacency list (undirected) for connected component detection
@@ -87,22 +85,25 @@ def partition_dag(dag: DAG) -> tuple[list[DAG], DAG]:
     # Sort components by size (largest first)
     components.sort(key=lambda c: len(c), reverse=True)
 
-    # Build DAGs for each connected component
+    # Build DAGs for each connected component. Node and Edge objects are
+    # shared with the input (they were validated when added), and edges
+    # are bucketed by component in a single pass.
     subgraphs: list[DAG] = []
+    component_of: dict[str, DAG] = {}
     for component in components:
         subgraph = DAG()
         for node_id in component:
-            node = dag.nodes[node_id]
-            subgraph.add_node(node_id, node.content)
-        for edge in dag.edges:
-            if edge.source in component and edge.target in component:
-                subgraph.add_edge(edge.source, edge.target)
+            subgraph.nodes[node_id] = dag.nodes[node_id]
+            component_of[node_id] = subgraph
         subgraphs.append(subgraph)
+    for edge in dag.edges:
+        subgraph = component_of.get(edge.source)
+        if subgraph is not None and edge.target in subgraph.nodes:
+            subgraph.edges.append(edge)
 
     # Build DAG for standalone nodes
     standalones = DAG()
     for node_id in standalone_ids:
-        node = dag.nodes[node_id]
-        standalones.add_node(node_id, node.content)
+        standalones.nodes[node_id] = dag.nodes[node_id]
 
     return subgraphs, standalones
@@ -1,5 +1,17 @@
 """Rendering components."""
 
 from visualflow.render.canvas import Canvas
+from visualflow.render.pages import paginate_layout
+from visualflow.render.pool import CanvasPool, canvas_pool
+from visualflow.render.sparse import SparseCanvas, canvas_for_layout
+from visualflow.render.tiled import tile_layout
 
-__all__ = ["Canvas"]
+__all__ = [
+    "Canvas",
+    "CanvasPool",
+    "SparseCanvas",
+    "canvas_for_layout",
+    "canvas_pool",
+    "paginate_layout",
+    "tile_layout",
+]
@@ -2,15 +2,99 @@
 
 The Canvas class manages a 2D character grid where boxes are placed.
 Boxes come pre-made with borders - the canvas just positions them.
+
+Edges live on a separate connectivity layer: each cell stores a 4-bit
+up/down/left/right mask that is OR-ed in as segments are drawn. Glyphs
+are resolved once, at read time, through the compiled theme's 16-entry
+table (see visualflow.render.glyphs), so overlapping paths always
+produce the correct corner, tee or cross.
 """
 
-from pydantic import BaseModel, PrivateAttr, model_validator
+from collections import defaultdict
+from collections.abc import Iterator
+from functools import lru_cache
+
 from wcwidth import wcwidth
 
-from visualflow.models import EdgePath, EdgeTheme, DEFAULT_THEME
+from visualflow.models import Edge, EdgePath, EdgeTheme, NodePosition, DEFAULT_THEME
+from visualflow.render.glyphs import ARROW, DOWN, LEFT, RIGHT, UP, compile_theme
+from visualflow.routing.segments import SegmentTable
+
+# bytes.translate tables that OR bits into every byte of a slice
+_OR_VERTICAL = bytes(value | UP | DOWN for value in range(256))
+_OR_HORIZONTAL = bytes(value | LEFT | RIGHT for value in range(256))
+
+
+@lru_cache(maxsize=4096)
+def _rasterize(content: str) -> tuple[tuple[str, ...], ...]:
+    """Lay box content out as cells, one tuple per line.
+
+    Each character takes one cell, or two for wide characters (emoji,
+    CJK): the character followed by an empty string placeholder.
+    Characters with no column width still take one cell. Cached by
+    content, so repeated and templated boxes are measured once.
 
+    Args:
+        content: The complete box content (with borders)
 
-class Canvas(BaseModel):
+    Returns:
+        Per line, the cells the line occupies from its left edge
+    """
+    lines = []
+    for line in content.split("\n"):
+        cells: list[str] = []
+        for char in line:
+            cells.append(char)
+            if wcwidth(char) == 2:
+                cells.append("")  # Placeholder
+        lines.append(tuple(cells))
+    return tuple(lines)
+
+
+def _or_runs(
+    line: bytearray,
+    runs: set[tuple[int, int]],
+    fill: bytes,
+    low_bit: int,
+    high_bit: int,
+    size: int,
+) -> None:
+    """OR the connectivity of many runs into one row or column.
+
+    Args:
+        line: Mask row (horizontal runs) or column (vertical runs)
+        runs: (low, high) run ends, low <= high, in line coordinates
+        fill: Translate table OR-ing both directions into interior cells
+        low_bit: Bit set on a run's low end (towards high)
+        high_bit: Bit set on a run's high end (towards low)
+        size: Cells of the line inside the canvas (runs are clipped to it)
+    """
+    # Merge overlapping interiors, then update each span with one slice
+    start = end = 0
+    for low, high in sorted((max(low + 1, 0), min(high, size)) for low, high in runs):
+        if low >= high:
+            continue
+        if low > end:
+            if start < end:
+                line[start:end] = line[start:end].translate(fill)
+            start = low
+        end = max(end, high)
+    if start < end:
+        line[start:end] = line[start:end].translate(fill)
+
+    for low, high in runs:
+        if low == high:
+            # Zero-length run: draw as a pass-through line
+            if 0 <= low < size:
+                line[low] |= low_bit | high_bit
+            continue
+        if 0 <= low < size:
+            line[low] |= low_bit
+        if 0 <= high < size:
+            line[high] |= high_bit
+
+
+class Canvas:
     """2D character grid for ASCII rendering.
 
     Coordinates: x = column (0 = left), y = row (0 = top)
@@ -18,18 +102,57 @@ class Canvas(BaseModel):
     Note:
         Wide characters (emoji, CJK) occupy 2 terminal columns but are
         stored as a single character followed by an empty string placeholder.
+
+        Edge masks are kept in two planes so both kinds of runs are slice
+        operations: horizontal bits row-major (`_hmask[y][x]`), vertical
+        bits and arrows column-major (`_vmask[x][y]`). Box characters
+        always win over edges; edges show through spaces.
+
+        Canvas is an internal working buffer rather than a data model, so
+        it is a plain slotted class: no validation on construction and
+        plain attribute access in the per-cell loops.
     """
 
-    width: int
-    height: int
-    theme: EdgeTheme = DEFAULT_THEME
-    _grid: list[list[str]] = PrivateAttr(default_factory=list)
+    __slots__ = (
+        "width",
+        "height",
+        "_theme",
+        "_compiled",
+        "_grid",
+        "_hmask",
+        "_vmask",
+        "_has_edges",
+    )
 
-    @model_validator(mode="after")
-    def _init_grid(self) -> "Canvas":
-        """Initialize the character grid with spaces."""
-        self._grid = [[" " for _ in range(self.width)] for _ in range(self.height)]
-        return self
+    def __init__(self, *, width: int, height: int, theme: EdgeTheme = DEFAULT_THEME) -> None:
+        """Create a blank canvas.
+
+        Args:
+            width: Columns
+            height: Rows
+            theme: Edge theme for line/arrow characters
+        """
+        self.width = width
+        self.height = height
+        self.theme = theme
+        self._grid = [[" "] * width for _ in range(height)]
+        self._hmask = [bytearray(width) for _ in range(height)]
+        self._vmask = [bytearray(height) for _ in range(width)]
+        self._has_edges = False
+
+    @property
+    def theme(self) -> EdgeTheme:
+        """Edge theme for line/arrow characters.
+
+        Compiled when assigned; changes made to the theme object later
+        take effect once it is assigned again.
+        """
+        return self._theme
+
+    @theme.setter
+    def theme(self, theme: EdgeTheme) -> None:
+        self._theme = theme
+        self._compiled = compile_theme(theme)
 
     def place_box(self, content: str, x: int, y: int) -> None:
         """Place a pre-made box at the given position.
@@ -42,28 +165,39 @@ class Canvas(BaseModel):
         Note:
             Uses wcwidth for accurate column positioning. Wide characters
             (emoji, CJK) occupy 2 columns and leave a placeholder in the
-            second column.
+            second column. The content is rasterized once (cached) and
+            copied in row by row; cells outside the canvas are clipped.
         """
-        lines = content.split("\n")
-        for row_offset, line in enumerate(lines):
+        for row_offset, cells in enumerate(_rasterize(content)):
             canvas_y = y + row_offset
             if canvas_y < 0 or canvas_y >= self.height:
                 continue
-            # Track column position (not character index)
-            col = 0
-            for char in line:
-                canvas_x = x + col
-                if canvas_x < 0 or canvas_x >= self.width:
-                    # Character starts out of bounds, but still advance column
-                    char_width = wcwidth(char)
-                    col += max(1, char_width if char_width >= 0 else 1)
-                    continue
-                self._grid[canvas_y][canvas_x] = char
-                # Handle wide characters (occupy 2 columns)
-                char_width = wcwidth(char)
-                if char_width == 2 and canvas_x + 1 < self.width:
-                    self._grid[canvas_y][canvas_x + 1] = ""  # Placeholder
-                col += max(1, char_width if char_width >= 0 else 1)
+            start = max(0, -x)
+            stop = min(len(cells), self.width - x)
+            if 0 < start < stop and cells[start] == "":
+                # Placeholder of a wide character clipped on the left
+                start += 1
+            if start >= stop:
+                continue
+            if start or stop < len(cells):
+                cells = cells[start:stop]
+            self._blit_row(cells, x + start, canvas_y)
+
+    def _blit_row(self, cells: tuple[str, ...], x: int, y: int) -> None:
+        """Copy in-bounds cells into one row, clearing edges under them.
+
+        Args:
+            cells: Cells to write
+            x: Column of the first cell
+            y: Row
+        """
+        end = x + len(cells)
+        self._grid[y][x:end] = cells
+        if self._has_edges:
+            hrow = self._hmask[y]
+            hrow[x:end] = bytes(end - x)
+            for column in self._vmask[x:end]:
+                column[y] = 0
 
     def put_char(self, char: str, x: int, y: int) -> None:
         """Place a single character at the given position.
@@ -75,10 +209,15 @@ class Canvas(BaseModel):
         """
         if 0 <= x < self.width and 0 <= y < self.height:
             self._grid[y][x] = char
+            if self._has_edges:
+                self._clear_edge(x, y)
 
     def get_char(self, x: int, y: int) -> str:
         """Get the character at the given position.
 
+        Box characters take precedence; otherwise the edge glyph resolved
+        from the cell's connectivity mask is returned.
+
         Args:
             x: Column
             y: Row
@@ -87,30 +226,102 @@ class Canvas(BaseModel):
             Character at position, or space if out of bounds
         """
         if 0 <= x < self.width and 0 <= y < self.height:
-            return self._grid[y][x]
+            char = self._cell(x, y)
+            if char != " " or not self._has_edges:
+                return char
+            return self._compiled.glyph(self._mask(x, y))
         return " "
 
+    def _cell(self, x: int, y: int) -> str:
+        """Get the box character stored at an in-bounds cell."""
+        return self._grid[y][x]
+
+    def _mask(self, x: int, y: int) -> int:
+        """Get the combined edge mask of an in-bounds cell."""
+        return self._hmask[y][x] | self._vmask[x][y]
+
+    def _inked_cells(self) -> Iterator[tuple[int, int, str]]:
+        """Iterate (x, y, char) over stored box characters."""
+        for y, row in enumerate(self._grid):
+            for x, char in enumerate(row):
+                yield x, y, char
+
+    def clear(self) -> None:
+        """Blank every cell and edge bit, keeping the allocated buffers.
+
+        Only the width x height region is touched (all writes are clipped
+        to it), and the edge planes only if an edge was drawn.
+        """
+        width, height = self.width, self.height
+        blank = [" "] * width
+        for row in self._grid[:height]:
+            row[:width] = blank
+        if self._has_edges:
+            zeros = bytes(width)
+            for hrow in self._hmask[:height]:
+                hrow[:width] = zeros
+            zeros = bytes(height)
+            for column in self._vmask[:width]:
+                column[:height] = zeros
+        self._has_edges = False
+
     def render(self) -> str:
         """Render the canvas to a string.
 
         Returns:
             Multi-line string representation of the canvas
-
-        Note:
-            Skips empty string placeholders (wide char continuations).
         """
-        lines = []
-        for row in self._grid:
-            # Skip empty string placeholders (wide char continuations)
-            line = "".join(char for char in row if char != "")
-            lines.append(line.rstrip())
+        lines = self.render_lines()
         # Remove trailing empty lines
         while lines and not lines[-1]:
             lines.pop()
         return "\n".join(lines)
 
+    def render_lines(self) -> list[str]:
+        """Render every canvas row, trailing spaces stripped.
+
+        Returns:
+            One string per row (height entries, blank rows included)
+
+        Note:
+            Empty string placeholders (wide char continuations) join to
+            nothing. Edge glyphs are resolved here, once per inked cell.
+        """
+        compiled = self._compiled
+        glyphs = compiled.glyphs
+        arrow = compiled.arrow
+        vmask = self._vmask
+        grid = self._grid
+        inked_columns = [
+            x for x in range(self.width) if vmask[x].count(0) != len(vmask[x])
+        ] if self._has_edges else []
+
+        lines = []
+        for y in range(self.height):
+            row = grid[y]
+            hrow = self._hmask[y]
+            hits = [x for x in inked_columns if vmask[x][y]]
+            if hrow.count(0) != len(hrow):
+                hits.extend(x for x, bits in enumerate(hrow) if bits)
+            if hits:
+                row = row.copy()
+                for x in hits:
+                    if row[x] == " ":
+                        mask = hrow[x] | vmask[x][y]
+                        row[x] = arrow if mask & ARROW else glyphs[mask & 15]
+            lines.append("".join(row).rstrip())
+        return lines
+
     def draw_edge(self, path: EdgePath) -> None:
-        """Draw edge path on canvas using box-drawing characters.
+        """Draw edge path on the connectivity layer.
+
+        Each segment ORs direction bits into the cells it covers: a
+        vertical run marks UP/DOWN, a horizontal run LEFT/RIGHT, and the
+        end cells only point back along the run. Turns, tees and crosses
+        fall out of the combined mask, so no overwrite rules or fix-up
+        pass are needed. Cells outside the canvas are clipped, but bits
+        are computed from the full segment, so a clipped run still
+        connects to the canvas border.
 
         Args:
             path: EdgePath with segments to draw
@@ -118,165 +329,137 @@ class Canvas(BaseModel):
         Characters used are defined by self.theme:
             - Vertical: theme.vertical
             - Horizontal: theme.horizontal
-            - Corners: theme.corner_*
+            - Corners/tees/cross: theme.corner_*, theme.tee_*, theme.cross
             - Arrow: theme.arrow_down (at target)
         """
         if not path.segments:
             return
 
-        t = self.theme  # Shorthand
-
+        last = len(path.segments) - 1
         for i, (x1, y1, x2, y2) in enumerate(path.segments):
-            is_last_segment = i == len(path.segments) - 1
-
             if x1 == x2:
                 # Vertical segment
-                start_y = min(y1, y2)
-                end_y = max(y1, y2)
-                for y in range(start_y, end_y + 1):
-                    if y == end_y and is_last_segment:
-                        # Arrow at target
-                        self._safe_put_edge_char(t.arrow_down, x1, y)
-                    else:
-                        self._safe_put_edge_char(t.vertical, x1, y)
+                self._draw_vertical(x1, y1, y2)
+                if i == last:
+                    # Arrow at target
+                    self._put_arrow(x1, max(y1, y2))
             elif y1 == y2:
                 # Horizontal segment
-                start_x = min(x1, x2)
-                end_x = max(x1, x2)
-                for x in range(start_x, end_x + 1):
-                    self._safe_put_edge_char(t.horizontal, x, y1)
-
-        # Place corners/junctions at segment connection points
-        for i in range(len(path.segments) - 1):
-            seg1_x1, seg1_y1, seg1_x2, seg1_y2 = path.segments[i]
-            seg2_x1, seg2_y1, seg2_x2, seg2_y2 = path.segments[i + 1]
-            # The end of segment i should connect to start of segment i+1
-            if seg1_x2 == seg2_x1 and seg1_y2 == seg2_y1:
-                corner = self._get_corner_char(
-                    seg1_x1, seg1_y1, seg1_x2, seg1_y2,
-                    seg2_x1, seg2_y1, seg2_x2, seg2_y2
-                )
-                self._safe_put_edge_char(corner, seg1_x2, seg1_y2)
-
-    def _get_corner_char(
-        self,
-        x1: int, y1: int, x2: int, y2: int,  # First segment
-        x3: int, y3: int, x4: int, y4: int,  # Second segment
-    ) -> str:
-        """Determine the correct corner character for a junction.
+                self._draw_horizontal(y1, x1, x2)
 
-        Args:
-            x1, y1, x2, y2: First segment (incoming)
-            x3, y3, x4, y4: Second segment (outgoing)
+    def draw_segments(self, table: SegmentTable) -> None:
+        """Draw every edge of a columnar routing result at once.
 
-        Returns:
-            Corner character from theme
+        Produces the same cells as draw_edge() on each path, but works per
+        line instead of per segment: runs are deduplicated (fan-out trunks
+        and merge drops repeat across paths), grouped by column or row, and
+        overlapping interiors are merged so each covered span gets a single
+        slice update.
+
+        Args:
+            table: SegmentTable from a router's route_columnar()
         """
-        t = self.theme  # Shorthand
-
-        # Determine incoming direction
-        if x1 == x2:  # Vertical incoming
-            from_above = y2 > y1
-            from_below = y2 < y1
-        else:  # Horizontal incoming
-            from_left = x2 > x1
-            from_right = x2 < x1
-
-        # Determine outgoing direction
-        if x3 == x4:  # Vertical outgoing
-            going_down = y4 > y3
-            going_up = y4 < y3
-        else:  # Horizontal outgoing
-            going_right = x4 > x3
-            going_left = x4 < x3
-
-        # Select corner based on directions
-        if x1 == x2:  # Came from vertical
-            if from_above:  # Coming from above
-                if x4 > x3:  # Going right
-                    return t.corner_bl  # └
-                else:  # Going left
-                    return t.corner_br  # ┘
-            else:  # Coming from below
-                if x4 > x3:  # Going right
-                    return t.corner_tl  # ┌
-                else:  # Going left
-                    return t.corner_tr  # ┐
-        else:  # Came from horizontal
-            if from_left:  # Coming from left
-                if y4 > y3:  # Going down
-                    return t.corner_tr  # ┐
-                else:  # Going up
-                    return t.corner_br  # ┘
-            else:  # Coming from right
-                if y4 > y3:  # Going down
-                    return t.corner_tl  # ┌
-                else:  # Going up
-                    return t.corner_bl  # └
-
-    def _safe_put_edge_char(self, char: str, x: int, y: int) -> None:
-        """Place edge character, avoiding overwriting box content.
+        data = table.segments
+        if not data:
+            return
+
+        vertical: dict[int, set[tuple[int, int]]] = defaultdict(set)
+        horizontal: dict[int, set[tuple[int, int]]] = defaultdict(set)
+        values = iter(data)
+        for x1, y1, x2, y2 in zip(values, values, values, values):
+            if x1 == x2:
+                vertical[x1].add((y1, y2) if y1 <= y2 else (y2, y1))
+            elif y1 == y2:
+                horizontal[y1].add((x1, x2) if x1 <= x2 else (x2, x1))
+
+        self._has_edges = True
+        for x, runs in vertical.items():
+            if 0 <= x < self.width:
+                _or_runs(self._vmask[x], runs, _OR_VERTICAL, DOWN, UP, self.height)
+        for y, runs in horizontal.items():
+            if 0 <= y < self.height:
+                _or_runs(self._hmask[y], runs, _OR_HORIZONTAL, RIGHT, LEFT, self.width)
+
+        # Arrow at target: end of each edge whose last segment is vertical
+        arrows = set()
+        for end in table.offsets[1:]:
+            base = end * 4 - 4
+            if base >= 0 and data[base] == data[base + 2]:
+                arrows.add((data[base], max(data[base + 1], data[base + 3])))
+        width, height, vmask = self.width, self.height, self._vmask
+        for x, y in arrows:
+            if 0 <= x < width and 0 <= y < height:
+                vmask[x][y] |= ARROW
+
+    def _draw_vertical(self, x: int, y1: int, y2: int) -> None:
+        """OR vertical connectivity into column x between y1 and y2.
 
         Args:
-            char: Edge character to place
             x: Column
-            y: Row
+            y1: One end row
+            y2: Other end row
         """
-        if not (0 <= x < self.width and 0 <= y < self.height):
+        if not 0 <= x < self.width:
             return
-        existing = self._grid[y][x]
-        t = self.theme  # Shorthand
-
-        # Combine corners when they overlap (e.g., fan-out/fan-in junctions)
-        corner_chars = t.corners
-        if existing in corner_chars and char in corner_chars:
-            # Two corners at same point = T-junction or cross
-            # bl + br = tee_up (both coming from above, going left and right)
-            # tl + tr = tee_down (both going down, coming from left and right)
-            # bl + tl = tee_right (vertical line, horizontal going right)
-            # br + tr = tee_left (vertical line, horizontal going left)
-            combo = {existing, char}
-            if combo == {t.corner_bl, t.corner_br}:
-                self._grid[y][x] = t.tee_up
-            elif combo == {t.corner_tl, t.corner_tr}:
-                self._grid[y][x] = t.tee_down
-            elif combo == {t.corner_bl, t.corner_tl}:
-                self._grid[y][x] = t.tee_right
-            elif combo == {t.corner_br, t.corner_tr}:
-                self._grid[y][x] = t.tee_left
-            else:
-                self._grid[y][x] = t.cross  # Full cross for other combos
+        self._has_edges = True
+        column = self._vmask[x]
+        low, high = (y1, y2) if y1 <= y2 else (y2, y1)
+        if low == high:
+            # Zero-length run: draw as a pass-through line
+            if 0 <= low < self.height:
+                column[low] |= UP | DOWN
             return
+        top = max(low + 1, 0)
+        bottom = min(high, self.height)
+        if top < bottom:
+            column[top:bottom] = column[top:bottom].translate(_OR_VERTICAL)
+        if 0 <= low < self.height:
+            column[low] |= DOWN
+        if 0 <= high < self.height:
+            column[high] |= UP
+
+    def _draw_horizontal(self, y: int, x1: int, x2: int) -> None:
+        """OR horizontal connectivity into row y between x1 and x2.
 
-        # Handle line meeting existing corner (T-junctions)
-        # Only when a LINE char is placed on an existing CORNER
-        # This happens when edges from different paths cross
-        if char == t.vertical and existing in corner_chars:
-            # Right-pointing corners (tl, bl) + vertical = tee_right
-            if existing in (t.corner_tl, t.corner_bl):
-                self._grid[y][x] = t.tee_right
-            else:  # Left-pointing corners (tr, br) + vertical = tee_left
-                self._grid[y][x] = t.tee_left
-            return
-        if char == t.horizontal and existing in corner_chars:
-            # Down-pointing corners (tl, tr) + horizontal = tee_down
-            if existing in (t.corner_tl, t.corner_tr):
-                self._grid[y][x] = t.tee_down
-            else:  # Up-pointing corners (bl, br) + horizontal = tee_up
-                self._grid[y][x] = t.tee_up
+        Args:
+            y: Row
+            x1: One end column
+            x2: Other end column
+        """
+        if not 0 <= y < self.height:
             return
+        self._has_edges = True
+        row = self._hmask[y]
+        low, high = (x1, x2) if x1 <= x2 else (x2, x1)
+        left = max(low + 1, 0)
+        right = min(high, self.width)
+        if left < right:
+            row[left:right] = row[left:right].translate(_OR_HORIZONTAL)
+        if 0 <= low < self.width:
+            row[low] |= RIGHT
+        if 0 <= high < self.width:
+            row[high] |= LEFT
+
+    def _put_arrow(self, x: int, y: int) -> None:
+        """Mark an arrowhead cell (arrow glyph wins over line glyphs).
 
-        # Only overwrite spaces or simple edge characters
-        # Don't let basic edge chars overwrite corners/junctions
-        basic_edge_chars = t.vertical + t.horizontal
-        if char in basic_edge_chars:
-            # Basic edge chars can only overwrite spaces or other basic chars
-            if existing == " " or existing in basic_edge_chars:
-                self._grid[y][x] = char
-        else:
-            # Corner/junction chars and arrows can overwrite anything except boxes
-            if existing == " " or existing in basic_edge_chars + "+v" + t.all_junctions:
-                self._grid[y][x] = char
+        Args:
+            x: Column
+            y: Row
+        """
+        if 0 <= x < self.width and 0 <= y < self.height:
+            self._has_edges = True
+            self._vmask[x][y] |= ARROW
+
+    def _clear_edge(self, x: int, y: int) -> None:
+        """Remove all edge connectivity from a cell.
+
+        Args:
+            x: Column
+            y: Row
+        """
+        self._hmask[y][x] = 0
+        self._vmask[x][y] = 0
 
     def place_box_connector(self, x: int, y: int) -> None:
         """Place a box connector at the given position.
@@ -294,7 +477,7 @@ class Canvas(BaseModel):
             return
 
         t = self.theme
-        existing = self._grid[y][x]
+        existing = self._cell(x, y)
         # Replace ASCII box border characters
         if existing in "-+":
             self._grid[y][x] = t.tee_down
@@ -311,246 +494,62 @@ class Canvas(BaseModel):
 
     def place_box_connectors(
         self,
-        positions: dict[str, "NodePosition"],
-        edges: list["Edge"],
+        positions: dict[str, NodePosition],
+        edges: list[Edge],
     ) -> None:
         """Place box connectors on all boxes that have outgoing edges.
 
-        For each source box with outgoing edges, places T-junction characters
-        on the box bottom border at the edge exit points.
-
-        Uses the same routing logic as SimpleRouter:
-        - Same-layer targets: single connector at center (trunk-and-split)
-        - Different-layer targets: multiple connectors (individual routing)
+        Convenience wrapper that routes the edges with SimpleRouter and
+        places its exit connectors. Renderers that already routed the
+        edges should call place_connectors() with the router's exits.
 
         Args:
             positions: Node positions keyed by node ID
             edges: List of edges in the DAG
         """
-        from visualflow.models import NodePosition, Edge
-
-        # Group edges by source
-        edges_by_source: dict[str, list[Edge]] = {}
-        for edge in edges:
-            if edge.source not in edges_by_source:
-                edges_by_source[edge.source] = []
-            edges_by_source[edge.source].append(edge)
-
-        # For each source, place connectors based on routing pattern
-        for source_id, source_edges in edges_by_source.items():
-            source_pos = positions.get(source_id)
-            if not source_pos:
-                continue
-
-            exit_y = source_pos.y + source_pos.node.height - 1  # Bottom border
-
-            if len(source_edges) == 1:
-                # Single edge - connector at center
-                center_x = source_pos.x + source_pos.node.width // 2
-                self.place_box_connector(center_x, exit_y)
-            else:
-                # Multiple edges - check for same-layer targets
-                same_layer_targets = self._find_same_layer_targets(positions, source_edges)
-
-                if same_layer_targets and len(same_layer_targets) == len(source_edges):
-                    # ALL targets on same layer - single connector at center
-                    center_x = source_pos.x + source_pos.node.width // 2
-                    self.place_box_connector(center_x, exit_y)
-                else:
-                    # Mixed layers - multiple connectors at calculated exit points
-                    exit_points = self._calculate_exit_points(source_pos, len(source_edges))
-                    for exit_x in exit_points:
-                        self.place_box_connector(exit_x, exit_y)
-
-    def _find_same_layer_targets(
-        self,
-        positions: dict[str, "NodePosition"],
-        edges: list["Edge"],
-        tolerance: int = 10,
-    ) -> list[str]:
-        """Find target nodes that are at approximately the same y-level.
-
-        Mirrors SimpleRouter._find_same_layer_targets() logic.
-        Uses tolerance to account for different box heights in same graph rank.
+        from visualflow.routing import SimpleRouter
 
-        Args:
-            positions: Node positions keyed by node ID
-            edges: Edges from a single source
-            tolerance: Max Y difference to consider same layer (default 10)
-
-        Returns:
-            List of target node IDs at the same layer
-        """
-        if not edges:
-            return []
-
-        # Get all target Y positions
-        target_ys: list[tuple[str, int]] = []
-        for edge in edges:
-            target_pos = positions.get(edge.target)
-            if target_pos:
-                target_ys.append((edge.target, target_pos.y))
-
-        if len(target_ys) < 2:
-            return []
-
-        # Check if all targets are within tolerance of each other
-        ys = [y for _, y in target_ys]
-        y_range = max(ys) - min(ys)
-
-        if y_range <= tolerance:
-            # All targets are approximately same layer
-            return [target_id for target_id, _ in target_ys]
-
-        # Group targets by approximate y position (buckets of tolerance size)
-        targets_by_bucket: dict[int, list[str]] = {}
-        for target_id, y in target_ys:
-            bucket = y // tolerance
-            if bucket not in targets_by_bucket:
-                targets_by_bucket[bucket] = []
-            targets_by_bucket[bucket].append(target_id)
-
-        # Return targets in largest bucket (if more than one)
-        if not targets_by_bucket:
-            return []
-        largest_bucket = max(targets_by_bucket.values(), key=len)
-        return largest_bucket if len(largest_bucket) > 1 else []
-
-    def _calculate_exit_points(
-        self,
-        source_pos: "NodePosition",
-        num_exits: int,
-    ) -> list[int]:
-        """Calculate x positions for exit points on box bottom.
+        self.place_connectors(SimpleRouter().route_with_connectors(positions, edges).exits)
 
-        Matches SimpleRouter._calculate_exit_points() logic exactly.
+    def place_connectors(self, points: list[tuple[int, int]]) -> None:
+        """Place box connectors at router-provided exit points.
 
         Args:
-            source_pos: Position of the source node
-            num_exits: Number of exit points needed
-
-        Returns:
-            List of x coordinates for exit points
+            points: (x, y) cells on box bottom borders, e.g. RouteResult.exits
         """
-        if num_exits <= 0:
-            return []
-
-        if num_exits == 1:
-            # Single exit at center
-            return [source_pos.x + source_pos.node.width // 2]
-
-        # Multiple exits - space evenly, avoid corners
-        box_left = source_pos.x + 1  # Skip left corner
-        box_right = source_pos.x + source_pos.node.width - 2  # Skip right corner
-        usable_width = box_right - box_left
-
-        # Minimum spacing of 2 characters between exits
-        min_spacing = 2
-        if usable_width < min_spacing * (num_exits - 1):
-            # Box too narrow - use center for all
-            center = source_pos.x + source_pos.node.width // 2
-            return [center] * num_exits
-
-        # Space evenly
-        if num_exits == 2:
-            # Two exits - left third and right third
-            spacing = usable_width // 3
-            return [box_left + spacing, box_right - spacing]
-
-        # Three or more - distribute evenly
-        spacing = usable_width // (num_exits - 1)
-        return [box_left + spacing * i for i in range(num_exits)]
+        for x, y in points:
+            self.place_box_connector(x, y)
 
     def fix_junctions(self) -> None:
-        """Fix junction characters based on actual neighbors.
+        """Fix junction characters written with put_char() based on neighbors.
 
-        After all edges are drawn, scan for junction/corner characters
-        and verify they match their neighbors. This handles cases where
-        multiple paths overlap and the correct junction wasn't determined
-        during incremental drawing.
+        Edges drawn with draw_edge() never need this: their glyphs are
+        resolved from the connectivity layer. This pass only corrects
+        junction/corner characters placed directly in the character grid.
         """
-        t = self.theme
-
-        # Characters that have lines going in each direction
-        # Using theme characters for the basic lines
-        has_down = set(
-            t.vertical + t.corner_tl + t.corner_tr +
-            t.tee_right + t.tee_left + t.tee_down + t.cross + t.arrow_down
-        )
-        has_up = set(
-            t.vertical + t.corner_bl + t.corner_br +
-            t.tee_right + t.tee_left + t.tee_up + t.cross
-        )
-        has_right = set(
-            t.horizontal + t.corner_tl + t.corner_bl +
-            t.tee_right + t.tee_down + t.tee_up + t.cross
-        )
-        has_left = set(
-            t.horizontal + t.corner_tr + t.corner_br +
-            t.tee_left + t.tee_down + t.tee_up + t.cross
-        )
-
-        # Characters that are junctions/corners (candidates for fixing)
-        junction_chars = set(t.all_junctions)
+        compiled = self._compiled
+        directions = compiled.directions
+        junction_chars = compiled.junctions
+        junction_glyphs = compiled.junction_glyphs
 
         # Scan for junctions that might need fixing
-        for y in range(self.height):
-            for x in range(self.width):
-                char = self._grid[y][x]
-                if char not in junction_chars:
-                    continue
-
-                # Check each neighbor direction
-                up = self._grid[y - 1][x] in has_down if y > 0 else False
-                down = self._grid[y + 1][x] in has_up if y < self.height - 1 else False
-                left = self._grid[y][x - 1] in has_right if x > 0 else False
-                right = self._grid[y][x + 1] in has_left if x < self.width - 1 else False
-
-                # Determine correct character based on connections
-                new_char = self._junction_for_directions(up, down, left, right)
-                if new_char and new_char != char:
-                    self._grid[y][x] = new_char
-
-    def _junction_for_directions(
-        self, up: bool, down: bool, left: bool, right: bool
-    ) -> str | None:
-        """Get the correct junction character for given directions.
-
-        Args:
-            up: Has connection going up
-            down: Has connection going down
-            left: Has connection going left
-            right: Has connection going right
+        get = self.get_char
+        for x, y, char in self._inked_cells():
+            if char not in junction_chars:
+                continue
 
-        Returns:
-            Correct junction character from theme, or None if no valid junction
-        """
-        t = self.theme
-        count = sum([up, down, left, right])
-
-        if count == 4:
-            return t.cross
-        elif count == 3:
-            if not up:
-                return t.tee_down  # down + left + right
-            elif not down:
-                return t.tee_up  # up + left + right
-            elif not left:
-                return t.tee_right  # up + down + right
-            else:  # not right
-                return t.tee_left  # up + down + left
-        elif count == 2:
-            if up and down:
-                return None  # Just a vertical line, not a junction
-            elif left and right:
-                return None  # Just a horizontal line, not a junction
-            elif up and left:
-                return t.corner_br  # ┘
-            elif up and right:
-                return t.corner_bl  # └
-            elif down and left:
-                return t.corner_tr  # ┐
-            elif down and right:
-                return t.corner_tl  # ┌
-        # count < 2: not a valid junction
-        return None
+            # Collect the directions whose neighbor connects back here
+            mask = 0
+            if y > 0 and directions.get(get(x, y - 1), 0) & DOWN:
+                mask |= UP
+            if y < self.height - 1 and directions.get(get(x, y + 1), 0) & UP:
+                mask |= DOWN
+            if x > 0 and directions.get(get(x - 1, y), 0) & RIGHT:
+                mask |= LEFT
+            if x < self.width - 1 and directions.get(get(x + 1, y), 0) & LEFT:
+                mask |= RIGHT
+
+            # Determine correct character based on connections
+            new_char = junction_glyphs.get(mask)
+            if new_char and new_char != char:
+                self._grid[y][x] = new_char
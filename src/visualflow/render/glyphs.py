@@ -0,0 +1,126 @@
+"""Compiled edge themes.
+
+An EdgeTheme is a flat set of characters. Rendering needs it the other
+way round: which glyph draws a given set of directions, which directions
+a glyph connects, and whether a glyph is a junction. CompiledTheme holds
+those lookups, built once per set of theme characters and cached, so
+per-cell work is a single tuple index or dict/set lookup.
+"""
+
+from dataclasses import dataclass
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Mapping
+
+from visualflow.models import EdgeTheme
+
+# Edge connectivity bits (a cell connects towards each set direction)
+UP = 1
+DOWN = 2
+LEFT = 4
+RIGHT = 8
+# Arrowhead marker, stored alongside the direction bits
+ARROW = 16
+
+# Masks that are plain lines rather than junctions
+_STRAIGHT = frozenset({UP, DOWN, LEFT, RIGHT, UP | DOWN, LEFT | RIGHT})
+
+# Theme fields, in the order compile_theme() keys its cache on
+_FIELDS = tuple(EdgeTheme.model_fields)
+
+
+@dataclass(frozen=True, slots=True)
+class CompiledTheme:
+    """Immutable lookup tables derived from an EdgeTheme.
+
+    Attributes:
+        theme: Source theme
+        glyphs: Glyph per direction mask, indexed by (UP | DOWN | LEFT | RIGHT)
+        arrow: Arrowhead glyph
+        directions: Glyph -> direction mask it connects
+        junctions: Corner, tee and cross glyphs
+        junction_glyphs: Direction mask -> glyph, junction masks only
+    """
+
+    theme: EdgeTheme
+    glyphs: tuple[str, ...]
+    arrow: str
+    directions: Mapping[str, int]
+    junctions: frozenset[str]
+    junction_glyphs: Mapping[int, str]
+
+    def glyph(self, mask: int) -> str:
+        """Get the glyph for a cell mask (arrow bit wins over directions).
+
+        Args:
+            mask: Direction bits, optionally with ARROW
+
+        Returns:
+            Glyph to draw, or space for an empty mask
+        """
+        if mask & ARROW:
+            return self.arrow
+        return self.glyphs[mask & 15]
+
+
+def compile_theme(theme: EdgeTheme) -> CompiledTheme:
+    """Build (or fetch the cached) lookup tables for a theme.
+
+    The cache is keyed on the theme's characters, so equal themes share
+    one entry and a theme changed after compiling gets fresh tables.
+
+    Args:
+        theme: Edge theme
+
+    Returns:
+        CompiledTheme for the theme
+    """
+    return _compile(tuple(getattr(theme, name) for name in _FIELDS))
+
+
+@lru_cache(maxsize=64)
+def _compile(characters: tuple[str, ...]) -> CompiledTheme:
+    """Build the lookup tables for a theme's characters.
+
+    Args:
+        characters: Theme field values, in _FIELDS order
+
+    Returns:
+        CompiledTheme for a theme with those characters
+    """
+    theme = EdgeTheme.model_construct(**dict(zip(_FIELDS, characters)))
+    table = [" "] * 16
+    for mask in (UP, DOWN, UP | DOWN):
+        table[mask] = theme.vertical
+    for mask in (LEFT, RIGHT, LEFT | RIGHT):
+        table[mask] = theme.horizontal
+    table[DOWN | RIGHT] = theme.corner_tl
+    table[DOWN | LEFT] = theme.corner_tr
+    table[UP | RIGHT] = theme.corner_bl
+    table[UP | LEFT] = theme.corner_br
+    table[DOWN | LEFT | RIGHT] = theme.tee_down
+    table[UP | LEFT | RIGHT] = theme.tee_up
+    table[UP | DOWN | RIGHT] = theme.tee_right
+    table[UP | DOWN | LEFT] = theme.tee_left
+    table[UP | DOWN | LEFT | RIGHT] = theme.cross
+
+    junction_glyphs = {
+        mask: table[mask]
+        for mask in range(1, 16)
+        if mask not in _STRAIGHT
+    }
+    # Lines are set last so a glyph shared with a junction keeps its line meaning
+    directions = {glyph: mask for mask, glyph in junction_glyphs.items()}
+    directions[theme.vertical] = UP | DOWN
+    directions[theme.horizontal] = LEFT | RIGHT
+    # The arrow is reached from above and points down into the cell below
+    directions.setdefault(theme.arrow_down, DOWN)
+
+    return CompiledTheme(
+        theme=theme,
+        glyphs=tuple(table),
+        arrow=theme.arrow_down,
+        directions=MappingProxyType(directions),
+        junctions=frozenset(junction_glyphs.values()),
+        junction_glyphs=MappingProxyType(junction_glyphs),
+    )
@@ -0,0 +1,314 @@
+"""Paginated rendering of tall layouts.
+
+Splits a layout into pages along layer bands (groups of nodes whose rows
+overlap) and draws each page on its own small canvas, so only one page's
+canvas is resident at a time. Edges that cross a page boundary end in
+labeled continuation stubs:
+
+    upper page footer:   v          <- stub arrow
+                         a          <- marker
+                         a: src -> tgt
+    lower page header:   a: src -> tgt
+                         a
+                         |          <- stub continues into the page
+
+Past 62 crossings of one break, markers grow to two characters (`aa`,
+`ab`, ...), written one above the other in the stub column.
+"""
+
+from bisect import bisect_right
+from collections.abc import Iterator
+from itertools import islice, product
+from string import ascii_letters, digits
+
+from visualflow.models import EdgePath, EdgeTheme, LayoutResult, NodePosition, RouteResult
+from visualflow.render.canvas import Canvas
+
+# Marker characters used to pair stubs across a page boundary
+_MARKERS = ascii_letters + digits
+
+# Stub rows around the legend: arrow/vertical row + marker row (one row
+# per marker character, so more for longer markers)
+_STUB_ROWS = 2
+
+
+def paginate_layout(
+    layout: LayoutResult,
+    routes: RouteResult,
+    theme: EdgeTheme,
+    max_rows: int,
+) -> Iterator[str]:
+    """Render a computed layout as a lazy sequence of pages.
+
+    Pages break only between layer bands, never through a box. A page
+    holds as many consecutive bands as fit in `max_rows` (including stub
+    rows); a single band taller than the budget gets a page of its own.
+
+    Args:
+        layout: Computed layout (node positions and canvas size)
+        routes: Routed edge paths and connector points in layout coordinates
+        theme: Edge theme for line/arrow characters
+        max_rows: Maximum rows per page
+
+    Yields:
+        Rendered pages as multi-line strings, top to bottom
+
+    Raises:
+        ValueError: If max_rows is too small to hold any content
+    """
+    if max_rows <= 2 * _STUB_ROWS:
+        raise ValueError(f"max_rows must be greater than {2 * _STUB_ROWS}, got {max_rows}")
+    if not layout.positions:
+        return
+
+    paths = routes.paths
+    bands = _layer_bands(layout)
+    cuts = _cut_rows(bands)
+    crossings = _find_crossings(paths, cuts)
+    width = max(layout.width, 1)
+    markers = [_markers(len(columns)) for columns in crossings]
+    legends = [
+        _legend_lines(columns, names, width) for columns, names in zip(crossings, markers)
+    ]
+    stubs = [_stub_rows(names) for names in markers]
+
+    # Bucket nodes and paths by the pages they touch, then draw lazily
+    plan = _plan_pages(bands, cuts, legends, stubs, layout.height, max_rows)
+    starts = [start for start, _, _, _ in plan]
+    nodes_by_page: list[list[NodePosition]] = [[] for _ in plan]
+    for pos in layout.positions.values():
+        nodes_by_page[bisect_right(starts, pos.y) - 1].append(pos)
+    exits_by_page: list[list[tuple[int, int]]] = [[] for _ in plan]
+    for x, y in routes.exits:
+        exits_by_page[max(0, bisect_right(starts, y) - 1)].append((x, y))
+    paths_by_page: list[list[EdgePath]] = [[] for _ in plan]
+    for path in paths:
+        if not path.segments:
+            continue
+        ys = [y for x1, y1, x2, y2 in path.segments for y in (y1, y2)]
+        first = max(0, bisect_right(starts, min(ys)) - 1)
+        last = max(0, bisect_right(starts, max(ys)) - 1)
+        for page in range(first, last + 1):
+            paths_by_page[page].append(path)
+
+    for page, (start, end, head_cut, foot_cut) in enumerate(plan):
+        head = legends[head_cut] if head_cut is not None else []
+        foot = legends[foot_cut] if foot_cut is not None else []
+        head_rows = len(head) + stubs[head_cut] if head else 0
+        foot_rows = len(foot) + stubs[foot_cut] if foot else 0
+        offset = head_rows - start
+
+        canvas = Canvas(width=width, height=head_rows + (end - start) + foot_rows, theme=theme)
+
+        # Boxes and connectors, shifted into page coordinates
+        for pos in nodes_by_page[page]:
+            canvas.place_box(pos.node.content, pos.x, pos.y + offset)
+        canvas.place_connectors([(x, y + offset) for x, y in exits_by_page[page]])
+
+        # Edges are clipped to the page by the canvas bounds; the parts
+        # that spill into the stub rows are blanked below
+        for path in paths_by_page[page]:
+            canvas.draw_edge(EdgePath.model_construct(
+                source_id=path.source_id,
+                target_id=path.target_id,
+                segments=[
+                    (x1, y1 + offset, x2, y2 + offset)
+                    for x1, y1, x2, y2 in path.segments
+                ],
+            ))
+        foot_top = head_rows + (end - start)
+        _clear_rows(canvas, 0, head_rows)
+        _clear_rows(canvas, foot_top, canvas.height)
+
+        # Continuation stubs
+        if head:
+            for row, line in enumerate(head):
+                canvas.place_box(line, 0, row)
+            for marker, x in zip(markers[head_cut], crossings[head_cut]):
+                for row, char in enumerate(marker, len(head)):
+                    canvas.put_char(char, x, row)
+                for row in range(len(head) + len(marker), head_rows):
+                    canvas.put_char(theme.vertical, x, row)
+        if foot:
+            for marker, x in zip(markers[foot_cut], crossings[foot_cut]):
+                canvas.put_char(theme.arrow_down, x, foot_top)
+                for row, char in enumerate(marker, foot_top + 1):
+                    canvas.put_char(char, x, row)
+            for row, line in enumerate(foot):
+                canvas.place_box(line, 0, foot_top + stubs[foot_cut] + row)
+
+        yield canvas.render().lstrip("\n")
+
+
+def _clear_rows(canvas: Canvas, top: int, bottom: int) -> None:
+    """Blank canvas rows in [top, bottom).
+
+    Args:
+        canvas: Canvas to modify
+        top: First row to clear
+        bottom: Row after the last row to clear
+    """
+    for y in range(top, bottom):
+        for x in range(canvas.width):
+            canvas.put_char(" ", x, y)
+
+
+def _layer_bands(layout: LayoutResult) -> list[tuple[int, int]]:
+    """Merge node row ranges into non-overlapping layer bands.
+
+    Args:
+        layout: Computed layout
+
+    Returns:
+        Sorted list of (top, bottom) row ranges, bottom exclusive
+    """
+    spans = sorted(
+        (pos.y, pos.y + pos.node.height) for pos in layout.positions.values()
+    )
+    bands: list[tuple[int, int]] = []
+    for top, bottom in spans:
+        if bands and top < bands[-1][1]:
+            bands[-1] = (bands[-1][0], max(bands[-1][1], bottom))
+        else:
+            bands.append((top, bottom))
+    return bands
+
+
+def _cut_rows(bands: list[tuple[int, int]]) -> list[int]:
+    """Choose the page-break row between each pair of adjacent bands.
+
+    The break sits just above the arrow row of the lower band, so split
+    lines stay with the upper page and arrows with their target boxes.
+
+    Args:
+        bands: Layer bands from _layer_bands()
+
+    Returns:
+        Break row before each band after the first (first row of lower page)
+    """
+    return [
+        max(bands[i][1], bands[i + 1][0] - 1) for i in range(len(bands) - 1)
+    ]
+
+
+def _find_crossings(
+    paths: list[EdgePath], cuts: list[int]
+) -> list[dict[int, list[tuple[str, str]]]]:
+    """Find edges whose vertical runs cross each page-break row.
+
+    Args:
+        paths: Routed edge paths
+        cuts: Page-break rows from _cut_rows()
+
+    Returns:
+        Per cut: column -> (source_id, target_id) pairs crossing there
+    """
+    crossings: list[dict[int, list[tuple[str, str]]]] = [{} for _ in cuts]
+    for path in paths:
+        for x1, y1, x2, y2 in path.segments:
+            if x1 != x2:
+                continue
+            low, high = min(y1, y2), max(y1, y2)
+            # Crosses cut c when the run covers both row c-1 and row c
+            for i in range(bisect_right(cuts, low), bisect_right(cuts, high)):
+                pair = (path.source_id, path.target_id)
+                column = crossings[i].setdefault(x1, [])
+                if pair not in column:
+                    column.append(pair)
+    return [dict(sorted(columns.items())) for columns in crossings]
+
+
+def _markers(count: int) -> list[str]:
+    """Unique stub markers: single characters, then pairs, and so on.
+
+    Args:
+        count: Number of markers needed
+
+    Returns:
+        `count` distinct markers, shortest first
+    """
+    markers: list[str] = []
+    length = 1
+    while len(markers) < count:
+        combinations = product(_MARKERS, repeat=length)
+        markers.extend("".join(chars) for chars in islice(combinations, count - len(markers)))
+        length += 1
+    return markers
+
+
+def _stub_rows(markers: list[str]) -> int:
+    """Stub rows a page break needs: one per marker character, plus one."""
+    return _STUB_ROWS - 1 + max(map(len, markers), default=1)
+
+
+def _legend_lines(
+    columns: dict[int, list[tuple[str, str]]], markers: list[str], width: int
+) -> list[str]:
+    """Format the marker legend for one page break, wrapped to width.
+
+    Args:
+        columns: Column -> crossing (source_id, target_id) pairs
+        markers: Marker of each column, in column order
+        width: Maximum line width
+
+    Returns:
+        Legend lines (empty if nothing crosses)
+    """
+    items = [
+        f"{marker}: " + ", ".join(f"{source} -> {target}" for source, target in pairs)
+        for marker, pairs in zip(markers, columns.values())
+    ]
+    lines: list[str] = []
+    for item in items:
+        if lines and len(lines[-1]) + 3 + len(item) <= width:
+            lines[-1] += "   " + item
+        else:
+            lines.append(item)
+    return lines
+
+
+def _plan_pages(
+    bands: list[tuple[int, int]],
+    cuts: list[int],
+    legends: list[list[str]],
+    stubs: list[int],
+    height: int,
+    max_rows: int,
+) -> list[tuple[int, int, int | None, int | None]]:
+    """Greedily pack consecutive bands into pages.
+
+    Args:
+        bands: Layer bands
+        cuts: Page-break rows between bands
+        legends: Legend lines per cut
+        stubs: Stub rows per cut (from _stub_rows())
+        height: Layout height (end of the last page)
+        max_rows: Maximum rows per page
+
+    Returns:
+        Per page: (start_row, end_row, head_cut_index, foot_cut_index)
+    """
+
+    def stub_rows(cut: int | None) -> int:
+        if cut is None or not legends[cut]:
+            return 0
+        return len(legends[cut]) + stubs[cut]
+
+    def page_rows(start: int, head: int | None, last: int) -> int:
+        foot = last if last < len(cuts) else None
+        end = cuts[last] if foot is not None else height
+        return stub_rows(head) + (end - start) + stub_rows(foot)
+
+    plan: list[tuple[int, int, int | None, int | None]] = []
+    first = 0
+    start = 0
+    head: int | None = None
+    while first < len(bands):
+        last = first
+        while last + 1 < len(bands) and page_rows(start, head, last + 1) <= max_rows:
+            last += 1
+        foot = last if last < len(cuts) else None
+        end = cuts[last] if foot is not None else max(height, bands[-1][1])
+        plan.append((start, end, head, foot))
+        start, head, first = end, foot, last + 1
+    return plan
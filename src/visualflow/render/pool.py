@@ -0,0 +1,141 @@
+"""Canvas pooling for repeated renders.
+
+A process that renders many similar-size diagrams would otherwise build a
+fresh width x height grid (one list per row plus two mask planes) for
+every render, only to drop it a moment later. CanvasPool keeps released
+canvases and hands them out again: a pooled canvas's buffers may be
+larger than requested, its width/height are set to the requested size
+(every write is clipped to width x height, so the rest stays blank), and
+on release only that region is cleared.
+
+Usage:
+    pool = CanvasPool()
+    with pool.canvas(width, height, theme) as canvas:
+        canvas.place_box(...)
+        text = canvas.render()
+"""
+
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+from visualflow.models import DEFAULT_THEME, EdgeTheme
+from visualflow.render.canvas import Canvas
+
+# Buffers are allocated rounded up to these steps so that slightly larger
+# diagrams still fit a pooled canvas
+_WIDTH_STEP = 32
+_HEIGHT_STEP = 16
+
+
+def _round_up(value: int, step: int) -> int:
+    """Round a size up to a multiple of step (at least one step)."""
+    return max(step, -(-value // step) * step)
+
+
+class CanvasPool:
+    """Thread-safe pool of reusable dense canvases.
+
+    Attributes:
+        max_idle: Maximum number of released canvases kept
+        max_cells: Canvases with more buffer cells than this are not kept,
+            so one huge diagram does not pin its grid for the process lifetime
+    """
+
+    __slots__ = ("max_idle", "max_cells", "_idle", "_lock")
+
+    def __init__(self, max_idle: int = 4, max_cells: int = 1 << 20) -> None:
+        """Create an empty pool.
+
+        Args:
+            max_idle: Maximum number of released canvases kept
+            max_cells: Largest buffer (columns x rows) worth keeping
+        """
+        self.max_idle = max_idle
+        self.max_cells = max_cells
+        self._idle: list[Canvas] = []
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Number of idle canvases held."""
+        return len(self._idle)
+
+    def acquire(self, width: int, height: int, theme: EdgeTheme = DEFAULT_THEME) -> Canvas:
+        """Get a blank canvas of the requested size.
+
+        Reuses the smallest idle canvas whose buffers fit, else allocates
+        a new one with rounded-up buffers.
+
+        Args:
+            width: Columns
+            height: Rows
+            theme: Edge theme for line/arrow characters
+
+        Returns:
+            Blank canvas with width/height/theme set as requested
+        """
+        canvas = None
+        with self._lock:
+            best = None
+            for index, idle in enumerate(self._idle):
+                if len(idle._vmask) >= width and len(idle._grid) >= height:
+                    if best is None or _cells(idle) < _cells(self._idle[best]):
+                        best = index
+            if best is not None:
+                canvas = self._idle.pop(best)
+        if canvas is None:
+            canvas = Canvas(
+                width=_round_up(width, _WIDTH_STEP),
+                height=_round_up(height, _HEIGHT_STEP),
+                theme=theme,
+            )
+        canvas.width = width
+        canvas.height = height
+        canvas.theme = theme
+        return canvas
+
+    def release(self, canvas: Canvas) -> None:
+        """Return a canvas to the pool.
+
+        Clears the region the last render could have dirtied. Canvases
+        that are not plain dense Canvas instances, are too large, or would
+        exceed max_idle are dropped.
+
+        Args:
+            canvas: Canvas obtained from acquire() (or any Canvas)
+        """
+        if type(canvas) is not Canvas or _cells(canvas) > self.max_cells:
+            return
+        canvas.clear()
+        with self._lock:
+            if len(self._idle) < self.max_idle:
+                self._idle.append(canvas)
+
+    @contextmanager
+    def canvas(
+        self, width: int, height: int, theme: EdgeTheme = DEFAULT_THEME
+    ) -> Iterator[Canvas]:
+        """Borrow a canvas for the duration of a with-block.
+
+        Args:
+            width: Columns
+            height: Rows
+            theme: Edge theme for line/arrow characters
+
+        Yields:
+            Blank canvas, released back to the pool on exit
+        """
+        canvas = self.acquire(width, height, theme)
+        try:
+            yield canvas
+        finally:
+            self.release(canvas)
+
+
+def _cells(canvas: Canvas) -> int:
+    """Buffer size of a canvas in cells (allocated, not logical)."""
+    return len(canvas._vmask) * len(canvas._grid)
+
+
+# Pool shared by render_dag() and friends
+canvas_pool = CanvasPool()
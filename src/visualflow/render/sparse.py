@@ -0,0 +1,186 @@
+"""Sparse canvas backend for mostly-empty diagrams.
+
+Wide layouts are mostly blank: a fan-out of a few dozen boxes can need a
+canvas of hundreds of thousands of cells of which a few percent are
+drawn. SparseCanvas stores only what is drawn - one dict of columns per
+touched row, and edge mask lines allocated on first write - and
+synthesizes spaces when rendering, so memory follows drawn content
+instead of width * height.
+
+canvas_for_layout() picks the backend from the layout's box density.
+"""
+
+from collections.abc import Callable, Iterator
+
+from visualflow.models import DEFAULT_THEME, EdgeTheme, LayoutResult
+from visualflow.render.canvas import Canvas
+from visualflow.render.glyphs import ARROW
+from visualflow.render.pool import CanvasPool
+
+# Use the sparse backend when boxes cover less than this fraction of the canvas
+SPARSE_DENSITY = 0.1
+
+
+class _LazyRows(dict):
+    """Row/column storage that creates an empty line on first write access."""
+
+    __slots__ = ("factory",)
+
+    def __init__(self, factory: Callable[[], dict[int, str] | bytearray]) -> None:
+        super().__init__()
+        self.factory = factory
+
+    def __missing__(self, key: int) -> dict[int, str] | bytearray:
+        line = self[key] = self.factory()
+        return line
+
+
+class SparseCanvas(Canvas):
+    """Canvas that stores only drawn cells.
+
+    Same interface and output as Canvas. Box characters are kept as
+    `_grid[y][x]` in per-row dicts; edge masks are bytearray lines created
+    only for rows/columns an edge touches. Reads never allocate.
+    """
+
+    __slots__ = ()
+
+    def __init__(self, *, width: int, height: int, theme: EdgeTheme = DEFAULT_THEME) -> None:
+        """Create a blank sparse canvas.
+
+        Args:
+            width: Columns
+            height: Rows
+            theme: Edge theme for line/arrow characters
+        """
+        self.width = width
+        self.height = height
+        self.theme = theme
+        self._grid = _LazyRows(dict)
+        self._hmask = _LazyRows(lambda: bytearray(width))
+        self._vmask = _LazyRows(lambda: bytearray(height))
+        self._has_edges = False
+
+    def _cell(self, x: int, y: int) -> str:
+        """Get the box character stored at an in-bounds cell."""
+        row = self._grid.get(y)
+        return row.get(x, " ") if row else " "
+
+    def _mask(self, x: int, y: int) -> int:
+        """Get the combined edge mask of an in-bounds cell."""
+        hrow = self._hmask.get(y)
+        column = self._vmask.get(x)
+        return (hrow[x] if hrow else 0) | (column[y] if column else 0)
+
+    def _inked_cells(self) -> Iterator[tuple[int, int, str]]:
+        """Iterate (x, y, char) over stored box characters."""
+        for y, row in self._grid.items():
+            for x, char in row.items():
+                yield x, y, char
+
+    def _blit_row(self, cells: tuple[str, ...], x: int, y: int) -> None:
+        """Copy in-bounds cells into one row, clearing edges under them."""
+        self._grid[y].update(zip(range(x, x + len(cells)), cells))
+        if self._has_edges:
+            for column in range(x, x + len(cells)):
+                self._clear_edge(column, y)
+
+    def _clear_edge(self, x: int, y: int) -> None:
+        """Remove all edge connectivity from a cell."""
+        hrow = self._hmask.get(y)
+        if hrow:
+            hrow[x] = 0
+        column = self._vmask.get(x)
+        if column:
+            column[y] = 0
+
+    def clear(self) -> None:
+        """Drop every stored cell and mask line."""
+        self._grid.clear()
+        self._hmask.clear()
+        self._vmask.clear()
+        self._has_edges = False
+
+    def render_lines(self) -> list[str]:
+        """Render every canvas row, synthesizing blank cells.
+
+        Returns:
+            One string per row (height entries, blank rows included)
+        """
+        compiled = self._compiled
+        glyphs = compiled.glyphs
+        arrow = compiled.arrow
+
+        # Edge cells per row: one pass over each allocated mask line
+        edge_rows: dict[int, list[int]] = {}
+        for y, hrow in self._hmask.items():
+            edge_rows[y] = [x for x, bits in enumerate(hrow) if bits]
+        for x, column in self._vmask.items():
+            for y, bits in enumerate(column):
+                if bits:
+                    edge_rows.setdefault(y, []).append(x)
+
+        grid = self._grid
+        last_row = max(
+            [y for y, row in grid.items() if row] + [y for y, xs in edge_rows.items() if xs],
+            default=-1,
+        )
+        lines = []
+        for y in range(last_row + 1):
+            row = grid.get(y) or {}
+            edge_xs = edge_rows.get(y, ())
+            if not row and not edge_xs:
+                lines.append("")
+                continue
+            cells = [" "] * (max(max(row, default=-1), max(edge_xs, default=-1)) + 1)
+            for x, char in row.items():
+                cells[x] = char
+            for x in edge_xs:
+                if cells[x] == " ":
+                    mask = self._mask(x, y)
+                    cells[x] = arrow if mask & ARROW else glyphs[mask & 15]
+            lines.append("".join(cells).rstrip())
+        lines.extend([""] * (self.height - len(lines)))
+        return lines
+
+
+def layout_density(layout: LayoutResult) -> float:
+    """Estimate the fraction of canvas cells a layout's boxes cover.
+
+    Args:
+        layout: Computed layout
+
+    Returns:
+        Box area divided by canvas area (0.0 for an empty canvas)
+    """
+    area = layout.width * layout.height
+    if area <= 0:
+        return 0.0
+    boxes = sum(pos.node.width * pos.node.height for pos in layout.positions.values())
+    return min(1.0, boxes / area)
+
+
+def canvas_for_layout(
+    layout: LayoutResult,
+    theme: EdgeTheme = DEFAULT_THEME,
+    pool: CanvasPool | None = None,
+) -> Canvas:
+    """Create a canvas for a layout, choosing the backend by density.
+
+    Layouts whose boxes cover less than SPARSE_DENSITY of the canvas get a
+    SparseCanvas; denser ones get the dense Canvas. Output is identical.
+
+    Args:
+        layout: Computed layout (sets the canvas size)
+        theme: Edge theme for line/arrow characters
+        pool: Pool to take a dense canvas from (release it when done);
+            sparse canvases are always created fresh
+
+    Returns:
+        Canvas or SparseCanvas sized to the layout
+    """
+    if layout_density(layout) < SPARSE_DENSITY:
+        return SparseCanvas(width=layout.width, height=layout.height, theme=theme)
+    if pool is not None:
+        return pool.acquire(layout.width, layout.height, theme)
+    return Canvas(width=layout.width, height=layout.height, theme=theme)
@@ -0,0 +1,112 @@
+"""Tiled rendering of layouts too large for one canvas.
+
+Splits the layout area into horizontal bands of `band_rows` rows and
+draws each band on one reusable band-sized canvas: only the boxes,
+connectors and edges that intersect the band are drawn, shifted into
+band coordinates, and the band's rows are emitted before the canvas is
+cleared for the next band. Memory is O(width * band_rows) regardless of
+the layout height.
+
+Band boundaries need no special junction handling: the canvas computes
+edge connectivity from the full (unclipped) segment, so a run cut by
+the band edge keeps its up/down bits on the boundary row, and the
+output is identical to drawing the whole layout on one canvas.
+"""
+
+from collections.abc import Iterator
+
+from visualflow.models import EdgeTheme, LayoutResult, NodePosition
+from visualflow.render.canvas import Canvas
+from visualflow.routing.segments import SegmentTable
+
+# Default band height: small enough to bound memory, large enough that
+# per-band overhead (bucket lookups, row joins) stays negligible
+DEFAULT_BAND_ROWS = 256
+
+
+def tile_layout(
+    layout: LayoutResult,
+    table: SegmentTable,
+    theme: EdgeTheme,
+    band_rows: int = DEFAULT_BAND_ROWS,
+) -> Iterator[str]:
+    """Render a computed layout band by band as a lazy sequence of rows.
+
+    Joining the rows with newlines gives the same text as drawing the
+    whole layout on one Canvas and calling render().
+
+    Args:
+        layout: Computed layout (node positions and canvas size)
+        table: Routed edges and connector points in layout coordinates
+        theme: Edge theme for line/arrow characters
+        band_rows: Rows per band (the only canvas ever allocated is
+            layout.width x band_rows)
+
+    Yields:
+        Rendered rows, top to bottom, trailing spaces and trailing blank
+        rows stripped
+
+    Raises:
+        ValueError: If band_rows is less than 1
+    """
+    if band_rows < 1:
+        raise ValueError(f"band_rows must be at least 1, got {band_rows}")
+    if not layout.positions:
+        return
+
+    height = layout.height
+    count = max(1, -(-height // band_rows))
+
+    def bands(top: int, bottom: int) -> range:
+        """Band indices covering rows [top, bottom]."""
+        first = min(max(top // band_rows, 0), count - 1)
+        last = min(max(bottom // band_rows, 0), count - 1)
+        return range(first, last + 1)
+
+    # Bucket everything by the bands it touches
+    nodes_by_band: list[list[NodePosition]] = [[] for _ in range(count)]
+    for pos in layout.positions.values():
+        for band in bands(pos.y, pos.y + pos.node.height - 1):
+            nodes_by_band[band].append(pos)
+    exits_by_band: list[list[tuple[int, int]]] = [[] for _ in range(count)]
+    for x, y in table.exits:
+        exits_by_band[bands(y, y)[0]].append((x, y))
+    edges_by_band: list[list[int]] = [[] for _ in range(count)]
+    data = table.segments
+    for index in range(len(table)):
+        start, end = table.offsets[index] * 4, table.offsets[index + 1] * 4
+        if start == end:
+            continue
+        ys = data[start + 1:end:2]
+        for band in bands(min(ys), max(ys)):
+            edges_by_band[band].append(index)
+
+    canvas = Canvas(width=max(layout.width, 1), height=band_rows, theme=theme)
+    blank_rows = 0
+    for band in range(count):
+        top = band * band_rows
+        if band:
+            canvas.clear()
+
+        for pos in nodes_by_band[band]:
+            canvas.place_box(pos.node.content, pos.x, pos.y - top)
+        canvas.place_connectors([(x, y - top) for x, y in exits_by_band[band]])
+        band_table = SegmentTable()
+        for index in edges_by_band[band]:
+            band_table.append(
+                table.source_ids[index],
+                table.target_ids[index],
+                ((x1, y1 - top, x2, y2 - top) for x1, y1, x2, y2 in table.edge_segments(index)),
+            )
+        canvas.draw_segments(band_table)
+
+        # Hold blank rows back until a drawn row follows, so trailing
+        # blank rows are dropped as render() does
+        for line in canvas.render_lines()[:height - top]:
+            if not line:
+                blank_rows += 1
+                continue
+            for _ in range(blank_rows):
+                yield ""
+            blank_rows = 0
+            yield line
@@ -1,6 +1,16 @@
 """Edge routing components."""
 
-from visualflow.routing.base import EdgeRouter
+from visualflow.routing.base import ColumnarRouter, ConnectorRouter, EdgeRouter, LayoutRouter
+from visualflow.routing.segments import SegmentTable
 from visualflow.routing.simple import SimpleRouter
+from visualflow.routing.snap import SnapRouter
 
-__all__ = ["EdgeRouter", "SimpleRouter"]
+__all__ = [
+    "EdgeRouter",
+    "ConnectorRouter",
+    "ColumnarRouter",
+    "LayoutRouter",
+    "SegmentTable",
+    "SimpleRouter",
+    "SnapRouter",
+]
@@ -1,13 +1,17 @@
-"""Edge router protocol definition.
+"""Edge router protocol definitions.
 
-Defines the interface that all edge routers must implement.
+Defines the interface that all edge routers must implement, and the
+richer outputs a router may add. The renderer checks for those with
+isinstance() and otherwise derives them from route().
 """
 
-from typing import Protocol
+from typing import Protocol, runtime_checkable
 
-from visualflow.models import Edge, EdgePath, NodePosition
+from visualflow.models import Edge, EdgePath, LayoutResult, NodePosition, RouteResult
+from visualflow.routing.segments import SegmentTable
 
 
+@runtime_checkable
 class EdgeRouter(Protocol):
     """Interface for edge path computation.
 
@@ -30,3 +34,78 @@ class EdgeRouter(Protocol):
             List of EdgePath objects with computed segments
         """
         ...
+
+
+@runtime_checkable
+class ConnectorRouter(EdgeRouter, Protocol):
+    """Edge router that also returns the box connector points it used.
+
+    The renderer falls back to RouteResult.from_paths(route()) for
+    routers without it.
+    """
+
+    def route_with_connectors(
+        self,
+        positions: dict[str, NodePosition],
+        edges: list[Edge],
+    ) -> RouteResult:
+        """Compute paths together with their box connector points.
+
+        Args:
+            positions: Node positions keyed by node ID
+            edges: List of edges to route
+
+        Returns:
+            RouteResult with paths, exit connectors and entry points
+        """
+        ...
+
+
+@runtime_checkable
+class ColumnarRouter(EdgeRouter, Protocol):
+    """Edge router with columnar output.
+
+    Preferred by render_dag() when available, since the canvas
+    rasterizes a table in bulk without per-edge EdgePath objects.
+    """
+
+    def route_columnar(
+        self,
+        positions: dict[str, NodePosition],
+        edges: list[Edge],
+    ) -> SegmentTable:
+        """Compute paths and connectors as a columnar SegmentTable.
+
+        Args:
+            positions: Node positions keyed by node ID
+            edges: List of edges to route
+
+        Returns:
+            SegmentTable with segments, edge offsets and connector points
+        """
+        ...
+
+
+@runtime_checkable
+class LayoutRouter(EdgeRouter, Protocol):
+    """Edge router that uses the whole layout, not just positions.
+
+    Preferred over the other outputs when available (SnapRouter follows
+    the engine's edge_points).
+    """
+
+    def route_layout(
+        self,
+        layout: LayoutResult,
+        edges: list[Edge],
+    ) -> SegmentTable:
+        """Compute paths from the whole layout.
+
+        Args:
+            layout: Computed layout
+            edges: List of edges to route
+
+        Returns:
+            SegmentTable with segments, edge offsets and connector points
+        """
+        ...
@@ -0,0 +1,107 @@
+"""Columnar routing output.
+
+A SegmentTable stores every routed segment in one flat integer array
+instead of one EdgePath (and one list of tuples) per edge. Routers can
+append to it directly, and Canvas.draw_segments() rasterizes the whole
+table at once, grouping runs by column and row.
+"""
+
+from array import array
+from collections.abc import Iterable, Iterator
+from itertools import chain
+
+from visualflow.models import EdgePath, RouteResult
+
+
+class SegmentTable:
+    """Columnar counterpart of RouteResult.
+
+    Layout:
+        segments: flat int array, 4 values (x1, y1, x2, y2) per segment
+        offsets: edge i owns segments offsets[i] to offsets[i + 1] (exclusive)
+        source_ids / target_ids: edge i's endpoints
+        exits / entries: connector points, as in RouteResult
+
+    Usage:
+        table = SimpleRouter().route_columnar(positions, edges)
+        canvas.place_connectors(table.exits)
+        canvas.draw_segments(table)
+    """
+
+    __slots__ = ("segments", "offsets", "source_ids", "target_ids", "exits", "entries")
+
+    def __init__(self) -> None:
+        """Create an empty table."""
+        self.segments = array("i")
+        self.offsets = array("i", [0])
+        self.source_ids: list[str] = []
+        self.target_ids: list[str] = []
+        self.exits: list[tuple[int, int]] = []
+        self.entries: list[tuple[int, int]] = []
+
+    def __len__(self) -> int:
+        """Number of edges in the table."""
+        return len(self.source_ids)
+
+    def append(
+        self,
+        source_id: str,
+        target_id: str,
+        segments: Iterable[tuple[int, int, int, int]],
+    ) -> None:
+        """Add one edge's segments.
+
+        Args:
+            source_id: Source node ID
+            target_id: Target node ID
+            segments: (x1, y1, x2, y2) segments in drawing order
+        """
+        self.segments.extend(chain.from_iterable(segments))
+        self.offsets.append(len(self.segments) // 4)
+        self.source_ids.append(source_id)
+        self.target_ids.append(target_id)
+
+    def edge_segments(self, index: int) -> list[tuple[int, int, int, int]]:
+        """Get the segments of one edge.
+
+        Args:
+            index: Edge index
+
+        Returns:
+            List of (x1, y1, x2, y2) tuples
+        """
+        data = self.segments
+        return [
+            (data[i], data[i + 1], data[i + 2], data[i + 3])
+            for i in range(self.offsets[index] * 4, self.offsets[index + 1] * 4, 4)
+        ]
+
+    def paths(self) -> Iterator[EdgePath]:
+        """Materialize the edges as EdgePath objects, in order."""
+        for index in range(len(self)):
+            yield EdgePath.model_construct(
+                source_id=self.source_ids[index],
+                target_id=self.target_ids[index],
+                segments=self.edge_segments(index),
+            )
+
+    def to_route_result(self) -> RouteResult:
+        """Convert to a RouteResult (allocates one EdgePath per edge)."""
+        return RouteResult(paths=list(self.paths()), exits=self.exits, entries=self.entries)
+
+    @classmethod
+    def from_route_result(cls, result: RouteResult) -> "SegmentTable":
+        """Build a table from a RouteResult.
+
+        Args:
+            result: Routed paths and connector points
+
+        Returns:
+            SegmentTable with the same edges and connectors
+        """
+        table = cls()
+        for path in result.paths:
+            table.append(path.source_id, path.target_id, path.segments)
+        table.exits = list(result.exits)
+        table.entries = list(result.entries)
+        return table
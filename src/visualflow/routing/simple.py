@@ -5,7 +5,67 @@ Routes edges using basic geometric patterns:
 - Z-shaped paths for offset nodes
 """
 
-from visualflow.models import Edge, EdgePath, NodePosition
+from collections.abc import Iterator
+from dataclasses import dataclass
+
+from visualflow.models import Edge, EdgePath, NodePosition, RouteResult
+from visualflow.routing.segments import SegmentTable
+
+
+@dataclass(slots=True)
+class _WrappedLayer:
+    """Geometry of a layer wrapped into sub-rows (see wrap_layers())."""
+
+    row_tops: list[int]  # Top row of each sub-row
+    bottom: int  # First row below the layer
+    cell_width: int  # Widest box; lanes run in the gaps beside cells
+    lanes: int  # Lanes on each side of a cell (sub-rows share if too few)
+
+    def out_lane(self, source: NodePosition) -> int:
+        """Column that edges out of an upper sub-row descend.
+
+        Lanes of higher sub-rows lie further right, so no edge turning
+        into its lane crosses the lane of another sub-row.
+        """
+        return source.x + self.cell_width + self.lanes - source.row % self.lanes
+
+    def in_lane(self, target: NodePosition) -> int:
+        """Column that edges into a lower sub-row descend.
+
+        Lanes of lower sub-rows lie further left, so no edge turning off
+        its lane crosses the lane of another sub-row.
+        """
+        return target.x - 1 - (target.row - 1) % self.lanes
+
+
+def _wrapped_layers(positions: dict[str, NodePosition]) -> dict[int, _WrappedLayer]:
+    """Collect the geometry of every wrapped layer in a layout.
+
+    Args:
+        positions: Node positions keyed by node ID
+
+    Returns:
+        Layer index -> geometry, for layers with more than one sub-row
+    """
+    members: dict[int, list[NodePosition]] = {}
+    for pos in positions.values():
+        if pos.layer is not None:
+            members.setdefault(pos.layer, []).append(pos)
+    wraps: dict[int, _WrappedLayer] = {}
+    for layer, layer_positions in members.items():
+        tops: dict[int, int] = {}
+        for pos in layer_positions:
+            tops[pos.row] = min(tops.get(pos.row, pos.y), pos.y)
+        if len(tops) < 2:
+            continue
+        wraps[layer] = _WrappedLayer(
+            row_tops=[tops[row] for row in sorted(tops)],
+            bottom=max(pos.y + pos.node.height for pos in layer_positions),
+            cell_width=max(pos.node.width for pos in layer_positions),
+            # wrap_layers() leaves a margin one column wider than the lanes
+            lanes=max(1, min(pos.x for pos in layer_positions) - 1),
+        )
+    return wraps
 
 
 class SimpleRouter:
@@ -34,8 +94,92 @@ class SimpleRouter:
 
         Returns:
             List of EdgePath objects with computed segments
+
+        Layers wrapped by wrap_layers() are routed around their sub-rows:
+        edges into a lower sub-row descend the column just left of their
+        target's cell, and edges out of an upper sub-row leave through the
+        column just right of their box. Each sub-row of each cell has
+        its own lanes, so edges to or from different nodes never share a
+        track.
         """
-        paths: list[EdgePath] = []
+        return self.route_with_connectors(positions, edges).paths
+
+    def route_with_connectors(
+        self,
+        positions: dict[str, NodePosition],
+        edges: list[Edge],
+    ) -> RouteResult:
+        """Compute paths and the connector points they leave and enter by.
+
+        Exits are recorded as edges are routed, so renderers place box
+        connectors from this result instead of re-deriving the routing
+        pattern per source. Every outgoing edge of a placed source gets
+        its exit connector, even if its target has no position.
+
+        Args:
+            positions: Node positions keyed by node ID
+            edges: List of edges to route
+
+        Returns:
+            RouteResult with paths, exit connectors and entry points
+        """
+        exits: dict[tuple[int, int], None] = {}
+        entries: dict[tuple[int, int], None] = {}
+        paths = [
+            EdgePath.model_construct(source_id=source_id, target_id=target_id, segments=segments)
+            for source_id, target_id, segments in self._plan_routes(
+                positions, edges, exits, entries
+            )
+        ]
+        return RouteResult.model_construct(paths=paths, exits=list(exits), entries=list(entries))
+
+    def route_columnar(
+        self,
+        positions: dict[str, NodePosition],
+        edges: list[Edge],
+    ) -> SegmentTable:
+        """Compute paths and connectors as a columnar SegmentTable.
+
+        Same routing as route_with_connectors(), but segments go straight
+        into flat integer arrays: no EdgePath is allocated or validated.
+
+        Args:
+            positions: Node positions keyed by node ID
+            edges: List of edges to route
+
+        Returns:
+            SegmentTable with segments, edge offsets and connector points
+        """
+        table = SegmentTable()
+        exits: dict[tuple[int, int], None] = {}
+        entries: dict[tuple[int, int], None] = {}
+        for source_id, target_id, segments in self._plan_routes(
+            positions, edges, exits, entries
+        ):
+            table.append(source_id, target_id, segments)
+        table.exits = list(exits)
+        table.entries = list(entries)
+        return table
+
+    def _plan_routes(
+        self,
+        positions: dict[str, NodePosition],
+        edges: list[Edge],
+        exits: dict[tuple[int, int], None],
+        entries: dict[tuple[int, int], None],
+    ) -> Iterator[tuple[str, str, list[tuple[int, int, int, int]]]]:
+        """Route all edges, yielding raw segments (shared by all outputs).
+
+        Args:
+            positions: Node positions keyed by node ID
+            edges: List of edges to route
+            exits: Ordered set of exit connectors (mutated)
+            entries: Ordered set of entry points (mutated)
+
+        Yields:
+            (source_id, target_id, segments) per routed edge
+        """
+        wraps = _wrapped_layers(positions)
 
         # Group edges by source
         edges_by_source: dict[str, list[Edge]] = {}
@@ -49,12 +193,16 @@ class SimpleRouter:
             source_pos = positions.get(source_id)
             if not source_pos:
                 continue
+            exit_y = source_pos.y + source_pos.node.height - 1  # Bottom border
 
             if len(source_edges) == 1:
                 # Single edge - simple routing from center
-                path = self._route_edge(positions, source_edges[0])
-                if path:
-                    paths.append(path)
+                edge = source_edges[0]
+                exits[(source_pos.x + source_pos.node.width // 2, exit_y)] = None
+                segments = self._edge_segments(positions, edge, wraps=wraps)
+                if segments is not None:
+                    entries[self._entry_point(positions[edge.target])] = None
+                    yield source_id, edge.target, segments
                 continue
 
             # Multiple edges - check for same-layer targets
@@ -63,10 +211,12 @@ class SimpleRouter:
             if same_layer_targets and len(same_layer_targets) == len(source_edges):
                 # ALL targets on same layer - use trunk-and-split
                 center_x = source_pos.x + source_pos.node.width // 2
-                trunk_paths = self._route_trunk_split(
-                    positions, source_id, same_layer_targets, center_x
-                )
-                paths.extend(trunk_paths)
+                exits[(center_x, exit_y)] = None
+                for target_id, segments in self._trunk_split_segments(
+                    positions, source_id, same_layer_targets, center_x, wraps
+                ):
+                    entries[self._entry_point(positions[target_id])] = None
+                    yield source_id, target_id, segments
             else:
                 # Mixed layers or no same-layer - use individual exit points
                 exit_points = self._calculate_exit_points(source_pos, len(source_edges))
@@ -79,11 +229,16 @@ class SimpleRouter:
 
                 for i, edge in enumerate(sorted_edges):
                     exit_x = exit_points[i] if i < len(exit_points) else exit_points[-1]
-                    path = self._route_edge(positions, edge, exit_x=exit_x)
-                    if path:
-                        paths.append(path)
+                    exits[(exit_x, exit_y)] = None
+                    segments = self._edge_segments(positions, edge, exit_x=exit_x, wraps=wraps)
+                    if segments is not None:
+                        entries[self._entry_point(positions[edge.target])] = None
+                        yield source_id, edge.target, segments
 
-        return paths
+    @staticmethod
+    def _entry_point(target_pos: NodePosition) -> tuple[int, int]:
+        """Get the entry cell just above the top center of a target box."""
+        return (target_pos.x + target_pos.node.width // 2, target_pos.y - 1)
 
     def _route_edge(
         self,
@@ -101,6 +256,33 @@ class SimpleRouter:
         Returns:
             EdgePath with segments, or None if positions missing
         """
+        segments = self._edge_segments(positions, edge, exit_x, _wrapped_layers(positions))
+        if segments is None:
+            return None
+        return EdgePath.model_construct(
+            source_id=edge.source,
+            target_id=edge.target,
+            segments=segments,
+        )
+
+    def _edge_segments(
+        self,
+        positions: dict[str, NodePosition],
+        edge: Edge,
+        exit_x: int | None = None,
+        wraps: dict[int, _WrappedLayer] | None = None,
+    ) -> list[tuple[int, int, int, int]] | None:
+        """Compute the segments of a single edge.
+
+        Args:
+            positions: Node positions keyed by node ID
+            edge: Edge to route
+            exit_x: Optional x coordinate for exit point (defaults to center)
+            wraps: Wrapped layer geometry from _wrapped_layers()
+
+        Returns:
+            List of segments, or None if positions missing
+        """
         source_pos = positions.get(edge.source)
         target_pos = positions.get(edge.target)
         if not source_pos or not target_pos:
@@ -119,6 +301,40 @@ class SimpleRouter:
         target_y = target_pos.y - 1  # Just above box
 
         segments: list[tuple[int, int, int, int]] = []
+        suffix: list[tuple[int, int, int, int]] = []
+        turn = 1  # Rows below the source where a lane-bound edge turns
+        lane_bound = False
+
+        if wraps:
+            source_wrap = wraps.get(source_pos.layer) if source_pos.layer is not None else None
+            if source_wrap is not None and source_pos.row < len(source_wrap.row_tops) - 1:
+                # Leave an upper sub-row: step into the gap row, right to
+                # the sub-row's lane beside the cell, down past the layer
+                gap_y = source_y + 1
+                lane_x = source_wrap.out_lane(source_pos)
+                segments.append((source_x, source_y, source_x, gap_y))
+                segments.append((source_x, gap_y, lane_x, gap_y))
+                segments.append((lane_x, gap_y, lane_x, source_wrap.bottom + 1))
+                source_x, source_y = lane_x, source_wrap.bottom + 1
+                # Higher sub-rows turn lower, so turns from different
+                # sub-rows never share a row
+                turn = len(source_wrap.row_tops) - 1 - source_pos.row
+            target_wrap = wraps.get(target_pos.layer) if target_pos.layer is not None else None
+            if target_wrap is not None and target_pos.row > 0:
+                # Enter a lower sub-row: down the lane just left of the
+                # target's cell, across over its box, then drop onto it
+                lane_x = target_wrap.in_lane(target_pos)
+                lane_top = target_wrap.row_tops[0] - 2
+                split_y = target_pos.y - 2
+                suffix = [
+                    (lane_x, lane_top, lane_x, split_y),
+                    (lane_x, split_y, target_x, split_y),
+                    (target_x, split_y, target_x, target_y),
+                ]
+                target_x, target_y = lane_x, lane_top
+                # Turn towards the lane just below the source, above the
+                # row where edges into upper sub-rows turn
+                lane_bound = True
 
         if source_x == target_x:
             # Straight vertical line
@@ -126,7 +342,7 @@ class SimpleRouter:
         else:
             # Z-shape: down, across, down
             # Midpoint Y between source bottom and target top
-            mid_y = (source_y + target_y) // 2
+            mid_y = source_y + turn if lane_bound else (source_y + target_y) // 2
 
             # Ensure mid_y creates valid segments (not zero-length)
             # Need at least 1 row for vertical segment before horizontal turn
@@ -150,11 +366,8 @@ class SimpleRouter:
                 # Boxes too close or inverted, just draw horizontal
                 segments.append((source_x, source_y, target_x, source_y))
 
-        return EdgePath(
-            source_id=edge.source,
-            target_id=edge.target,
-            segments=segments,
-        )
+        segments.extend(suffix)
+        return segments
 
     def _analyze_edges(
         self,
@@ -225,6 +438,11 @@ class SimpleRouter:
         if len(target_ys) < 2:
             return []
 
+        # Targets all in one wrapped layer share a trunk across sub-rows
+        layers = {positions[target_id].layer for target_id, _ in target_ys}
+        if len(layers) == 1 and None not in layers:
+            return [target_id for target_id, _ in target_ys]
+
         # Check if all targets are within tolerance of each other
         ys = [y for _, y in target_ys]
         y_range = max(ys) - min(ys)
@@ -334,6 +552,38 @@ class SimpleRouter:
         Returns:
             List of EdgePath objects for all routed edges
         """
+        return [
+            EdgePath.model_construct(source_id=source_id, target_id=target_id, segments=segments)
+            for target_id, segments in self._trunk_split_segments(
+                positions, source_id, target_ids, exit_x, _wrapped_layers(positions)
+            )
+        ]
+
+    def _trunk_split_segments(
+        self,
+        positions: dict[str, NodePosition],
+        source_id: str,
+        target_ids: list[str],
+        exit_x: int,
+        wraps: dict[int, _WrappedLayer] | None = None,
+    ) -> list[tuple[str, list[tuple[int, int, int, int]]]]:
+        """Compute trunk-and-split segments for same-layer targets.
+
+        Targets in lower sub-rows of a wrapped layer branch off the split
+        line into the lane just left of their cell, and turn onto the
+        target over its own box.
+
+        Args:
+            positions: Node positions keyed by node ID
+            source_id: ID of source node
+            target_ids: IDs of target nodes (all at same y, or all in
+                one wrapped layer)
+            exit_x: X coordinate for trunk exit
+            wraps: Wrapped layer geometry from _wrapped_layers()
+
+        Returns:
+            List of (target_id, segments), sorted left to right
+        """
         if not target_ids:
             return []
 
@@ -341,7 +591,7 @@ class SimpleRouter:
         if not source_pos:
             return []
 
-        paths: list[EdgePath] = []
+        routes: list[tuple[str, list[tuple[int, int, int, int]]]] = []
 
         # Get target positions and sort by x
         target_positions = []
@@ -355,31 +605,62 @@ class SimpleRouter:
 
         target_positions.sort(key=lambda t: t[1].x)
 
+        def layer_top(target_pos: NodePosition) -> int:
+            """Top of the target's first sub-row (its own top if not wrapped)."""
+            wrap = wraps.get(target_pos.layer) if wraps and target_pos.layer is not None else None
+            return wrap.row_tops[0] if wrap is not None else target_pos.y
+
         # Calculate trunk endpoint (4 rows above topmost target for arrow space)
         # Use minimum y (topmost target) to ensure all targets have room for arrows
-        min_target_y = min(tp[1].y for tp in target_positions)
+        min_target_y = min(layer_top(tp[1]) for tp in target_positions)
         trunk_end_y = min_target_y - 4  # Leave room for arrow below split
 
-        # Calculate horizontal split range
-        leftmost_x = min(tp[1].x + tp[1].node.width // 2 for tp in target_positions)
-        rightmost_x = max(tp[1].x + tp[1].node.width // 2 for tp in target_positions)
-
         # Source exit point
         source_y = source_pos.y + source_pos.node.height
 
+        # A source in an upper sub-row of a wrapped layer leaves through
+        # the gap right of its cell; the trunk starts below the layer
+        prefix: list[tuple[int, int, int, int]] = []
+        trunk_x, trunk_y = exit_x, source_y
+        source_wrap = (
+            wraps.get(source_pos.layer) if wraps and source_pos.layer is not None else None
+        )
+        if source_wrap is not None and source_pos.row < len(source_wrap.row_tops) - 1:
+            gap_y = source_y + 1
+            trunk_x = source_wrap.out_lane(source_pos)
+            trunk_y = source_wrap.bottom + 1
+            prefix = [
+                (exit_x, source_y, exit_x, gap_y),
+                (exit_x, gap_y, trunk_x, gap_y),
+                (trunk_x, gap_y, trunk_x, trunk_y),
+            ]
+
         # Create path for each target
         for target_id, target_pos in target_positions:
-            segments: list[tuple[int, int, int, int]] = []
+            segments: list[tuple[int, int, int, int]] = list(prefix)
             target_x = target_pos.x + target_pos.node.width // 2
             target_entry_y = target_pos.y - 1
 
             # Segment 1: Vertical trunk from source
-            if source_y < trunk_end_y:
-                segments.append((exit_x, source_y, exit_x, trunk_end_y))
+            if trunk_y < trunk_end_y:
+                segments.append((trunk_x, trunk_y, trunk_x, trunk_end_y))
+
+            wrap = wraps.get(target_pos.layer) if wraps and target_pos.layer is not None else None
+            if wrap is not None and target_pos.row > 0:
+                # Lower sub-row: along the split line to the target's lane,
+                # down the lane, across over the target, drop onto it
+                lane_x = wrap.in_lane(target_pos)
+                split_y = target_pos.y - 2
+                segments.append((trunk_x, trunk_end_y, lane_x, trunk_end_y))
+                segments.append((lane_x, trunk_end_y, lane_x, split_y))
+                segments.append((lane_x, split_y, target_x, split_y))
+                segments.append((target_x, split_y, target_x, target_entry_y))
+                routes.append((target_id, segments))
+                continue
 
             # Segment 2: Horizontal to target column
-            if exit_x != target_x:
-                segments.append((exit_x, trunk_end_y, target_x, trunk_end_y))
+            if trunk_x != target_x:
+                segments.append((trunk_x, trunk_end_y, target_x, trunk_end_y))
 
             # Segment 3: Vertical drop to target (if any gap)
             if trunk_end_y < target_entry_y:
@@ -392,13 +673,9 @@ class SimpleRouter:
             if not segments:
                 segments.append((exit_x, source_y, target_x, target_entry_y))
 
-            paths.append(EdgePath(
-                source_id=source_id,
-                target_id=target_id,
-                segments=segments,
-            ))
+            routes.append((target_id, segments))
 
-        return paths
+        return routes
 
     def _route_merge_edges(
         self,
@@ -484,7 +761,7 @@ class SimpleRouter:
             if not segments:
                 segments.append((source_x, source_y, target_x, target_entry_y))
 
-            paths.append(EdgePath(
+            paths.append(EdgePath.model_construct(
                 source_id=source_id,
                 target_id=target_id,
                 segments=segments,
@@ -623,7 +900,7 @@ class SimpleRouter:
                     segments.append((exit_x, source_y, target_x, source_y))
                     segments.append((target_x, source_y, target_x, target_y))
 
-            paths.append(EdgePath(
+            paths.append(EdgePath.model_construct(
                 source_id=source_id,
                 target_id=edge.target,
                 segments=segments,
@@ -658,7 +935,7 @@ class SimpleRouter:
             if not segments:
                 segments.append((exit_x, source_y, target_x, target_y))
 
-            paths.append(EdgePath(
+            paths.append(EdgePath.model_construct(
                 source_id=source_id,
                 target_id=edge.target,
                 segments=segments,
@@ -0,0 +1,299 @@
+"""Edge router that follows engine-computed routes.
+
+Layout engines such as Graphviz route every edge themselves, bending
+splines around the boxes they pass. SnapRouter keeps the shape of those
+routes instead of drawing a Z-shape between the endpoints:
+
+- Edges leave the source's bottom border and enter the target's top
+  border where the route does (clamped inside the border)
+- Between layers, the edge runs down the column where the route crosses
+  each layer it passes, moved to the nearest free column if a box is
+  there
+- Column changes are drawn as horizontal jogs in the empty rows between
+  layers
+
+Edges without a route in the layout (or pointing up or sideways), and
+edges that would have to change column where no row is free to jog in,
+are routed by a fallback router, SimpleRouter by default.
+"""
+
+from visualflow.models import Edge, EdgePath, LayoutResult, NodePosition, RouteResult
+from visualflow.routing.base import ColumnarRouter, ConnectorRouter, EdgeRouter
+from visualflow.routing.segments import SegmentTable
+from visualflow.routing.simple import SimpleRouter
+
+# (top, bottom exclusive, boxes) of one layer
+_Band = tuple[int, int, list[NodePosition]]
+
+
+class SnapRouter:
+    """Router that snaps the layout's edge_points to the character grid.
+
+    Usage:
+        layout = GraphvizEngine(keep_edge_points=True).compute(dag)
+        table = SnapRouter().route_layout(layout, dag.edges)
+
+    render_dag() calls route_layout() itself, so passing
+    GraphvizEngine(keep_edge_points=True) and SnapRouter() is enough.
+    """
+
+    def __init__(self, fallback: EdgeRouter | None = None, samples: int = 8) -> None:
+        """Initialize router.
+
+        Args:
+            fallback: Router for edges without a route (defaults to
+                SimpleRouter)
+            samples: Points sampled per cubic Bezier piece of a route
+        """
+        self.fallback = fallback if fallback is not None else SimpleRouter()
+        self.samples = samples
+
+    def route(
+        self,
+        positions: dict[str, NodePosition],
+        edges: list[Edge],
+    ) -> list[EdgePath]:
+        """Compute paths with the fallback router (no routes known).
+
+        Args:
+            positions: Node positions keyed by node ID
+            edges: List of edges to route
+
+        Returns:
+            List of EdgePath objects with computed segments
+        """
+        return self.fallback.route(positions, edges)
+
+    def route_with_connectors(
+        self,
+        positions: dict[str, NodePosition],
+        edges: list[Edge],
+    ) -> RouteResult:
+        """Compute paths and connectors with the fallback router.
+
+        Args:
+            positions: Node positions keyed by node ID
+            edges: List of edges to route
+
+        Returns:
+            RouteResult with paths, exit connectors and entry points
+        """
+        return self._fallback_table(positions, edges).to_route_result()
+
+    def route_columnar(
+        self,
+        positions: dict[str, NodePosition],
+        edges: list[Edge],
+    ) -> SegmentTable:
+        """Compute a SegmentTable with the fallback router.
+
+        Args:
+            positions: Node positions keyed by node ID
+            edges: List of edges to route
+
+        Returns:
+            SegmentTable with segments, edge offsets and connector points
+        """
+        return self._fallback_table(positions, edges)
+
+    def route_layout(self, layout: LayoutResult, edges: list[Edge]) -> SegmentTable:
+        """Route edges along the layout's edge_points.
+
+        Args:
+            layout: Computed layout, with edge_points from the engine
+            edges: List of edges to route
+
+        Returns:
+            SegmentTable with the snapped edges first, then the edges
+            routed by the fallback router
+        """
+        positions = layout.positions
+        if not layout.edge_points:
+            return self._fallback_table(positions, edges)
+
+        table = SegmentTable()
+        bands = _bands(positions)
+        unrouted: list[Edge] = []
+        exits: dict[tuple[int, int], None] = {}
+        entries: dict[tuple[int, int], None] = {}
+        for edge in edges:
+            source = positions.get(edge.source)
+            target = positions.get(edge.target)
+            points = layout.edge_points.get((edge.source, edge.target))
+            if (
+                source is None
+                or target is None
+                or not points
+                or target.y <= source.y + source.node.height
+            ):
+                unrouted.append(edge)
+                continue
+            snapped = self._snap(source, target, points, bands, layout.width)
+            if snapped is None:
+                unrouted.append(edge)
+                continue
+            exit_x, entry_x, segments = snapped
+            table.append(edge.source, edge.target, segments)
+            exits[(exit_x, source.y + source.node.height - 1)] = None
+            entries[(entry_x, target.y - 1)] = None
+
+        if unrouted:
+            rest = self._fallback_table(positions, unrouted)
+            for index in range(len(rest)):
+                table.append(rest.source_ids[index], rest.target_ids[index], rest.edge_segments(index))
+            exits.update(dict.fromkeys(rest.exits))
+            entries.update(dict.fromkeys(rest.entries))
+        table.exits = list(exits)
+        table.entries = list(entries)
+        return table
+
+    def _fallback_table(
+        self,
+        positions: dict[str, NodePosition],
+        edges: list[Edge],
+    ) -> SegmentTable:
+        """Route edges with the fallback router, as a SegmentTable."""
+        if isinstance(self.fallback, ColumnarRouter):
+            return self.fallback.route_columnar(positions, edges)
+        if isinstance(self.fallback, ConnectorRouter):
+            return SegmentTable.from_route_result(self.fallback.route_with_connectors(positions, edges))
+        return SegmentTable.from_route_result(RouteResult.from_paths(self.fallback.route(positions, edges)))
+
+    def _snap(
+        self,
+        source: NodePosition,
+        target: NodePosition,
+        points: list[tuple[float, float]],
+        bands: list[_Band],
+        width: int,
+    ) -> tuple[int, int, list[tuple[int, int, int, int]]] | None:
+        """Snap one downward route to grid segments.
+
+        Args:
+            source: Source box position
+            target: Target box position
+            points: Route control points in character coordinates
+            bands: Layers of the layout, top to bottom
+            width: Canvas width (passed layers are crossed inside it)
+
+        Returns:
+            (exit x, entry x, segments from below the source to the
+            arrow cell above the target), or None if the route changes
+            column where there is no row to jog in and its column is
+            not free in the next layer
+        """
+        curve = _sample(points, self.samples)
+        if curve[0][1] > curve[-1][1]:
+            curve.reverse()  # Drawn head to tail
+        start_y = source.y + source.node.height
+        end_y = target.y - 1
+        exit_x = _clamp(round(curve[0][0]), source.x, source.node.width)
+        entry_x = _clamp(round(curve[-1][0]), target.x, target.node.width)
+
+        # Column per layer passed between the two boxes; the gaps around
+        # those layers are where the edge may change column
+        passed = [band for band in bands if band[0] >= start_y and band[1] <= target.y]
+        columns = [exit_x]
+        gaps = []
+        gap_top = start_y
+        for top, bottom, boxes in passed:
+            x = round(_x_at(curve, (top + bottom - 1) / 2))
+            columns.append(_free_column(x, boxes, width))
+            gaps.append((gap_top, top - 1))
+            gap_top = bottom
+        columns.append(entry_x)
+        gaps.append((gap_top, end_y))
+
+        segments: list[tuple[int, int, int, int]] = []
+        x, y = exit_x, start_y
+        for index, ((first, last), next_x) in enumerate(zip(gaps, columns[1:])):
+            if next_x == x:
+                continue
+            if last < first:
+                # No row to jog in: run on down the same column if the
+                # next layer leaves it free (never into the target)
+                if index == len(passed) or _covered(x, passed[index][2]) or not 0 <= x < width:
+                    return None
+                continue
+            # Jog mid-gap, keeping a vertical stub below the source and
+            # above the arrow where the gap allows
+            jog = (first + last) // 2
+            if first == start_y and last > first:
+                jog = max(jog, first + 1)
+            if last == end_y and last > first:
+                jog = min(jog, last - 1)
+            if jog > y:
+                segments.append((x, y, x, jog))
+            segments.append((x, jog, next_x, jog))
+            x, y = next_x, jog
+        segments.append((x, y, x, end_y))
+        return exit_x, entry_x, segments
+
+
+def _bands(positions: dict[str, NodePosition]) -> list[_Band]:
+    """Group boxes into layers of overlapping row ranges, top to bottom."""
+    bands: list[_Band] = []
+    for pos in sorted(positions.values(), key=lambda pos: pos.y):
+        bottom = pos.y + pos.node.height
+        if bands and pos.y < bands[-1][1]:
+            top, end, boxes = bands[-1]
+            boxes.append(pos)
+            bands[-1] = (top, max(end, bottom), boxes)
+        else:
+            bands.append((pos.y, bottom, [pos]))
+    return bands
+
+
+def _sample(points: list[tuple[float, float]], samples: int) -> list[tuple[float, float]]:
+    """Flatten a route into a polyline.
+
+    Points are read as a piecewise cubic Bezier curve (1 + 3k points, as
+    Graphviz writes splines); any other count is taken as a polyline.
+    """
+    if len(points) < 4 or (len(points) - 1) % 3:
+        return list(points)
+    curve = [points[0]]
+    for i in range(0, len(points) - 1, 3):
+        (x0, y0), (x1, y1), (x2, y2), (x3, y3) = points[i : i + 4]
+        for step in range(1, samples + 1):
+            t = step / samples
+            u = 1 - t
+            curve.append(
+                (
+                    u * u * u * x0 + 3 * u * u * t * x1 + 3 * u * t * t * x2 + t * t * t * x3,
+                    u * u * u * y0 + 3 * u * u * t * y1 + 3 * u * t * t * y2 + t * t * t * y3,
+                )
+            )
+    return curve
+
+
+def _x_at(curve: list[tuple[float, float]], y: float) -> float:
+    """Column where a polyline first reaches row y (nearest end if never)."""
+    for (x1, y1), (x2, y2) in zip(curve, curve[1:]):
+        if min(y1, y2) <= y <= max(y1, y2):
+            return x1 if y1 == y2 else x1 + (x2 - x1) * (y - y1) / (y2 - y1)
+    start, end = curve[0], curve[-1]
+    return start[0] if abs(start[1] - y) <= abs(end[1] - y) else end[0]
+
+
+def _clamp(x: int, left: int, width: int) -> int:
+    """Clamp a column inside a box border, off its corners."""
+    if width < 3:
+        return left + width // 2
+    return min(max(x, left + 1), left + width - 2)
+
+
+def _free_column(x: int, boxes: list[NodePosition], width: int) -> int:
+    """Nearest column to x, inside the canvas, that no box of a layer covers."""
+
+    x = min(max(x, 0), max(width - 1, 0))
+    for distance in range(width):
+        for column in (x - distance, x + distance):
+            if 0 <= column < width and not _covered(column, boxes):
+                return column
+    return x
+
+
+def _covered(column: int, boxes: list[NodePosition]) -> bool:
+    """Check whether any of a layer's boxes covers a column."""
+    return any(pos.x <= column < pos.x + pos.node.width for pos in boxes)
@@ -1,6 +1,9 @@
 """Global settings for visualflow."""
 
 import os
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
 
 from dotenv import load_dotenv
 
@@ -36,6 +39,14 @@ def _load_theme_from_env() -> EdgeTheme:
     return THEME_MAP.get(theme_name, DEFAULT_THEME)
 
 
+# Context-local theme override (None = use the global theme). ContextVar
+# values are per thread and per asyncio task, so concurrent renders with
+# different themes never race on the shared Settings instance.
+_theme_override: ContextVar[EdgeTheme | None] = ContextVar(
+    "visualflow_theme_override", default=None
+)
+
+
 class Settings:
     """Global configuration for visualflow.
 
@@ -55,6 +66,10 @@ class Settings:
         # All render_dag calls will now use ROUNDED_THEME by default
         render_dag(dag)  # Uses global theme
         render_dag(dag, theme=HEAVY_THEME)  # Overrides with HEAVY_THEME
+
+        # Or scope a theme to the current thread / asyncio task:
+        with settings.override(theme=HEAVY_THEME):
+            render_dag(dag)  # Uses HEAVY_THEME, other threads unaffected
     """
 
     def __init__(self) -> None:
@@ -62,14 +77,42 @@ class Settings:
 
     @property
     def theme(self) -> EdgeTheme:
-        """Get the global theme."""
-        return self._theme
+        """Get the active theme (context override, else the global theme)."""
+        override = _theme_override.get()
+        return override if override is not None else self._theme
 
     @theme.setter
     def theme(self, value: EdgeTheme) -> None:
-        """Set the global theme."""
+        """Set the global theme (shadowed by any active override)."""
         self._theme = value
 
+    @contextmanager
+    def override(self, theme: EdgeTheme | str | None = None) -> Iterator[None]:
+        """Override settings for the current context only.
+
+        Safe for threads and asyncio tasks: the override is stored in a
+        ContextVar, so it is visible only to code running in this thread
+        (or task, and tasks it creates) until the block exits. Overrides
+        nest; the global settings are never modified.
+
+        Args:
+            theme: Theme instance or name ("default", "light", "rounded",
+                "heavy"); None keeps the currently active theme
+
+        Raises:
+            ValueError: If theme is an unknown theme name
+        """
+        if isinstance(theme, str):
+            name = theme.lower().strip()
+            if name not in THEME_MAP:
+                raise ValueError(f"Unknown theme: {theme!r}")
+            theme = THEME_MAP[name]
+        token = _theme_override.set(theme if theme is not None else self.theme)
+        try:
+            yield
+        finally:
+            _theme_override.reset(token)
+
     def reset(self) -> None:
         """Reset all settings to defaults."""
         self._theme = DEFAULT_THEME
@@ -77,3 +120,6 @@ class Settings:
 
 # Global settings instance
 settings = Settings()
+
+# Module-level alias: `with visualflow.settings.override(theme=...)`
+override = settings.override
@@ -0,0 +1,144 @@
+"""Tests for the asyncio render API and async Graphviz engine path."""
+
+import asyncio
+import os
+import stat
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from visualflow import render_dag, render_dag_async, GrandalfEngine, GraphvizEngine, HEAVY_THEME
+from visualflow.models import DAG
+from visualflow.settings import override
+from tests.fixtures import create_complex_graph, create_standalone
+
+# Canned `dot -Tplain` output for a -> b
+PLAIN_A_B = """\
+graph 1 1.5 10.5
+node a 0.75 8 1.5 5 a solid box black lightgrey
+node b 0.75 2.5 1.5 5 b solid box black lightgrey
+edge a b 4 0.75 5.5 0.75 5.25 0.75 5.25 0.75 5 solid black
+stop
+"""
+
+
+@pytest.fixture
+def fake_dot(tmp_path, monkeypatch):
+    """Put a fake `dot` on PATH that prints PLAIN_A_B."""
+    script = tmp_path / "dot"
+    script.write_text(f"#!/bin/sh\ncat > /dev/null\ncat <<'EOF'\n{PLAIN_A_B}EOF\n")
+    script.chmod(script.stat().st_mode | stat.S_IEXEC)
+    monkeypatch.setenv("PATH", f"{tmp_path}{os.pathsep}{os.environ.get('PATH', '')}")
+    return script
+
+
+def _a_b() -> DAG:
+    """Create a -> b with 15x10 character boxes."""
+    dag = DAG()
+    box = "\n".join(["+-------------+"] + ["|             |"] * 8 + ["+-------------+"])
+    dag.add_node("a", box.replace("|             |", "|      A      |", 1))
+    dag.add_node("b", box.replace("|             |", "|      B      |", 1))
+    dag.add_edge("a", "b")
+    return dag
+
+
+class TestRenderDagAsync:
+    """Tests for render_dag_async()."""
+
+    def test_matches_sync_render(self) -> None:
+        """Async render produces the same output as render_dag()."""
+        dag = create_complex_graph()
+        expected = render_dag(dag, GrandalfEngine())
+        assert asyncio.run(render_dag_async(dag, GrandalfEngine())) == expected
+
+    def test_with_standalones(self) -> None:
+        """Subgraph ordering (standalones last) matches render_dag()."""
+        dag = create_complex_graph()
+        for node_id, node in create_standalone().nodes.items():
+            dag.add_node(node_id, node.content)
+        expected = render_dag(dag, GrandalfEngine())
+        assert asyncio.run(render_dag_async(dag, GrandalfEngine())) == expected
+
+    def test_custom_executor(self) -> None:
+        """A caller-supplied executor is used for CPU stages."""
+        dag = create_complex_graph()
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            result = asyncio.run(render_dag_async(dag, executor=executor))
+        assert result == render_dag(dag)
+
+    def test_theme_resolved_in_calling_context(self) -> None:
+        """settings.override() in the caller applies to offloaded work."""
+
+        async def main() -> str:
+            with override(theme=HEAVY_THEME):
+                return await render_dag_async(create_complex_graph())
+
+        assert HEAVY_THEME.vertical in asyncio.run(main())
+
+    def test_concurrent_renders(self) -> None:
+        """Many renders can be awaited concurrently."""
+
+        async def main() -> list[str]:
+            dag = create_complex_graph()
+            return await asyncio.gather(*(render_dag_async(dag) for _ in range(5)))
+
+        results = asyncio.run(main())
+        assert len(set(results)) == 1
+
+    def test_empty_dag(self) -> None:
+        """Empty DAG renders to an empty string."""
+        assert asyncio.run(render_dag_async(DAG())) == ""
+
+
+class TestGraphvizComputeAsync:
+    """Tests for GraphvizEngine.compute_async()."""
+
+    def test_not_installed_raises(self, monkeypatch) -> None:
+        """Missing Graphviz raises RuntimeError."""
+        monkeypatch.setattr(GraphvizEngine, "is_available", staticmethod(lambda: False))
+        with pytest.raises(RuntimeError):
+            asyncio.run(GraphvizEngine().compute_async(_a_b()))
+
+    def test_async_matches_sync(self, fake_dot) -> None:
+        """Async subprocess path parses the same layout as compute()."""
+        engine = GraphvizEngine()
+        sync_layout = engine.compute(_a_b())
+        async_layout = asyncio.run(engine.compute_async(_a_b()))
+        assert async_layout == sync_layout
+        assert async_layout.positions["a"].y < async_layout.positions["b"].y
+
+    def test_render_dag_async_awaits_engine(self, fake_dot) -> None:
+        """render_dag_async uses the engine's async path."""
+        result = asyncio.run(render_dag_async(_a_b(), GraphvizEngine()))
+        assert result == render_dag(_a_b(), GraphvizEngine())
+        assert "A" in result and "B" in result
+
+    def test_failure_raises_runtime_error(self, tmp_path, monkeypatch) -> None:
+        """Non-zero exit from dot raises RuntimeError."""
+        script = tmp_path / "dot"
+        script.write_text("#!/bin/sh\necho boom >&2\nexit 1\n")
+        script.chmod(script.stat().st_mode | stat.S_IEXEC)
+        monkeypatch.setenv("PATH", f"{tmp_path}{os.pathsep}{os.environ.get('PATH', '')}")
+        with pytest.raises(RuntimeError, match="boom"):
+            asyncio.run(GraphvizEngine().compute_async(_a_b()))
+
+    def test_cancellation_kills_dot(self, tmp_path, monkeypatch) -> None:
+        """Cancelling the awaiting task kills and reaps the dot process."""
+        pid_file = tmp_path / "pid"
+        script = tmp_path / "dot"
+        script.write_text(f"#!/bin/sh\necho $$ > {pid_file}\nexec sleep 30\n")
+        script.chmod(script.stat().st_mode | stat.S_IEXEC)
+        monkeypatch.setenv("PATH", f"{tmp_path}{os.pathsep}{os.environ.get('PATH', '')}")
+
+        async def cancel_while_running() -> int:
+            task = asyncio.create_task(GraphvizEngine().compute_async(_a_b()))
+            while not pid_file.exists() or not pid_file.read_text().strip():
+                await asyncio.sleep(0.01)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+            return int(pid_file.read_text())
+
+        pid = asyncio.run(cancel_while_running())
+        with pytest.raises(ProcessLookupError):
+            os.kill(pid, 0)  # Gone, not even a zombie
@@ -2,8 +2,12 @@
 
 import pytest
 
+from visualflow.engines import GrandalfEngine
 from visualflow.render import Canvas
-from visualflow.models import EdgePath
+from visualflow.render.canvas import _rasterize
+from visualflow.models import EdgePath, LIGHT_THEME
+from visualflow.routing import SegmentTable, SimpleRouter
+from tests.fixtures import create_complex_graph, create_diamond, create_wide_fanout
 
 
 class TestCanvasCreation:
@@ -210,6 +214,31 @@ class TestCanvasUnicode:
         # Should render without error
         assert "..." in result
 
+    def test_wide_char_clipped_on_left(self) -> None:
+        """A wide character cut by the left border leaves no placeholder."""
+        canvas = Canvas(width=6, height=1)
+        canvas.put_char("x", 0, 0)
+        canvas.place_box("\U0001F680ab", x=-1, y=0)
+        assert canvas.get_char(0, 0) == "x"
+        assert canvas.get_char(1, 0) == "a"
+
+
+class TestCanvasBoxRaster:
+    """Tests for cached box rasterization."""
+
+    def test_identical_contents_share_raster(self) -> None:
+        """Boxes with equal content reuse one cached raster."""
+        content = "+---+\n| \u4e2d |\n+---+"
+        assert _rasterize(content) is _rasterize("".join(content))
+        assert _rasterize(content)[1] == ("|", " ", "\u4e2d", "", " ", "|")
+
+    def test_box_clears_edges_under_it(self) -> None:
+        """A box placed over an edge hides the edge in its cells only."""
+        canvas = Canvas(width=10, height=5)
+        canvas.draw_edge(EdgePath(source_id="a", target_id="b", segments=[(0, 1, 9, 1)]))
+        canvas.place_box("+--+\n|  |\n+--+", x=3, y=0)
+        assert canvas.render().splitlines()[1] == "---|  |---"
+
 
 class TestCanvasDrawEdge:
     """Tests for Canvas.draw_edge method."""
@@ -310,3 +339,86 @@ class TestCanvasDrawEdge:
         # Only in-bounds portion drawn
         for x in range(2, 5):
             assert canvas.get_char(x, 2) == "-"
+
+
+class TestCanvasEdgeMasks:
+    """Tests for glyph resolution from the edge connectivity layer."""
+
+    def test_crossing_paths_render_cross(self) -> None:
+        """A vertical and a horizontal path crossing resolve to the cross glyph."""
+        canvas = Canvas(width=9, height=9, theme=LIGHT_THEME)
+        canvas.draw_edge(EdgePath(source_id="a", target_id="b", segments=[(4, 0, 4, 8)]))
+        canvas.draw_edge(EdgePath(source_id="c", target_id="d", segments=[(0, 4, 8, 4)]))
+        assert canvas.get_char(4, 4) == LIGHT_THEME.cross
+
+    def test_result_independent_of_draw_order(self) -> None:
+        """Overlapping paths render the same regardless of drawing order."""
+        paths = [
+            EdgePath(source_id="a", target_id="b", segments=[(2, 0, 2, 4), (2, 4, 8, 4), (8, 4, 8, 8)]),
+            EdgePath(source_id="a", target_id="c", segments=[(2, 0, 2, 8)]),
+        ]
+        renders = []
+        for ordered in (paths, paths[::-1]):
+            canvas = Canvas(width=10, height=10, theme=LIGHT_THEME)
+            for path in ordered:
+                canvas.draw_edge(path)
+            renders.append(canvas.render())
+        assert renders[0] == renders[1]
+        canvas = Canvas(width=10, height=10, theme=LIGHT_THEME)
+        for path in paths:
+            canvas.draw_edge(path)
+        assert canvas.get_char(2, 4) == LIGHT_THEME.tee_right
+        assert canvas.get_char(8, 4) == LIGHT_THEME.corner_tr
+
+    def test_arrow_wins_over_lines(self) -> None:
+        """Arrowheads are kept where other paths pass through."""
+        canvas = Canvas(width=9, height=9)
+        canvas.draw_edge(EdgePath(source_id="a", target_id="b", segments=[(4, 0, 4, 4)]))
+        canvas.draw_edge(EdgePath(source_id="c", target_id="d", segments=[(0, 4, 8, 4)]))
+        assert canvas.get_char(4, 4) == "v"
+
+    def test_put_char_replaces_edge(self) -> None:
+        """Writing a character over an edge cell removes the edge there."""
+        canvas = Canvas(width=5, height=5)
+        canvas.draw_edge(EdgePath(source_id="a", target_id="b", segments=[(0, 2, 4, 2)]))
+        canvas.put_char(" ", 2, 2)
+        assert canvas.get_char(2, 2) == " "
+        assert canvas.get_char(1, 2) == "-"
+
+    def test_clipped_run_connects_to_border(self) -> None:
+        """A run entering from above the canvas is a straight line at row 0."""
+        canvas = Canvas(width=5, height=5, theme=LIGHT_THEME)
+        canvas.draw_edge(EdgePath(source_id="a", target_id="b", segments=[(2, -3, 2, 2), (2, 2, 4, 2)]))
+        assert canvas.get_char(2, 0) == LIGHT_THEME.vertical
+        assert canvas.get_char(2, 2) == LIGHT_THEME.corner_bl
+
+
+class TestCanvasDrawSegments:
+    """Tests for bulk drawing of a SegmentTable."""
+
+    @pytest.mark.parametrize("create", [create_diamond, create_wide_fanout, create_complex_graph])
+    def test_matches_draw_edge(self, create) -> None:  # type: ignore[no-untyped-def]
+        """Bulk drawing produces the same output as drawing path by path."""
+        dag = create()
+        layout = GrandalfEngine().compute(dag)
+        table = SimpleRouter().route_columnar(layout.positions, dag.edges)
+
+        bulk = Canvas(width=layout.width, height=layout.height, theme=LIGHT_THEME)
+        bulk.draw_segments(table)
+        single = Canvas(width=layout.width, height=layout.height, theme=LIGHT_THEME)
+        for path in table.paths():
+            single.draw_edge(path)
+        assert bulk.render() == single.render()
+
+    def test_overlapping_runs_merged(self) -> None:
+        """Shared and overlapping runs on one column draw as one line."""
+        table = SegmentTable()
+        table.append("a", "b", [(2, 0, 2, 6)])
+        table.append("a", "c", [(2, 0, 2, 3), (2, 3, 6, 3), (6, 3, 6, 6)])
+        table.append("x", "y", [(2, 4, 2, 8)])
+        canvas = Canvas(width=10, height=10, theme=LIGHT_THEME)
+        canvas.draw_segments(table)
+        column = [canvas.get_char(2, y) for y in range(9)]
+        assert column == ["│", "│", "│", "├", "│", "│", "▼", "│", "▼"]
+        assert canvas.get_char(6, 3) == LIGHT_THEME.corner_tr
+        assert canvas.get_char(6, 6) == LIGHT_THEME.arrow_down
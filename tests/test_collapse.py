@@ -0,0 +1,212 @@
+"""Tests for level-of-detail collapsing (collapse_dag / render_summary)."""
+
+import pytest
+
+from visualflow import render_dag, render_summary
+from visualflow.collapse import collapse_dag
+from visualflow.models import DAG
+from tests.fixtures import create_simple_chain, create_wide_fanout
+
+
+def _chain(*ids: str) -> DAG:
+    """Create a linear chain DAG over the given ids."""
+    dag = DAG()
+    for node_id in ids:
+        dag.add_node(node_id, node_id.upper())
+    for source, target in zip(ids, ids[1:]):
+        dag.add_edge(source, target)
+    return dag
+
+
+def _diamond() -> DAG:
+    """Create a -> b, a -> c, b -> d, c -> d."""
+    dag = DAG()
+    for node_id in ("a", "b", "c", "d"):
+        dag.add_node(node_id, node_id.upper())
+    for source, target in [("a", "b"), ("a", "c"), ("b", "d"), ("c", "d")]:
+        dag.add_edge(source, target)
+    return dag
+
+
+class TestCollapseChains:
+    """Tests for mode='chains'."""
+
+    def test_simple_chain_collapses_to_one_box(self) -> None:
+        """A fully linear chain becomes a single aggregate."""
+        collapsed, groups = collapse_dag(create_simple_chain())
+        assert groups == {"a..c": ["a", "b", "c"]}
+        assert list(collapsed.nodes) == ["a..c"]
+        assert collapsed.edges == []
+
+    def test_aggregate_box_shows_count(self) -> None:
+        """Aggregate box content includes id and member count."""
+        collapsed, _ = collapse_dag(create_simple_chain())
+        content = collapsed.nodes["a..c"].content
+        assert "a..c" in content
+        assert "(3 nodes)" in content
+
+    def test_branching_stops_chain(self) -> None:
+        """Chains end at fan-out and fan-in points."""
+        dag = _chain("a", "b", "c", "d")
+        dag.add_node("x", "X")
+        dag.add_edge("b", "x")
+        collapsed, groups = collapse_dag(dag)
+        # b has two children, so a..b and c..d are separate runs
+        assert groups == {"a..b": ["a", "b"], "c..d": ["c", "d"]}
+        edges = {(e.source, e.target) for e in collapsed.edges}
+        assert edges == {("a..b", "c..d"), ("a..b", "x")}
+
+    def test_expand_node_splits_chain(self) -> None:
+        """Expanding a member keeps it visible and splits the chain."""
+        dag = _chain("a", "b", "c", "d", "e")
+        collapsed, groups = collapse_dag(dag, expand=["c"])
+        assert groups == {"a..b": ["a", "b"], "d..e": ["d", "e"]}
+        assert "c" in collapsed.nodes
+        edges = {(e.source, e.target) for e in collapsed.edges}
+        assert edges == {("a..b", "c"), ("c", "d..e")}
+
+    def test_expand_aggregate_id(self) -> None:
+        """Expanding an aggregate id restores its members."""
+        dag = _chain("a", "b", "c")
+        collapsed, groups = collapse_dag(dag, expand=["a..c"])
+        assert groups == {}
+        assert set(collapsed.nodes) == {"a", "b", "c"}
+
+    def test_aggregate_id_taken_by_node(self) -> None:
+        """An aggregate named like an ungrouped node gets a suffix."""
+        dag = _chain("a", "b", "c")
+        dag.add_node("a..c", "REAL")
+        dag.add_node("x", "X")
+        dag.add_edge("x", "a..c")
+        dag.add_edge("x", "a")
+        collapsed, groups = collapse_dag(dag)
+        assert groups == {"a..c#1": ["a", "b", "c"]}
+        assert collapsed.nodes["a..c"].content == "REAL"
+        assert "(3 nodes)" in collapsed.nodes["a..c#1"].content
+        edges = [(e.source, e.target) for e in collapsed.edges]
+        assert edges == [("x", "a..c"), ("x", "a..c#1")]
+        _, groups = collapse_dag(dag, expand=["a..c#1"])
+        assert groups == {}
+
+    def test_diamond_has_no_chains(self) -> None:
+        """Diamond has no linear links, so nothing collapses."""
+        collapsed, groups = collapse_dag(_diamond())
+        assert groups == {}
+        assert len(collapsed.nodes) == 4
+
+
+class TestCollapseSubtrees:
+    """Tests for mode='subtrees'."""
+
+    def test_fanout_collapses_whole_tree(self) -> None:
+        """An out-tree collapses into a single aggregate at its root."""
+        collapsed, groups = collapse_dag(create_wide_fanout(), mode="subtrees")
+        assert list(groups) == ["poc-3/*"]
+        assert groups["poc-3/*"][0] == "poc-3"
+        assert len(groups["poc-3/*"]) == 6
+        assert list(collapsed.nodes) == ["poc-3/*"]
+
+    def test_shared_child_is_not_a_tree(self) -> None:
+        """Nodes with multiple parents break the tree."""
+        collapsed, groups = collapse_dag(_diamond(), mode="subtrees")
+        assert groups == {}
+
+    def test_expand_root_collapses_children(self) -> None:
+        """Expanding a root exposes it and collapses each child subtree."""
+        dag = DAG()
+        for node_id in ("r", "a", "a1", "a2", "b", "b1"):
+            dag.add_node(node_id, node_id)
+        for source, target in [("r", "a"), ("a", "a1"), ("a", "a2"), ("r", "b"), ("b", "b1")]:
+            dag.add_edge(source, target)
+        collapsed, groups = collapse_dag(dag, mode="subtrees", expand=["r"])
+        assert groups == {"a/*": ["a", "a1", "a2"], "b/*": ["b", "b1"]}
+        edges = {(e.source, e.target) for e in collapsed.edges}
+        assert edges == {("r", "a/*"), ("r", "b/*")}
+
+
+class TestCollapsePrefixAndComponents:
+    """Tests for mode='prefix' and mode='components'."""
+
+    def test_prefix_groups_by_separator(self) -> None:
+        """Nodes sharing an id prefix are grouped."""
+        collapsed, groups = collapse_dag(create_wide_fanout(), mode="prefix")
+        assert groups == {"poc-*": ["poc-3", "poc-4", "poc-5", "poc-6"]}
+        assert set(collapsed.nodes) == {"poc-*", "bugs", "pydantic"}
+        edges = {(e.source, e.target) for e in collapsed.edges}
+        assert edges == {("poc-*", "bugs"), ("poc-*", "pydantic")}
+
+    def test_prefix_split_around_outside_node(self) -> None:
+        """A path leaving a prefix group and coming back splits it."""
+        dag = _chain("a-1", "b", "a-2", "a-3")
+        dag.add_node("a-0", "A-0")
+        dag.add_edge("a-0", "a-1")
+        collapsed, groups = collapse_dag(dag, mode="prefix")
+        assert groups == {"a-*#1": ["a-1", "a-0"], "a-*#2": ["a-2", "a-3"]}
+        edges = {(e.source, e.target) for e in collapsed.edges}
+        assert edges == {("a-*#1", "b"), ("b", "a-*#2")}
+        render_summary(dag, mode="prefix")  # Lays out without a cycle
+
+    def test_prefix_split_below_min_size_stays_expanded(self) -> None:
+        """Parts smaller than min_size are not collapsed."""
+        collapsed, groups = collapse_dag(_chain("a-1", "b", "a-2"), mode="prefix")
+        assert groups == {}
+        assert set(collapsed.nodes) == {"a-1", "b", "a-2"}
+
+    def test_prefix_groups_cycling_between_each_other_stay_expanded(self) -> None:
+        """Two groups linked both ways are left expanded; others collapse."""
+        dag = _chain("a-1", "b-1", "c-1", "c-2")
+        dag.add_node("b-2", "B-2")
+        dag.add_node("a-2", "A-2")
+        dag.add_edge("b-2", "a-2")
+        collapsed, groups = collapse_dag(dag, mode="prefix")
+        assert groups == {"c-*": ["c-1", "c-2"]}
+        edges = {(e.source, e.target) for e in collapsed.edges}
+        assert edges == {("a-1", "b-1"), ("b-1", "c-*"), ("b-2", "a-2")}
+
+    def test_components_collapse_connected_subgraphs(self) -> None:
+        """Each connected subgraph becomes one box; standalones stay."""
+        dag = _chain("a", "b")
+        dag.add_node("z", "Z")
+        collapsed, groups = collapse_dag(dag, mode="components")
+        assert groups == {"a+1": ["a", "b"]}
+        assert set(collapsed.nodes) == {"a+1", "z"}
+
+    def test_invalid_mode_raises(self) -> None:
+        """Unknown modes are rejected."""
+        with pytest.raises(ValueError):
+            collapse_dag(DAG(), mode="bogus")  # type: ignore[arg-type]
+
+    def test_min_size_validated(self) -> None:
+        """min_size below 2 is rejected."""
+        with pytest.raises(ValueError):
+            collapse_dag(DAG(), min_size=1)
+
+
+class TestRenderSummary:
+    """Tests for render_summary()."""
+
+    def test_render_summary_shows_aggregate(self) -> None:
+        """Summary render shows the aggregate instead of member boxes."""
+        result = render_summary(create_simple_chain())
+        assert "a..c" in result
+        assert "(3 nodes)" in result
+        assert "Task A" not in result
+
+    def test_render_summary_large_chain_is_small(self) -> None:
+        """A 2,000-node chain renders as one small box."""
+        ids = [f"n{i}" for i in range(2000)]
+        result = render_summary(_chain(*ids))
+        assert "n0..n1999" in result
+        assert len(result.splitlines()) < 20
+
+    def test_render_summary_max_width(self) -> None:
+        """Wrapping and compaction options reach render_dag()."""
+        dag = _chain("a", "b", "c", "hub")
+        for i in range(12):
+            dag.add_node(f"leaf{i}", f"+--------+\n| LEAF{i:<3}|\n+--------+")
+            dag.add_edge("hub", f"leaf{i}")
+        collapsed, _ = collapse_dag(dag)
+        result = render_summary(dag, max_width=60, compact=True)
+        assert result == render_dag(collapsed, max_width=60, compact=True)
+        assert max(len(line) for line in result.splitlines()) <= 60
+        assert max(len(line) for line in render_summary(dag).splitlines()) > 60
@@ -1,9 +1,27 @@
 """Tests for layout engines."""
 
+import asyncio
+import io
+import os
+import stat
+import subprocess
+import time
+
 import pytest
 
+from visualflow import render_dag
 from visualflow.models import DAG, LayoutResult, NodePosition
-from visualflow.engines import LayoutEngine, GrandalfEngine, GraphvizEngine
+from visualflow.engines import grandalf as grandalf_engine
+from visualflow.engines import (
+    AutoEngine,
+    ChainEngine,
+    GrandalfEngine,
+    GraphvizEngine,
+    LayoutEngine,
+    PackEngine,
+    TreeEngine,
+    classify,
+)
 from tests.fixtures import (
     create_simple_chain,
     create_diamond,
@@ -389,3 +407,498 @@ class TestGraphvizEngineNoOverlap:
         for i, pos1 in enumerate(positions):
             for pos2 in positions[i + 1 :]:
                 assert not self._boxes_overlap(pos1, pos2)
+
+
+# Node IDs DOT cannot take unquoted
+SPECIAL_IDS = [
+    "a-1",
+    "a_1",
+    'say "hi"',
+    "two words",
+    "node",
+    "-3.5",
+    "\u00e9t\u00e9",
+    "C:\\dir",
+    "dir\\\\",
+    'x\\\\"y',
+]
+
+
+def _special_chain() -> DAG:
+    """Create a chain through SPECIAL_IDS."""
+    dag = DAG()
+    for node_id in SPECIAL_IDS:
+        dag.add_node(node_id, "+-----+\n|  X  |\n+-----+")
+    for source, target in zip(SPECIAL_IDS, SPECIAL_IDS[1:]):
+        dag.add_edge(source, target)
+    return dag
+
+
+class TestGraphvizDotIO:
+    """Tests for GraphvizEngine's DOT writer and plain output parser."""
+
+    def test_ids_quoted(self) -> None:
+        """IDs other than plain identifiers are quoted, inner quotes escaped."""
+        dot = GraphvizEngine()._generate_dot(_special_chain())
+        assert '  "a-1" [' in dot
+        assert '  "say \\"hi\\"" [' in dot
+        assert '  "a-1" -> a_1;' in dot
+        assert '  "two words" -> "node";' in dot  # Keywords are quoted too
+        assert '  "-3.5" -> \u00e9t\u00e9;' in dot
+
+    def test_write_dot_matches_generate(self) -> None:
+        """write_dot() streams the same text _generate_dot() returns."""
+        engine = GraphvizEngine()
+        dag = create_complex_graph()
+        out = io.StringIO()
+        engine.write_dot(dag, out)
+        assert out.getvalue() == engine._generate_dot(dag)
+
+    def test_parse_quoted_names(self) -> None:
+        """Quoted node and edge names are unquoted and unescaped."""
+        plain = (
+            "graph 1 2 5\n"
+            'node "say \\"hi\\"" 1 4.25 1.1 1.5 "" solid box black lightgrey\n'
+            "node plain 1 0.75 1.1 1.5 \"\" solid box black lightgrey\n"
+            'edge "say \\"hi\\"" plain 4 1 3.5 1 3 1 2 1 1.5 solid black\n'
+            "stop\n"
+        )
+        nodes, edges = GraphvizEngine()._parse_plain(plain, keep_edges=True)
+        assert set(nodes) == {'say "hi"', "plain"}
+        assert (nodes["plain"].x, nodes["plain"].y) == (1.0, 0.75)
+        assert edges == [('say "hi"', "plain", [(1.0, 3.5), (1.0, 3.0), (1.0, 2.0), (1.0, 1.5)])]
+
+    def test_parse_backslash_names(self) -> None:
+        """Backslashes pair up; a single one before a quote escapes it."""
+        plain = (
+            'node "C:\\dir" 1 4.25 1.1 1.5 "" solid box black lightgrey\n'
+            'node "dir\\\\" 1 2.5 1.1 1.5 "" solid box black lightgrey\n'
+            'node "x\\\\\\"y" 1 0.75 1.1 1.5 "" solid box black lightgrey\n'
+            'edge "dir\\\\" "x\\\\\\"y" 2 1 2 1 1.25 solid black\n'
+        )
+        nodes, edges = GraphvizEngine()._parse_plain(plain, keep_edges=True)
+        assert set(nodes) == {"C:\\dir", "dir\\\\", 'x\\\\"y'}
+        assert nodes["dir\\\\"].y == 2.5
+        assert edges == [("dir\\\\", 'x\\\\"y', [(1.0, 2.0), (1.0, 1.25)])]
+
+    def test_unwritable_ids_rejected(self, monkeypatch) -> None:
+        """IDs DOT cannot read back raise ValueError before dot runs."""
+        monkeypatch.setattr(GraphvizEngine, "is_available", staticmethod(lambda: True))
+        for node_id in ("dir\\", 'x\\"y', "a\\\nb", "a\\\\\\"):
+            dag = DAG()
+            dag.add_node(node_id, "+---+\n| A |\n+---+")
+            with pytest.raises(ValueError, match="cannot represent node ID"):
+                GraphvizEngine().compute(dag)
+            with pytest.raises(ValueError, match="cannot represent node ID"):
+                GraphvizEngine().write_dot(dag, io.StringIO())
+        dag = DAG()
+        dag.add_node("a", "+---+\n| A |\n+---+")
+        dag.add_edge("a", "b\\")  # Endpoint missing from dag.nodes
+        with pytest.raises(ValueError, match="cannot represent node ID"):
+            GraphvizEngine().write_dot(dag, io.StringIO())
+
+    def test_backslash_ids_written_unchanged(self) -> None:
+        """Representable backslashes go into the DOT string as they are."""
+        dot = GraphvizEngine()._generate_dot(_special_chain())
+        assert '  "C:\\dir" -> "dir\\\\";' in dot
+        assert '  "dir\\\\" -> "x\\\\\\"y";' in dot
+
+    def test_edges_skipped_unless_kept(self) -> None:
+        """Edge lines are only parsed when asked for."""
+        plain = "node a 1 1 1 1 a\nnode b 1 3 1 1 b\nedge a b 2 1 2.5 1 1.5 solid black\n"
+        nodes, edges = GraphvizEngine()._parse_plain(plain)
+        assert set(nodes) == {"a", "b"} and edges == []
+
+    def test_edge_to_unknown_node(self) -> None:
+        """Edges to IDs missing from dag.nodes are still written."""
+        dag = DAG()
+        dag.add_node("a", "+---+\n| A |\n+---+")
+        dag.add_edge("a", "b-2")
+        assert '  a -> "b-2";' in GraphvizEngine()._generate_dot(dag)
+
+    @pytest.mark.skipif(not GraphvizEngine.is_available(), reason="Graphviz not installed")
+    def test_special_ids_round_trip(self) -> None:
+        """IDs that used to collide or break parsing lay out correctly."""
+        result = GraphvizEngine().compute(_special_chain())
+        assert set(result.positions) == set(SPECIAL_IDS)
+        rows = [result.positions[node_id].y for node_id in SPECIAL_IDS]
+        assert rows == sorted(rows) and len(set(rows)) == len(rows)
+
+
+def _layout_key(result: LayoutResult) -> tuple[dict[str, tuple[int, int]], int, int]:
+    """Positions and canvas size, for comparing engines."""
+    return (
+        {node_id: (pos.x, pos.y) for node_id, pos in result.positions.items()},
+        result.width,
+        result.height,
+    )
+
+
+def _varied_chain(length: int) -> DAG:
+    """Create a chain of boxes with varying widths and heights."""
+    dag = DAG()
+    for i in range(length):
+        width, height = 7 + (i * 5) % 11, 3 + i % 4
+        dag.add_node(f"n{i}", "\n".join(["+" + "-" * (width - 2) + "+"] * height))
+    for i in range(length - 1):
+        dag.add_edge(f"n{i}", f"n{i + 1}")
+    return dag
+
+
+def _crossed_layers(layers: int, width: int) -> DAG:
+    """Create layers fully connected in reverse order (many crossings)."""
+    dag = DAG()
+    for level in range(layers):
+        for i in range(width):
+            dag.add_node(f"n{level}_{i}", f"+---+\n|{i:^3}|\n+---+")
+    for level in range(layers - 1):
+        for i in range(width):
+            dag.add_edge(f"n{level}_{i}", f"n{level + 1}_{width - 1 - i}")
+            dag.add_edge(f"n{level}_{i}", f"n{level + 1}_{(i * 3) % width}")
+    return dag
+
+
+class TestAnytimeLayout:
+    """Tests for time-budgeted and sweep-limited layout."""
+
+    @staticmethod
+    def _ordering_crossings(engine: GrandalfEngine, dag: DAG, monkeypatch: pytest.MonkeyPatch) -> list[int]:
+        """Crossing counts seen by the anytime ordering, in order."""
+        counts: list[int] = []
+        count = grandalf_engine._crossings
+
+        def record(sug) -> int:
+            counts.append(count(sug))
+            return counts[-1]
+
+        monkeypatch.setattr(grandalf_engine, "_crossings", record)
+        engine.compute(dag)
+        return counts
+
+    def test_defaults_unchanged(self) -> None:
+        """Without a budget or sweep limit, Grandalf's default ordering is used."""
+        dag = create_complex_graph()
+        assert _layout_key(GrandalfEngine(time_budget=None).compute(dag)) == _layout_key(
+            GrandalfEngine().compute(dag)
+        )
+
+    def test_sweep_limit(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """max_sweeps bounds the sweeps after the quick layout."""
+        dag = _crossed_layers(4, 6)
+        assert len(self._ordering_crossings(GrandalfEngine(max_sweeps=0), dag, monkeypatch)) == 1
+        assert len(self._ordering_crossings(GrandalfEngine(max_sweeps=3), dag, monkeypatch)) <= 4
+
+    def test_best_ordering_kept(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """The returned layout has the fewest crossings seen."""
+        dag = _crossed_layers(4, 6)
+        engine = GrandalfEngine(max_sweeps=6)
+        counts = self._ordering_crossings(engine, dag, monkeypatch)
+        assert min(counts) <= counts[0]
+
+        final: list[int] = []
+        original_setxy = grandalf_engine.SugiyamaLayout.setxy
+
+        def setxy(sug) -> None:
+            final.append(grandalf_engine._crossings(sug))
+            original_setxy(sug)
+
+        monkeypatch.setattr(grandalf_engine.SugiyamaLayout, "setxy", setxy)
+        engine.compute(dag)
+        assert final == [min(counts)]
+
+    def test_expired_budget_returns_quick_layout(self) -> None:
+        """A zero budget still lays out every node."""
+        dag = _crossed_layers(6, 8)
+        start = time.monotonic()
+        result = GrandalfEngine(time_budget=0).compute(dag)
+        assert time.monotonic() - start < 5
+        assert set(result.positions) == set(dag.nodes)
+        ys = {result.positions[f"n{level}_0"].y for level in range(6)}
+        assert len(ys) == 6
+
+    @staticmethod
+    def _final_crossings(engine: GrandalfEngine, dag: DAG, monkeypatch: pytest.MonkeyPatch) -> int:
+        """Crossings of the orderings the engine places, over all components."""
+        final: list[int] = []
+        original_setxy = grandalf_engine.SugiyamaLayout.setxy
+
+        def setxy(sug) -> None:
+            final.append(grandalf_engine._crossings(sug))
+            original_setxy(sug)
+
+        monkeypatch.setattr(grandalf_engine.SugiyamaLayout, "setxy", setxy)
+        engine.compute(dag)
+        return sum(final)
+
+    def test_budget_bounds_ordering_time(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """On a large graph, time outside layering and placement stays in budget."""
+        dag = _crossed_layers(15, 20)
+        fixed: list[float] = []
+        for name in ("init_all", "setxy"):
+            original = getattr(grandalf_engine.SugiyamaLayout, name)
+
+            def timed(sug, _original=original) -> None:
+                start = time.perf_counter()
+                _original(sug)
+                fixed.append(time.perf_counter() - start)
+
+            monkeypatch.setattr(grandalf_engine.SugiyamaLayout, name, timed)
+        budget = 0.3
+        start = time.perf_counter()
+        GrandalfEngine(time_budget=budget).compute(dag)
+        ordering = time.perf_counter() - start - sum(fixed)
+        assert ordering < budget + 0.2
+
+    def test_budget_not_worse_than_default(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """A budget that fits Grandalf's three sweeps never adds crossings."""
+        dag = _crossed_layers(10, 12)
+        dag.add_node("lone", "+--+\n|  |\n+--+")  # A second component
+        default = self._final_crossings(GrandalfEngine(), dag, monkeypatch)
+        budgeted = self._final_crossings(GrandalfEngine(time_budget=2), dag, monkeypatch)
+        assert budgeted <= default
+
+    def test_graphviz_options(self, tmp_path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Iteration limits are passed to dot and the timeout is enforced."""
+        engine = GraphvizEngine(timeout=0.2, mclimit=0.5, nslimit=2)
+        assert engine.command == ("dot", "-Tplain", "-Gmclimit=0.5", "-Gnslimit=2", "-Gnslimit1=2")
+        assert GraphvizEngine().timeout == GraphvizEngine.TIMEOUT
+
+        script = tmp_path / "dot"
+        script.write_text("#!/bin/sh\nsleep 5\n")
+        script.chmod(script.stat().st_mode | stat.S_IEXEC)
+        monkeypatch.setenv("PATH", f"{tmp_path}{os.pathsep}{os.environ.get('PATH', '')}")
+        with pytest.raises(subprocess.TimeoutExpired):
+            engine.compute(create_diamond())
+
+    def test_graphviz_timeout_fallback(self, tmp_path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """With a fallback engine, a timed-out dot gives the fallback's layout."""
+        script = tmp_path / "dot"
+        script.write_text("#!/bin/sh\nexec sleep 5\n")
+        script.chmod(script.stat().st_mode | stat.S_IEXEC)
+        monkeypatch.setenv("PATH", f"{tmp_path}{os.pathsep}{os.environ.get('PATH', '')}")
+        quick = GrandalfEngine(max_sweeps=0)
+        engine = GraphvizEngine(timeout=0.2, fallback=quick)
+        dag = create_diamond()
+        start = time.monotonic()
+        assert engine.compute(dag) == quick.compute(dag)
+        assert asyncio.run(engine.compute_async(dag)) == quick.compute(dag)
+        assert time.monotonic() - start < 3
+
+
+class TestChainEngine:
+    """Tests for ChainEngine."""
+
+    def test_matches_grandalf(self) -> None:
+        """Chains are placed exactly as GrandalfEngine places them."""
+        for dag in (create_simple_chain(), _varied_chain(6)):
+            assert _layout_key(ChainEngine().compute(dag)) == _layout_key(GrandalfEngine().compute(dag))
+
+    def test_edge_order_independent(self) -> None:
+        """The path is followed, not the edge list order."""
+        dag = _varied_chain(4)
+        dag.edges.reverse()
+        result = ChainEngine().compute(dag)
+        ys = [result.positions[f"n{i}"].y for i in range(4)]
+        assert ys == sorted(ys)
+
+    def test_rejects_non_chain(self) -> None:
+        """Branching graphs are rejected."""
+        with pytest.raises(ValueError, match="single path"):
+            ChainEngine().compute(create_diamond())
+
+
+class TestPackEngine:
+    """Tests for PackEngine."""
+
+    def test_matches_grandalf(self) -> None:
+        """Standalones are placed exactly as GrandalfEngine places them."""
+        dag = _varied_chain(5)
+        dag.edges.clear()
+        assert _layout_key(PackEngine().compute(dag)) == _layout_key(GrandalfEngine().compute(dag))
+
+    def test_max_width_wraps_rows(self) -> None:
+        """A width budget starts new rows."""
+        dag = _varied_chain(8)
+        dag.edges.clear()
+        result = PackEngine(max_width=60).compute(dag)
+        assert result.width <= 60
+        assert len({pos.y for pos in result.positions.values()}) > 1
+
+    def test_rejects_edges(self) -> None:
+        """Connected graphs are rejected."""
+        with pytest.raises(ValueError, match="without edges"):
+            PackEngine().compute(create_simple_chain())
+
+
+def _varied_tree(depth: int, fanout: int) -> DAG:
+    """Create a complete tree of boxes with varying widths."""
+    dag = DAG()
+    level = ["n0"]
+    dag.add_node("n0", "+---+")
+    for _ in range(depth - 1):
+        next_level = []
+        for parent in level:
+            for _ in range(fanout):
+                node_id = f"n{len(dag.nodes)}"
+                width = 5 + (len(dag.nodes) * 7) % 13
+                dag.add_node(node_id, "\n".join(["+" + "-" * (width - 2) + "+"] * 3))
+                dag.add_edge(parent, node_id)
+                next_level.append(node_id)
+        level = next_level
+    return dag
+
+
+class TestTreeEngine:
+    """Tests for TreeEngine."""
+
+    @staticmethod
+    def _assert_no_overlap(result: LayoutResult) -> None:
+        """No two boxes share a cell, and all lie within the canvas."""
+        cells: set[tuple[int, int]] = set()
+        for pos in result.positions.values():
+            box = {
+                (x, y)
+                for x in range(pos.x, pos.x + pos.node.width)
+                for y in range(pos.y, pos.y + pos.node.height)
+            }
+            assert not cells & box
+            cells |= box
+            assert pos.x + pos.node.width <= result.width
+            assert pos.y + pos.node.height <= result.height
+
+    def test_layers_by_depth(self) -> None:
+        """Children sit one layer below their parent, in edge order."""
+        dag = _varied_tree(3, 3)
+        result = TreeEngine().compute(dag)
+        for edge in dag.edges:
+            source, target = result.positions[edge.source], result.positions[edge.target]
+            assert target.y >= source.y + source.node.height + 6
+        row = [result.positions[f"n{i}"].x for i in range(1, 4)]
+        assert row == sorted(row)
+        self._assert_no_overlap(result)
+
+    def test_parent_centered_over_children(self) -> None:
+        """Each parent's center lies midway between its outer children."""
+        dag = _varied_tree(3, 2)
+        result = TreeEngine().compute(dag)
+        center = {node_id: pos.x + pos.node.width // 2 for node_id, pos in result.positions.items()}
+        children: dict[str, list[str]] = {}
+        for edge in dag.edges:
+            children.setdefault(edge.source, []).append(edge.target)
+        for parent, kids in children.items():
+            assert abs(center[parent] - (center[kids[0]] + center[kids[-1]]) / 2) <= 1
+
+    def test_subtrees_packed_by_contour(self) -> None:
+        """A shallow subtree tucks in under a wide neighbor's overhang."""
+        dag = DAG()
+        dag.add_node("root", "+--+")
+        dag.add_node("wide", "+" + "-" * 38 + "+")
+        dag.add_node("narrow", "+--+")
+        dag.add_node("leaf", "+--+")
+        dag.add_edge("root", "wide")
+        dag.add_edge("root", "narrow")
+        dag.add_edge("narrow", "leaf")
+        result = TreeEngine(horizontal_spacing=4).compute(dag)
+        wide, narrow = result.positions["wide"], result.positions["narrow"]
+        assert narrow.x == wide.x + wide.node.width + 4
+        self._assert_no_overlap(result)
+
+    def test_forest_and_deep_chain(self) -> None:
+        """Forests lay out side by side; deep trees do not recurse."""
+        dag = _varied_tree(3, 2)
+        chain = _varied_chain(2000)
+        for node_id, node in chain.nodes.items():
+            dag.nodes[f"c{node_id}"] = node
+        for edge in chain.edges:
+            dag.add_edge(f"c{edge.source}", f"c{edge.target}")
+        result = TreeEngine().compute(dag)
+        self._assert_no_overlap(result)
+
+    def test_rejects_shared_children(self) -> None:
+        """Nodes with several parents are rejected."""
+        with pytest.raises(ValueError, match="several parents"):
+            TreeEngine().compute(create_diamond())
+
+    @staticmethod
+    def _broom(length: int, fork: int = 10) -> DAG:
+        """Create a chain of `length` nodes whose last node forks `fork` ways."""
+        dag = DAG()
+        for i in range(length + fork):
+            dag.add_node(f"n{i}", "+--+\n|  |\n+--+")
+        for i in range(1, length):
+            dag.add_edge(f"n{i - 1}", f"n{i}")
+        for i in range(length, length + fork):
+            dag.add_edge(f"n{length - 1}", f"n{i}")
+        return dag
+
+    def test_deep_broom_scales_linearly(self) -> None:
+        """Four times the depth takes about four times as long, not sixteen."""
+        assert classify(self._broom(100)).kind == "tree"
+        times = []
+        for length in (4_000, 16_000):
+            dag = self._broom(length)
+            runs = []
+            for _ in range(3):
+                start = time.perf_counter()
+                TreeEngine().compute(dag)
+                runs.append(time.perf_counter() - start)
+            times.append(min(runs))
+        assert times[1] < 8 * times[0]
+
+
+class TestAutoEngine:
+    """Tests for AutoEngine and graph classification."""
+
+    @pytest.mark.parametrize(
+        ("factory", "kind"),
+        [
+            (create_simple_chain, "chain"),
+            (create_wide_fanout, "tree"),
+            (create_diamond, "dag"),
+            (create_skip_level, "tree"),
+            (create_merge_branch, "dag"),
+            (create_standalone, "standalones"),
+        ],
+    )
+    def test_classify(self, factory, kind: str) -> None:
+        """Fixtures are classified by shape."""
+        assert classify(factory()).kind == kind
+
+    def test_classify_forest_and_depth(self) -> None:
+        """Several trees form a forest; depth counts nodes on the longest path."""
+        dag = DAG()
+        for node_id in "abcde":
+            dag.add_node(node_id, node_id)
+        dag.add_edge("a", "b")
+        dag.add_edge("b", "c")
+        dag.add_edge("d", "e")
+        shape = classify(dag)
+        assert (shape.kind, shape.nodes, shape.edges, shape.depth) == ("forest", 5, 3, 3)
+
+    def test_strategy_recorded(self) -> None:
+        """Each compute() records the strategy it used."""
+        engine = AutoEngine()
+        engine.compute(create_simple_chain())
+        assert engine.last_strategy == "chain"
+        engine.compute(create_diamond())
+        engine.compute(create_standalone())
+        assert engine.last_strategy == "pack"
+        engine.compute(create_wide_fanout())
+        assert engine.last_strategy == "tree"
+        assert engine.strategy_counts == {"chain": 1, "grandalf": 1, "pack": 1, "tree": 1}
+
+    def test_large_graphs_use_graphviz_when_available(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Graphviz is chosen for large graphs only if installed."""
+        engine = AutoEngine(large_graph=4)
+        monkeypatch.setattr(GraphvizEngine, "is_available", staticmethod(lambda: False))
+        assert engine.choose(create_diamond()) == "grandalf"
+        monkeypatch.setattr(GraphvizEngine, "is_available", staticmethod(lambda: True))
+        assert engine.choose(create_diamond()) == "graphviz"
+        assert engine.choose(_varied_chain(10)) == "chain"
+
+    def test_render_matches_grandalf(self) -> None:
+        """Rendering a mixed graph with AutoEngine gives the Grandalf output."""
+        dag = create_simple_chain()
+        for node_id, node in create_standalone().nodes.items():
+            dag.nodes[node_id] = node
+        assert render_dag(dag, engine=AutoEngine()) == render_dag(dag, engine=GrandalfEngine())
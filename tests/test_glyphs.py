@@ -0,0 +1,97 @@
+"""Tests for compiled edge themes."""
+
+import pytest
+
+from visualflow.models import DEFAULT_THEME, HEAVY_THEME, ROUNDED_THEME, EdgePath, EdgeTheme
+from visualflow.render import Canvas
+from visualflow.render import glyphs
+from visualflow.render.glyphs import ARROW, DOWN, LEFT, RIGHT, UP, compile_theme
+
+
+class TestCompileTheme:
+    """Tests for compile_theme()."""
+
+    def test_compiled_once_per_theme(self) -> None:
+        """Compiling the same theme returns the cached tables."""
+        assert compile_theme(HEAVY_THEME) is compile_theme(HEAVY_THEME)
+
+    def test_equal_themes_share_tables(self) -> None:
+        """Equal themes share one compiled entry."""
+        assert compile_theme(EdgeTheme()) is compile_theme(DEFAULT_THEME)
+
+    def test_changed_theme_recompiled(self) -> None:
+        """Themes stay mutable; a changed theme gets its own tables."""
+        theme = EdgeTheme()
+        assert compile_theme(theme).glyph(UP | DOWN | LEFT | RIGHT) == DEFAULT_THEME.cross
+        theme.cross = "#"
+        assert compile_theme(theme).glyph(UP | DOWN | LEFT | RIGHT) == "#"
+        assert compile_theme(DEFAULT_THEME).glyph(UP | DOWN | LEFT | RIGHT) == DEFAULT_THEME.cross
+
+    def test_cache_bounded(self) -> None:
+        """Many custom themes do not grow the cache without limit."""
+        for i in range(200):
+            compile_theme(EdgeTheme(cross=chr(0x2500 + i)))
+        info = glyphs._compile.cache_info()
+        assert info.maxsize is not None and info.currsize <= info.maxsize
+
+    @pytest.mark.parametrize("theme", [DEFAULT_THEME, ROUNDED_THEME, HEAVY_THEME])
+    def test_glyph_table(self, theme: EdgeTheme) -> None:
+        """Direction masks map to the theme's characters."""
+        compiled = compile_theme(theme)
+        assert compiled.glyph(UP | DOWN) == theme.vertical
+        assert compiled.glyph(LEFT | RIGHT) == theme.horizontal
+        assert compiled.glyph(DOWN | RIGHT) == theme.corner_tl
+        assert compiled.glyph(UP | LEFT) == theme.corner_br
+        assert compiled.glyph(UP | DOWN | LEFT) == theme.tee_left
+        assert compiled.glyph(UP | DOWN | LEFT | RIGHT) == theme.cross
+        assert compiled.glyph(ARROW | LEFT) == theme.arrow_down
+
+    def test_glyph_directions_round_trip(self) -> None:
+        """Each junction glyph maps back to its direction mask."""
+        compiled = compile_theme(ROUNDED_THEME)
+        for mask, glyph in compiled.junction_glyphs.items():
+            assert compiled.directions[glyph] == mask
+        assert set(compiled.junctions) == set(ROUNDED_THEME.all_junctions)
+
+
+class TestCanvasTheme:
+    """Tests for the theme a Canvas compiles."""
+
+    def test_compiled_when_set(self, monkeypatch) -> None:
+        """Cell reads and render() use the tables compiled on assignment."""
+        calls = []
+        monkeypatch.setattr(
+            "visualflow.render.canvas.compile_theme",
+            lambda theme: calls.append(theme) or compile_theme(theme),
+        )
+        canvas = Canvas(width=5, height=3, theme=HEAVY_THEME)
+        canvas.draw_edge(EdgePath(source_id="a", target_id="b", segments=[(0, 1, 4, 1)]))
+        assert [canvas.get_char(x, 1) for x in range(1, 4)] == [HEAVY_THEME.horizontal] * 3
+        canvas.render()
+        assert calls == [HEAVY_THEME]
+        canvas.theme = ROUNDED_THEME
+        assert canvas.get_char(1, 1) == ROUNDED_THEME.horizontal
+        assert calls == [HEAVY_THEME, ROUNDED_THEME]
+
+
+class TestFixJunctions:
+    """Tests for Canvas.fix_junctions() on hand-placed characters."""
+
+    def test_corner_with_three_neighbors_becomes_tee(self) -> None:
+        """A corner joined from three sides is rewritten as a tee."""
+        canvas = Canvas(width=3, height=3)
+        canvas.put_char("|", 1, 0)
+        canvas.put_char("┐", 1, 1)
+        canvas.put_char("-", 0, 1)
+        canvas.put_char("|", 1, 2)
+        canvas.fix_junctions()
+        assert canvas.get_char(1, 1) == DEFAULT_THEME.tee_left
+
+    def test_straight_line_junction_left_alone(self) -> None:
+        """A junction with only a straight run through it is not changed."""
+        canvas = Canvas(width=3, height=3)
+        canvas.put_char("|", 1, 0)
+        canvas.put_char("┼", 1, 1)
+        canvas.put_char("|", 1, 2)
+        canvas.fix_junctions()
+        assert canvas.get_char(1, 1) == "┼"
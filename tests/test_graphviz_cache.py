@@ -0,0 +1,233 @@
+"""Tests for GraphvizCache and cached Graphviz layouts."""
+
+import asyncio
+import os
+import stat
+import time
+
+import pytest
+
+import visualflow.engines.graphviz as graphviz
+import visualflow.engines.libgvc as libgvc
+from visualflow import GraphvizCache, GraphvizEngine, LibGraphvizEngine
+from visualflow.engines.graphviz_cache import _decode, _encode
+from tests.test_async import PLAIN_A_B, _a_b
+
+NODES = {
+    "a": (0.75, 8.0, 1.5, 5.0),
+    'say "hi"': (0.75, 2.5, 1.5, 5.0),
+    "ünï": (2.25, 2.5, 1.5, 5.0),
+}
+EDGES = [
+    ("a", 'say "hi"', [(0.75, 5.5), (0.75, 5.25), (0.75, 5.25), (0.75, 5.0)]),
+    ("a", "ünï", [(0.75, 5.5), (2.25, 5.0)]),
+]
+
+
+@pytest.fixture
+def counting_dot(tmp_path, monkeypatch):
+    """Put a fake `dot` on PATH that prints PLAIN_A_B and logs each layout.
+
+    Returns:
+        Function giving the number of layouts run so far
+    """
+    log = tmp_path / "runs"
+    script = tmp_path / "dot"
+    script.write_text(
+        "#!/bin/sh\n"
+        'if [ "$1" = "-V" ]; then echo "dot - graphviz version ${FAKE_DOT_VERSION:-2.43.0} (0)" >&2; exit 0; fi\n'
+        f"echo run >> {log}\n"
+        "cat > /dev/null\n"
+        f"cat <<'EOF'\n{PLAIN_A_B}EOF\n"
+    )
+    script.chmod(script.stat().st_mode | stat.S_IEXEC)
+    monkeypatch.setenv("PATH", f"{tmp_path}{os.pathsep}{os.environ.get('PATH', '')}")
+    monkeypatch.setattr(libgvc, "_load_libgvc", lambda: None)
+    graphviz._dot_version.cache_clear()
+    yield lambda: len(log.read_text().splitlines()) if log.exists() else 0
+    graphviz._dot_version.cache_clear()
+
+
+class TestEntries:
+    """Tests for the binary entry format and the cache directory."""
+
+    def test_round_trip(self) -> None:
+        """Names (quotes, non-ASCII) and coordinates survive exactly."""
+        nodes, edges = _decode(_encode(NODES, EDGES))
+        assert nodes == NODES
+        assert edges == EDGES
+
+    def test_edges_to_unknown_nodes_dropped(self) -> None:
+        """Edges whose endpoints are not nodes are not stored."""
+        _, edges = _decode(_encode(NODES, EDGES + [("a", "gone", [(0.0, 0.0)])]))
+        assert edges == EDGES
+
+    def test_put_get(self, tmp_path) -> None:
+        """A stored entry is read back and counted as a hit."""
+        cache = GraphvizCache(tmp_path / "cache")
+        key = cache.key("digraph G {}", "", "2.43.0")
+        assert cache.get(key) is None
+        cache.put(key, NODES, EDGES)
+        assert cache.get(key) == (NODES, EDGES)
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_put_leaves_no_temporary_files(self, tmp_path) -> None:
+        """Entries are renamed into place; only entry files remain."""
+        cache = GraphvizCache(tmp_path)
+        for i in range(3):
+            cache.put(cache.key(str(i), "", "1"), NODES, EDGES)
+        assert sorted(path.suffix for path in tmp_path.iterdir()) == [".layout"] * 3
+
+    def test_corrupt_entry_is_miss(self, tmp_path) -> None:
+        """Truncated or foreign files are misses, not errors."""
+        cache = GraphvizCache(tmp_path)
+        key = cache.key("dot", "", "1")
+        cache.put(key, NODES, EDGES)
+        path = cache._path(key)
+        data = path.read_bytes()
+        for corrupt in (data[:-5], b"junk", data + b"\0", b""):
+            path.write_bytes(corrupt)
+            assert cache.get(key) is None
+        assert cache.misses == 4
+
+    def test_key_covers_every_part(self) -> None:
+        """DOT text, options and version each change the key."""
+        base = GraphvizCache.key("digraph G {}", "nodesep=0.5", "2.43.0")
+        assert base == GraphvizCache.key("digraph G {}", "nodesep=0.5", "2.43.0")
+        assert base != GraphvizCache.key("digraph G { }", "nodesep=0.5", "2.43.0")
+        assert base != GraphvizCache.key("digraph G {}", "nodesep=0.6", "2.43.0")
+        assert base != GraphvizCache.key("digraph G {}", "nodesep=0.5", "9.0.0")
+        # Parts are length-prefixed, so moving text between them matters
+        assert GraphvizCache.key("ab", "", "1") != GraphvizCache.key("b", "a", "1")
+
+    def test_evicts_least_recently_used(self, tmp_path) -> None:
+        """Past max_bytes, the oldest entries go first."""
+        entry_size = len(_encode(NODES, EDGES))
+        cache = GraphvizCache(tmp_path, max_bytes=entry_size * 3)
+        keys = [cache.key(str(i), "", "1") for i in range(4)]
+        for i, key in enumerate(keys[:3]):
+            cache.put(key, NODES, EDGES)
+            os.utime(cache._path(key), (i, i))
+        assert cache.get(keys[0]) is not None  # Now the most recently used
+        cache.put(keys[3], NODES, EDGES)
+        assert cache.size() <= entry_size * 3 * 0.8
+        assert cache.get(keys[0]) is not None and cache.get(keys[3]) is not None
+        assert cache.get(keys[1]) is None
+
+    def test_overwrite_counted_once(self, tmp_path) -> None:
+        """Writing an existing key again does not grow the size estimate."""
+        cache = GraphvizCache(tmp_path)
+        key = cache.key("x", "", "1")
+        for _ in range(5):
+            cache.put(key, NODES, EDGES)
+        assert cache._size == cache.size() == len(_encode(NODES, EDGES))
+
+    def test_evicts_stale_temporary_files(self, tmp_path) -> None:
+        """Eviction removes old temporary files but not ones being written."""
+        stale, fresh = tmp_path / ".tmp-stale", tmp_path / ".tmp-fresh"
+        stale.write_bytes(b"partial")
+        fresh.write_bytes(b"partial")
+        os.utime(stale, (0, 0))
+        cache = GraphvizCache(tmp_path, max_bytes=1)
+        cache.put(cache.key("x", "", "1"), NODES, EDGES)
+        assert not stale.exists() and fresh.exists()
+
+    def test_clear(self, tmp_path) -> None:
+        """clear() removes every entry."""
+        cache = GraphvizCache(tmp_path)
+        cache.put(cache.key("x", "", "1"), NODES, EDGES)
+        cache.clear()
+        assert cache.size() == 0
+
+
+class TestCachedEngine:
+    """Tests for GraphvizEngine and LibGraphvizEngine with a cache."""
+
+    def test_second_layout_skips_dot(self, counting_dot, tmp_path) -> None:
+        """The same DAG is laid out once, and the cached layout matches."""
+        cache = GraphvizCache(tmp_path / "cache")
+        uncached = GraphvizEngine().compute(_a_b())
+        first = GraphvizEngine(cache=cache).compute(_a_b())
+        second = GraphvizEngine(cache=cache).compute(_a_b())
+        assert first == second == uncached
+        assert counting_dot() == 2  # uncached + first
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_edge_points_from_cache(self, counting_dot, tmp_path) -> None:
+        """Entries keep splines, so keep_edge_points works on a hit."""
+        cache = GraphvizCache(tmp_path)
+        GraphvizEngine(cache=cache).compute(_a_b())
+        layout = GraphvizEngine(cache=cache, keep_edge_points=True).compute(_a_b())
+        assert layout == GraphvizEngine(keep_edge_points=True).compute(_a_b())
+        assert cache.hits == 1
+
+    def test_options_and_version_miss(self, counting_dot, tmp_path, monkeypatch) -> None:
+        """Other layout options or another Graphviz version lay out again."""
+        cache = GraphvizCache(tmp_path)
+        GraphvizEngine(cache=cache).compute(_a_b())
+        GraphvizEngine(cache=cache, mclimit=0.5).compute(_a_b())
+        monkeypatch.setenv("FAKE_DOT_VERSION", "12.1.0")
+        graphviz._dot_version.cache_clear()
+        GraphvizEngine(cache=cache).compute(_a_b())
+        assert counting_dot() == 3
+        assert cache.hits == 0
+
+    def test_async(self, counting_dot, tmp_path) -> None:
+        """compute_async() shares entries with compute()."""
+        cache = GraphvizCache(tmp_path)
+        engine = GraphvizEngine(cache=cache)
+        layout = engine.compute(_a_b())
+        assert asyncio.run(engine.compute_async(_a_b())) == layout
+        assert counting_dot() == 1
+
+    def test_async_cache_io_off_the_loop(self, counting_dot, tmp_path, monkeypatch) -> None:
+        """Slow cache reads and writes leave the event loop running."""
+        cache = GraphvizCache(tmp_path)
+        engine = GraphvizEngine(cache=cache)
+        get, put = cache.get, cache.put
+
+        def slow_get(*args: object) -> object:
+            time.sleep(0.2)
+            return get(*args)
+
+        def slow_put(*args: object) -> None:
+            time.sleep(0.2)
+            put(*args)
+
+        monkeypatch.setattr(cache, "get", slow_get)
+        monkeypatch.setattr(cache, "put", slow_put)
+
+        async def ticks_during_layout() -> int:
+            ticks = 0
+
+            async def tick() -> None:
+                nonlocal ticks
+                while True:
+                    await asyncio.sleep(0.01)
+                    ticks += 1
+
+            ticker = asyncio.create_task(tick())
+            await engine.compute_async(_a_b())
+            ticker.cancel()
+            return ticks
+
+        assert asyncio.run(ticks_during_layout()) >= 10  # Miss: get and put
+        assert asyncio.run(ticks_during_layout()) >= 5  # Hit: get
+        assert (counting_dot(), cache.hits) == (1, 1)
+
+    def test_shared_with_libgvc_fallback(self, counting_dot, tmp_path) -> None:
+        """LibGraphvizEngine reads entries GraphvizEngine wrote."""
+        cache = GraphvizCache(tmp_path)
+        layout = GraphvizEngine(cache=cache).compute(_a_b())
+        assert LibGraphvizEngine(cache=cache).compute(_a_b()) == layout
+        assert counting_dot() == 1
+
+    def test_unwritable_cache_still_lays_out(self, counting_dot, tmp_path, monkeypatch) -> None:
+        """A failing write costs only the caching."""
+        cache = GraphvizCache(tmp_path)
+
+        def fail(*args: object) -> None:
+            raise OSError("disk full")
+
+        monkeypatch.setattr(cache, "put", fail)
+        assert GraphvizEngine(cache=cache).compute(_a_b()) == GraphvizEngine().compute(_a_b())
@@ -0,0 +1,104 @@
+"""Tests for layer assignment."""
+
+import itertools
+import random
+
+import pytest
+
+from visualflow import render_dag
+from visualflow.engines import GrandalfEngine
+from visualflow.layering import longest_path_ranks, network_simplex_ranks, total_span
+from visualflow.models import DAG
+from tests.fixtures import create_complex_graph
+
+
+def _late_input() -> DAG:
+    """Create a -> b -> c -> d -> e with x -> e joining at the bottom."""
+    dag = DAG()
+    for node_id in "abcdex":
+        dag.add_node(node_id, f"+---+\n| {node_id} |\n+---+")
+    for source, target in ["ab", "bc", "cd", "de", "xe"]:
+        dag.add_edge(source, target)
+    return dag
+
+
+class TestLongestPath:
+    """Tests for longest_path_ranks()."""
+
+    def test_sources_on_top(self) -> None:
+        """Sources get rank 0, others one below their lowest parent."""
+        ranks = longest_path_ranks("abcx", [("a", "b"), ("b", "c"), ("x", "c")])
+        assert ranks == {"a": 0, "b": 1, "c": 2, "x": 0}
+
+    def test_cycle_rejected(self) -> None:
+        """Cycles cannot be ranked."""
+        with pytest.raises(ValueError, match="cycle"):
+            longest_path_ranks("ab", [("a", "b"), ("b", "a")])
+
+
+class TestNetworkSimplex:
+    """Tests for network_simplex_ranks()."""
+
+    def test_optimal_on_small_graphs(self) -> None:
+        """Total span matches exhaustive search on random small DAGs."""
+        rng = random.Random(3)
+        for _ in range(150):
+            count = rng.randrange(2, 6)
+            edges = []
+            for _ in range(rng.randrange(1, 8)):
+                source, target = sorted(rng.sample(range(count), 2))
+                edges.append((source, target))
+            ranks = network_simplex_ranks(range(count), edges)
+            assert all(ranks[target] > ranks[source] for source, target in edges)
+            best = min(
+                total_span(dict(enumerate(candidate)), edges)
+                for candidate in itertools.product(range(count), repeat=count)
+                if all(candidate[target] > candidate[source] for source, target in edges)
+            )
+            assert total_span(ranks, edges) == best
+
+    def test_late_input_moves_down(self) -> None:
+        """A source feeding a deep node is ranked just above it."""
+        dag = _late_input()
+        pairs = [(edge.source, edge.target) for edge in dag.edges]
+        ranks = network_simplex_ranks(dag.nodes, pairs)
+        assert ranks["x"] == ranks["e"] - 1 == 3
+        assert total_span(ranks, pairs) == 5
+
+    def test_components_normalized(self) -> None:
+        """Each component starts at rank 0; isolated nodes are at 0."""
+        ranks = network_simplex_ranks("abcdz", [("a", "b"), ("c", "d"), ("b", "d")])
+        assert min(ranks[node] for node in "abcd") == 0
+        assert ranks["z"] == 0
+
+    def test_iteration_limit_keeps_ranks_valid(self) -> None:
+        """Stopping early still satisfies every edge."""
+        rng = random.Random(1)
+        edges = [(i, rng.randrange(i + 1, i + 10)) for i in range(200) for _ in range(2)]
+        for limit in (0, 1, 5):
+            ranks = network_simplex_ranks(range(210), edges, max_iterations=limit)
+            assert all(ranks[target] > ranks[source] for source, target in edges)
+
+    def test_cycle_rejected(self) -> None:
+        """Cycles cannot be ranked."""
+        with pytest.raises(ValueError, match="cycle"):
+            network_simplex_ranks("abc", [("a", "b"), ("b", "c"), ("c", "a")])
+
+
+class TestGrandalfLayering:
+    """GrandalfEngine with network simplex layering."""
+
+    def test_late_input_layered_above_target(self) -> None:
+        """The late input sits one layer above its target, shortening the canvas edge."""
+        dag = _late_input()
+        layout = GrandalfEngine(layering="network_simplex").compute(dag)
+        assert layout.positions["x"].y == layout.positions["d"].y
+        default = GrandalfEngine().compute(dag)
+        assert default.positions["x"].y == default.positions["a"].y
+
+    def test_render(self) -> None:
+        """Rendering with network simplex layering draws every node."""
+        dag = create_complex_graph()
+        result = render_dag(dag, engine=GrandalfEngine(layering="network_simplex"))
+        for node in dag.nodes.values():
+            assert node.content.splitlines()[1].strip() in result
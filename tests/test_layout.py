@@ -0,0 +1,241 @@
+"""Tests for layout post-passes (compact_layout, wrap_layers)."""
+
+import asyncio
+
+import pytest
+
+from visualflow import (
+    compact_layout,
+    render_dag,
+    render_dag_async,
+    render_pages,
+    render_tiled,
+    wrap_layers,
+)
+from visualflow.engines import GrandalfEngine
+from visualflow.models import DAG, LayoutResult, Node, NodePosition
+from visualflow.routing import SimpleRouter
+from tests.fixtures import create_diamond, create_simple_chain, create_wide_fanout
+
+
+def _fanout(children: int, grandchildren: bool = True) -> DAG:
+    """Create root -> c_i (-> g_i) for i in range(children)."""
+    dag = DAG()
+    dag.add_node("root", "+--------+\n|  ROOT  |\n+--------+")
+    for i in range(children):
+        dag.add_node(f"c{i}", f"+-----+\n| C{i:<3}|\n+-----+")
+        dag.add_edge("root", f"c{i}")
+        if grandchildren:
+            dag.add_node(f"g{i}", f"+-----+\n| G{i:<3}|\n+-----+")
+            dag.add_edge(f"c{i}", f"g{i}")
+    return dag
+
+
+def _box_cells(layout: LayoutResult) -> set[tuple[int, int]]:
+    """All cells covered by boxes."""
+    return {
+        (x, y)
+        for pos in layout.positions.values()
+        for x in range(pos.x, pos.x + pos.node.width)
+        for y in range(pos.y, pos.y + pos.node.height)
+    }
+
+
+# Directions each line glyph of the default theme connects to
+_LINKS = {
+    "│": "ud", "─": "lr", "╭": "rd", "╮": "ld", "╰": "ur", "╯": "ul",
+    "┬": "lrd", "┴": "lru", "├": "udr", "┤": "udl", "┼": "udlr",
+}
+_STEPS = {"u": (0, -1), "d": (0, 1), "l": (-1, 0), "r": (1, 0)}
+_BACK = {"u": "d", "d": "u", "l": "r", "r": "l"}
+
+
+def _traced_sources(lines: list[str], x: int, y: int) -> set[str]:
+    """Labels of the boxes whose connectors reach the arrow at (x, y)."""
+
+    def at(cx: int, cy: int) -> str:
+        return lines[cy][cx] if 0 <= cy < len(lines) and 0 <= cx < len(lines[cy]) else " "
+
+    sources: set[str] = set()
+    seen: set[tuple[int, int]] = set()
+    stack = [(x, y - 1, "d")]
+    while stack:
+        cx, cy, came_from = stack.pop()
+        if (cx, cy) in seen:
+            continue
+        seen.add((cx, cy))
+        if at(cx - 1, cy) in "+-" and at(cx + 1, cy) in "+-":
+            # Exit connector on a box's bottom border: read its label
+            row = lines[cy - 1]
+            sources.add(row[row.rindex("|", 0, cx) + 1:row.index("|", cx)].strip())
+            continue
+        for direction in _LINKS.get(at(cx, cy), ""):
+            if direction != came_from:
+                dx, dy = _STEPS[direction]
+                stack.append((cx + dx, cy + dy, _BACK[direction]))
+    return sources
+
+
+def _at(node_id: str, x: int, y: int, content: str = "+--+\n|  |\n+--+") -> tuple[str, NodePosition]:
+    """Position a small box."""
+    return node_id, NodePosition(node=Node(id=node_id, content=content), x=x, y=y)
+
+
+class TestCompactLayout:
+    """Tests for compact_layout()."""
+
+    def test_shrinks_empty_columns_and_rows(self) -> None:
+        """Empty bands longer than the gaps are shrunk to the gaps."""
+        layout = LayoutResult(
+            positions=dict([_at("a", 10, 0), _at("b", 40, 0), _at("c", 40, 30)]),
+            width=60,
+            height=40,
+        )
+        compacted = compact_layout(layout, column_gap=4, row_gap=6)
+        positions = compacted.positions
+        assert (positions["a"].x, positions["a"].y) == (4, 0)
+        assert (positions["b"].x, positions["b"].y) == (12, 0)
+        assert (positions["c"].x, positions["c"].y) == (12, 9)
+        assert (compacted.width, compacted.height) == (20, 18)
+
+    def test_shared_columns_stay_shared(self) -> None:
+        """Vertically aligned boxes stay aligned, so straight edges stay straight."""
+        layout = GrandalfEngine().compute(create_simple_chain())
+        compacted = compact_layout(layout)
+        centers = {pos.x + pos.node.width // 2 for pos in compacted.positions.values()}
+        assert len(centers) == 1
+
+    def test_order_preserved(self) -> None:
+        """Boxes keep their left-to-right order."""
+        layout = GrandalfEngine().compute(create_wide_fanout())
+        compacted = compact_layout(layout)
+        before = sorted(layout.positions, key=lambda n: (layout.positions[n].y, layout.positions[n].x))
+        after = sorted(compacted.positions, key=lambda n: (compacted.positions[n].y, compacted.positions[n].x))
+        assert before == after
+        assert compacted.width < layout.width
+
+    def test_tight_layout_unchanged(self) -> None:
+        """Layouts without removable space are returned as is."""
+        layout = LayoutResult(positions=dict([_at("a", 0, 0)]), width=4, height=3)
+        assert compact_layout(layout) is layout
+
+    def test_rejects_narrow_gaps(self) -> None:
+        """Gaps too small to route through are rejected."""
+        layout = GrandalfEngine().compute(create_diamond())
+        with pytest.raises(ValueError, match="column_gap"):
+            compact_layout(layout, column_gap=1)
+        with pytest.raises(ValueError, match="row_gap"):
+            compact_layout(layout, row_gap=4)
+
+    def test_render_dag_compact(self) -> None:
+        """render_dag(compact=True) draws every box on a narrower canvas."""
+        dag = create_wide_fanout()
+        plain = render_dag(dag)
+        compacted = render_dag(dag, compact=True)
+        assert max(map(len, compacted.splitlines())) < max(map(len, plain.splitlines()))
+        for node_id in dag.nodes:
+            assert dag.nodes[node_id].content.splitlines()[1].strip() in compacted
+
+
+class TestWrapLayers:
+    """Tests for wrap_layers()."""
+
+    def test_fitting_layout_unchanged(self) -> None:
+        """Layouts within the budget are returned as is."""
+        layout = GrandalfEngine().compute(create_diamond())
+        assert wrap_layers(layout, max_width=layout.width) is layout
+
+    def test_wide_layer_wrapped_within_budget(self) -> None:
+        """A huge fan-out is folded into sub-rows no wider than the budget."""
+        layout = GrandalfEngine().compute(_fanout(60))
+        assert layout.width > 1000
+        wrapped = wrap_layers(layout, max_width=100)
+        assert wrapped.width <= 100
+        assert all(pos.x + pos.node.width <= 100 for pos in wrapped.positions.values())
+        assert len(wrapped.positions) == len(layout.positions)
+
+    def test_boxes_do_not_overlap(self) -> None:
+        """Wrapped sub-rows and the layers below them never overlap."""
+        wrapped = wrap_layers(GrandalfEngine().compute(_fanout(25)), max_width=60)
+        cells = 0
+        for pos in wrapped.positions.values():
+            cells += pos.node.width * pos.node.height
+        assert len(_box_cells(wrapped)) == cells
+        assert max(pos.y + pos.node.height for pos in wrapped.positions.values()) <= wrapped.height
+
+    def test_wrapped_nodes_tagged(self) -> None:
+        """Wrapped nodes carry their layer and sub-row, in x order."""
+        wrapped = wrap_layers(GrandalfEngine().compute(_fanout(10, grandchildren=False)), max_width=40)
+        children = [wrapped.positions[f"c{i}"] for i in range(10)]
+        assert {pos.layer for pos in children} == {1}
+        assert [pos.row for pos in children] == sorted(pos.row for pos in children)
+        assert children[-1].row > 0
+        assert wrapped.positions["root"].layer is None
+
+    def test_rejects_narrow_gaps(self) -> None:
+        """Gaps too small to route through are rejected."""
+        layout = GrandalfEngine().compute(_fanout(3))
+        with pytest.raises(ValueError, match="column_gap"):
+            wrap_layers(layout, max_width=20, column_gap=1)
+        with pytest.raises(ValueError, match="row_gap"):
+            wrap_layers(layout, max_width=20, row_gap=2)
+
+
+class TestWrappedRouting:
+    """SimpleRouter routes around wrapped sub-rows."""
+
+    def test_routes_avoid_boxes(self) -> None:
+        """No routed cell lies inside a box."""
+        dag = _fanout(12)
+        wrapped = wrap_layers(GrandalfEngine().compute(dag), max_width=50)
+        boxes = _box_cells(wrapped)
+        for path in SimpleRouter().route(wrapped.positions, dag.edges):
+            for x1, y1, x2, y2 in path.segments:
+                cells = {
+                    (x, y)
+                    for x in range(min(x1, x2), max(x1, x2) + 1)
+                    for y in range(min(y1, y2), max(y1, y2) + 1)
+                }
+                assert not cells & boxes, (path.source_id, path.target_id)
+
+    def test_every_target_gets_an_arrow(self) -> None:
+        """Each path ends just above its target."""
+        dag = _fanout(12)
+        wrapped = wrap_layers(GrandalfEngine().compute(dag), max_width=50)
+        for path in SimpleRouter().route(wrapped.positions, dag.edges):
+            target = wrapped.positions[path.target_id]
+            x1, y1, x2, y2 = path.segments[-1]
+            assert (x2, y2) == (target.x + target.node.width // 2, target.y - 1)
+
+    @pytest.mark.parametrize("max_width", [50, 40])  # Two and three sub-rows
+    def test_wrapped_render_traces_edge_by_edge(self, max_width: int) -> None:
+        """Following the drawn lines up from each arrow reaches only its source."""
+        dag = _fanout(8)
+        lines = render_dag(dag, max_width=max_width).splitlines()
+        assert max(len(line) for line in lines) <= max_width
+        assert not any("┼" in line for line in lines)
+        for i in range(8):
+            for label, source in ((f"C{i}", "ROOT"), (f"G{i}", f"C{i}")):
+                y = next(y for y, line in enumerate(lines) if f"| {label} " in line) - 2
+                x = lines[y + 2].index(f"| {label} ") + 3
+                assert lines[y][x] == "▼", label
+                assert _traced_sources(lines, x, y) == {source}, label
+
+    def test_render_dag_max_width(self) -> None:
+        """render_dag() wraps when given a width budget."""
+        result = render_dag(_fanout(40), max_width=80)
+        assert max(len(line) for line in result.splitlines()) <= 80
+        for i in range(40):
+            assert f"C{i}" in result
+            assert f"G{i}" in result
+
+    def test_other_entry_points_max_width(self) -> None:
+        """Async, tiled and paged rendering wrap like render_dag()."""
+        dag = _fanout(40)
+        expected = render_dag(dag, max_width=80, compact=True)
+        assert asyncio.run(render_dag_async(dag, max_width=80, compact=True)) == expected
+        assert "\n".join(render_tiled(dag, band_rows=16, max_width=80, compact=True)) == expected
+        pages = list(render_pages(dag, max_rows=40, max_width=80))
+        assert max(len(line) for page in pages for line in page.splitlines()) <= 80
+        for i in range(40):
+            assert any(f"G{i}" in page for page in pages)
@@ -0,0 +1,155 @@
+"""Tests for LibGraphvizEngine (in-process libgvc with subprocess fallback)."""
+
+import asyncio
+import ctypes
+import os
+import stat
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import visualflow.engines.libgvc as libgvc
+from visualflow import GraphvizEngine, LibGraphvizEngine
+from visualflow.models import DAG
+from tests.fixtures import create_complex_graph
+from tests.test_async import PLAIN_A_B, _a_b
+
+in_process = pytest.mark.skipif(
+    not LibGraphvizEngine.is_in_process(),
+    reason="libgvc not installed (run: brew install graphviz)",
+)
+
+
+@pytest.fixture
+def fallback_dot(tmp_path, monkeypatch):
+    """Hide libgvc and put a fake `dot` printing PLAIN_A_B on PATH."""
+    monkeypatch.setattr(libgvc, "_load_libgvc", lambda: None)
+    script = tmp_path / "dot"
+    script.write_text(f"#!/bin/sh\ncat > /dev/null\ncat <<'EOF'\n{PLAIN_A_B}EOF\n")
+    script.chmod(script.stat().st_mode | stat.S_IEXEC)
+    monkeypatch.setenv("PATH", f"{tmp_path}{os.pathsep}{os.environ.get('PATH', '')}")
+    return script
+
+
+class TestSubprocessFallback:
+    """Tests for LibGraphvizEngine without libgvc."""
+
+    def test_matches_graphviz_engine(self, fallback_dot) -> None:
+        """Without libgvc, layouts come from the dot command."""
+        assert not LibGraphvizEngine.is_in_process()
+        assert LibGraphvizEngine().compute(_a_b()) == GraphvizEngine().compute(_a_b())
+
+    def test_async_matches_graphviz_engine(self, fallback_dot) -> None:
+        """compute_async() falls back to the async subprocess path."""
+        layout = asyncio.run(LibGraphvizEngine().compute_async(_a_b()))
+        assert layout == GraphvizEngine().compute(_a_b())
+
+    def test_unavailable_without_library_or_command(self, monkeypatch) -> None:
+        """Neither libgvc nor dot: unavailable, and compute() raises."""
+        monkeypatch.setattr(libgvc, "_load_libgvc", lambda: None)
+        monkeypatch.setenv("PATH", "")
+        assert not LibGraphvizEngine.is_available()
+        with pytest.raises(RuntimeError, match="not installed"):
+            LibGraphvizEngine().compute(_a_b())
+
+    def test_empty_dag(self, monkeypatch) -> None:
+        """Empty DAGs need neither libgvc nor dot."""
+        monkeypatch.setattr(libgvc, "_load_libgvc", lambda: None)
+        monkeypatch.setenv("PATH", "")
+        layout = LibGraphvizEngine().compute(DAG())
+        assert layout.positions == {} and layout.width == 0
+
+
+class _FakeLibrary:
+    """Stand-in for a loaded library: any symbol, with set return values."""
+
+    def __init__(self, **results: object) -> None:
+        for symbol, result in results.items():
+            setattr(self, symbol, _FakeFunction(result))
+
+    def __getattr__(self, symbol: str) -> "_FakeFunction":
+        function = _FakeFunction(None)
+        setattr(self, symbol, function)
+        return function
+
+
+class _FakeFunction:
+    """Stand-in for a C function: accepts argtypes/restype, returns a value."""
+
+    def __init__(self, result: object) -> None:
+        self.result = result
+
+    def __call__(self, *args: object) -> object:
+        return self.result
+
+
+class TestSignatures:
+    """Tests for the C signatures declared for the loaded libraries."""
+
+    @pytest.mark.parametrize(
+        ("version", "length_type"),
+        [(b"2.43.0", ctypes.c_uint), (b"8.1.0", ctypes.c_uint), (b"9.0.0", ctypes.c_size_t)],
+    )
+    def test_render_length_type_follows_version(self, monkeypatch, version, length_type) -> None:
+        """gvRenderData() takes an unsigned int length before Graphviz 9."""
+        monkeypatch.setattr(libgvc._Agdesc, "in_dll", lambda library, symbol: libgvc._Agdesc())
+        gvc = _FakeLibrary(gvContext=1, gvcVersion=version)
+        lib = libgvc._LibGvc(_FakeLibrary(), gvc)
+        assert lib.length_type is length_type
+        assert gvc.gvRenderData.argtypes[-1] is ctypes.POINTER(length_type)
+
+
+@in_process
+class TestInProcessLayout:
+    """Tests for layouts through libgvc."""
+
+    def test_lays_out_all_nodes(self) -> None:
+        """Every node gets a position, edges point down."""
+        dag = create_complex_graph()
+        layout = LibGraphvizEngine().compute(dag)
+        assert set(layout.positions) == set(dag.nodes)
+        for edge in dag.edges:
+            assert layout.positions[edge.source].y < layout.positions[edge.target].y
+
+    @pytest.mark.skipif(not GraphvizEngine.is_available(), reason="dot not installed")
+    def test_matches_dot_command(self) -> None:
+        """Same positions and edge points as the subprocess engine."""
+        dag = create_complex_graph()
+        engine_options = {"keep_edge_points": True, "mclimit": 0.5}
+        expected = GraphvizEngine(**engine_options).compute(dag)
+        assert LibGraphvizEngine(**engine_options).compute(dag) == expected
+
+    def test_hyphenated_ids(self) -> None:
+        """Node IDs are mapped like the DOT path does."""
+        dag = DAG()
+        dag.add_node("a-1", "+---+\n| A |\n+---+")
+        dag.add_node("b-1", "+---+\n| B |\n+---+")
+        dag.add_edge("a-1", "b-1")
+        layout = LibGraphvizEngine().compute(dag)
+        assert layout.positions["a-1"].y < layout.positions["b-1"].y
+
+    def test_edge_points_kept(self) -> None:
+        """keep_edge_points reads splines from the in-memory plain output."""
+        layout = LibGraphvizEngine(keep_edge_points=True).compute(_a_b())
+        assert list(layout.edge_points) == [("a", "b")]
+
+    def test_concurrent_layouts(self) -> None:
+        """Layouts from several threads are serialized and all succeed."""
+        dag = create_complex_graph()
+        expected = LibGraphvizEngine().compute(dag)
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            layouts = list(pool.map(lambda _: LibGraphvizEngine().compute(dag), range(8)))
+        assert all(layout == expected for layout in layouts)
+
+    def test_async(self) -> None:
+        """compute_async() gives the same layout as compute()."""
+        dag = create_complex_graph()
+        engine = LibGraphvizEngine()
+        assert asyncio.run(engine.compute_async(dag)) == engine.compute(dag)
+
+    def test_unwritable_ids_rejected(self) -> None:
+        """IDs the DOT path rejects are rejected here too."""
+        dag = DAG()
+        dag.add_node("dir\\", "+---+\n| A |\n+---+")
+        with pytest.raises(ValueError, match="cannot represent node ID"):
+            LibGraphvizEngine().compute(dag)
@@ -0,0 +1,94 @@
+"""Tests for layout quality metrics."""
+
+import random
+
+from visualflow import LayoutMetrics, count_crossings, measure_layout
+from visualflow.engines import GrandalfEngine
+from visualflow.metrics import bilayer_crossings, count_bends, edge_length
+from visualflow.models import DAG, EdgePath, LayoutResult, NodePosition, RouteResult
+from visualflow.routing import SegmentTable, SimpleRouter
+from tests.fixtures import create_complex_graph, create_diamond
+
+
+def _grid(rows: list[list[str]], edges: list[tuple[str, str]]) -> tuple[LayoutResult, DAG]:
+    """Place 3x3 boxes in rows 10 apart, columns 10 apart."""
+    dag = DAG()
+    positions = {}
+    for r, row in enumerate(rows):
+        for c, node_id in enumerate(row):
+            dag.add_node(node_id, "+-+\n| |\n+-+")
+            positions[node_id] = NodePosition(node=dag.nodes[node_id], x=10 * c, y=10 * r)
+    for source, target in edges:
+        dag.add_edge(source, target)
+    return LayoutResult(positions=positions, width=10 * max(map(len, rows)), height=10 * len(rows)), dag
+
+
+class TestCrossings:
+    """Tests for crossing counting."""
+
+    def test_bilayer_matches_brute_force(self) -> None:
+        """Inversion counting agrees with checking every pair."""
+        rng = random.Random(7)
+        for _ in range(200):
+            segments = [(rng.randrange(6), rng.randrange(6)) for _ in range(rng.randrange(15))]
+            expected = sum(
+                1 for a in segments for b in segments if a[0] < b[0] and a[1] > b[1]
+            )
+            assert bilayer_crossings(segments) == expected
+
+    def test_crossed_pair(self) -> None:
+        """a->d and b->c cross; edges sharing an endpoint do not."""
+        layout, dag = _grid([["a", "b"], ["c", "d"]], [("a", "d"), ("b", "c"), ("a", "c")])
+        assert count_crossings(layout, dag.edges) == 1
+
+    def test_long_edge_split_at_layers(self) -> None:
+        """A long edge crosses edges of every layer pair it spans."""
+        layout, dag = _grid(
+            [["a", "b", "c"], ["d", "e", "f"], ["g", "h", "i"]],
+            [("a", "i"), ("c", "d"), ("f", "g")],
+        )
+        assert count_crossings(layout, dag.edges) == 2
+
+    def test_same_layer_and_unknown_edges_ignored(self) -> None:
+        """Edges within a layer or to missing nodes are not counted."""
+        layout, dag = _grid([["a", "b"], ["c", "d"]], [("a", "b"), ("a", "d"), ("b", "c")])
+        dag.add_edge("a", "missing")
+        assert count_crossings(layout, dag.edges) == 1
+
+
+class TestRouteMetrics:
+    """Tests for edge length and bends."""
+
+    def test_length_and_bends(self) -> None:
+        """Lengths sum per segment; bends count direction changes."""
+        result = RouteResult(
+            paths=[
+                EdgePath(source_id="a", target_id="b", segments=[(0, 0, 0, 4), (0, 4, 6, 4), (6, 4, 6, 9)]),
+                EdgePath(source_id="a", target_id="c", segments=[(0, 0, 0, 9), (0, 9, 0, 9)]),
+            ]
+        )
+        table = SegmentTable.from_route_result(result)
+        assert edge_length(table) == 4 + 6 + 5 + 9
+        assert count_bends(table) == 2
+
+    def test_measure_layout(self) -> None:
+        """measure_layout() routes when needed and accepts either route format."""
+        dag = create_complex_graph()
+        layout = GrandalfEngine().compute(dag)
+        metrics = measure_layout(layout, dag.edges)
+        assert isinstance(metrics, LayoutMetrics)
+        assert metrics.area == layout.width * layout.height
+        assert metrics.edge_length > 0
+        routed = SimpleRouter().route(layout.positions, dag.edges)
+        assert measure_layout(layout, dag.edges, routes=routed) == metrics
+
+    def test_straight_chain_has_no_bends(self) -> None:
+        """Vertically aligned boxes are joined without bends or crossings."""
+        layout, dag = _grid([["a"], ["b"], ["c"]], [("a", "b"), ("b", "c")])
+        metrics = measure_layout(layout, dag.edges)
+        assert (metrics.crossings, metrics.bends) == (0, 0)
+
+    def test_diamond(self) -> None:
+        """A diamond has no crossings."""
+        dag = create_diamond()
+        assert measure_layout(GrandalfEngine().compute(dag), dag.edges).crossings == 0
@@ -66,6 +66,13 @@ class TestNode:
         # "Hello " (6) + "\u4e16" (2) + "\u754c" (2) = 10 columns
         assert node.width == 10
 
+    def test_node_size_follows_content_changes(self) -> None:
+        """Cached width and height are recomputed when content changes."""
+        node = Node(id="test", content="abc")
+        assert (node.width, node.height) == (3, 1)
+        node.content = "abcdef\nx\ny"
+        assert (node.width, node.height) == (6, 3)
+
 
 class TestEdge:
     """Tests for Edge model."""
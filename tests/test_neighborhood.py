@@ -0,0 +1,107 @@
+"""Tests for neighborhood extraction and rendering."""
+
+import pytest
+
+from visualflow import render_neighborhood
+from visualflow.models import DAG
+from visualflow.neighborhood import AdjacencyIndex, extract_neighborhood
+from tests.fixtures import create_complex_graph
+
+
+def _chain(*ids: str) -> DAG:
+    """Create a linear chain DAG over the given ids."""
+    dag = DAG()
+    for node_id in ids:
+        dag.add_node(node_id, node_id.upper())
+    for source, target in zip(ids, ids[1:]):
+        dag.add_edge(source, target)
+    return dag
+
+
+class TestAdjacencyIndex:
+    """Tests for AdjacencyIndex."""
+
+    def test_successors_and_predecessors(self) -> None:
+        """Index reports direct neighbors in both directions."""
+        index = AdjacencyIndex(_chain("a", "b", "c"))
+        assert index.successors("a") == ["b"]
+        assert index.predecessors("c") == ["b"]
+        assert index.successors("c") == []
+        assert index.predecessors("a") == []
+
+    def test_edges_to_unknown_nodes_ignored(self) -> None:
+        """Edges referencing missing nodes are not indexed."""
+        dag = _chain("a", "b")
+        dag.add_edge("b", "ghost")
+        index = AdjacencyIndex(dag)
+        assert index.successors("b") == []
+
+
+class TestExtractNeighborhood:
+    """Tests for extract_neighborhood()."""
+
+    def test_one_hop_both_directions(self) -> None:
+        """Default extracts direct dependencies and dependents."""
+        dag = _chain("a", "b", "c", "d", "e")
+        sub = extract_neighborhood(dag, ["c"])
+        assert set(sub.nodes) == {"b", "c", "d"}
+        assert {(e.source, e.target) for e in sub.edges} == {("b", "c"), ("c", "d")}
+
+    def test_upstream_only(self) -> None:
+        """downstream=0 keeps only what the node depends on."""
+        dag = _chain("a", "b", "c", "d", "e")
+        sub = extract_neighborhood(dag, ["c"], upstream=2, downstream=0)
+        assert set(sub.nodes) == {"a", "b", "c"}
+
+    def test_unlimited_hops(self) -> None:
+        """None walks the full transitive closure."""
+        dag = _chain("a", "b", "c", "d", "e")
+        sub = extract_neighborhood(dag, ["e"], upstream=None, downstream=0)
+        assert set(sub.nodes) == {"a", "b", "c", "d", "e"}
+
+    def test_induced_edges_between_included_nodes(self) -> None:
+        """Edges between included nodes are kept even if not walked."""
+        dag = create_complex_graph()
+        index = AdjacencyIndex(dag)
+        seed = next(iter(dag.nodes))
+        sub = extract_neighborhood(index, [seed], upstream=None, downstream=None)
+        expected = {
+            (e.source, e.target) for e in dag.edges
+            if e.source in sub.nodes and e.target in sub.nodes
+        }
+        assert {(e.source, e.target) for e in sub.edges} == expected
+
+    def test_multiple_seeds(self) -> None:
+        """Neighborhoods of several seeds are merged."""
+        dag = _chain("a", "b", "c", "d", "e", "f", "g")
+        sub = extract_neighborhood(dag, ["b", "f"], upstream=0, downstream=1)
+        assert set(sub.nodes) == {"b", "c", "f", "g"}
+
+    def test_unknown_seed_raises(self) -> None:
+        """Unknown seed ids raise KeyError."""
+        with pytest.raises(KeyError):
+            extract_neighborhood(_chain("a", "b"), ["nope"])
+
+    def test_nodes_shared_with_source(self) -> None:
+        """Node objects are not copied."""
+        dag = _chain("a", "b")
+        sub = extract_neighborhood(dag, ["a"])
+        assert sub.nodes["a"] is dag.nodes["a"]
+
+
+class TestRenderNeighborhood:
+    """Tests for render_neighborhood()."""
+
+    def test_renders_only_neighborhood(self) -> None:
+        """Only nodes in the neighborhood appear in the output."""
+        dag = DAG()
+        for node_id in ("a", "b", "c", "d", "e"):
+            dag.add_node(node_id, f"+-----+\n| {node_id.upper()}_X |\n+-----+")
+        for source, target in zip("abcd", "bcde"):
+            dag.add_edge(source, target)
+        result = render_neighborhood(AdjacencyIndex(dag), ["c"])
+        assert "B_X" in result
+        assert "C_X" in result
+        assert "D_X" in result
+        assert "A_X" not in result
+        assert "E_X" not in result
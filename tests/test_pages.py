@@ -0,0 +1,105 @@
+"""Tests for paginated rendering (render_pages / paginate_layout)."""
+
+import types
+
+import pytest
+
+from visualflow import render_dag, render_pages, GrandalfEngine
+from visualflow.models import DEFAULT_THEME, DAG, EdgePath, LayoutResult, NodePosition, RouteResult
+from visualflow.render.pages import paginate_layout
+from tests.fixtures import create_complex_graph, create_simple_chain
+
+
+def _tall_chain(length: int) -> DAG:
+    """Create a chain of small boxes n0 -> n1 -> ... (ids in box text)."""
+    dag = DAG()
+    for i in range(length):
+        dag.add_node(f"n{i}", f"+-----+\n| N{i:02d} |\n+-----+")
+    for i in range(length - 1):
+        dag.add_edge(f"n{i}", f"n{i + 1}")
+    return dag
+
+
+class TestRenderPages:
+    """Tests for render_pages()."""
+
+    def test_returns_lazy_generator(self) -> None:
+        """Pages are produced lazily."""
+        pages = render_pages(create_simple_chain(), max_rows=20)
+        assert isinstance(pages, types.GeneratorType)
+
+    def test_single_page_matches_render_dag(self) -> None:
+        """With a large budget, the only page equals the full render."""
+        dag = create_complex_graph()
+        pages = list(render_pages(dag, max_rows=10_000, engine=GrandalfEngine()))
+        assert pages == [render_dag(dag, engine=GrandalfEngine())]
+
+    def test_pages_respect_max_rows(self) -> None:
+        """No page exceeds max_rows when every layer fits."""
+        pages = list(render_pages(_tall_chain(12), max_rows=20))
+        assert len(pages) > 1
+        for page in pages:
+            assert len(page.splitlines()) <= 20
+
+    def test_every_box_on_exactly_one_page(self) -> None:
+        """Each node's box appears on exactly one page."""
+        pages = list(render_pages(_tall_chain(12), max_rows=20))
+        for i in range(12):
+            label = f"N{i:02d}"
+            assert sum(label in page for page in pages) == 1
+
+    def test_continuation_stubs_are_labeled(self) -> None:
+        """Edges crossing a page break are labeled on both pages."""
+        pages = list(render_pages(_tall_chain(12), max_rows=20))
+        for upper, lower in zip(pages, pages[1:]):
+            upper_legend = upper.splitlines()[-1]
+            lower_legend = lower.splitlines()[0]
+            assert "->" in upper_legend
+            assert upper_legend == lower_legend
+
+    def test_standalones_paginated_after_subgraphs(self) -> None:
+        """Standalone nodes are rendered on their own trailing page(s)."""
+        dag = create_simple_chain()
+        dag.add_node("lonely", "+--------+\n| LONELY |\n+--------+")
+        pages = list(render_pages(dag, max_rows=10_000))
+        assert len(pages) == 2
+        assert "LONELY" in pages[1]
+
+    def test_max_rows_too_small_raises(self) -> None:
+        """A budget that cannot hold stubs is rejected."""
+        with pytest.raises(ValueError):
+            list(render_pages(create_simple_chain(), max_rows=4))
+
+    def test_empty_dag_yields_nothing(self) -> None:
+        """Empty DAG produces no pages."""
+        assert list(render_pages(DAG(), max_rows=20)) == []
+
+    def test_markers_unique_past_62_crossings(self) -> None:
+        """More stubs than marker characters get longer, distinct markers."""
+        dag = DAG()
+        positions = {}
+        paths = []
+        for i in range(70):
+            for node_id, y in ((f"t{i}", 0), (f"b{i}", 20)):
+                dag.add_node(node_id, "+-+\n| |\n+-+")
+                positions[node_id] = NodePosition(node=dag.nodes[node_id], x=4 * i, y=y)
+            segments = [(4 * i + 1, 3, 4 * i + 1, 19)]
+            paths.append(EdgePath(source_id=f"t{i}", target_id=f"b{i}", segments=segments))
+        layout = LayoutResult(positions=positions, width=280, height=23)
+        upper, lower = paginate_layout(layout, RouteResult(paths=paths), DEFAULT_THEME, 20)
+
+        def markers(rows: list[str]) -> list[str]:
+            columns = ("".join(row[4 * i + 1] for row in rows) for i in range(70))
+            return [column.replace(DEFAULT_THEME.vertical, "").strip() for column in columns]
+
+        upper_lines, lower_lines = upper.splitlines(), lower.splitlines()
+        arrow_row = next(y for y, line in enumerate(upper_lines) if line.startswith(" v"))
+        found = markers(upper_lines[arrow_row + 1 : arrow_row + 3])
+        assert len(set(found)) == 70
+        assert found[61:64] == ["9", "aa", "ab"]
+        legend = "\n".join(upper_lines[arrow_row + 3 :])
+        for i, marker in enumerate(found):
+            assert f"{marker}: t{i} -> b{i}" in legend
+        legend_rows = len(upper_lines) - arrow_row - 3
+        assert lower_lines[:legend_rows] == upper_lines[arrow_row + 3 :]
+        assert markers(lower_lines[legend_rows : legend_rows + 2]) == found
@@ -227,6 +227,19 @@ class TestPartitionDagEdgePreservation:
         connected, standalones = partition_dag(dag)
         assert len(standalones.edges) == 0
 
+    def test_nodes_and_edges_shared_with_input(self) -> None:
+        """Subgraphs reuse the input's Node and Edge objects."""
+        dag = DAG()
+        dag.add_node("a", "A")
+        dag.add_node("b", "B")
+        dag.add_edge("a", "b")
+        dag.add_node("c", "C")  # standalone
+
+        connected, standalones = partition_dag(dag)
+        assert connected[0].nodes["a"] is dag.nodes["a"]
+        assert connected[0].edges[0] is dag.edges[0]
+        assert standalones.nodes["c"] is dag.nodes["c"]
+
 
 class TestPartitionDagExport:
     """Tests for partition_dag export from visualflow package."""
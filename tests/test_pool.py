@@ -0,0 +1,75 @@
+"""Tests for canvas pooling."""
+
+from visualflow import render_dag
+from visualflow.models import EdgePath, HEAVY_THEME, LIGHT_THEME
+from visualflow.render import Canvas, CanvasPool, SparseCanvas, canvas_pool
+from tests.fixtures import create_complex_graph, create_diamond
+
+
+def _draw(canvas: Canvas) -> str:
+    """Draw a box and edges that run off every canvas border."""
+    canvas.place_box("+---+\n| A |\n+---+", 1, 1)
+    canvas.place_box_connector(3, 3)
+    canvas.draw_edge(EdgePath(source_id="a", target_id="b", segments=[(3, 4, 3, 9), (3, 9, 40, 9)]))
+    canvas.draw_edge(EdgePath(source_id="c", target_id="d", segments=[(8, -5, 8, 40)]))
+    return canvas.render()
+
+
+class TestCanvasPool:
+    """Tests for CanvasPool acquire/release."""
+
+    def test_acquire_sets_requested_size(self) -> None:
+        """Pooled canvases report the requested size and theme."""
+        canvas = CanvasPool().acquire(13, 7, LIGHT_THEME)
+        assert (canvas.width, canvas.height) == (13, 7)
+        assert canvas.theme == LIGHT_THEME
+        assert canvas.render() == ""
+
+    def test_released_canvas_is_reused(self) -> None:
+        """A released canvas is handed out again for a fitting request."""
+        pool = CanvasPool()
+        first = pool.acquire(20, 10)
+        pool.release(first)
+        assert len(pool) == 1
+        second = pool.acquire(18, 12)
+        assert second is first
+        assert len(pool) == 0
+
+    def test_reused_canvas_is_blank(self) -> None:
+        """Content from the previous render is cleared on release."""
+        pool = CanvasPool()
+        with pool.canvas(20, 10) as canvas:
+            _draw(canvas)
+        with pool.canvas(20, 10, HEAVY_THEME) as canvas:
+            assert canvas.render() == ""
+            assert canvas.get_char(8, 5) == " "
+
+    def test_oversized_buffers_render_like_exact_canvas(self) -> None:
+        """Writes are clipped to the requested size, not the buffer size."""
+        pool = CanvasPool()
+        with pool.canvas(100, 50) as canvas:
+            _draw(canvas)
+        with pool.canvas(12, 10) as canvas:
+            assert _draw(canvas) == _draw(Canvas(width=12, height=10))
+
+    def test_limits(self) -> None:
+        """Idle count, huge canvases and other backends are not kept."""
+        pool = CanvasPool(max_idle=1, max_cells=10_000)
+        pool.release(pool.acquire(5, 5))
+        pool.release(Canvas(width=5, height=5))
+        assert len(pool) == 1
+        pool = CanvasPool(max_cells=10_000)
+        pool.release(pool.acquire(500, 500))
+        pool.release(SparseCanvas(width=5, height=5))
+        assert len(pool) == 0
+
+
+class TestRenderPooling:
+    """render_dag() draws on the shared pool."""
+
+    def test_repeated_renders_match(self) -> None:
+        """Renders through a reused canvas are unchanged."""
+        first = [render_dag(factory()) for factory in (create_complex_graph, create_diamond)]
+        assert len(canvas_pool) > 0
+        second = [render_dag(factory()) for factory in (create_complex_graph, create_diamond)]
+        assert first == second
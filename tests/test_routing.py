@@ -2,8 +2,17 @@
 
 import pytest
 
-from visualflow.models import DAG, Edge, NodePosition, Node
-from visualflow.routing import SimpleRouter, EdgeRouter
+from visualflow import render_dag
+from visualflow.models import DAG, Edge, NodePosition, Node, RouteResult
+from visualflow.routing import (
+    ColumnarRouter,
+    ConnectorRouter,
+    EdgeRouter,
+    LayoutRouter,
+    SegmentTable,
+    SimpleRouter,
+    SnapRouter,
+)
 
 
 def make_test_node(id: str, width: int = 10, height: int = 3) -> Node:
@@ -24,6 +33,24 @@ class TestSimpleRouterProtocol:
         assert hasattr(router, "route")
         assert callable(router.route)
 
+    def test_optional_outputs_are_separate_protocols(self) -> None:
+        """route() alone satisfies EdgeRouter; richer outputs are opt-in."""
+
+        class PathsOnly:
+            def route(self, positions: dict[str, NodePosition], edges: list[Edge]) -> list:
+                return SimpleRouter().route(positions, edges)
+
+        assert isinstance(PathsOnly(), EdgeRouter)
+        assert not isinstance(PathsOnly(), (ConnectorRouter, ColumnarRouter, LayoutRouter))
+        assert isinstance(SimpleRouter(), ConnectorRouter) and isinstance(SimpleRouter(), ColumnarRouter)
+        assert isinstance(SnapRouter(), LayoutRouter)
+
+        dag = DAG()
+        dag.add_node("a", make_test_node("a").content)
+        dag.add_node("b", make_test_node("b").content)
+        dag.add_edge("a", "b")
+        assert render_dag(dag, router=PathsOnly()) == render_dag(dag)
+
 
 class TestSimpleRouterVertical:
     """Tests for vertical edge routing."""
@@ -212,3 +239,112 @@ class TestSimpleRouterEdgeCases:
             for seg in path.segments:
                 for coord in seg:
                     assert isinstance(coord, int)
+
+
+class TestRouteWithConnectors:
+    """Tests for SimpleRouter.route_with_connectors() and RouteResult."""
+
+    def test_paths_match_route(self) -> None:
+        """The paths in the result are the same as route() returns."""
+        router = SimpleRouter()
+        positions = {
+            "a": NodePosition(node=make_test_node("a", width=20), x=0, y=0),
+            "b": NodePosition(node=make_test_node("b"), x=0, y=10),
+            "c": NodePosition(node=make_test_node("c"), x=20, y=20),
+        }
+        edges = [Edge(source="a", target="b"), Edge(source="a", target="c")]
+        result = router.route_with_connectors(positions, edges)
+        assert result.paths == router.route(positions, edges)
+
+    def test_exit_on_source_bottom_border(self) -> None:
+        """Exits sit on the bottom border above each path's first segment."""
+        router = SimpleRouter()
+        positions = {
+            "a": NodePosition(node=make_test_node("a"), x=5, y=0),
+            "b": NodePosition(node=make_test_node("b"), x=20, y=10),
+        }
+        result = router.route_with_connectors(positions, [Edge(source="a", target="b")])
+        assert result.exits == [(10, 2)]
+        assert result.entries == [(25, 9)]
+
+    def test_trunk_split_has_single_exit(self) -> None:
+        """Same-layer fan-out shares one exit connector."""
+        router = SimpleRouter()
+        positions = {
+            "a": NodePosition(node=make_test_node("a", width=20), x=10, y=0),
+            "b": NodePosition(node=make_test_node("b"), x=0, y=10),
+            "c": NodePosition(node=make_test_node("c"), x=30, y=10),
+        }
+        edges = [Edge(source="a", target="b"), Edge(source="a", target="c")]
+        result = router.route_with_connectors(positions, edges)
+        assert result.exits == [(20, 2)]
+        assert len(result.entries) == 2
+
+    def test_from_paths_derives_connectors(self) -> None:
+        """RouteResult.from_paths() takes connectors from path endpoints."""
+        router = SimpleRouter()
+        positions = {
+            "a": NodePosition(node=make_test_node("a"), x=5, y=0),
+            "b": NodePosition(node=make_test_node("b"), x=20, y=10),
+        }
+        edges = [Edge(source="a", target="b")]
+        derived = RouteResult.from_paths(router.route(positions, edges))
+        assert derived == router.route_with_connectors(positions, edges)
+
+    def test_route_only_router_renders(self) -> None:
+        """Routers that only implement route() still get box connectors."""
+
+        class RouteOnly:
+            def route(self, positions, edges):  # type: ignore[no-untyped-def]
+                return SimpleRouter().route(positions, edges)
+
+        dag = DAG()
+        dag.add_node("a", "+-------+\n|   A   |\n+-------+")
+        dag.add_node("b", "+-------+\n|   B   |\n+-------+")
+        dag.add_edge("a", "b")
+        assert render_dag(dag, router=RouteOnly()) == render_dag(dag)
+
+
+class TestRouteColumnar:
+    """Tests for SimpleRouter.route_columnar() and SegmentTable."""
+
+    def _layout(self) -> tuple[dict[str, NodePosition], list[Edge]]:
+        positions = {
+            "a": NodePosition(node=make_test_node("a", width=20), x=10, y=0),
+            "b": NodePosition(node=make_test_node("b"), x=0, y=10),
+            "c": NodePosition(node=make_test_node("c"), x=30, y=10),
+            "d": NodePosition(node=make_test_node("d"), x=15, y=25),
+        }
+        edges = [
+            Edge(source="a", target="b"),
+            Edge(source="a", target="c"),
+            Edge(source="b", target="d"),
+            Edge(source="c", target="d"),
+        ]
+        return positions, edges
+
+    def test_matches_route_with_connectors(self) -> None:
+        """Columnar output converts back to the same RouteResult."""
+        router = SimpleRouter()
+        positions, edges = self._layout()
+        table = router.route_columnar(positions, edges)
+        assert table.to_route_result() == router.route_with_connectors(positions, edges)
+
+    def test_offsets_index_edges(self) -> None:
+        """Offsets delimit each edge's segments in the flat array."""
+        router = SimpleRouter()
+        positions, edges = self._layout()
+        table = router.route_columnar(positions, edges)
+        assert len(table) == 4
+        assert len(table.offsets) == 5
+        assert len(table.segments) == table.offsets[-1] * 4
+        paths = router.route(positions, edges)
+        for i, path in enumerate(paths):
+            assert table.edge_segments(i) == path.segments
+
+    def test_round_trip_from_route_result(self) -> None:
+        """A table built from a RouteResult converts back unchanged."""
+        router = SimpleRouter()
+        positions, edges = self._layout()
+        result = router.route_with_connectors(positions, edges)
+        assert SegmentTable.from_route_result(result).to_route_result() == result
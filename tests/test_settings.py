@@ -0,0 +1,101 @@
+"""Tests for global and context-local settings."""
+
+import asyncio
+import threading
+
+import pytest
+
+from visualflow import DAG, render_dag, settings, DEFAULT_THEME, HEAVY_THEME, ROUNDED_THEME
+from visualflow.settings import override
+
+
+def _dag() -> DAG:
+    """Create a -> b so rendered output contains edge characters."""
+    dag = DAG()
+    dag.add_node("a", "+---+\n| A |\n+---+")
+    dag.add_node("b", "+---+\n| B |\n+---+")
+    dag.add_edge("a", "b")
+    return dag
+
+
+@pytest.fixture(autouse=True)
+def _restore_theme():
+    """Restore the global theme after each test."""
+    original = settings.theme
+    yield
+    settings.theme = original
+
+
+class TestSettingsOverride:
+    """Tests for settings.override()."""
+
+    def test_override_scopes_theme(self) -> None:
+        """Theme is overridden inside the block and restored after."""
+        settings.theme = DEFAULT_THEME
+        with settings.override(theme=HEAVY_THEME):
+            assert settings.theme is HEAVY_THEME
+        assert settings.theme is DEFAULT_THEME
+
+    def test_override_accepts_theme_name(self) -> None:
+        """Theme names resolve through THEME_MAP."""
+        with override(theme="Rounded"):
+            assert settings.theme is ROUNDED_THEME
+
+    def test_unknown_theme_name_raises(self) -> None:
+        """Unknown names are rejected."""
+        with pytest.raises(ValueError):
+            with override(theme="neon"):
+                pass
+
+    def test_overrides_nest(self) -> None:
+        """Inner overrides shadow outer ones and unwind in order."""
+        with override(theme=HEAVY_THEME):
+            with override(theme=ROUNDED_THEME):
+                assert settings.theme is ROUNDED_THEME
+            assert settings.theme is HEAVY_THEME
+
+    def test_render_dag_uses_override(self) -> None:
+        """render_dag picks up the context-local theme."""
+        with override(theme=HEAVY_THEME):
+            result = render_dag(_dag())
+        assert HEAVY_THEME.vertical in result
+
+    def test_override_is_thread_local(self) -> None:
+        """Concurrent threads each see only their own override."""
+        settings.theme = DEFAULT_THEME
+        barrier = threading.Barrier(2)
+        seen: dict[str, object] = {}
+
+        def worker(name: str, theme) -> None:
+            with override(theme=theme):
+                barrier.wait()  # Both overrides active at once
+                seen[name] = settings.theme
+                seen[name + "-render"] = render_dag(_dag())
+
+        threads = [
+            threading.Thread(target=worker, args=("heavy", HEAVY_THEME)),
+            threading.Thread(target=worker, args=("rounded", ROUNDED_THEME)),
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert seen["heavy"] is HEAVY_THEME
+        assert seen["rounded"] is ROUNDED_THEME
+        assert HEAVY_THEME.vertical in seen["heavy-render"]
+        assert HEAVY_THEME.vertical not in seen["rounded-render"]
+        assert settings.theme is DEFAULT_THEME
+
+    def test_override_is_task_local(self) -> None:
+        """asyncio tasks each see only their own override."""
+
+        async def task(theme):
+            with override(theme=theme):
+                await asyncio.sleep(0)
+                return settings.theme
+
+        async def main():
+            return await asyncio.gather(task(HEAVY_THEME), task(ROUNDED_THEME))
+
+        assert asyncio.run(main()) == [HEAVY_THEME, ROUNDED_THEME]
@@ -0,0 +1,257 @@
+"""Tests for GraphvizEngine edge points and SnapRouter."""
+
+import os
+import stat
+
+import pytest
+
+from visualflow import GraphvizEngine, SimpleRouter, SnapRouter, measure_layout, render_dag
+from visualflow.models import DAG, Edge, LayoutResult, Node, NodePosition
+from visualflow.routing import SegmentTable
+
+# Canned `dot -Tplain` output for a -> b -> c plus a -> c, which dot
+# bends around b on the right
+PLAIN_SKIP = """\
+graph 1 4 9.5
+node a 2 8.75 1.1 1.5 a solid box black lightgrey
+node b 1.25 5 1.1 1.5 b solid box black lightgrey
+node c 2 1.25 1.1 1.5 c solid box black lightgrey
+edge a b 4 1.8 8 1.6 7 1.4 6.5 1.3 5.75 solid black
+edge b c 4 1.3 4.25 1.5 3.5 1.8 2.5 1.9 2 solid black
+edge a c 7 2.3 8 2.8 7 3 6 3 5 3 4 2.8 3 2.3 2 solid black
+stop
+"""
+
+
+@pytest.fixture
+def fake_dot(tmp_path, monkeypatch):
+    """Put a fake `dot` on PATH that prints PLAIN_SKIP."""
+    script = tmp_path / "dot"
+    script.write_text(f"#!/bin/sh\ncat > /dev/null\ncat <<'EOF'\n{PLAIN_SKIP}EOF\n")
+    script.chmod(script.stat().st_mode | stat.S_IEXEC)
+    monkeypatch.setenv("PATH", f"{tmp_path}{os.pathsep}{os.environ.get('PATH', '')}")
+    return script
+
+
+def _box(label: str) -> str:
+    """Create an 11x3 box."""
+    return f"+---------+\n| {label:<7} |\n+---------+"
+
+
+def _skip_dag() -> DAG:
+    """Create a -> b -> c plus the skip edge a -> c."""
+    dag = DAG()
+    for node_id in "abc":
+        dag.add_node(node_id, _box(node_id.upper()))
+    dag.add_edge("a", "b")
+    dag.add_edge("b", "c")
+    dag.add_edge("a", "c")
+    return dag
+
+
+def _position(x: int, y: int, label: str = "N") -> NodePosition:
+    """Create a positioned 11x3 box."""
+    return NodePosition(node=Node(id=label, content=_box(label)), x=x, y=y)
+
+
+class TestGraphvizEdgePoints:
+    """Tests for GraphvizEngine(keep_edge_points=True)."""
+
+    def test_not_kept_by_default(self, fake_dot) -> None:
+        """Default layouts carry no edge points."""
+        layout = GraphvizEngine().compute(_skip_dag())
+        assert layout.edge_points == {}
+
+    def test_points_in_character_coordinates(self, fake_dot) -> None:
+        """Points use the same transform as the boxes."""
+        layout = GraphvizEngine(keep_edge_points=True).compute(_skip_dag())
+        assert set(layout.edge_points) == {("a", "b"), ("b", "c"), ("a", "c")}
+        points = layout.edge_points[("a", "c")]
+        assert len(points) == 7
+        # Starts on a's bottom border, ends on c's top border
+        a, c = layout.positions["a"], layout.positions["c"]
+        assert points[0][1] == pytest.approx(a.y + a.node.height)
+        assert points[-1][1] == pytest.approx(c.y)
+        # Bends right of b
+        b = layout.positions["b"]
+        assert max(x for x, _ in points) > b.x + b.node.width
+
+    def test_quoted_ids(self) -> None:
+        """Edge endpoints are read from quoted names in plain output."""
+        dag = DAG()
+        dag.add_node("n-1", _box("N1"))
+        dag.add_node("n-2", _box("N2"))
+        dag.add_edge("n-1", "n-2")
+        plain = (
+            'graph 1 2 5\nnode "n-1" 1 4.25 1.1 1.5 "" solid box black lightgrey\n'
+            'node "n-2" 1 0.75 1.1 1.5 "" solid box black lightgrey\n'
+            'edge "n-1" "n-2" 4 1 3.5 1 3 1 2 1 1.5 solid black\nstop\n'
+        )
+        layout = GraphvizEngine(keep_edge_points=True)._build_layout(dag, plain)
+        assert list(layout.edge_points) == [("n-1", "n-2")]
+
+    def test_dropped_by_post_passes(self, fake_dot) -> None:
+        """Boxes moved by compact_layout() invalidate the points."""
+        from visualflow import compact_layout
+
+        layout = GraphvizEngine(keep_edge_points=True).compute(_skip_dag())
+        assert compact_layout(layout).edge_points == {}
+
+
+class TestSnapRouter:
+    """Tests for SnapRouter."""
+
+    def test_follows_route_around_box(self, fake_dot) -> None:
+        """The skip edge passes b on the side dot routed it."""
+        layout = GraphvizEngine(keep_edge_points=True).compute(_skip_dag())
+        table = SnapRouter().route_layout(layout, _skip_dag().edges)
+        b = layout.positions["b"]
+        index = [i for i in range(len(table)) if (table.source_ids[i], table.target_ids[i]) == ("a", "c")][0]
+        vertical = [
+            (x1, y1, x2, y2) for x1, y1, x2, y2 in table.edge_segments(index)
+            if x1 == x2 and min(y1, y2) <= b.y and max(y1, y2) >= b.y + b.node.height - 1
+        ]
+        assert vertical and all(x >= b.x + b.node.width for x, _, _, _ in vertical)
+
+    def test_segments_connect_exit_to_arrow(self, fake_dot) -> None:
+        """Each snapped path is continuous from below the source to the arrow cell."""
+        dag = _skip_dag()
+        layout = GraphvizEngine(keep_edge_points=True).compute(dag)
+        table = SnapRouter().route_layout(layout, dag.edges)
+        assert len(table) == 3
+        for index in range(len(table)):
+            segments = table.edge_segments(index)
+            source = layout.positions[table.source_ids[index]]
+            target = layout.positions[table.target_ids[index]]
+            assert segments[0][1] == source.y + source.node.height
+            assert segments[-1][3] == target.y - 1
+            for (_, _, x2, y2), (x1, y1, _, _) in zip(segments, segments[1:]):
+                assert (x2, y2) == (x1, y1)
+            for x1, y1, x2, y2 in segments:
+                assert x1 == x2 or y1 == y2
+
+    def test_connectors_on_borders(self, fake_dot) -> None:
+        """Exits sit on the source's bottom border, entries above the target."""
+        dag = _skip_dag()
+        layout = GraphvizEngine(keep_edge_points=True).compute(dag)
+        table = SnapRouter().route_layout(layout, dag.edges)
+        for index, (exit_x, exit_y) in enumerate(table.exits):
+            source = layout.positions[table.source_ids[index]]
+            assert exit_y == source.y + source.node.height - 1
+            assert source.x < exit_x < source.x + source.node.width - 1
+        for index, (entry_x, entry_y) in enumerate(table.entries):
+            target = layout.positions[table.target_ids[index]]
+            assert entry_y == target.y - 1
+            assert target.x < entry_x < target.x + target.node.width - 1
+
+    def test_render_dag_uses_route_layout(self, fake_dot) -> None:
+        """render_dag() routes with route_layout(), so the skip edge clears b."""
+        dag = _skip_dag()
+        snapped = render_dag(dag, GraphvizEngine(keep_edge_points=True), SnapRouter())
+        simple = render_dag(dag, GraphvizEngine(keep_edge_points=True), SimpleRouter())
+        assert snapped != simple
+        b_row = next(line for line in snapped.splitlines() if "| B" in line)
+        # The skip edge runs right of b
+        assert b_row.rstrip().endswith("│")
+
+    def test_without_points_matches_fallback(self) -> None:
+        """Layouts without edge points are routed by the fallback router."""
+        dag = _skip_dag()
+        layout = LayoutResult(
+            positions={"a": _position(10, 0, "A"), "b": _position(0, 6, "B"), "c": _position(10, 12, "C")},
+            width=25,
+            height=15,
+        )
+        snapped = SnapRouter().route_layout(layout, dag.edges)
+        simple = SimpleRouter().route_columnar(layout.positions, dag.edges)
+        assert list(snapped.segments) == list(simple.segments)
+        assert snapped.exits == simple.exits
+
+    def test_edges_without_points_use_fallback(self) -> None:
+        """Edges missing from edge_points are appended from the fallback router."""
+        dag = _skip_dag()
+        layout = LayoutResult(
+            positions={"a": _position(10, 0, "A"), "b": _position(0, 6, "B"), "c": _position(10, 12, "C")},
+            width=25,
+            height=15,
+            edge_points={("a", "b"): [(15.0, 3.0), (5.0, 6.0)]},
+        )
+        table = SnapRouter().route_layout(layout, dag.edges)
+        assert list(zip(table.source_ids, table.target_ids)) == [("a", "b"), ("b", "c"), ("a", "c")]
+        assert table.exits == [(15, 2), (5, 8)]  # a's exit is shared, listed once
+
+    def test_parallel_edges_share_connectors(self) -> None:
+        """Parallel edges add their exit and entry once."""
+        dag = DAG()
+        dag.add_node("a", _box("A"))
+        dag.add_node("b", _box("B"))
+        dag.add_edge("a", "b")
+        dag.add_edge("a", "b")
+        layout = LayoutResult(
+            positions={"a": _position(0, 0, "A"), "b": _position(0, 10, "B")},
+            width=11,
+            height=13,
+            edge_points={("a", "b"): [(5.0, 3.0), (5.0, 10.0)]},
+        )
+        table = SnapRouter().route_layout(layout, dag.edges)
+        assert len(table) == 2
+        assert table.exits == [(5, 2)] and table.entries == [(5, 9)]
+
+    @pytest.mark.parametrize("passed_x", [0, 20])
+    def test_no_jog_rows_before_layer(self, passed_x) -> None:
+        """With no row above a passed layer, the column is kept only if free there."""
+        positions = {
+            "a": _position(0, 0, "A"),
+            "b": _position(passed_x, 3, "B"),  # Directly below a: no gap rows
+            "c": _position(0, 10, "C"),
+        }
+        layout = LayoutResult(
+            positions=positions,
+            width=31,
+            height=13,
+            edge_points={("a", "c"): [(5.0, 3.0), (15.0, 4.0), (15.0, 6.0), (5.0, 10.0)]},
+        )
+        fallback_edges: list[Edge] = []
+
+        class Fallback(SimpleRouter):
+            def route_columnar(self, positions, edges):
+                fallback_edges.extend(edges)
+                return super().route_columnar(positions, edges)
+
+        edge = Edge(source="a", target="c")
+        table = SnapRouter(fallback=Fallback()).route_layout(layout, [edge])
+        if passed_x == 20:
+            assert table.edge_segments(0) == [(5, 3, 5, 9)] and fallback_edges == []
+        else:
+            assert fallback_edges == [edge]  # Column 5 runs through b
+
+    def test_polyline_points(self) -> None:
+        """Point lists that are not Bezier splines are read as polylines."""
+        layout = LayoutResult(
+            positions={"a": _position(0, 0, "A"), "b": _position(20, 10, "B")},
+            width=31,
+            height=13,
+            edge_points={("a", "b"): [(5.0, 3.0), (24.0, 10.0)]},
+        )
+        dag = DAG()
+        dag.add_node("a", _box("A"))
+        dag.add_node("b", _box("B"))
+        dag.add_edge("a", "b")
+        table = SnapRouter().route_layout(layout, dag.edges)
+        assert table.edge_segments(0) == [(5, 3, 5, 6), (5, 6, 24, 6), (24, 6, 24, 9)]
+
+    def test_positions_only_methods_use_fallback(self) -> None:
+        """route() and route_columnar() have no layout, so they fall back."""
+        dag = _skip_dag()
+        positions = {"a": _position(10, 0, "A"), "b": _position(0, 6, "B"), "c": _position(10, 12, "C")}
+        router = SnapRouter()
+        assert router.route(positions, dag.edges) == SimpleRouter().route(positions, dag.edges)
+        assert isinstance(router.route_columnar(positions, dag.edges), SegmentTable)
+
+    def test_measure_layout_uses_route_layout(self, fake_dot) -> None:
+        """measure_layout() routes with route_layout() when the router has it."""
+        dag = _skip_dag()
+        layout = GraphvizEngine(keep_edge_points=True).compute(dag)
+        snapped = measure_layout(layout, dag.edges, router=SnapRouter())
+        table = SnapRouter().route_layout(layout, dag.edges)
+        assert snapped == measure_layout(layout, dag.edges, routes=table)
@@ -0,0 +1,78 @@
+"""Tests for the sparse canvas backend."""
+
+import pytest
+
+from visualflow import render_dag
+from visualflow.engines import GrandalfEngine
+from visualflow.models import EdgePath, LIGHT_THEME, LayoutResult
+from visualflow.render import Canvas, SparseCanvas, canvas_for_layout
+from visualflow.render.sparse import layout_density
+from tests.fixtures import (
+    create_complex_graph,
+    create_diamond,
+    create_simple_chain,
+    create_standalone,
+    create_wide_fanout,
+)
+
+
+class TestSparseCanvas:
+    """SparseCanvas behaves exactly like Canvas."""
+
+    def test_box_and_edges_match_dense(self) -> None:
+        """Boxes, wide characters and edges render identically."""
+        canvases = [
+            backend(width=30, height=12, theme=LIGHT_THEME)
+            for backend in (Canvas, SparseCanvas)
+        ]
+        for canvas in canvases:
+            canvas.place_box("+-------+\n| A \U0001f389  |\n+-------+", 2, 1)
+            canvas.place_box_connector(6, 3)
+            canvas.draw_edge(EdgePath(source_id="a", target_id="b", segments=[(6, 4, 6, 6), (6, 6, 20, 6), (20, 6, 20, 10)]))
+            canvas.draw_edge(EdgePath(source_id="c", target_id="d", segments=[(12, 2, 12, 10)]))
+        assert canvases[0].render() == canvases[1].render()
+        assert canvases[0].get_char(12, 6) == canvases[1].get_char(12, 6) == LIGHT_THEME.cross
+
+    def test_reads_do_not_allocate(self) -> None:
+        """Reading blank cells stores nothing."""
+        canvas = SparseCanvas(width=1000, height=1000)
+        assert canvas.get_char(500, 500) == " "
+        assert canvas.render() == ""
+        assert len(canvas._grid) == 0
+        assert len(canvas._vmask) == 0
+
+    def test_put_char_clears_edge(self) -> None:
+        """Overwriting an edge cell removes the edge there."""
+        canvas = SparseCanvas(width=5, height=5)
+        canvas.draw_edge(EdgePath(source_id="a", target_id="b", segments=[(0, 2, 4, 2)]))
+        canvas.put_char(" ", 2, 2)
+        assert canvas.render() == "\n\n-- --"
+
+
+class TestCanvasSelection:
+    """Tests for density-based backend selection."""
+
+    def test_dense_layout_uses_dense_canvas(self) -> None:
+        """Layouts mostly covered by boxes get the dense backend."""
+        layout = GrandalfEngine().compute(create_simple_chain())
+        assert layout_density(layout) >= 0.1
+        assert type(canvas_for_layout(layout)) is Canvas
+
+    def test_sparse_layout_uses_sparse_canvas(self) -> None:
+        """Mostly-empty layouts get the sparse backend."""
+        layout = LayoutResult(positions={}, width=400, height=300)
+        assert layout_density(layout) == 0.0
+        assert isinstance(canvas_for_layout(layout), SparseCanvas)
+
+    @pytest.mark.parametrize(
+        "create",
+        [create_simple_chain, create_diamond, create_wide_fanout, create_standalone, create_complex_graph],
+    )
+    def test_backends_render_identically(self, create, monkeypatch: pytest.MonkeyPatch) -> None:  # type: ignore[no-untyped-def]
+        """render_dag output does not depend on the backend chosen."""
+        dag = create()
+        monkeypatch.setattr("visualflow.render.sparse.SPARSE_DENSITY", 0.0)
+        dense = render_dag(dag, engine=GrandalfEngine(), theme=LIGHT_THEME)
+        monkeypatch.setattr("visualflow.render.sparse.SPARSE_DENSITY", 2.0)
+        sparse = render_dag(dag, engine=GrandalfEngine(), theme=LIGHT_THEME)
+        assert dense == sparse
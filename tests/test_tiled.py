@@ -0,0 +1,105 @@
+"""Tests for tiled rendering (render_tiled / tile_layout)."""
+
+import types
+
+import pytest
+
+from visualflow import render_dag, render_tiled, tile_layout, GrandalfEngine
+from visualflow.models import DAG, DEFAULT_THEME, EdgePath, LayoutResult
+from visualflow.render import Canvas, SparseCanvas
+from visualflow.routing import SegmentTable, SimpleRouter
+from tests.fixtures import (
+    create_complex_graph,
+    create_diamond,
+    create_simple_chain,
+    create_standalone,
+    create_wide_fanout,
+)
+
+
+def _tall_chain(length: int) -> DAG:
+    """Create a chain of small boxes n0 -> n1 -> ... (ids in box text)."""
+    dag = DAG()
+    for i in range(length):
+        dag.add_node(f"n{i}", f"+-----+\n| N{i:02d} |\n+-----+")
+    for i in range(length - 1):
+        dag.add_edge(f"n{i}", f"n{i + 1}")
+    return dag
+
+
+class TestRenderTiled:
+    """Tests for render_tiled()."""
+
+    def test_returns_lazy_generator(self) -> None:
+        """render_tiled() yields rows lazily."""
+        rows = render_tiled(create_simple_chain(), band_rows=4)
+        assert isinstance(rows, types.GeneratorType)
+
+    @pytest.mark.parametrize("band_rows", [1, 2, 3, 7, 256])
+    @pytest.mark.parametrize(
+        "factory",
+        [create_simple_chain, create_diamond, create_wide_fanout, create_complex_graph, create_standalone],
+    )
+    def test_matches_render_dag(self, factory, band_rows: int) -> None:
+        """Any band height reproduces render_dag() exactly."""
+        dag = factory()
+        engine = GrandalfEngine()
+        expected = render_dag(dag, engine=engine)
+        assert "\n".join(render_tiled(dag, band_rows=band_rows, engine=engine)) == expected
+
+    def test_tall_chain_across_many_bands(self) -> None:
+        """Edges crossing band boundaries keep their lines and arrows."""
+        dag = _tall_chain(30)
+        expected = render_dag(dag)
+        assert "\n".join(render_tiled(dag, band_rows=5)) == expected
+
+    def test_rejects_empty_band(self) -> None:
+        """band_rows must be positive."""
+        with pytest.raises(ValueError, match="band_rows"):
+            list(render_tiled(create_simple_chain(), band_rows=0))
+
+
+class TestTileLayout:
+    """Tests for tile_layout()."""
+
+    def test_empty_layout_yields_nothing(self) -> None:
+        """A layout without nodes produces no rows."""
+        layout = LayoutResult(positions={}, width=0, height=0)
+        assert list(tile_layout(layout, SegmentTable(), DEFAULT_THEME)) == []
+
+    def test_boundary_junction(self) -> None:
+        """A corner on a band's first row still joins the run from above."""
+        dag = _tall_chain(2)
+        layout = GrandalfEngine().compute(dag)
+        table = SimpleRouter().route_columnar(layout.positions, dag.edges)
+        whole = Canvas(width=layout.width, height=layout.height)
+        for pos in layout.positions.values():
+            whole.place_box(pos.node.content, pos.x, pos.y)
+        whole.place_connectors(table.exits)
+        whole.draw_segments(table)
+        for band_rows in range(1, layout.height + 1):
+            assert "\n".join(tile_layout(layout, table, DEFAULT_THEME, band_rows)) == whole.render()
+
+
+class TestCanvasClear:
+    """Tests for Canvas.clear() used to reuse band canvases."""
+
+    @pytest.mark.parametrize("backend", [Canvas, SparseCanvas])
+    def test_clear_blanks_boxes_and_edges(self, backend) -> None:
+        """clear() leaves a canvas that renders empty and can be redrawn."""
+        canvas = backend(width=10, height=6)
+        canvas.place_box("+--+\n|A |\n+--+", 0, 0)
+        canvas.draw_edge(EdgePath(source_id="a", target_id="b", segments=[(1, 3, 1, 5)]))
+        first = canvas.render()
+        canvas.clear()
+        assert canvas.render() == ""
+        assert canvas.get_char(1, 4) == " "
+        canvas.place_box("+--+\n|A |\n+--+", 0, 0)
+        canvas.draw_edge(EdgePath(source_id="a", target_id="b", segments=[(1, 3, 1, 5)]))
+        assert canvas.render() == first
+
+    def test_render_lines_keeps_blank_rows(self) -> None:
+        """render_lines() returns one entry per row."""
+        canvas = Canvas(width=4, height=5)
+        canvas.put_char("x", 1, 1)
+        assert canvas.render_lines() == ["", " x", "", "", ""]